@@ -15,6 +15,8 @@ block), so tests and tooling can import the module safely.
 
 import asyncio
 import atexit
+import functools
+import json
 from collections import deque
 from dataclasses import dataclass, field
 
@@ -41,9 +43,25 @@ from flask import (
 )
 from flask.typing import ResponseReturnValue
 
-from config import Config, _config, get_timezone
+from config import Config, ConfigWatcher, _config, get_timezone
 
+from constants import (
+    CONFIG_WATCH_POLL_SECS,
+    CONTROL_PLANE_REFRESH_SECS,
+    CONTROL_PLANE_STALE_SECS,
+    RESPONSE_CACHE_LAG_BUCKET_SECS,
+)
+from control_plane import ControlPlane, ControlPlaneSnapshot
+from cycle_waker import CycleWaker
 from energy_cache import EnergyCache
+from history_store import HistoryStore
+from instrumentation import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    REGISTRY,
+    SSE_SUBSCRIBERS,
+    merge_families,
+    render as render_metrics,
+)
 from metrics import (
     create_metrics,
     Metrics,
@@ -52,9 +70,12 @@ from metrics import (
     RetryableMetricsException,
 )
 from mockdata import MetricsMock
+from response_cache import CachedBody, ResponseCache
 from load_models import CycleResult
-from sse_event import SSEBroadcaster, event_stream
-from util import CustomJSONProvider, is_debug
+from sse_event import SSEBroadcaster, StreamFilter, event_stream
+from sse_server import SSEStreamServer
+from tou_rollup import TOURollupCache
+from util import CustomJSONProvider, camelize, custom_json_default, is_debug
 
 from tesla_oauth import bp
 
@@ -70,44 +91,42 @@ class _AppState:
 
     energy_cache: EnergyCache
     sse_broadcaster: SSEBroadcaster
+    history_store: HistoryStore | None = None
+    tou_rollups: TOURollupCache = field(default_factory=TOURollupCache)
     load_manager: Any = None
     load_manager_lock: threading.Lock = field(default_factory=threading.Lock)
     load_manager_init_failed: bool = False
     last_cycle_result: CycleResult | None = None
+    load_generation: int = 0
     recent_cycles: deque[dict[str, Any]] = field(
         default_factory=lambda: deque(maxlen=10)
     )
     telegram_sender: Any = None
+    sse_samples_sent_through: datetime | None = None
+    responses: ResponseCache = field(default_factory=ResponseCache)
+    sse_stream_server: Any = None
+    control_plane: ControlPlane | None = None
+    control_snapshot: ControlPlaneSnapshot | None = None
     consecutive_error_count: int = 0
     last_error_type: str | None = None
     lm_thread_started: bool = False
+    cycle_waker: CycleWaker = field(default_factory=CycleWaker)
+    recorder: Any = None
 
 
 # Application-level configuration injected into all consumers.
 _config = Config()
 
+# Same serialization as app.json.dumps (CustomJSONProvider), usable outside
+# an app context: the broadcaster and the SSE stream server encode with it.
+_sse_dumps = functools.partial(json.dumps, default=custom_json_default, sort_keys=True)
+
 # Shared runtime state (cache, broadcaster, load-manager singleton, ...).
 _state = _AppState(
     energy_cache=EnergyCache(ttl_seconds=60),
-    sse_broadcaster=SSEBroadcaster(),
+    sse_broadcaster=SSEBroadcaster(dumper=_sse_dumps),
 )
-
-
-def camelize(obj: object) -> object:
-    """Convert snake_case keys to camelCase recursively."""
-    if isinstance(obj, dict):
-        new_dict = {}
-        for k, v in obj.items():
-            if isinstance(k, str) and "_" in k:
-                parts = k.split("_")
-                new_key = parts[0] + "".join(p.capitalize() for p in parts[1:])
-            else:
-                new_key = k
-            new_dict[new_key] = camelize(v)
-        return new_dict
-    if isinstance(obj, list):
-        return [camelize(i) for i in obj]
-    return obj
+SSE_SUBSCRIBERS.labels("flask").set_function(_state.sse_broadcaster.subscriber_count)
 
 
 def _trim_output_device(device: dict[str, Any]) -> dict[str, Any]:
@@ -167,14 +186,84 @@ def _enrich_metrics_for_sse(metrics_data: dict[str, Any], now: datetime | None =
             d["lag"] = timedelta(seconds=cached_lag.total_seconds() + elapsed)
     samples = _state.energy_cache.samples
     if samples:
-        accumulated = list(samples)
         devices = metrics_data.get("devices", [])
         if len(devices) == 1:
-            devices[0]["per_second_data"] = accumulated
+            # Only the tail survives _trim_output_device; copy just that.
+            devices[0]["per_second_data"] = list(samples[-300:])
     metrics_data["devices"] = [_trim_output_device(d) for d in metrics_data.get("devices", [])]
     return metrics_data
 
 
+def _mark_sample_range(
+    metrics_data: dict[str, Any],
+    since: datetime | None = None,
+) -> datetime | None:
+    """Tag the device's per_second_data with the sample range it covers.
+
+    With *since* set (the ``per_second_end`` of the previous event), the
+    device's ``per_second_data`` is cut down to the samples taken after
+    *since* and ``per_second_reset`` is False: clients append them to
+    their window.  Otherwise — and whenever the delta cannot be expressed
+    (multiple devices, no samples, a gap longer than the 300-sample
+    window, or the window restarting) — the trimmed tail is kept and
+    ``per_second_reset`` is True: clients replace their window.
+
+    Args:
+        metrics_data: Output of ``_enrich_metrics_for_sse`` (mutated).
+        since: Last sample time already sent to subscribers, or None.
+
+    Returns:
+        Time of the newest sample in the payload, or None if unknown.
+    """
+    devices = metrics_data.get("devices", [])
+    data = _state.energy_cache.data
+    end = data.last_sample_at if data is not None else None
+    if len(devices) != 1 or data is None or end is None or not data.samples:
+        for d in devices:
+            d["per_second_reset"] = True
+        return None
+    # Re-read the tail from the same snapshot as ``end`` so the range stays
+    # consistent even if a fetch swapped the cache since enrichment.
+    device = devices[0]
+    window = data.samples[-300:]
+    new = int((end - since).total_seconds()) if since is not None else -1
+    if 0 <= new <= len(window):
+        device["per_second_data"] = list(window[len(window) - new:]) if new else []
+        device["per_second_reset"] = False
+    else:
+        device["per_second_data"] = list(window)
+        device["per_second_reset"] = True
+    device["per_second_end"] = end
+    return end
+
+
+def _metrics_update_payload() -> tuple[dict[str, Any], dict[str, Any] | None] | None:
+    """Build the camelized ``metrics_update`` delta for the SSE broadcast.
+
+    Carries only the samples appended since the previous ``metrics_update``
+    (see ``_mark_sample_range``), so the per-cycle event no longer repeats
+    the whole 300-sample window.
+
+    Returns:
+        ``(delta, keyframe)``, where *keyframe* is the same event with the
+        full window for subscribers that skipped earlier updates (None when
+        the delta already is a full window); or None when no metrics are
+        cached.
+    """
+    full_metrics_dict = _state.energy_cache.full_metrics_dict
+    if full_metrics_dict is None:
+        return None
+    metrics_data = _enrich_metrics_for_sse(dict(full_metrics_dict))
+    keyframe = dict(metrics_data, devices=[dict(d) for d in metrics_data["devices"]])
+    _state.sse_samples_sent_through = _mark_sample_range(
+        metrics_data, since=_state.sse_samples_sent_through,
+    )
+    if all(d.get("per_second_reset") for d in metrics_data["devices"]):
+        return camelize(metrics_data), None  # type: ignore[return-value]
+    _mark_sample_range(keyframe)
+    return camelize(metrics_data), camelize(keyframe)  # type: ignore[return-value]
+
+
 # The template_folder and static_folder default to 'templates' and 'static'
 # relative to the application path. Using the default root structure.
 
@@ -267,7 +356,14 @@ def _get_tou_model(start_date: datetime, end_date: datetime, force_mock: bool =
     if is_mock:
         mock = MetricsMock()
         return TOUResult(buckets=mock.tou_result, nbc=mock.nbc_result)
-    model = TOUReporter(start_date, end_date, logger, config=_config)
+    model = TOUReporter(
+        start_date,
+        end_date,
+        logger,
+        config=_config,
+        store=_state.history_store,
+        rollups=_state.tou_rollups,
+    )
     assert model.tou_result is not None
     assert model.nbc_result is not None
     return TOUResult(buckets=model.tou_result, nbc=model.nbc_result)
@@ -320,6 +416,9 @@ def index() -> ResponseReturnValue:
     """Main index endpoint serving HTML or JSON based on Accept header.
 
     In mock mode, falls back to MetricsMock for deterministic test data.
+    Real-data bodies are memoized per cache generation, load generation,
+    representation and lag bucket, and carry an ``ETag`` so pollers get
+    ``304 Not Modified`` while nothing changed.
     """
     logger.debug("index")
     is_mock_error = _config.is_mock_error
@@ -343,25 +442,43 @@ def index() -> ResponseReturnValue:
                 instant_minute = None
         model = _get_model(logger, now, is_mock_error, instant_minute=instant_minute)
         metrics_data = model.metrics
+    elif _follower_snapshot(now) is not None:
+        # Follower worker: serve the leader's cache instead of fetching.
+        metrics_data = _state.energy_cache.full_metrics_dict
+        logger.debug("Serving control-plane snapshot for index endpoint")
     else:
         # Real mode: use cached metrics to avoid hammering the API
-        metrics_data, was_fresh = _state.energy_cache.get_or_fetch(
-            lambda: create_metrics(_state.energy_cache, datetime.now(pytz.timezone(_config.timezone)), logger),
-            now
-        )
+        metrics_data, was_fresh = _refresh_metrics(now, caller="index")
         if was_fresh:
             logger.debug("Fetched fresh metrics for index endpoint")
         else:
             logger.debug("Serving cached metrics for index endpoint")
 
+    # check for default html first, to handle missing Accept header.
+    if request.accept_mimetypes.accept_html:
+        representation = "html"
+    elif request.accept_mimetypes.accept_json:
+        representation = "json"
+    else:
+        return abort(406)
+
+    # Real data: reuse the body rendered for the same cache snapshot, load
+    # cycle and lag bucket (home-automation pollers hit this constantly).
+    cache_key: tuple[Any, ...] | None = None
+    cache_inputs: tuple[Any, ...] = ()
+    if not is_mock and metrics_data is not None:
+        cache_key, cache_inputs, now = _index_cache_key(representation, metrics_data, now)
+        cached = _state.responses.get(cache_key, cache_inputs)
+        if cached is not None:
+            return _cached_response(cached)
+
     # Enrich metrics for output: recalculate lag, merge samples, trim output.
     metrics_data = _enrich_metrics_for_sse(metrics_data, now=now)
 
-    # Gather load management state for display
-    load_management = _build_load_management_payload()
+    # Gather load management state for display (camelCase for JSON clients)
+    load_management = _build_load_management_payload(camel=representation == "json")
 
-    # check for default html first, to handle missing Accept header.
-    if request.accept_mimetypes.accept_html:
+    if representation == "html":
         refresh_secs: int | None = None
         if not metrics_data.get("devices"):
             # First-boot API outage: the 500 retry page is dead for
@@ -374,19 +491,76 @@ def index() -> ResponseReturnValue:
                 "index: serving empty dashboard (no devices); auto-refreshing in %ds",
                 refresh_secs,
             )
-        return render_template(
+        html = render_template(
             "index.html",
             metrics=metrics_data,
             load_management=load_management,
             refresh_secs=refresh_secs,
         )
-
-    if request.accept_mimetypes.accept_json:
-        payload: dict = camelize(metrics_data)  # type: ignore[assignment]
-        payload["loadManagement"] = camelize(load_management)
+        if cache_key is None:
+            return html
+        return _cached_response(_state.responses.put(
+            cache_key, cache_inputs, html.encode("utf-8"), "text/html; charset=utf-8",
+        ))
+
+    payload: dict = camelize(metrics_data)  # type: ignore[assignment]
+    payload["loadManagement"] = load_management
+    if cache_key is None:
         return _json_response(payload)
+    return _cached_response(_state.responses.put(
+        cache_key, cache_inputs, current_app.json.dumps(payload).encode("utf-8"),
+        "application/json",
+    ))
 
-    return abort(406)
+
+def _index_cache_key(
+    representation: str, metrics_data: dict[str, Any], now: datetime,
+) -> tuple[tuple[Any, ...], tuple[Any, ...], datetime]:
+    """Return the response-cache key and inputs for an ``index`` request.
+
+    The recalculated ``lag`` is the only part of the body that changes
+    between cache swaps, so *now* is rounded down to a
+    ``RESPONSE_CACHE_LAG_BUCKET_SECS`` step after the fetch and the bucket
+    becomes part of the key.
+
+    Args:
+        representation: ``"html"`` or ``"json"``.
+        metrics_data: The cached metrics dict about to be rendered.
+        now: Request time.
+
+    Returns:
+        ``(key, inputs, now)`` with *now* rounded to the lag bucket.
+    """
+    fetched_at = metrics_data.get("_fetched_at")
+    bucket: int | None = None
+    if fetched_at is not None:
+        bucket = int((now - fetched_at).total_seconds() // RESPONSE_CACHE_LAG_BUCKET_SECS)
+        now = fetched_at + timedelta(seconds=bucket * RESPONSE_CACHE_LAG_BUCKET_SECS)
+    key = (
+        representation,
+        bucket,
+        _state.energy_cache.generation,
+        _state.load_generation,
+        _config.load_manage_enabled,
+    )
+    inputs = (
+        _state.energy_cache,
+        _state.energy_cache.data,
+        metrics_data,
+        _state.load_manager,
+        _state.last_cycle_result,
+        _state.control_snapshot,
+    )
+    return key, inputs, now
+
+
+def _cached_response(cached: CachedBody) -> Response:
+    """Serve a memoized body with its ETag, or 304 if the client has it."""
+    resp = Response(cached.body, content_type=cached.mimetype)
+    resp.set_etag(cached.etag)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.make_conditional(request)
+    return resp
 
 
 def health() -> Response:
@@ -397,6 +571,25 @@ def health() -> Response:
     return resp
 
 
+def prometheus_metrics() -> Response:
+    """Instrumentation in the Prometheus text format (``/metrics``).
+
+    A control-plane follower serves the leader's families, since the
+    leader runs the cycles and fetches, with its own SSE families.
+    """
+    families = REGISTRY.collect()
+    snapshot = _state.control_snapshot
+    if (
+        _following_control_plane()
+        and snapshot is not None
+        and snapshot.instrumentation is not None
+    ):
+        families = merge_families(snapshot.instrumentation, families)
+    resp = Response(render_metrics(families))
+    resp.headers["Content-Type"] = METRICS_CONTENT_TYPE
+    return resp
+
+
 def tou() -> ResponseReturnValue:
     """Time-of-Use API endpoint for energy consumption data."""
     logger.debug("tou")
@@ -446,7 +639,9 @@ def tou() -> ResponseReturnValue:
 # === Load Management State ===
 
 
-def _cycle_result_to_dict(result: CycleResult | dict | None) -> dict:
+def _cycle_result_to_dict(
+    result: CycleResult | dict | None, camel: bool = False,
+) -> dict:
     """Convert a CycleResult to a plain dict for JSON serialization.
 
     Accepts both CycleResult objects (calling .to_dict()) and plain dicts
@@ -454,6 +649,8 @@ def _cycle_result_to_dict(result: CycleResult | dict | None) -> dict:
 
     Args:
         result: The CycleResult or dict to convert.
+        camel: Return camelCase keys (``to_camel_dict()``, or ``camelize``
+            for plain dicts) for the JSON/SSE payloads.
 
     Returns:
         A plain dict representation suitable for JSON serialization
@@ -462,11 +659,11 @@ def _cycle_result_to_dict(result: CycleResult | dict | None) -> dict:
     if result is None:
         return {}
     if isinstance(result, dict):
-        return result
-    return result.to_dict()
+        return camelize(result) if camel else result  # type: ignore[return-value]
+    return result.to_camel_dict() if camel else result.to_dict()
 
 
-def _build_load_management_payload(lm: Any = None) -> dict:
+def _build_load_management_payload(lm: Any = None, camel: bool = False) -> dict:
     """Build a load management state payload for the index endpoint.
 
     Args:
@@ -477,22 +674,40 @@ def _build_load_management_payload(lm: Any = None) -> dict:
             When omitted, the load manager is resolved under the lock;
             an empty dict is returned if load management is disabled or
             the manager is unavailable.
+        camel: Build the camelCase payload sent to JSON and SSE clients
+            directly, instead of camelizing the snake_case one.
 
     Returns:
         Dict with enabled flag, device states, pending effects, and the
-        last cycle result; an empty dict when unavailable.
+        last cycle result; an empty dict when unavailable.  Control-plane
+        followers return the leader's payload from its last snapshot.
     """
     if lm is None:
         if _config.load_manage_enabled is False:
             return {}
+        if _following_control_plane():
+            snapshot = _state.control_snapshot
+            shared = (snapshot.load_management or {}) if snapshot is not None else {}
+            return camelize(shared) if camel else shared  # type: ignore[return-value]
         lm = _get_load_manager()
         if lm is None:
             return {}
         with _state.load_manager_lock:
-            last_result = _cycle_result_to_dict(_state.last_cycle_result) if _state.last_cycle_result else {}
+            last_result = _cycle_result_to_dict(_state.last_cycle_result, camel)
     else:
-        last_result = _cycle_result_to_dict(_state.last_cycle_result) if _state.last_cycle_result else {}
-
+        last_result = _cycle_result_to_dict(_state.last_cycle_result, camel)
+
+    if camel:
+        return {
+            "enabled": lm.enabled,
+            "dryRun": lm.dry_run,
+            "targetWh": lm.target_wh,
+            "nbcDevice": lm.nbc_device,
+            "state": camelize(lm.state.to_dict()),
+            "lastCycleResult": last_result,
+            "sleepHint": last_result.get("sleepHint", lm.config_interval_secs),
+            "sleepHintAt": last_result.get("sleepHintAt"),
+        }
     payload: dict = {
         "enabled": lm.enabled,
         "dry_run": lm.dry_run,
@@ -518,12 +733,16 @@ def _get_load_manager():
             try:
                 from load_manager import LoadManager, LoadManagerConfig
 
+                recorder = _open_recorder()
+
                 def metrics_fetch():
                     now = datetime.now(timezone.utc)
                     return _state.energy_cache.get_or_fetch(
                         lambda: create_metrics(_state.energy_cache, datetime.now(pytz.timezone(_config.timezone)), logger),
                         now,
-                        force=True
+                        force=True,
+                        skip_unchanged=True,
+                        caller="load_manager",
                     )[0]
 
                 # Wire up Telegram notifications if configured (env vars or
@@ -544,13 +763,20 @@ def _get_load_manager():
                 _state.load_manager = LoadManager(
                     LoadManagerConfig(
                         config=_config,
-                        metrics_fetch=metrics_fetch,
+                        metrics_fetch=(
+                            recorder.wrap_fetch(metrics_fetch)
+                            if recorder is not None else metrics_fetch
+                        ),
                         config_interval_secs=_config.load_manage_interval_secs,
                         telegram_sender=telegram_sender,
                         energy_cache=_state.energy_cache,
                     ),
                 )
+                _state.load_generation += 1
                 logger.info("LoadManager initialized")
+                if recorder is not None:
+                    recorder.attach(_state.load_manager)
+                    _state.recorder = recorder
 
 
             except Exception as e:
@@ -559,6 +785,42 @@ def _get_load_manager():
         return _state.load_manager
 
 
+def _open_recorder() -> Any:
+    """Open the replay log named by ``LOAD_RECORD_PATH`` (see replay.py).
+
+    Returns:
+        A ``replay.Recorder``, or None when recording is off or the log
+        cannot be opened.
+    """
+    path = _config.load_record_path
+    if path is None:
+        return None
+    from replay import Recorder
+
+    try:
+        recorder = Recorder.open(path)
+    except OSError as e:
+        logger.warning("Cannot open replay log %s: %s", path, e)
+        return None
+    logger.info("Recording load-management inputs to %s", path)
+    return recorder
+
+
+def _configure_tracing() -> None:
+    """Trace sampled load cycles to ``TRACE_PATH`` (see tracing.py)."""
+    path = _config.trace_path
+    if path is None:
+        return
+    import tracing
+
+    tracing.configure(
+        tracing.Tracer(tracing.TraceFile(path), _config.trace_sample_rate)
+    )
+    logger.info(
+        "Tracing %.0f%% of load cycles to %s", _config.trace_sample_rate * 100, path,
+    )
+
+
 def _send_error_alert(exc: Exception) -> None:
     """Send a telegram error alert for background loop errors.
 
@@ -576,6 +838,143 @@ def _send_error_alert(exc: Exception) -> None:
         logger.debug("Failed to send error alert", exc_info=True)
 
 
+# === Control plane (multi-worker) ===
+
+
+def _following_control_plane() -> bool:
+    """Return True when another worker owns fetching and load management."""
+    plane = _state.control_plane
+    return plane is not None and not plane.is_leader
+
+
+def _follower_snapshot(now: datetime) -> ControlPlaneSnapshot | None:
+    """Return the leader's snapshot if this worker follows one.
+
+    A follower serves the snapshot however old it is rather than call
+    Emporia itself; only before the first snapshot arrives does it fetch.
+    """
+    if not _following_control_plane():
+        return None
+    snapshot = _state.control_snapshot
+    if snapshot is None:
+        return None
+    age = (now - snapshot.written_at).total_seconds()
+    if age > CONTROL_PLANE_STALE_SECS:
+        logger.debug("Control plane: serving a snapshot %.0fs old", age)
+    return snapshot
+
+
+def _refresh_metrics(now: datetime, caller: str) -> tuple[dict[str, Any] | None, bool]:
+    """Return cached metrics, fetching once the cache has expired.
+
+    A control-plane leader publishes every fresh fetch, so followers see
+    it whether or not the load-management loop runs.
+
+    Args:
+        now: Current time.
+        caller: ``caller`` label for ``EnergyCache.get_or_fetch``.
+
+    Returns:
+        Tuple of *(metrics_dict_or_none, was_fresh)*.
+    """
+    metrics_data, was_fresh = _state.energy_cache.get_or_fetch(
+        lambda: create_metrics(_state.energy_cache, datetime.now(pytz.timezone(_config.timezone)), logger),
+        now,
+        caller=caller,
+    )
+    if was_fresh:
+        _publish_control_snapshot()
+    return metrics_data, was_fresh
+
+
+def _publish_control_snapshot(**fields: Any) -> None:
+    """Share the leader's cache and load state with follower workers.
+
+    ``load_management`` and ``load_status`` carry over from the previous
+    snapshot when not given, so a publish from the fetch path keeps the
+    load state; the one-shot SSE events do not.
+
+    Args:
+        **fields: ``ControlPlaneSnapshot`` fields besides ``cache_data``.
+    """
+    plane = _state.control_plane
+    if plane is None or not plane.is_leader:
+        return
+    previous = _state.control_snapshot
+    if previous is not None:
+        fields.setdefault("load_management", previous.load_management)
+        fields.setdefault("load_status", previous.load_status)
+    try:
+        _state.control_snapshot = plane.publish(
+            cache_data=_state.energy_cache.data,
+            instrumentation=tuple(REGISTRY.collect()),
+            **fields,
+        )
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning("Control plane: snapshot not published: %s", e)
+
+
+def _control_refresh_loop() -> None:
+    """Keep the leader's cache fresh for followers without load management.
+
+    The load-management loop normally drives the fetches; with it off, the
+    leader refreshes on the cache TTL so followers never fall back to
+    Emporia.
+    """
+    logger.info("Control plane: refreshing metrics for followers")
+    while True:
+        try:
+            _refresh_metrics(datetime.now(timezone.utc), caller="control_plane")
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Control plane: refresh failed: %s", e)
+        time.sleep(CONTROL_PLANE_REFRESH_SECS)
+
+
+def _apply_control_snapshot(snapshot: ControlPlaneSnapshot, skipped: bool) -> None:
+    """Mirror a leader snapshot in this follower and relay its SSE events.
+
+    Args:
+        snapshot: The new snapshot.
+        skipped: Whether earlier generations were missed; the
+            ``metrics_update`` delta then no longer applies and its
+            keyframe is sent instead.
+    """
+    _state.energy_cache.adopt(snapshot.cache_data)
+    _state.control_snapshot = snapshot
+    _state.load_generation += 1
+    if snapshot.load_cycle is not None:
+        _state.sse_broadcaster.publish("load_cycle", snapshot.load_cycle)
+    if snapshot.metrics_update is not None:
+        delta, keyframe = snapshot.metrics_update
+        if skipped and keyframe is not None:
+            _state.sse_broadcaster.publish("metrics_update", keyframe)
+        else:
+            _state.sse_broadcaster.publish("metrics_update", delta, keyframe=keyframe)
+
+
+def _join_control_plane() -> bool:
+    """Elect one worker to run the background services if configured.
+
+    With ``CONTROL_PLANE_DIR`` set, the worker that wins the lock leads;
+    the others follow its snapshots and take over if it exits.
+
+    Returns:
+        True if this worker follows (and must not start the services).
+    """
+    directory = _config.control_plane_dir
+    if not directory or _state.control_plane is not None:
+        return False
+    plane = ControlPlane(directory)
+    _state.control_plane = plane
+    atexit.register(plane.close)
+    if plane.try_lead():
+        logger.info("Control plane: leading from %s", directory)
+        return False
+    logger.info("Control plane: following the leader in %s", directory)
+    plane.start_following(_apply_control_snapshot, on_promote=_start_control_services)
+    return True
+
+
 def _load_management_loop() -> None:
     """Background thread that runs load management cycle with adaptive sleep."""
     interval_secs_config = _config.load_manage_interval_secs
@@ -592,6 +991,7 @@ def _load_management_loop() -> None:
                 lm._send_pending_notifications_sync()  # flush Telegram sends outside lock
                 with _state.load_manager_lock:
                     _state.last_cycle_result = result
+                    _state.load_generation += 1
                     _state.recent_cycles.append({
                         "status": result.status,
                         "reason": result.diagnostics.reason if result.diagnostics else None,
@@ -600,7 +1000,15 @@ def _load_management_loop() -> None:
                         "gap_wh": result.gap_wh,
                         "timestamp": datetime.now(timezone.utc).isoformat(),
                     })
-                    lm_payload = _build_load_management_payload(lm)
+                    load_cycle = _build_load_management_payload(lm, camel=True)
+                    lm_payload = (
+                        _build_load_management_payload(lm)
+                        if _state.control_plane is not None else None
+                    )
+                    status_payload = (
+                        _build_load_status_payload(lm)
+                        if _state.control_plane is not None else None
+                    )
                 logger.debug("Load management cycle result: %s", result)
                 if (
                     result.status == "no_incomplete_qh"
@@ -609,13 +1017,19 @@ def _load_management_loop() -> None:
                     logger.warning(
                         "Load management: no data available (possible network issue)"
                     )
-                _state.sse_broadcaster.publish("load_cycle", camelize(lm_payload))
-                full_metrics_dict = _state.energy_cache.full_metrics_dict
-                if full_metrics_dict is not None:
+                _state.sse_broadcaster.publish("load_cycle", load_cycle)
+                metrics_update = _metrics_update_payload()
+                if metrics_update is not None:
+                    delta, keyframe = metrics_update
                     _state.sse_broadcaster.publish(
-                        "metrics_update",
-                        camelize(_enrich_metrics_for_sse(dict(full_metrics_dict))),
+                        "metrics_update", delta, keyframe=keyframe,
                     )
+                _publish_control_snapshot(
+                    load_management=lm_payload,
+                    load_status=status_payload,
+                    load_cycle=load_cycle,
+                    metrics_update=metrics_update,
+                )
             interval_secs = interval_secs_config
         except RetryableMetricsException as e:
             interval_secs = interval_secs_config
@@ -640,21 +1054,20 @@ def _load_management_loop() -> None:
             interval_secs_adjusted = _state.energy_cache.sleep_interval_adjust(
                 interval_secs, datetime.now(pytz.timezone(_config.timezone)))
         logger.debug("Load management sleeping %.1f", interval_secs_adjusted)
-        time.sleep(interval_secs_adjusted)
+        reasons = _state.cycle_waker.wait(interval_secs_adjusted)
+        if reasons:
+            logger.info("Load management woken early: %s", ", ".join(reasons))
 
 
-def load_status() -> Response:
-    """Read-only endpoint returning current load management state.
+def _build_load_status_payload(lm: Any) -> dict[str, Any]:
+    """Build the ``/api/v1/load/status`` payload (snake case).
 
-    Returns StateTracker state, last cycle result timestamp, enabled/disabled flag,
-    and cache status.
-    """
-    lm = _get_load_manager()
-    if lm is None:
-        return abort(503, "LoadManager not initialized")
+    The caller holds ``_state.load_manager_lock``.
 
-    with _state.load_manager_lock:
-        last_result = _cycle_result_to_dict(_state.last_cycle_result) if _state.last_cycle_result else {}
+    Args:
+        lm: The LoadManager instance.
+    """
+    last_result = _cycle_result_to_dict(_state.last_cycle_result) if _state.last_cycle_result else {}
 
     payload = {
         "enabled": lm.enabled,
@@ -686,9 +1099,84 @@ def load_status() -> Response:
                 "timestamp": effect.timestamp.isoformat(),
             }
         )
+    return payload
+
+
+def load_status() -> Response:
+    """Read-only endpoint returning current load management state.
+
+    Returns StateTracker state, last cycle result timestamp, enabled/disabled flag,
+    and cache status. Control-plane followers serve the leader's snapshot.
+    """
+    if _following_control_plane():
+        snapshot = _state.control_snapshot
+        if snapshot is None or snapshot.load_status is None:
+            return abort(503, "LoadManager not initialized")
+        return _json_response(camelize(snapshot.load_status))
+
+    lm = _get_load_manager()
+    if lm is None:
+        return abort(503, "LoadManager not initialized")
+
+    with _state.load_manager_lock:
+        payload = _build_load_status_payload(lm)
     return _json_response(camelize(payload))
 
 
+def trigger_load_cycle() -> ResponseReturnValue:
+    """Wake the load-management loop for an immediate cycle.
+
+    ``POST /api/v1/load/cycle``.  The cycle still honours the loop's
+    debounce and minimum spacing; the response does not wait for it.
+    Returns 503 when this worker does not run the loop (load management
+    disabled, or a control-plane follower).
+    """
+    if not _state.lm_thread_started:
+        abort(503, "Load management loop not running in this worker")
+    _state.cycle_waker.wake("api")
+    return _json_response({"queued": True}), 202
+
+
+def _initial_sse_events(
+    stream_filter: StreamFilter | None = None,
+    published: dict[str, object] | None = None,
+) -> list[tuple[str, object]]:
+    """Return the bootstrap events for a new SSE client.
+
+    Used by ``/stream/status`` and by the dedicated SSE stream server.
+    ``initial_load_state`` and ``initial_metrics`` are only sent to clients
+    whose filter selects ``load_cycle`` and ``metrics_update`` respectively.
+
+    ``initial_metrics`` is the last published ``metrics_update`` keyframe,
+    not the cache: a fetch may already have swapped in samples that the
+    next delta will carry, and the client resumes from the id of the last
+    published event.  Only before the first ``metrics_update`` (whose
+    window is then a full reset) is it built from the cache.
+
+    Args:
+        stream_filter: The client's event selection; None selects all.
+        published: Payloads published up to the client's snapshot id
+            (``SSEBroadcaster.snapshot``).
+    """
+    initial: list[tuple[str, object]] = []
+    if stream_filter is None or stream_filter.accepts("load_cycle"):
+        initial.append(
+            ("initial_load_state", _build_load_management_payload(camel=True))
+        )
+    if stream_filter is not None and not stream_filter.accepts("metrics_update"):
+        return initial
+    keyframe = (published or {}).get("metrics_update")
+    if keyframe is not None:
+        initial.append(("initial_metrics", keyframe))
+        return initial
+    full_metrics_dict = _state.energy_cache.full_metrics_dict
+    if full_metrics_dict is not None:
+        metrics_data = _enrich_metrics_for_sse(dict(full_metrics_dict))
+        _mark_sample_range(metrics_data)
+        initial.append(("initial_metrics", camelize(metrics_data)))
+    return initial
+
+
 def stream_status():
     """SSE endpoint streaming load management state and metrics updates.
 
@@ -696,17 +1184,31 @@ def stream_status():
     management payload, and an initial_metrics event (if cached metrics
     are available). Then subscribes to the SSE broadcaster for ongoing
     load_cycle and metrics_update events as they occur.
+
+    A reconnecting client whose ``Last-Event-ID`` is still covered by the
+    broadcaster's replay ring skips the bootstrap and receives only the
+    events it missed. ``metrics_update`` events are deltas: a device's
+    ``perSecondData`` holds the samples after the previous event, ending
+    at ``perSecondEnd``; ``perSecondReset`` marks a full window instead.
+
+    Query parameters narrow the stream per client: ``events`` selects event
+    types (comma-separated) and ``interval`` sets a minimum number of
+    seconds between deliveries, for all types (``interval=60``) or per type
+    (``interval=load_cycle:60,metrics_update:10``). Throttled types are
+    coalesced to the latest event. Invalid values get a 400.
     """
-    initial: list[tuple[str, object]] = [
-        ("initial_load_state", camelize(_build_load_management_payload())),
-    ]
-    full_metrics_dict = _state.energy_cache.full_metrics_dict
-    if full_metrics_dict is not None:
-        initial.append(
-            ("initial_metrics", camelize(_enrich_metrics_for_sse(dict(full_metrics_dict))))
-        )
+    try:
+        stream_filter = StreamFilter.from_query(request.args)
+    except ValueError as exc:
+        return abort(400, f"Invalid stream filter: {exc}")
     return Response(
-        event_stream(_state.sse_broadcaster, initial_events=initial, dumper=current_app.json.dumps),
+        event_stream(
+            _state.sse_broadcaster,
+            dumper=current_app.json.dumps,
+            last_event_id=request.headers.get("Last-Event-ID"),
+            bootstrap=functools.partial(_initial_sse_events, stream_filter),
+            stream_filter=stream_filter,
+        ),
         mimetype="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -716,13 +1218,33 @@ def stream_status():
     )
 
 
+def _wake_on_charge_transition(field: str, old: Any, new: Any) -> None:
+    """MQTT listener: wake the load loop when the vehicle's charging changes."""
+    from mqtt_telemetry import is_charge_transition
+    if is_charge_transition(field, old, new):
+        _state.cycle_waker.wake(f"telemetry:{field}")
+
+
 def _start_mqtt_subscriber() -> None:
     """Start the MQTT subscriber thread for Tesla fleet-telemetry events."""
-    from mqtt_telemetry import start_mqtt_subscriber as _start
+    from mqtt_telemetry import add_listener, start_mqtt_subscriber as _start
+    add_listener(_wake_on_charge_transition)
     _start(_config)
     logger.info("MQTT subscriber started")
 
 
+def _config_watch_loop(watcher: ConfigWatcher) -> None:
+    """Background thread: wake the load loop when .env/devices.json change.
+
+    The load manager's own ``ConfigWatcher`` still performs the reload at
+    the top of the woken cycle.
+    """
+    while True:
+        time.sleep(CONFIG_WATCH_POLL_SECS)
+        if watcher.modified():
+            _state.cycle_waker.wake("config")
+
+
 def _start_load_manager_thread():
     """Start the load management background thread (called once per process)."""
     if _state.lm_thread_started:
@@ -730,6 +1252,10 @@ def _start_load_manager_thread():
     _state.lm_thread_started = True
     lm_thread = threading.Thread(target=_load_management_loop, daemon=True)
     lm_thread.start()
+    threading.Thread(
+        target=_config_watch_loop, args=(ConfigWatcher(),),
+        name="config-watch", daemon=True,
+    ).start()
 
 
 def _shutdown_load_manager():
@@ -741,6 +1267,61 @@ def _shutdown_load_manager():
                 logger.info("LoadManager shut down cleanly")
             except Exception as e:
                 logger.warning("Error during LoadManager shutdown: %s", e)
+        if _state.recorder is not None:
+            _state.recorder.close()
+            _state.recorder = None
+
+
+def _open_history_store() -> None:
+    """Open the configured history store and warm the energy cache from it."""
+    if _state.history_store is not None:
+        return
+    store = HistoryStore.from_config(_config)
+    if store is None:
+        return
+    _state.history_store = store
+    _state.energy_cache.attach_store(store)
+    _state.tou_rollups.attach_store(store)
+    atexit.register(store.close)
+    logger.info("History store: %s", store.path)
+
+
+def _start_sse_stream_server() -> None:
+    """Serve SSE clients from the event-driven stream server if configured.
+
+    With ``SSE_STREAM_PORT`` set, stream clients connect to that port (via
+    the reverse proxy) instead of holding a gunicorn request thread each;
+    ``/stream/status`` on the main port keeps working. Only one gunicorn
+    worker can bind the port; the others log and carry on.
+    """
+    port = _config.sse_stream_port
+    if not port or _state.sse_stream_server is not None:
+        return
+    server = SSEStreamServer(
+        _state.sse_broadcaster, bootstrap=_initial_sse_events, dumper=_sse_dumps,
+    )
+    try:
+        server.start(port=port)
+    except OSError as exc:
+        logger.warning("SSE stream server not started on port %d: %s", port, exc)
+        return
+    _state.sse_stream_server = server
+    SSE_SUBSCRIBERS.labels("stream").set_function(lambda: server.client_count)
+    atexit.register(server.close)
+
+
+def _start_control_services() -> None:
+    """Start the services only the control-plane leader runs."""
+    _configure_tracing()
+    _start_sse_stream_server()
+    if _config.load_tesla_controller == "real":
+        _start_mqtt_subscriber()
+    if _config.load_manage_enabled is not False:
+        _start_load_manager_thread()
+    elif _state.control_plane is not None:
+        threading.Thread(
+            target=_control_refresh_loop, name="control-refresh", daemon=True,
+        ).start()
 
 
 def start_background_services() -> None:
@@ -750,11 +1331,14 @@ def start_background_services() -> None:
     side-effect free so tests and tooling can import it safely. The gunicorn
     entry point (wsgi.py) and the ``__main__`` block call this explicitly
     after the app is constructed.
+
+    With ``CONTROL_PLANE_DIR`` set, only the elected worker starts them;
+    the other workers serve its snapshots (see ``control_plane.py``).
     """
-    if _config.load_tesla_controller == "real":
-        _start_mqtt_subscriber()
-    if _config.load_manage_enabled is not False:
-        _start_load_manager_thread()
+    _open_history_store()
+    if _join_control_plane():
+        return
+    _start_control_services()
 
 
 def create_app() -> Flask:
@@ -786,8 +1370,13 @@ def create_app() -> Flask:
     application.register_error_handler(RetryableMetricsException, error_retryable)
     application.add_url_rule("/", "index", index)
     application.add_url_rule("/health", "health", health)
+    application.add_url_rule("/metrics", "prometheus_metrics", prometheus_metrics)
     application.add_url_rule("/api/v1/tou", "tou", tou)
     application.add_url_rule("/api/v1/load/status", "load_status", load_status)
+    application.add_url_rule(
+        "/api/v1/load/cycle", "trigger_load_cycle", trigger_load_cycle,
+        methods=["POST"],
+    )
     application.add_url_rule("/stream/status", "stream_status", stream_status)
     return application
 
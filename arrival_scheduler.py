@@ -0,0 +1,169 @@
+"""Learned schedule for when Emporia publishes the next data quantum.
+
+Emporia's per-second series advances in quanta (see quantization.py), and
+each quantum becomes visible some seconds after it ends.  Aligning sleeps
+to quantum boundaries alone (``EnergyCache.sleep_interval_adjust``) fires
+the forced fetch in ``_stage_nbc_fetch`` before the new quantum is
+published, so the call returns the same samples as the last one.
+
+``ArrivalScheduler`` records, for every fetch that brought new samples,
+how long after the newest sample's timestamp the fetch ran (the
+publication lag).  The lag at ``ARRIVAL_LAG_QUANTILE`` over the last
+``ARRIVAL_LAG_WINDOW`` observations predicts when the next quantum will
+be available; until then a fetch cannot return anything new and is
+skipped, and the load loop sleeps until just after it.
+
+Observations are upper bounds (the quantum may have been published well
+before the fetch), so a low quantile is used.  Once fetches follow the
+schedule their lags are censored: a fetch issued at the expected arrival
+can only report a lag at or above the estimate, and recording it would
+ratchet the estimate upward.  Given the quantum, ``record`` therefore
+treats an on-schedule fetch that found a new quantum as confirming the
+schedule and pulls the estimate ``ARRIVAL_PROBE_SECS`` earlier, and a
+fetch that found nothing although the next quantum had ended as a lower
+bound that moves the estimate out to it.  The schedule keeps probing
+just ahead of publication instead of drifting away from it.
+
+Not thread-safe: ``EnergyCache`` calls it under its own lock.
+
+Usage::
+
+    from arrival_scheduler import ArrivalScheduler
+
+    scheduler = ArrivalScheduler()
+    scheduler.record(newest_sample_at, fetched_at)
+    if scheduler.can_have_new_data(newest_sample_at, quantum_secs, now):
+        fetch()
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from datetime import datetime, timedelta
+
+from constants import (
+    ARRIVAL_LAG_QUANTILE,
+    ARRIVAL_LAG_WINDOW,
+    ARRIVAL_MARGIN_SECS,
+    ARRIVAL_MIN_OBSERVATIONS,
+    ARRIVAL_PROBE_SECS,
+)
+
+
+class ArrivalScheduler:
+    """Running distribution of publication lag and next-arrival estimate."""
+
+    def __init__(
+        self,
+        window: int = ARRIVAL_LAG_WINDOW,
+        quantile: float = ARRIVAL_LAG_QUANTILE,
+        min_observations: int = ARRIVAL_MIN_OBSERVATIONS,
+        margin_secs: float = ARRIVAL_MARGIN_SECS,
+        probe_secs: float = ARRIVAL_PROBE_SECS,
+    ) -> None:
+        """Initialize with no observations.
+
+        Args:
+            window: Most recent lag observations kept.
+            quantile: Quantile of the kept lags used as the expected lag.
+            min_observations: Observations needed before estimates are
+                made; until then every fetch is allowed.
+            margin_secs: Added to the expected arrival so the fetch lands
+                just after publication rather than racing it.
+            probe_secs: Seconds each on-schedule fetch that found a new
+                quantum pulls the expected lag earlier.
+        """
+        self._lags: deque[float] = deque(maxlen=window)
+        self._quantile = quantile
+        self._min_observations = min_observations
+        self._margin_secs = margin_secs
+        self._probe_secs = probe_secs
+        self._offset_secs = 0.0
+        self._newest_seen: datetime | None = None
+        self.skipped = 0
+
+    def record(
+        self,
+        newest_sample_at: datetime,
+        fetched_at: datetime,
+        quantum_secs: int | None = None,
+    ) -> None:
+        """Record a fetch result.
+
+        Without *quantum_secs* only fetches that advanced the newest sample
+        are used, each as a lag observation.  With it, an advancing fetch
+        issued at or after the expected arrival is censored and only
+        probes the estimate earlier, and a fetch that did not advance is
+        a lower bound on the lag (see the module docstring).
+
+        Args:
+            newest_sample_at: Timestamp of the newest sample after the fetch.
+            fetched_at: Wall-clock time the fetch was issued.
+            quantum_secs: Detected quantization period, or None if unknown.
+        """
+        previous = self._newest_seen
+        if previous is not None and newest_sample_at <= previous:
+            if quantum_secs is not None:
+                self._record_miss(previous, quantum_secs, fetched_at)
+            return
+        arrival = None
+        if previous is not None and quantum_secs is not None:
+            arrival = self.expected_arrival(previous, quantum_secs)
+        self._newest_seen = newest_sample_at
+        if arrival is not None and fetched_at >= arrival:
+            self._offset_secs += self._probe_secs
+            return
+        self._lags.append((fetched_at - newest_sample_at).total_seconds())
+
+    def _record_miss(
+        self, newest_sample_at: datetime, quantum_secs: int, fetched_at: datetime
+    ) -> None:
+        """Move the estimate out to a fetch that found no new quantum."""
+        lag = self.expected_lag_secs
+        if lag is None:
+            return
+        lower = (fetched_at - newest_sample_at).total_seconds() - quantum_secs
+        if lower > lag:
+            self._offset_secs -= lower - lag
+
+    @property
+    def expected_lag_secs(self) -> float | None:
+        """Return the expected publication lag, or None while still learning."""
+        if len(self._lags) < self._min_observations:
+            return None
+        ordered = sorted(self._lags)
+        observed = ordered[min(len(ordered) - 1, math.floor(self._quantile * len(ordered)))]
+        return max(0.0, observed - self._offset_secs)
+
+    def expected_arrival(
+        self, newest_sample_at: datetime, quantum_secs: int
+    ) -> datetime | None:
+        """Return when the quantum after *newest_sample_at* should be fetchable.
+
+        Args:
+            newest_sample_at: Timestamp of the newest cached sample.
+            quantum_secs: Detected quantization period.
+
+        Returns:
+            Expected arrival plus margin, or None while still learning.
+        """
+        lag = self.expected_lag_secs
+        if lag is None:
+            return None
+        return newest_sample_at + timedelta(
+            seconds=quantum_secs + lag + self._margin_secs
+        )
+
+    def can_have_new_data(
+        self, newest_sample_at: datetime, quantum_secs: int, now: datetime
+    ) -> bool:
+        """Return False when a fetch at *now* cannot return a new quantum.
+
+        Args:
+            newest_sample_at: Timestamp of the newest cached sample.
+            quantum_secs: Detected quantization period.
+            now: Time of the prospective fetch.
+        """
+        arrival = self.expected_arrival(newest_sample_at, quantum_secs)
+        return arrival is None or now >= arrival
@@ -0,0 +1,45 @@
+"""Micro-benchmarks for the fetch, decision and serve hot paths.
+
+Each benchmark times one operation on synthetic, production-shaped input
+(see bench/cases.py).  Results are written as JSON; a previous results
+file serves as the baseline, and a median more than ``--threshold``
+slower than the baseline's is reported as a regression.
+
+Baselines are machine-specific, so ``bench/baseline.json`` is not
+committed: record one on the machine you compare on.
+
+Usage::
+
+    uv run python -m bench --update-baseline      # record bench/baseline.json
+    uv run python -m bench --output bench.json    # compare, exit 1 on regression
+    uv run python -m bench --only util.camelize --number 1000
+    uv run pytest -m slow tests/test_bench.py     # smoke-run every benchmark
+"""
+
+from bench.core import (
+    DEFAULT_THRESHOLD,
+    Benchmark,
+    BenchResult,
+    Comparison,
+    benchmark,
+    compare,
+    load_medians,
+    registry,
+    run_benchmark,
+    run_benchmarks,
+    save_results,
+)
+
+__all__ = [
+    "DEFAULT_THRESHOLD",
+    "BenchResult",
+    "Benchmark",
+    "Comparison",
+    "benchmark",
+    "compare",
+    "load_medians",
+    "registry",
+    "run_benchmark",
+    "run_benchmarks",
+    "save_results",
+]
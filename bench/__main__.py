@@ -0,0 +1,96 @@
+"""Command-line entry point: ``python -m bench``."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from bench.core import (
+    DEFAULT_THRESHOLD,
+    BenchResult,
+    Comparison,
+    compare,
+    load_medians,
+    registry,
+    run_benchmarks,
+    save_results,
+)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Solara micro-benchmarks")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="run only these benchmarks")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    parser.add_argument("--number", type=int, help="calls per repeat (overrides each benchmark)")
+    parser.add_argument("--repeat", type=int, help="timed repeats (overrides each benchmark)")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument(
+        "--baseline", type=Path, default=DEFAULT_BASELINE,
+        help="results JSON to compare against (default: bench/baseline.json)",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="fractional median slowdown reported as a regression (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true",
+        help="write results to --baseline instead of comparing",
+    )
+    return parser
+
+
+def _print_results(results: list[BenchResult], comparisons: list[Comparison]) -> None:
+    """Print one line per benchmark, with the baseline ratio when known."""
+    by_name = {c.name: c for c in comparisons}
+    width = max(len(r.name) for r in results)
+    for r in results:
+        line = f"{r.name:<{width}}  median {r.median_secs * 1e6:12.1f} us  best {r.best_secs * 1e6:12.1f} us"
+        cmp = by_name.get(r.name)
+        if cmp is not None:
+            flag = "  REGRESSION" if cmp.regressed else ""
+            line += f"  x{cmp.ratio:.2f} vs baseline{flag}"
+        print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks.
+
+    Returns:
+        Exit status: 1 if any benchmark regressed past the threshold.
+    """
+    args = _build_parser().parse_args(argv)
+    if args.list:
+        print("\n".join(sorted(registry())))
+        return 0
+    try:
+        results = run_benchmarks(args.only, args.number, args.repeat)
+    except KeyError as exc:
+        print(f"unknown benchmark: {exc.args[0]}", file=sys.stderr)
+        return 2
+    if args.output:
+        save_results(args.output, results)
+    if args.update_baseline:
+        save_results(args.baseline, results)
+        _print_results(results, [])
+        print(f"baseline written to {args.baseline}")
+        return 0
+    comparisons = []
+    if args.baseline.exists():
+        comparisons = compare(results, load_medians(args.baseline), args.threshold)
+    _print_results(results, comparisons)
+    regressed = [c.name for c in comparisons if c.regressed]
+    if regressed:
+        print(f"{len(regressed)} regression(s) over {args.threshold:.0%}: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    # Decision and cache code log at INFO on every call; keep timings quiet.
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
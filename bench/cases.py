@@ -0,0 +1,270 @@
+"""The bundled benchmarks: hot paths of the fetch, decision and serve loops.
+
+Inputs are synthetic but shaped like production: one hour of per-second
+kWh samples quantized to 30 s, a handful of plugs plus a Tesla, and a
+metrics dict with 300 trailing samples per device.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from collections.abc import Callable
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from bench.core import benchmark
+
+NOW = datetime(2026, 6, 8, 14, 10, 0, tzinfo=timezone.utc)
+"""Fixed wall-clock time: 10 minutes into QH1 of the 14:00 hour."""
+
+QUANTUM_SECS = 30
+
+
+def quantized_samples(
+    count: int, quantum: int = QUANTUM_SECS, seed: int = 7
+) -> list[float]:
+    """Return *count* per-second kWh samples, constant within each quantum.
+
+    Values hover around a small net export (negative), like a sunny
+    afternoon with intermittent loads.
+    """
+    rng = random.Random(seed)
+    samples: list[float] = []
+    while len(samples) < count:
+        samples.extend([rng.uniform(-0.0012, 0.0004)] * quantum)
+    return samples[:count]
+
+
+def _hour_window() -> tuple[datetime, list[float]]:
+    """Return ``(data_start, samples)``: three complete QHs plus the current one."""
+    data_start = NOW.replace(minute=0, second=0) - timedelta(minutes=45)
+    count = int((NOW - data_start).total_seconds())
+    return data_start, quantized_samples(count)
+
+
+def _fetch_result(data_start: datetime, samples: list[float]) -> dict[str, Any]:
+    """A per-second fetch result as ``create_metrics`` would return it."""
+    from util import compute_nbc_quarters
+
+    return {
+        "per_second_data": samples,
+        "data_start": data_start,
+        "devices": [{
+            "name": "main_panel",
+            "per_second_data": samples[-300:],
+            "nbc": compute_nbc_quarters(samples).to_dict(),
+        }],
+        "_fetched_at": NOW,
+        "_data_lag_secs": 15.0,
+    }
+
+
+@benchmark("quantization.detect_quantization", number=50)
+def _detect_quantization() -> Callable[[], Any]:
+    from quantization import detect_quantization
+
+    samples = quantized_samples(3600)
+    return lambda: detect_quantization(samples)
+
+
+@benchmark("util.compute_nbc_quarters", number=200)
+def _compute_nbc_quarters() -> Callable[[], Any]:
+    from util import compute_nbc_quarters
+
+    samples = quantized_samples(3000)
+    return lambda: compute_nbc_quarters(samples)
+
+
+@benchmark("energy_cache.get_or_fetch", number=50)
+def _get_or_fetch() -> Callable[[], Any]:
+    from energy_cache import EnergyCache
+
+    data_start, samples = _hour_window()
+    result = _fetch_result(data_start, samples)
+    cache = EnergyCache(ttl_seconds=3600)
+    return lambda: cache.get_or_fetch(lambda: result, NOW, force=True)
+
+
+@benchmark("energy_cache.compact", number=50)
+def _compact() -> Callable[[], Any]:
+    from energy_cache import EnergyCache
+    from sample_window import SampleWindow
+
+    data_start, samples = _hour_window()
+    cache = EnergyCache(ttl_seconds=3600)
+    cache.get_or_fetch(lambda: {"per_second_data": samples, "data_start": data_start}, NOW)
+    # The fetch already compacted; restore the full window before each call.
+    fetched = cache.data
+    assert fetched is not None
+    uncompacted = replace(
+        fetched, samples=SampleWindow(samples), data_start=data_start,
+        sample_count=len(samples), completed_periods=None,
+    )
+
+    def run() -> None:
+        cache.adopt(uncompacted)
+        with cache.lock:
+            cache.compact(NOW)
+
+    return run
+
+
+@benchmark("energy_cache.get_current_qh", number=200)
+def _get_current_qh() -> Callable[[], Any]:
+    from energy_cache import EnergyCache
+
+    data_start, samples = _hour_window()
+    cache = EnergyCache(ttl_seconds=3600)
+    cache.get_or_fetch(lambda: {"per_second_data": samples, "data_start": data_start}, NOW)
+    return lambda: cache.get_current_qh(NOW)
+
+
+def _plugs() -> dict[str, Any]:
+    from load_models import PlugConfig
+
+    return {
+        f"plug_{i}": PlugConfig(
+            name=f"plug_{i}", accessory_id=f"acc{i}",
+            power_watts=300.0 + 250.0 * i, priority=i,
+        )
+        for i in range(8)
+    }
+
+
+def _tesla_state() -> Any:
+    from load_models import TeslaState
+
+    return TeslaState(is_charging=True, current_amps=16, plugged_in=True, at_home=True)
+
+
+@benchmark("load_nbc.GapMinder.decide", number=500)
+def _gapminder_decide() -> Callable[[], Any]:
+    from load_nbc import DecideContext, GapMinder, StateTracker
+
+    engine = GapMinder(hysteresis_wh=100)
+    plugs = _plugs()
+    tesla = _tesla_state()
+
+    def run() -> Any:
+        ctx = DecideContext(
+            now=NOW, seconds_remaining=300, state=StateTracker(),
+            plugs=plugs, tesla=tesla, dry_run=True,
+        )
+        return engine.decide(ctx, predicted_wh=-2500.0, target_wh=-50.0)
+
+    return run
+
+
+def build_load_manager(
+    metrics_fetch: Callable[[], dict[str, Any] | None],
+    energy_cache: Any,
+    clock: Any,
+    dry_run: bool = False,
+) -> tuple[Any, Any, Any]:
+    """Build a LoadManager wired to the in-memory mock controllers.
+
+    Returns:
+        ``(manager, plug_ctrl, tesla_ctrl)``.
+    """
+    from load_controllers import PlugController, TeslaController
+    from load_manager import LoadManager, LoadManagerConfig
+    from load_models import TeslaConfig
+
+    plug_ctrl = PlugController(_plugs())
+    tesla_ctrl = TeslaController(TeslaConfig(
+        client_id="bench", client_secret="bench",
+        redirect_uri="http://localhost/callback", vehicle_id="bench",
+        home_lat=37.0, home_lon=-122.0, home_radius_m=500,
+    ))
+    tesla_ctrl.set_mock_state(_tesla_state())
+    manager = LoadManager(LoadManagerConfig(
+        metrics_fetch=metrics_fetch,
+        energy_cache=energy_cache,
+        plug_ctrl=plug_ctrl,
+        tesla_ctrl=tesla_ctrl,
+        target_wh=-50,
+        nbc_device="main_panel",
+        enabled=True,
+        dry_run=dry_run,
+        clock=clock,
+    ))
+    return manager, plug_ctrl, tesla_ctrl
+
+
+@benchmark("load_manager.LoadManager.run_cycle", number=20)
+def _run_cycle() -> Callable[[], Any]:
+    from clock import FakeClock
+    from energy_cache import EnergyCache
+
+    data_start, samples = _hour_window()
+    result = _fetch_result(data_start, samples)
+    cache = EnergyCache(ttl_seconds=3600, clock=FakeClock(NOW))
+
+    def metrics_fetch() -> dict[str, Any] | None:
+        return cache.get_or_fetch(lambda: result, NOW, force=True)[0]
+
+    manager, _plugs_ctrl, _tesla_ctrl = build_load_manager(
+        metrics_fetch, cache, FakeClock(NOW), dry_run=True,
+    )
+    return manager.run_cycle
+
+
+def _metrics_payload() -> dict[str, Any]:
+    from load_models import CycleResult
+
+    data_start, samples = _hour_window()
+    result = _fetch_result(data_start, samples)
+    device = dict(result["devices"][0])
+    device.update({
+        "gid": 1, "lag": timedelta(seconds=15), "prediction": 1.5,
+        "prediction_min": 1.2, "prediction_max": 1.9,
+        "minute_predicted": 0.1, "minutes_remaining": 5.0,
+        "timezone": "America/Los_Angeles",
+    })
+    return {
+        "devices": [device, dict(device, name="sub_panel", gid=2)],
+        "api_response": {"first_usage_instant": data_start.isoformat()},
+        "instant": NOW,
+        "load_management": {
+            "last_cycle_result": CycleResult(status="ok", qh="QH1").to_dict(),
+        },
+    }
+
+
+@benchmark("util.camelize", number=200)
+def _camelize() -> Callable[[], Any]:
+    from util import camelize
+
+    payload = _metrics_payload()
+    return lambda: camelize(payload)
+
+
+@benchmark("sse_event.SSEBroadcaster.publish[100]", number=50)
+def _sse_publish() -> Callable[[], Any]:
+    from sse_event import SSEBroadcaster
+    from util import camelize, custom_json_default
+
+    broadcaster = SSEBroadcaster(
+        dumper=lambda obj: json.dumps(obj, default=custom_json_default),
+        epoch="bench",
+    )
+    subscribers = [broadcaster.subscribe() for _ in range(100)]
+    payload = camelize(_metrics_payload())
+
+    def run() -> None:
+        broadcaster.publish("metrics_update", payload)
+        for sub in subscribers:
+            sub.poll()
+
+    return run
+
+
+@benchmark("energy_aggregator.aggregate_from_15min[year]", number=3)
+def _aggregate_year() -> Callable[[], Any]:
+    from energy_aggregator import EnergyDataAggregator
+
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    usage = quantized_samples(365 * 96, quantum=1, seed=11)
+    return lambda: EnergyDataAggregator.aggregate_from_15min(start, usage)
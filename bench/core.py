@@ -0,0 +1,188 @@
+"""Timing harness, result files and baseline comparison.
+
+A benchmark is a *setup* function registered with :func:`benchmark`; setup
+builds its inputs once and returns the zero-argument callable that is
+timed.  :func:`run_benchmarks` calls it ``number`` times per repeat and
+keeps the per-call time of every repeat, so the reported ``best`` and
+``median`` are seconds per call.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+DEFAULT_THRESHOLD = 0.25
+"""Fractional slowdown of the median, relative to the baseline, reported
+as a regression (0.25 = 25 % slower)."""
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A registered benchmark.
+
+    Attributes:
+        name: Dotted name, ``module.operation``.
+        setup: Builds the inputs and returns the callable to time.
+        number: Calls per repeat.
+        repeat: Timed repeats; the median of these is compared.
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    number: int
+    repeat: int
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    """Timing of one benchmark, in seconds per call."""
+
+    name: str
+    number: int
+    repeat: int
+    best_secs: float
+    median_secs: float
+    mean_secs: float
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """A benchmark's median against its baseline median."""
+
+    name: str
+    baseline_secs: float
+    current_secs: float
+    ratio: float
+    regressed: bool
+
+
+_REGISTRY: dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str, number: int = 100, repeat: int = 5
+) -> Callable[[Callable[[], Callable[[], Any]]], Callable[[], Callable[[], Any]]]:
+    """Register a setup function as benchmark *name*.
+
+    Args:
+        name: Unique dotted name.
+        number: Calls per repeat.
+        repeat: Timed repeats.
+    """
+
+    def register(setup: Callable[[], Callable[[], Any]]) -> Callable[[], Callable[[], Any]]:
+        if name in _REGISTRY:
+            raise ValueError(f"duplicate benchmark {name!r}")
+        _REGISTRY[name] = Benchmark(name, setup, number, repeat)
+        return setup
+
+    return register
+
+
+def registry() -> dict[str, Benchmark]:
+    """Return all registered benchmarks, loading the bundled cases."""
+    import bench.cases  # noqa: F401  # pylint: disable=unused-import
+    return dict(_REGISTRY)
+
+
+def run_benchmark(
+    bench: Benchmark, number: int | None = None, repeat: int | None = None
+) -> BenchResult:
+    """Time one benchmark.
+
+    Args:
+        bench: The benchmark to run.
+        number: Override ``bench.number`` (e.g. 1 for a smoke run).
+        repeat: Override ``bench.repeat``.
+    """
+    number = bench.number if number is None else number
+    repeat = bench.repeat if repeat is None else repeat
+    func = bench.setup()
+    func()  # warm caches and lazy imports outside the timed region
+    per_call: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - start) / number)
+    return BenchResult(
+        name=bench.name,
+        number=number,
+        repeat=repeat,
+        best_secs=min(per_call),
+        median_secs=statistics.median(per_call),
+        mean_secs=statistics.fmean(per_call),
+    )
+
+
+def run_benchmarks(
+    names: Iterable[str] | None = None,
+    number: int | None = None,
+    repeat: int | None = None,
+) -> list[BenchResult]:
+    """Run the selected benchmarks (all when *names* is None) in name order.
+
+    Raises:
+        KeyError: If a name is not registered.
+    """
+    benches = registry()
+    selected = sorted(benches) if names is None else list(names)
+    return [run_benchmark(benches[n], number, repeat) for n in selected]
+
+
+def results_to_json(results: list[BenchResult]) -> dict[str, Any]:
+    """Build the JSON document written by the CLI."""
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": {r.name: asdict(r) for r in results},
+    }
+
+
+def save_results(path: Path, results: list[BenchResult]) -> None:
+    """Write *results* to *path* as JSON."""
+    path.write_text(json.dumps(results_to_json(results), indent=2) + "\n", encoding="utf-8")
+
+
+def load_medians(path: Path) -> dict[str, float]:
+    """Return ``{name: median_secs}`` from a results file."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {name: r["median_secs"] for name, r in data["results"].items()}
+
+
+def compare(
+    results: list[BenchResult],
+    baseline: dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Comparison]:
+    """Compare medians with *baseline*; benchmarks missing from it are skipped.
+
+    Args:
+        results: Current results.
+        baseline: ``{name: median_secs}`` from :func:`load_medians`.
+        threshold: Fractional slowdown that counts as a regression.
+    """
+    comparisons = []
+    for r in results:
+        base = baseline.get(r.name)
+        if not base:
+            continue
+        ratio = r.median_secs / base
+        comparisons.append(Comparison(
+            name=r.name,
+            baseline_secs=base,
+            current_secs=r.median_secs,
+            ratio=ratio,
+            regressed=ratio > 1.0 + threshold,
+        ))
+    return comparisons
@@ -83,3 +83,13 @@ class FakeClock:
             seconds: Number of seconds to advance (or retreat, if negative).
         """
         self._fixed += timedelta(seconds=seconds)
+
+    def set(self, when: datetime) -> None:
+        """Move the fixed time to *when*.
+
+        Args:
+            when: The new time; naive values are taken as UTC.
+        """
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        self._fixed = when
@@ -26,6 +26,7 @@ from pathlib import Path
 from typing import Any, Optional
 
 import device_config
+from constants import TRACE_SAMPLE_RATE_DEFAULT
 
 
 logger = logging.getLogger(__name__)
@@ -52,7 +53,8 @@ _APP_ENV_KEY_PREFIXES = (
     "LOAD_", "LOG_", "MQTT_", "TELEGRAM_", "TESLA_", "VOCOLINC_", "VUE_",
 )
 _APP_ENV_KEY_NAMES = frozenset({
-    "DEBUG", "MOCK", "MOCK_ERROR", "PUBLIC_URL", "TIMEZONE",
+    "CONTROL_PLANE_DIR", "DEBUG", "MOCK", "MOCK_ERROR", "PUBLIC_URL",
+    "SSE_STREAM_PORT", "TIMEZONE",
 })
 
 
@@ -332,6 +334,47 @@ class Config:
         """Return number of rotated log files to keep."""
         return self._get_int("LOG_BACKUP_COUNT", default=5)
 
+    @property
+    def sse_stream_port(self) -> int:
+        """Return the port of the dedicated SSE stream server (0 = disabled)."""
+        return self._get_int("SSE_STREAM_PORT", default=0)
+
+    @property
+    def control_plane_dir(self) -> str | None:
+        """Return the shared control-plane directory, or None to disable it."""
+        return self._get("CONTROL_PLANE_DIR", default=None) or None
+
+    @property
+    def load_history_db(self) -> str | None:
+        """Return the history store (SQLite) path, or None to disable it."""
+        return self._get("LOAD_HISTORY_DB", default=None) or None
+
+    @property
+    def load_history_samples(self) -> bool:
+        """Return True when raw per-second samples are kept in the history store."""
+        return self._get_bool("LOAD_HISTORY_SAMPLES")
+
+    @property
+    def load_record_path(self) -> str | None:
+        """Return the replay log path (see replay.py), or None to disable recording."""
+        return self._get("LOAD_RECORD_PATH", default=None) or None
+
+    @property
+    def trace_path(self) -> str | None:
+        """Return the cycle trace file (see tracing.py), or None to disable tracing."""
+        return self._get("TRACE_PATH", default=None) or None
+
+    @property
+    def trace_sample_rate(self) -> float:
+        """Return the fraction of load cycles traced, clamped to 0.0 - 1.0."""
+        val = self._get("TRACE_SAMPLE_RATE")
+        if not val:
+            return TRACE_SAMPLE_RATE_DEFAULT
+        try:
+            return min(max(float(val), 0.0), 1.0)
+        except ValueError:
+            return TRACE_SAMPLE_RATE_DEFAULT
+
     @property
     def dry_run(self) -> bool:
         """Return True when load management is in dry-run mode."""
@@ -349,6 +392,18 @@ class Config:
         val = self._get("VUE_PASSWORD")
         return val if val else None
 
+    @property
+    def vue_simulator_host(self) -> str | None:
+        """Return an Emporia API stand-in URL (see fake_services.py), or None."""
+        return self._get("VUE_SIMULATOR_HOST", default=None) or None
+
+    @property
+    def telegram_api_base(self) -> str:
+        """Return the Telegram Bot API root URL."""
+        return (
+            self._get("TELEGRAM_API_BASE", default=None) or "https://api.telegram.org"
+        ).rstrip("/")
+
     @property
     def tesla_client_id(self) -> Optional[str]:
         """Return Tesla Fleet API client ID, or None if not configured."""
@@ -461,6 +516,11 @@ class Config:
         """Return plug controller type (real or stub)."""
         return (self._get("LOAD_PLUG_CONTROLLER", "stub") or "stub").lower()
 
+    @property
+    def homekit_stub_url(self) -> str | None:
+        """Return a HomeKit characteristic stand-in URL (see fake_services.py), or None."""
+        return self._get("HOMEKIT_STUB_URL", default=None) or None
+
     @property
     def load_tesla_controller(self) -> str:
         """Return Tesla controller type (real or stub)."""
@@ -527,8 +587,10 @@ RESTART_REQUIRED_KEYS = frozenset({
     "TESLA_PRIVATE_KEY_PATH", "MQTT_HOST", "MQTT_PORT", "MQTT_TOPIC_BASE",
     "LOAD_PLUG_CONTROLLER", "LOAD_TESLA_CONTROLLER",
     "VOCOLINC_USERNAME", "VOCOLINC_PASSWORD",
-    "VUE_USERNAME", "VUE_PASSWORD",
+    "VUE_USERNAME", "VUE_PASSWORD", "VUE_SIMULATOR_HOST", "HOMEKIT_STUB_URL",
     "LOAD_MANAGE_INTERVAL_SECS",
+    "LOAD_HISTORY_DB", "LOAD_HISTORY_SAMPLES", "LOAD_RECORD_PATH", "TRACE_PATH",
+    "SSE_STREAM_PORT", "CONTROL_PLANE_DIR",
 })
 
 
@@ -652,3 +714,17 @@ class ConfigWatcher:
                 pass
 
         return changes
+
+    def modified(self) -> bool:
+        """Return True if either file's mtime advanced since the last call.
+
+        Unlike :meth:`check`, nothing is reloaded: this only notices edits
+        (e.g. to wake the load-management loop, whose own watcher then
+        reloads them).
+        """
+        env_mtime = self._safe_mtime(self._env_path)
+        devices_mtime = self._safe_mtime(self._devices_path)
+        modified = env_mtime > self._env_mtime or devices_mtime > self._devices_mtime
+        self._env_mtime = max(self._env_mtime, env_mtime)
+        self._devices_mtime = max(self._devices_mtime, devices_mtime)
+        return modified
@@ -41,6 +41,50 @@ DEFAULT_SLEEP_HINT_SECS: float = 5.0
 MIN_SLEEP_SECS: float = 5.0
 """Minimum sleep duration used by EnergyCache.sleep_interval_adjust."""
 
+LOAD_WAKE_DEBOUNCE_SECS: float = 1.0
+"""Seconds the load-management loop waits after an early wake-up
+(telemetry transition, config change, API trigger) so a burst of events
+runs one cycle."""
+
+LOAD_WAKE_MIN_SPACING_SECS: float = 3.0
+"""Minimum seconds between the start of consecutive load-management
+cycles when woken early; the regular sleep is not affected."""
+
+CONFIG_WATCH_POLL_SECS: float = 2.0
+"""Seconds between checks of ``.env``/``devices.json`` mtimes by the
+thread that wakes the load-management loop on config edits."""
+
+# ── Data-arrival scheduling ──────────────────────────────────────────
+
+ARRIVAL_LAG_WINDOW: int = 32
+"""Recent publication-lag observations kept by ``ArrivalScheduler``."""
+
+ARRIVAL_LAG_QUANTILE: float = 0.25
+"""Quantile of the observed lags used as the expected publication lag.
+Observations are upper bounds, so a low quantile tracks the true lag."""
+
+ARRIVAL_MIN_OBSERVATIONS: int = 4
+"""Lag observations needed before fetches are skipped or sleeps aligned
+to the expected arrival."""
+
+ARRIVAL_MARGIN_SECS: float = 1.0
+"""Seconds added to the expected arrival of the next quantum so the
+fetch lands just after publication."""
+
+ARRIVAL_PROBE_SECS: float = 0.1
+"""Seconds each on-schedule fetch that found a new quantum pulls the
+expected publication lag earlier, so censored observations cannot ratchet
+the estimate upward."""
+
+# ── Plug I/O ─────────────────────────────────────────────────────────
+
+PLUG_CALL_TIMEOUT_SECS: float = 10.0
+"""Per-call timeout for plug get_state/set_state during a cycle.
+
+Plug reads and actions are fanned out concurrently; a plug that does not
+answer within this window is treated as failed so it cannot stall the
+others.  Long enough to cover a HomeKit reconnect."""
+
 # ── Quantization ────────────────────────────────────────────────────
 
 QUANTIZATION_CONFIDENCE_THRESHOLD: float = 0.55
@@ -77,6 +121,44 @@ reliable NBC prediction.  Below this threshold the pipeline returns
 ``no_incomplete_qh`` with a short sleep hint instead of acting on a
 wildly extrapolated single-sample prediction."""
 
+# ── Incremental (tail-only) fetch ───────────────────────────────────
+
+TAIL_FETCH_OVERLAP_SECS: int = 5
+"""Number of already-cached trailing samples re-requested by a tail-only
+fetch.  ``EnergyCache.splice_tail`` compares them against the cache to
+verify alignment before appending; a mismatch falls back to a full-QH
+refetch (see ``_tail_start_for`` in metrics.py)."""
+
+# ── Emporia session ──────────────────────────────────────────────────
+
+EMPORIA_TOKEN_REFRESH_MARGIN_SECS: int = 300
+"""Refresh the Emporia (Cognito) tokens when the access token expires
+within this many seconds, so no request — including a long TOU report on
+the fetch pool — starts with a token about to lapse."""
+
+EMPORIA_TOKEN_FALLBACK_LIFETIME_SECS: int = 3600
+"""Assumed access-token lifetime when its expiry cannot be decoded
+(Cognito access tokens last one hour)."""
+
+# ── TOU report fetch ─────────────────────────────────────────────────
+
+TOU_FETCH_MAX_WORKERS: int = 4
+"""Maximum concurrent ``get_chart_usage`` calls for one TOU report.
+
+Keeps a year-long report (about 52 seven-day chunks) well inside the
+gunicorn worker timeout without flooding the Emporia API."""
+
+TOU_FETCH_MIN_INTERVAL_SECS: float = 0.2
+"""Minimum spacing between the starts of TOU chunk requests, across all
+workers (a simple client-side rate limit)."""
+
+TOU_FETCH_MAX_ATTEMPTS: int = 3
+"""Attempts per TOU chunk before the report fails.  Only transient errors
+(connection errors, timeouts, HTTP 429 and 5xx) are retried."""
+
+TOU_FETCH_RETRY_BACKOFF_SECS: float = 0.5
+"""Delay before the first TOU chunk retry; doubled for each further one."""
+
 # ── Fetch drift observability ────────────────────────────────────────
 
 DRIFT_REJECTION_ALERT_AFTER: int = 5
@@ -109,3 +191,54 @@ refresh always happens before the access token expires server-side."""
 
 TESLA_HOME_RADIUS_M_DEFAULT: float = 500.0
 """Default radius in metres around home used for at-home detection."""
+
+# ── SSE stream server ────────────────────────────────────────────────
+
+SSE_HEARTBEAT_SECS: int = 30
+"""Idle seconds before a stream-server client gets a heartbeat frame;
+kept below typical proxy read timeouts (nginx default 60s), like the
+``event_stream`` default."""
+
+SSE_STREAM_MAX_BUFFER_BYTES: int = 256 * 1024
+"""Unsent bytes above which the stream server stops writing to a client
+and lets its frames coalesce to the latest per event type until the
+client catches up."""
+
+SSE_STREAM_REQUEST_TIMEOUT_SECS: float = 10.0
+"""Seconds a new stream-server connection has to send its request head."""
+
+# ── Control plane (multi-worker) ─────────────────────────────────────
+
+CONTROL_PLANE_POLL_SECS: float = 1.0
+"""Seconds between a follower worker's checks for a new snapshot and for
+a vacated leader lock."""
+
+CONTROL_PLANE_REFRESH_SECS: float = 5.0
+"""Seconds between the leader's cache checks when load management is off;
+it fetches (and publishes) only once the cache TTL has lapsed."""
+
+CONTROL_PLANE_STALE_SECS: int = 300
+"""Age in seconds after which a follower logs that the leader's snapshot
+is stale; it keeps serving it rather than fetch metrics itself."""
+
+# ── Response cache ───────────────────────────────────────────────────
+
+RESPONSE_CACHE_LAG_BUCKET_SECS: int = 5
+"""Granularity of the recalculated ``lag`` in cached ``/`` responses: all
+requests within one bucket get the same, byte-identical body."""
+
+RESPONSE_CACHE_MAX_ENTRIES: int = 8
+"""Rendered bodies kept by the response cache (LRU)."""
+
+# ── Tracing ──────────────────────────────────────────────────────────
+
+TRACE_SAMPLE_RATE_DEFAULT: float = 0.05
+"""Fraction of load cycles traced when ``TRACE_PATH`` is set and
+``TRACE_SAMPLE_RATE`` is not (about one cycle in ten minutes at the
+30 s cycle interval)."""
+
+TRACE_MAX_BYTES: int = 10 * 1024 * 1024
+"""Size at which the trace file is rotated."""
+
+TRACE_BACKUP_COUNT: int = 3
+"""Rotated trace files kept (``<path>.1`` .. ``<path>.3``)."""
@@ -0,0 +1,264 @@
+"""One control-plane owner per host, shared snapshots for the rest.
+
+``wsgi.py`` calls ``start_background_services()`` in every gunicorn
+worker.  Without coordination, N workers mean N MQTT subscribers, N load
+loops forcing N Emporia fetches per cycle and N controllers toggling the
+same plugs.
+
+``ControlPlane`` elects one worker with an exclusive ``flock`` on
+``<dir>/leader.lock``.  The leader runs fetching and load management and,
+after every cycle, publishes an immutable ``ControlPlaneSnapshot`` to
+``<dir>/snapshot.pickle`` (written to a temporary file and renamed over
+the old one, so readers never see a partial write).  Followers only read
+the snapshot — re-loading it when the file changes — and keep trying the
+lock, so a follower takes over when the leader exits.
+
+The lock is released by the kernel when the leader's process dies, so no
+stale-lock cleanup is needed.  Point the directory at a tmpfs such as
+``/dev/shm`` to keep the snapshot in memory.
+
+Snapshots are pickles, and unpickling runs code, so the directory must be
+owned by this user and not writable by group or others; ``ControlPlane``
+refuses any other directory, and ``read`` ignores a snapshot file owned by
+another user.
+
+Usage::
+
+    from control_plane import ControlPlane
+
+    plane = ControlPlane("/dev/shm/solara")
+    if plane.try_lead():
+        ...  # start background services, then after every cycle:
+        plane.publish(cache_data=..., load_management=..., ...)
+    else:
+        plane.start_following(on_snapshot=apply, on_promote=start_services)
+"""
+
+from __future__ import annotations
+
+import fcntl
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from constants import CONTROL_PLANE_POLL_SECS
+from energy_cache import EnergyCacheData
+from instrumentation import MetricFamily
+
+logger = logging.getLogger(__name__)
+
+_LOCK_NAME = "leader.lock"
+_SNAPSHOT_NAME = "snapshot.pickle"
+
+
+@dataclass(frozen=True, slots=True)
+class ControlPlaneSnapshot:
+    """State the leader shares with follower workers after each cycle.
+
+    Attributes:
+        generation: Increases by one per published snapshot, including
+            across a change of leader.
+        written_at: When the leader published it (UTC).
+        cache_data: The leader's ``EnergyCache`` snapshot.
+        load_management: ``_build_load_management_payload`` output (snake
+            case), or empty when load management is off.
+        load_status: ``/api/v1/load/status`` payload (snake case), or None.
+        load_cycle: Camelized ``load_cycle`` SSE payload, or None.
+        metrics_update: Camelized ``(delta, keyframe)`` of the
+            ``metrics_update`` SSE event, or None.
+        instrumentation: The leader's ``/metrics`` families, or None.
+    """
+
+    generation: int
+    written_at: datetime
+    cache_data: EnergyCacheData | None = None
+    load_management: dict[str, Any] | None = None
+    load_status: dict[str, Any] | None = None
+    load_cycle: dict[str, Any] | None = None
+    metrics_update: tuple[dict[str, Any], dict[str, Any] | None] | None = None
+    instrumentation: tuple[MetricFamily, ...] | None = None
+
+
+class ControlPlane:
+    """Leader election and snapshot exchange through a shared directory."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        poll_secs: float = CONTROL_PLANE_POLL_SECS,
+    ) -> None:
+        """Initialize without taking the lock.
+
+        Args:
+            directory: Directory shared by all workers; created if missing.
+            poll_secs: Follower polling period.
+
+        Raises:
+            PermissionError: If the directory is owned by another user or
+                is group- or world-writable.
+        """
+        self._dir = Path(directory)
+        self._dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = os.stat(self._dir)
+        if st.st_uid != os.getuid() or st.st_mode & 0o022:
+            raise PermissionError(
+                f"control plane directory {self._dir} must be owned by uid "
+                f"{os.getuid()} and not writable by group or others"
+            )
+        self._poll_secs = poll_secs
+        self._lock_file: Any = None
+        self._generation = 0
+        self._snapshot: ControlPlaneSnapshot | None = None
+        self._snapshot_key: tuple[int, int, int] | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        """Return True while this process holds the leader lock."""
+        return self._lock_file is not None
+
+    @property
+    def snapshot_path(self) -> Path:
+        """Return the path of the shared snapshot file."""
+        return self._dir / _SNAPSHOT_NAME
+
+    def try_lead(self) -> bool:
+        """Take the leader lock if no other process holds it.
+
+        Returns:
+            True if this process is (now) the leader.
+        """
+        if self._lock_file is not None:
+            return True
+        lock_file = open(self._dir / _LOCK_NAME, "a+b")  # pylint: disable=consider-using-with
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        # Continue the previous leader's numbering so followers never see
+        # the generation go backwards.
+        previous = self.read()
+        self._generation = previous.generation if previous is not None else 0
+        return True
+
+    def publish(self, **fields: Any) -> ControlPlaneSnapshot:
+        """Write a new snapshot for the followers (leader only).
+
+        Args:
+            **fields: ``ControlPlaneSnapshot`` fields other than
+                ``generation`` and ``written_at``.
+
+        Returns:
+            The published snapshot.
+
+        Raises:
+            RuntimeError: If this process is not the leader.
+        """
+        if not self.is_leader:
+            raise RuntimeError("only the control-plane leader can publish")
+        self._generation += 1
+        snapshot = ControlPlaneSnapshot(
+            generation=self._generation,
+            written_at=datetime.now(timezone.utc),
+            **fields,
+        )
+        fd, tmp = tempfile.mkstemp(dir=self._dir, prefix=".snapshot-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.snapshot_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return snapshot
+
+    def read(self) -> ControlPlaneSnapshot | None:
+        """Return the latest published snapshot, or None if there is none.
+
+        The file is only re-read when it has been replaced since the last
+        call; otherwise the previously loaded snapshot is returned.  A file
+        owned by another user is never unpickled.
+        """
+        try:
+            st = os.stat(self.snapshot_path)
+        except FileNotFoundError:
+            return self._snapshot
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if key == self._snapshot_key:
+            return self._snapshot
+        if st.st_uid != os.getuid():
+            logger.warning(
+                "Control plane: ignoring snapshot owned by uid %d", st.st_uid,
+            )
+            self._snapshot_key = key
+            return self._snapshot
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError) as exc:
+            logger.warning("Control plane: unreadable snapshot: %s", exc)
+            return self._snapshot
+        self._snapshot, self._snapshot_key = snapshot, key
+        return snapshot
+
+    def start_following(
+        self,
+        on_snapshot: Callable[[ControlPlaneSnapshot, bool], None],
+        on_promote: Callable[[], None],
+    ) -> None:
+        """Watch for new snapshots and for the leader lock on a thread.
+
+        Args:
+            on_snapshot: Called with each new snapshot and whether earlier
+                generations were skipped.
+            on_promote: Called once if this process takes over as leader;
+                the thread then exits.
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._follow,
+            args=(on_snapshot, on_promote),
+            name="control-plane-follower",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _follow(
+        self,
+        on_snapshot: Callable[[ControlPlaneSnapshot, bool], None],
+        on_promote: Callable[[], None],
+    ) -> None:
+        seen = 0
+        while not self._stop.is_set():
+            snapshot = self.read()
+            if snapshot is not None and snapshot.generation != seen:
+                try:
+                    on_snapshot(snapshot, snapshot.generation != seen + 1)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception("Control plane: applying snapshot failed")
+                seen = snapshot.generation
+            if self.try_lead():
+                logger.info("Control plane: leader gone, taking over (pid %d)", os.getpid())
+                on_promote()
+                return
+            self._stop.wait(self._poll_secs)
+
+    def close(self) -> None:
+        """Stop following and release the leader lock."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self._poll_secs + 1)
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
@@ -0,0 +1,114 @@
+"""Wakeable sleep for the load-management loop.
+
+The loop used to ``time.sleep()`` for the whole adaptive interval, so a
+Tesla telemetry transition (the car stops charging), an edited
+``devices.json`` or an operator request waited up to a full interval
+before the next cycle saw it.  ``CycleWaker.wait`` sleeps on a condition
+instead; any thread may call :meth:`CycleWaker.wake` to end the sleep
+early.
+
+Early wake-ups are debounced (a burst of MQTT messages runs one cycle)
+and rate limited (a woken cycle never starts less than
+``min_spacing_secs`` after the previous one), so a chatty source cannot
+turn the loop into a busy loop.  The regular timer is never delayed.
+
+Usage::
+
+    from cycle_waker import CycleWaker
+
+    waker = CycleWaker()
+    while True:
+        run_cycle()
+        reasons = waker.wait(interval_secs)  # [] when the timer expired
+
+    # from another thread
+    waker.wake("telemetry:ChargeAmps")
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+
+from constants import LOAD_WAKE_DEBOUNCE_SECS, LOAD_WAKE_MIN_SPACING_SECS
+
+
+class CycleWaker:
+    """Condition-based sleep that other threads can cut short."""
+
+    def __init__(
+        self,
+        debounce_secs: float = LOAD_WAKE_DEBOUNCE_SECS,
+        min_spacing_secs: float = LOAD_WAKE_MIN_SPACING_SECS,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize with no pending wake-up.
+
+        Args:
+            debounce_secs: Delay after the first wake-up before the sleep
+                ends, so later wake-ups in the same burst are coalesced.
+            min_spacing_secs: Minimum time between the ends of consecutive
+                waits when a wait is ended early.
+            monotonic: Clock used for all timing (tests may inject one).
+        """
+        self._debounce_secs = debounce_secs
+        self._min_spacing_secs = min_spacing_secs
+        self._monotonic = monotonic
+        self._cond = threading.Condition()
+        self._reasons: list[str] = []
+        self._first_wake_at: float | None = None
+        self._last_release_at: float | None = None
+
+    def wake(self, reason: str) -> None:
+        """Request an early cycle.
+
+        Thread-safe and non-blocking; repeated reasons are recorded once.
+
+        Args:
+            reason: Short label for logs (e.g. ``"api"``, ``"config"``).
+        """
+        with self._cond:
+            if self._first_wake_at is None:
+                self._first_wake_at = self._monotonic()
+            if reason not in self._reasons:
+                self._reasons.append(reason)
+            self._cond.notify_all()
+
+    @property
+    def pending(self) -> bool:
+        """Return True while a wake-up is waiting to be consumed."""
+        with self._cond:
+            return self._first_wake_at is not None
+
+    def wait(self, timeout: float) -> list[str]:
+        """Sleep up to *timeout* seconds or until a wake-up is due.
+
+        A wake-up requested while no one is waiting is not lost: the next
+        call returns as soon as its debounce and spacing allow.
+
+        Args:
+            timeout: Regular sleep interval in seconds.
+
+        Returns:
+            The wake-up reasons that ended the sleep, or ``[]`` when the
+            full interval elapsed without one.
+        """
+        deadline = self._monotonic() + max(0.0, timeout)
+        with self._cond:
+            while True:
+                now = self._monotonic()
+                due = deadline
+                if self._first_wake_at is not None:
+                    due = self._first_wake_at + self._debounce_secs
+                    if self._last_release_at is not None:
+                        due = max(due, self._last_release_at + self._min_spacing_secs)
+                    due = min(due, deadline)
+                if now >= due:
+                    break
+                self._cond.wait(due - now)
+            reasons = self._reasons
+            self._reasons = []
+            self._first_wake_at = None
+            self._last_release_at = self._monotonic()
+            return reasons
@@ -0,0 +1,141 @@
+"""Process-wide login state for the shared Emporia (PyEmVue) client.
+
+``MetricsBase`` keeps one class-level ``PyEmVue``, but used to log it in
+again — reading and parsing ``.vue-keys.json`` and possibly refreshing
+tokens against Cognito — every time a ``HourlyProjection`` or
+``TOUReporter`` was built, i.e. on every fetch.
+
+``EmporiaSession`` logs the client in once and afterwards only refreshes
+its tokens when the access token is close to expiry.  Logins and
+refreshes are serialized under a lock, so concurrent request threads (and
+the TOU fetch pool) never race on ``vue.auth``.
+
+Usage::
+
+    from emporia_session import get_session
+
+    vue = get_session().ensure(MetricsBase.vue, login=metrics_base.vue_init)
+    vue.get_chart_usage(...)
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import jwt
+
+from clock import Clock, RealClock
+from constants import (
+    EMPORIA_TOKEN_FALLBACK_LIFETIME_SECS,
+    EMPORIA_TOKEN_REFRESH_MARGIN_SECS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _token_expiry(vue: Any) -> datetime | None:
+    """Return the access-token expiry of *vue*, or None if unknown."""
+    try:
+        token = vue.auth.tokens["access_token"]
+        claims = jwt.decode(token, options={"verify_signature": False})
+        return datetime.fromtimestamp(int(claims["exp"]), timezone.utc)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+class EmporiaSession:
+    """Log a ``PyEmVue`` client in once and keep its tokens fresh."""
+
+    def __init__(
+        self,
+        refresh_margin_secs: float = EMPORIA_TOKEN_REFRESH_MARGIN_SECS,
+        clock: Clock | None = None,
+    ) -> None:
+        """Initialize without logging in.
+
+        Args:
+            refresh_margin_secs: Refresh tokens this long before expiry.
+            clock: Time source (``RealClock`` by default).
+        """
+        self._lock = threading.Lock()
+        self._clock: Clock = clock if clock is not None else RealClock()
+        self._margin = timedelta(seconds=refresh_margin_secs)
+        self._vue: Any = None
+        self._expires_at: datetime | None = None
+        self._authenticated_at: datetime | None = None
+        self.logins = 0
+        self.refreshes = 0
+
+    def ensure(self, vue: Any, login: Callable[[], None]) -> Any:
+        """Return *vue*, logged in and with tokens valid beyond the margin.
+
+        Args:
+            vue: The shared ``PyEmVue`` client.
+            login: Full login routine (``MetricsBase.vue_init``); raises on
+                failure.
+
+        Returns:
+            *vue*, ready for API calls.
+        """
+        with self._lock:
+            now = self._clock.now()
+            if (
+                self._vue is not vue
+                or getattr(vue, "auth", None) is None
+                or self._expires_at is None
+            ):
+                self._login(vue, login, now)
+            elif now + self._margin >= self._expires_at:
+                self._refresh(vue, login, now)
+        return vue
+
+    def _login(self, vue: Any, login: Callable[[], None], now: datetime) -> None:
+        """Run the full login. Caller holds ``_lock``."""
+        self._vue = None
+        self._expires_at = None
+        login()
+        self._vue = vue
+        self._expires_at = _token_expiry(vue) or now + timedelta(
+            seconds=EMPORIA_TOKEN_FALLBACK_LIFETIME_SECS
+        )
+        self._authenticated_at = now
+        self.logins += 1
+        logger.debug("Emporia session: logged in, token expires %s", self._expires_at)
+
+    def _refresh(self, vue: Any, login: Callable[[], None], now: datetime) -> None:
+        """Refresh tokens, falling back to a full login. Caller holds ``_lock``."""
+        try:
+            vue.auth.refresh_tokens()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Emporia session: token refresh failed (%s); logging in", exc)
+            self._login(vue, login, now)
+            return
+        self._expires_at = _token_expiry(vue) or now + timedelta(
+            seconds=EMPORIA_TOKEN_FALLBACK_LIFETIME_SECS
+        )
+        self._authenticated_at = now
+        self.refreshes += 1
+        logger.debug("Emporia session: tokens refreshed, expire %s", self._expires_at)
+
+    @property
+    def authenticated_at(self) -> datetime | None:
+        """Return when the client last logged in or refreshed its tokens."""
+        return self._authenticated_at
+
+    def invalidate(self) -> None:
+        """Force a full login on the next :meth:`ensure` (e.g. after a 401)."""
+        with self._lock:
+            self._vue = None
+            self._expires_at = None
+
+
+_session = EmporiaSession()
+
+
+def get_session() -> EmporiaSession:
+    """Return the process-wide session."""
+    return _session
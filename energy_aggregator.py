@@ -5,7 +5,7 @@ Energy data aggregation for Time-of-Use (TOU) reporting.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Any, List
 
 import pytz
@@ -34,6 +34,32 @@ class TOUBuckets:
             "off_peak": self.off_peak,
         }
 
+    def __add__(self, other: TOUBuckets) -> TOUBuckets:
+        """Return the bucket-wise sum of two totals."""
+        return TOUBuckets(
+            total=self.total + other.total,
+            peak=self.peak + other.peak,
+            part_peak=self.part_peak + other.part_peak,
+            off_peak=self.off_peak + other.off_peak,
+        )
+
+
+@dataclass(frozen=True)
+class DayRollup:
+    """TOU totals for one channel over one local day.
+
+    Attributes:
+        day: Local calendar date.
+        buckets: TOU bucket totals in Wh.
+        nbc: Sum of positive 15-minute periods in Wh.
+        periods: Number of 15-minute periods aggregated.
+    """
+
+    day: date
+    buckets: TOUBuckets
+    nbc: float
+    periods: int
+
 
 class EnergyDataAggregator:
     """
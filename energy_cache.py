@@ -7,22 +7,36 @@ from __future__ import annotations
 import concurrent.futures
 import concurrent.futures.thread
 import logging
+import math
+import sqlite3
 import threading
 import time as _time_mod
 import weakref
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 from typing import Any
 
+from arrival_scheduler import ArrivalScheduler
 from clock import Clock, RealClock
 from constants import MIN_SLEEP_SECS, QUANTIZATION_CONFIDENCE_THRESHOLD
-from quantization import detect_quantization
+from history_store import HistoryStore
+from instrumentation import (
+    CACHE_FETCH_SECONDS,
+    CACHE_REQUESTS,
+    CACHE_SAMPLES_FETCHED,
+    CACHE_SAMPLES_NEW,
+    EMPORIA_FETCH_TIMEOUTS,
+)
+from quantization import QuantizationDetector, detect_quantization
+from sample_window import SampleWindow
+from tracing import propagate
 from util import (
     CompletedNBCPeriod,
     RetryableError,
     ceil_to_qh,
     compute_nbc_quarters,
+    floor_to_qh,
     qh_seconds_remaining,
 )
 
@@ -140,6 +154,8 @@ class EnergyCacheData:
 
     Attributes:
         samples: Per-second energy values (Wh). Ordered chronologically.
+            Stored as an immutable ``SampleWindow``; any sequence passed in
+            is copied into one, and slices of it are zero-copy views.
         data_start: Timestamp of the first sample in *samples*.
         last_sample_at: Timestamp of the last sample in *samples*.
         last_fetch_at: When data was last fetched from the API.
@@ -154,7 +170,7 @@ class EnergyCacheData:
             returned on cache hits, preserved from the original fetch.
     """
 
-    samples: list[float] | None
+    samples: SampleWindow | None
     data_start: datetime | None
     last_sample_at: datetime | None
     last_fetch_at: datetime | None
@@ -166,6 +182,10 @@ class EnergyCacheData:
     full_metrics_dict: dict[str, Any] | None = None
     completed_periods: list["CompletedNBCPeriod"] | None = None
 
+    def __post_init__(self) -> None:
+        if self.samples is not None and not isinstance(self.samples, SampleWindow):
+            object.__setattr__(self, "samples", SampleWindow(self.samples))
+
 
 
 class EnergyCache:
@@ -180,7 +200,10 @@ class EnergyCache:
     after every fetch, and quantization is re-detected on each replace.
 
     Thread-safe via internal lock for concurrent access between Flask and
-    LoadManager background threads.
+    LoadManager background threads.  The lock only guards snapshot swaps:
+    API fetches run outside it on a single-flight basis, so readers keep
+    getting the current snapshot while a slow refresh is in flight (see
+    ``get_or_fetch``).
 
     The public interface is a thin wrapper around the frozen ``EnergyCacheData``
     dataclass.  All mutating ``get_or_fetch`` logic is encapsulated inside the
@@ -188,8 +211,16 @@ class EnergyCache:
 
     Attributes:
         _data: Frozen ``EnergyCacheData`` snapshot or ``None`` when empty.
+            Assigning it bumps ``generation``.
         _ttl_seconds: Maximum age of cached data before forcing a refresh.
         _lock: Thread-safety lock.
+        _inflight: Future for the refresh currently in flight, or ``None``.
+        _stale_while_revalidate: Serve the current snapshot to non-forced
+            callers while a refresh is in flight instead of joining it.
+        _store: Optional ``HistoryStore`` that completed QHs (and, when
+            enabled, raw samples) are written to and warmed from.
+        _arrivals: ``ArrivalScheduler`` learning when the next quantum is
+            published; drives ``skip_unchanged`` fetches and sleeps.
     """
 
     def __init__(
@@ -197,22 +228,63 @@ class EnergyCache:
         ttl_seconds: int = 30,
         clock: Clock | None = None,
         fetch_timeout_secs: int = 30,
+        stale_while_revalidate: bool = True,
+        store: HistoryStore | None = None,
     ) -> None:
-        self._data: EnergyCacheData | None = None
+        self._generation: int = 0
+        self._snapshot: EnergyCacheData | None = None
         self._ttl_seconds: int = ttl_seconds
         self._clock: Clock = clock if clock is not None else RealClock()
         self._lock: threading.Lock = threading.Lock()
         self._fetch_timeout_secs: int = fetch_timeout_secs
+        self._inflight: concurrent.futures.Future[
+            tuple[dict[str, Any] | None, bool]
+        ] | None = None
+        self._stale_while_revalidate: bool = stale_while_revalidate
+        # Incremental quantization state for the stored window; only used
+        # while successive windows extend one another (see _quantization_for).
+        self._quant_detector: QuantizationDetector | None = None
+        self._quant_data_start: datetime | None = None
+        # Completed periods produced by compact() that still have to be
+        # written to the store; flushed outside the lock after each fetch.
+        self._store: HistoryStore | None = None
+        self._pending_periods: list[CompletedNBCPeriod] = []
+        self._pending_window: tuple[datetime, SampleWindow | None] | None = None
+        self._arrivals: ArrivalScheduler = ArrivalScheduler()
+        if store is not None:
+            self.attach_store(store)
 
     # ------------------------------------------------------------------
     # Public properties (mimic the old direct-attribute interface)
     # ------------------------------------------------------------------
 
+    @property
+    def _data(self) -> EnergyCacheData | None:
+        return self._snapshot
+
+    @_data.setter
+    def _data(self, value: EnergyCacheData | None) -> None:
+        # Every snapshot swap goes through here, so the generation counts
+        # them all (fetches, compaction, invalidate, adopt, tests).
+        if value is not self._snapshot:
+            self._generation += 1
+        self._snapshot = value
+
     @property
     def data(self) -> EnergyCacheData | None:
         """The current ``EnergyCacheData`` snapshot, or ``None`` if empty."""
         return self._data
 
+    @property
+    def generation(self) -> int:
+        """Number of snapshot swaps so far; changes whenever ``data`` does."""
+        return self._generation
+
+    @property
+    def arrivals(self) -> ArrivalScheduler:
+        """Return the data-arrival scheduler (read under ``lock``)."""
+        return self._arrivals
+
     @property
     def lock(self) -> threading.Lock:
         """Thread-safety lock."""
@@ -224,11 +296,11 @@ class EnergyCache:
         return self._ttl_seconds
 
     @property
-    def samples(self) -> list[float] | None:
+    def samples(self) -> SampleWindow | None:
         """Per-second energy samples, or ``None`` if empty.
 
         Returns:
-            List of float Wh values, or ``None``.
+            Read-only ``SampleWindow`` of float Wh values, or ``None``.
         """
         if self._data is None:
             return None
@@ -432,13 +504,12 @@ class EnergyCache:
             return data
 
         cutoff = ceil_to_qh(now - timedelta(seconds=3600))
-        old_count = 0
-        for i, _ in enumerate(data.samples):
-            sample_time = data.data_start + timedelta(seconds=i)
-            if sample_time < cutoff:
-                old_count += 1
-            else:
-                break
+        # Samples are one second apart: those at index i < (cutoff -
+        # data_start) seconds fall before the cutoff.
+        old_count = min(
+            len(data.samples),
+            max(0, math.ceil((cutoff - data.data_start).total_seconds())),
+        )
 
         result = data
 
@@ -473,7 +544,8 @@ class EnergyCache:
 
         1. Identify completed QH periods from per-second data.
         2. Compute raw_wh for each completed period.
-        3. Store as CompletedNBCPeriod objects (up to 3).
+        3. Store as CompletedNBCPeriod objects (up to 3), and queue them
+           for the history store when one is configured.
         4. Purge completed QH per-second data.
         5. Purge CompletedNBCPeriod objects older than 1 hour.
 
@@ -523,8 +595,7 @@ class EnergyCache:
             if qh_end_time >= current_qh_start:
                 # This is the current (possibly incomplete) QH — don't compact.
                 break
-            qh_values = samples[offset:offset + 900]
-            raw_wh = 1000.0 * sum(qh_values)
+            raw_wh = 1000.0 * samples.total(offset, offset + 900)
             new_completed.append(CompletedNBCPeriod(
                 start=qh_start_time,
                 raw_wh=raw_wh,
@@ -549,6 +620,9 @@ class EnergyCache:
                 data_start,
             )
 
+        if self._store is not None:
+            self._pending_periods.extend(new_completed)
+
         # Merge new completed periods with existing, deduplicate by start time.
         all_completed = existing_completed + new_completed
         seen_starts: set[datetime] = set()
@@ -566,7 +640,7 @@ class EnergyCache:
         # Keep at most 3.
         deduped = deduped[-3:]
 
-        # Trim per-second samples: remove compacted chunks.
+        # Trim per-second samples: remove compacted chunks (a zero-copy view).
         remaining_samples = samples[offset:]
         # QH-aligned by construction: offset starts at the aligned boundary
         # (see lead-trim above) and advances in whole QH steps, so the next
@@ -574,7 +648,10 @@ class EnergyCache:
         remaining_data_start = data_start + timedelta(seconds=offset)
 
         # Re-detect quantization on remaining samples.
-        quant_tuple = detect_quantization(remaining_samples) if remaining_samples else None
+        quant_tuple = (
+            self._quantization_for(remaining_samples, remaining_data_start)
+            if remaining_samples else None
+        )
         qs: int | None = None
         qo: int | None = None
         qc: float | None = None
@@ -607,9 +684,52 @@ class EnergyCache:
             len(deduped),
         )
 
+    def _quantization_for(
+        self, samples: Sequence[float], data_start: datetime
+    ) -> tuple[int, int, float] | None:
+        """Detect quantization, incrementally when *samples* extend the cache.
+
+        When *samples* start where the stored window starts and repeat all
+        of its samples (a tail fetch appended to it), the
+        ``QuantizationDetector`` is extended with just the new samples.
+        Otherwise the window is scanned in full with ``detect_quantization``.
+        Caller holds ``self._lock``.
+
+        Args:
+            samples: The per-second window to classify.
+            data_start: Start time of *samples*.
+
+        Returns:
+            ``(sample_size, offset, confidence)`` or ``None``.
+        """
+        detector = self._quant_detector
+        if (
+            detector is not None
+            and self._quant_data_start == data_start
+            and detector.matches_prefix(samples)
+        ):
+            detector.extend(samples[len(detector):])
+            return detector.result()
+        previous = self._data
+        if (
+            previous is not None
+            and previous.samples
+            and previous.data_start == data_start
+            and samples[:len(previous.samples)] == previous.samples
+        ):
+            detector = QuantizationDetector(samples)
+            self._quant_detector = detector
+            self._quant_data_start = data_start
+            return detector.result()
+        self._quant_detector = None
+        self._quant_data_start = None
+        if isinstance(samples, SampleWindow):
+            return detect_quantization(samples.tolist())
+        return detect_quantization(list(samples))
+
     def _merge_samples_replace(
         self,
-        new_samples: list[float],
+        new_samples: Sequence[float],
         data_start: datetime,
         now: datetime,
     ) -> EnergyCacheData:
@@ -629,7 +749,7 @@ class EnergyCache:
         Returns:
             A new ``EnergyCacheData`` with replaced samples.
         """
-        quant_tuple = detect_quantization(new_samples)
+        quant_tuple = self._quantization_for(new_samples, data_start)
         if quant_tuple is not None:
             qs, qo, qc = quant_tuple
             if qc < QUANTIZATION_CONFIDENCE_THRESHOLD:
@@ -645,7 +765,7 @@ class EnergyCache:
         ) if new_samples else data_start
 
         return EnergyCacheData(
-            samples=list(new_samples),
+            samples=SampleWindow.of(new_samples),
             data_start=data_start,
             last_sample_at=last_sample_at,
             last_fetch_at=now,
@@ -656,6 +776,52 @@ class EnergyCache:
             completed_periods=self._data.completed_periods if self._data else None,
         )
 
+    def splice_tail(
+        self,
+        tail: list[float],
+        tail_start: datetime,
+        overlap: int,
+    ) -> list[float] | None:
+        """Append a tail-only fetch to the cached window.
+
+        The first *overlap* samples of *tail* must repeat the cached samples
+        at the same offsets; this verifies that the tail lines up with the
+        cached window before anything is appended.  The cache itself is not
+        mutated — the spliced window is stored by the regular
+        ``get_or_fetch`` replace path.
+
+        Args:
+            tail: Per-second samples starting at *tail_start*.
+            tail_start: Timestamp of ``tail[0]``.
+            overlap: Number of leading tail samples expected to match the
+                cached window.
+
+        Returns:
+            The full window (cached prefix + *tail*) starting at the cached
+            ``data_start``, or ``None`` when the overlap check fails and the
+            caller must refetch the whole window.
+        """
+        with self._lock:
+            snapshot = self._data
+        if (
+            snapshot is None
+            or snapshot.samples is None
+            or snapshot.data_start is None
+        ):
+            return None
+        samples = snapshot.samples
+        offset = int((tail_start - snapshot.data_start).total_seconds())
+        if offset < 0 or offset + overlap > len(samples) or len(tail) < overlap:
+            return None
+        if list(tail[:overlap]) != list(samples[offset:offset + overlap]):
+            logger.info(
+                "EnergyCache splice_tail: overlap mismatch at %s; "
+                "full refetch required",
+                tail_start,
+            )
+            return None
+        return samples[:offset].tolist() + list(tail)
+
     # ------------------------------------------------------------------
     # Build result dict (for non-incremental callers)
     # ------------------------------------------------------------------
@@ -728,11 +894,13 @@ class EnergyCache:
                 raise
 
         pool = DaemonThreadPoolExecutor(max_workers=1)
-        future = pool.submit(_wrapped)
+        # propagate(): spans opened by fetch_func join the caller's trace.
+        future = pool.submit(propagate(_wrapped))
         try:
             result = future.result(timeout=self._fetch_timeout_secs)
         except concurrent.futures.TimeoutError:
             timed_out.set()
+            EMPORIA_FETCH_TIMEOUTS.inc()
             logger.warning(
                 "EnergyCache fetch timed out after %ds",
                 self._fetch_timeout_secs,
@@ -763,6 +931,8 @@ class EnergyCache:
         fetch_func: Callable[[], dict[str, Any] | None],
         now: datetime,
         force: bool = False,
+        skip_unchanged: bool = False,
+        caller: str = "other",
     ) -> tuple[dict[str, Any] | None, bool]:
         """Return *(metrics_dict_or_none, was_fresh)*.
 
@@ -772,6 +942,17 @@ class EnergyCache:
         boundary afterwards), stores the result, and returns
         ``was_fresh=True``.
 
+        Refreshes are single-flight: at most one *fetch_func* runs at a
+        time, and it runs outside ``self._lock`` so readers are never
+        blocked behind Emporia latency.  While a refresh is in flight:
+
+        * non-forced callers with a snapshot available get the current
+          (stale) result immediately with ``was_fresh=False``
+          (stale-while-revalidate, when enabled);
+        * forced callers, and callers with nothing cached yet, join the
+          in-flight refresh and receive its outcome instead of starting a
+          second API call.
+
         The *fetch_func* may return either:
 
         * A full metrics dict (e.g. ``HourlyProjection.metrics``) — stored
@@ -786,13 +967,29 @@ class EnergyCache:
             fetch_func: Callable that returns fresh data dict.
             now: Current datetime.
             force: When ``True``, bypass cache and always fetch.
+            skip_unchanged: When ``True``, return the cached result with
+                ``was_fresh=False`` instead of fetching if the next
+                quantum is not expected yet (see ``ArrivalScheduler``),
+                even when *force* is set.
+            caller: ``caller`` label of ``solara_cache_requests_total``
+                (a fixed name such as ``"index"``, never request data).
 
         Returns:
             Tuple of *(metrics_dict_or_none, was_fresh)*.
         """
         with self._lock:
+            if skip_unchanged and not self._may_have_new_data_unlocked(now):
+                self._arrivals.skipped += 1
+                CACHE_REQUESTS.labels(caller, "skipped").inc()
+                logger.debug(
+                    "EnergyCache fetch skipped: next quantum expected at %s",
+                    self._next_arrival_unlocked(),
+                )
+                return self._build_result(), False
+
             # Check if cache is valid (non-expired data exists).
             if not force and self._is_valid_unlocked(now):
+                CACHE_REQUESTS.labels(caller, "hit").inc()
                 result = self._build_result()
                 logger.debug(
                     "EnergyCache cache_hit: keys=%s, "
@@ -803,96 +1000,223 @@ class EnergyCache:
                 )
                 return result, False
 
-            # Fetch fresh data with timeout protection.
-            fetch_start = _time_mod.monotonic()
-            result = self._run_fetch_with_timeout(fetch_func)
-            fetch_elapsed = _time_mod.monotonic() - fetch_start
-            logger.debug(
-                "EnergyCache fetch_func completed in %.2fs, result=%s",
-                fetch_elapsed,
-                "ok" if result is not None else "None",
-            )
-
-            if result is None:
-                # Timed out or fetch_func returned None — return stale cache
-                # if available, so callers get stale-but-valid data instead
-                # of crashing on None.
-                if self._data is not None:
+            inflight = self._inflight
+            if inflight is None:
+                inflight = concurrent.futures.Future()
+                self._inflight = inflight
+                is_owner = True
+            else:
+                is_owner = False
+                if (
+                    not force
+                    and self._stale_while_revalidate
+                    and self._data is not None
+                    and self._data.last_fetch_at is not None
+                ):
+                    CACHE_REQUESTS.labels(caller, "stale").inc()
+                    logger.debug(
+                        "EnergyCache refresh in flight: serving current snapshot"
+                    )
                     return self._build_result(), False
-                logger.warning(
-                    "EnergyCache: fetch failed and no stale cache available"
-                )
-                return (None, True)
-
-            if result is not None:
-                new_samples: list[float] = []
-
-                # Extract per-second data from the result dict.
-                if "per_second_data" in result:
-                    new_samples = list(result["per_second_data"])
-                elif "devices" in result:
-                    # Extract from nested devices (full metrics dict path).
-                    new_samples = [
-                        point
-                        for device in result["devices"]
-                        for point in device.get("per_second_data", [])
-                    ]
 
-                logger.debug(
-                    "EnergyCache merge_input: extracted %d samples from "
-                    "result_keys=%s, existing_samples=%d",
-                    len(new_samples),
-                    list(result.keys()),
-                    len(self._data.samples) if self._data and self._data.samples else 0,
-                )
+        if not is_owner:
+            CACHE_REQUESTS.labels(caller, "joined").inc()
+            logger.debug("EnergyCache refresh in flight: joining")
+            return inflight.result()
 
-                result_data_start: datetime | None = result.get("data_start")
+        CACHE_REQUESTS.labels(caller, "miss").inc()
 
-                effective_data_start = result_data_start if result_data_start is not None else now
-                if new_samples:
-                    logger.debug(
-                        "EnergyCache replace: %d old → %d new samples, "
-                        "data_start=%s",
-                        len(self._data.samples) if self._data and self._data.samples else 0,
-                        len(new_samples),
-                        result_data_start,
-                    )
-                    self._data = self._merge_samples_replace(
-                        new_samples, effective_data_start, now,
-                    )
-                elif self._data is not None:
-                    # No new samples — prune old data in place.
-                    self._data = self._prune_old_samples(self._data, now)
-
-                # Store the full metrics dict so cache hits return it.
-                # Always update on fetch — ensures cache hits serve fresh
-                # predictions (NBC, device metrics, etc.) rather than stale
-                # values from the initial fetch.
-                if self._data is not None:
-                    self._data = replace(
-                        self._data,
-                        full_metrics_dict=result,
-                        data_lag_secs=float(result.get("_data_lag_secs", 0.0)),
-                    )
+        try:
+            outcome = self._fetch_and_store(fetch_func, now)
+        except BaseException as exc:
+            with self._lock:
+                self._inflight = None
+            inflight.set_exception(exc)
+            raise
+        with self._lock:
+            self._inflight = None
+        inflight.set_result(outcome)
+        return outcome
 
-                # Always compact after fetch — O(1) no-op when
-                # len(samples) < 900.
-                self.compact(now)
+    def _confident_quantum_unlocked(self) -> int | None:
+        """Return the detected quantum if confidently known (caller holds lock)."""
+        data = self._data
+        if (
+            data is None
+            or data.quantization_seconds is None
+            or data.quantization_confidence is None
+            or data.quantization_confidence < QUANTIZATION_CONFIDENCE_THRESHOLD
+        ):
+            return None
+        return data.quantization_seconds
 
-                data = self._data
-                if data and data.samples:
-                    logger.debug(
-                        "EnergyCache: len %d start %s now %s",
-                        len(data.samples),
-                        data.data_start,
-                        now,
-                    )
+    def _next_arrival_unlocked(self) -> datetime | None:
+        """Return the expected arrival of the next quantum (caller holds lock).
+
+        ``None`` when there is no fetched data, no confident quantization,
+        or the scheduler is still learning.
+        """
+        data = self._data
+        quantum = self._confident_quantum_unlocked()
+        if (
+            data is None
+            or data.last_fetch_at is None
+            or data.last_sample_at is None
+            or quantum is None
+        ):
+            return None
+        return self._arrivals.expected_arrival(data.last_sample_at, quantum)
 
-                return (result, True) if result is not None else (None, True)
+    def _may_have_new_data_unlocked(self, now: datetime) -> bool:
+        """Return False when a fetch at *now* cannot advance the samples."""
+        arrival = self._next_arrival_unlocked()
+        return arrival is None or now >= arrival
 
-            # fetch_func returned None — keep existing cache data.
+    def _fetch_and_store(
+        self,
+        fetch_func: Callable[[], dict[str, Any] | None],
+        now: datetime,
+    ) -> tuple[dict[str, Any] | None, bool]:
+        """Run *fetch_func* outside the lock, then swap in the new snapshot.
+
+        Only the single-flight owner in ``get_or_fetch`` calls this.  The
+        network call runs without holding ``self._lock``; merging, pruning
+        and compaction run under it so readers see either the old or the
+        new ``EnergyCacheData``, never a partial update.
+
+        Args:
+            fetch_func: Callable that returns fresh data dict.
+            now: Current datetime.
+
+        Returns:
+            Tuple of *(metrics_dict_or_none, was_fresh)*.
+        """
+        # Fetch fresh data with timeout protection.
+        fetch_start = _time_mod.monotonic()
+        result = self._run_fetch_with_timeout(fetch_func)
+        fetch_elapsed = _time_mod.monotonic() - fetch_start
+        CACHE_FETCH_SECONDS.labels("ok" if result is not None else "failed").observe(
+            fetch_elapsed
+        )
+        logger.debug(
+            "EnergyCache fetch_func completed in %.2fs, result=%s",
+            fetch_elapsed,
+            "ok" if result is not None else "None",
+        )
+
+        with self._lock:
+            outcome = self._store_result(result, now)
+            periods, self._pending_periods = self._pending_periods, []
+            window, self._pending_window = self._pending_window, None
+        if self._store is not None:
+            self._flush_to_store(periods, window)
+        return outcome
+
+    def _store_result(
+        self, result: dict[str, Any] | None, now: datetime
+    ) -> tuple[dict[str, Any] | None, bool]:
+        """Merge a fetch result into the snapshot (caller holds ``self._lock``).
+
+        Args:
+            result: The *fetch_func* return value, or ``None`` on failure.
+            now: Current datetime.
+
+        Returns:
+            Tuple of *(metrics_dict_or_none, was_fresh)*.
+        """
+        if result is None:
+            # Timed out or fetch_func returned None — return stale cache
+            # if available, so callers get stale-but-valid data instead
+            # of crashing on None.  A snapshot warmed from the history
+            # store was never fetched and is not a usable result.
+            if self._data is not None and self._data.last_fetch_at is not None:
+                return self._build_result(), False
+            logger.warning(
+                "EnergyCache: fetch failed and no stale cache available"
+            )
             return (None, True)
 
+        new_samples: Sequence[float] = []
+
+        # Extract per-second data from the result dict.
+        if "per_second_data" in result:
+            # Copied once, into the SampleWindow, by the replace below.
+            new_samples = result["per_second_data"]
+        elif "devices" in result:
+            # Extract from nested devices (full metrics dict path).
+            new_samples = [
+                point
+                for device in result["devices"]
+                for point in device.get("per_second_data", [])
+            ]
+
+        logger.debug(
+            "EnergyCache merge_input: extracted %d samples from "
+            "result_keys=%s, existing_samples=%d",
+            len(new_samples),
+            list(result.keys()),
+            len(self._data.samples) if self._data and self._data.samples else 0,
+        )
+
+        result_data_start: datetime | None = result.get("data_start")
+
+        effective_data_start = result_data_start if result_data_start is not None else now
+        if new_samples:
+            logger.debug(
+                "EnergyCache replace: %d old → %d new samples, "
+                "data_start=%s",
+                len(self._data.samples) if self._data and self._data.samples else 0,
+                len(new_samples),
+                result_data_start,
+            )
+            previous_last = self._data.last_sample_at if self._data else None
+            self._data = self._merge_samples_replace(
+                new_samples, effective_data_start, now,
+            )
+            CACHE_SAMPLES_FETCHED.inc(len(new_samples))
+            if previous_last is None or self._data.last_sample_at is None:
+                CACHE_SAMPLES_NEW.inc(len(new_samples))
+            elif self._data.last_sample_at > previous_last:
+                CACHE_SAMPLES_NEW.inc(
+                    (self._data.last_sample_at - previous_last).total_seconds()
+                )
+            if self._data.last_sample_at is not None:
+                self._arrivals.record(
+                    self._data.last_sample_at, now, self._confident_quantum_unlocked()
+                )
+            if self._store is not None:
+                # Persisted before compact() trims the completed QHs.
+                self._pending_window = (effective_data_start, self._data.samples)
+        elif self._data is not None:
+            # No new samples — prune old data in place.
+            self._data = self._prune_old_samples(self._data, now)
+
+        # Store the full metrics dict so cache hits return it.
+        # Always update on fetch — ensures cache hits serve fresh
+        # predictions (NBC, device metrics, etc.) rather than stale
+        # values from the initial fetch.
+        if self._data is not None:
+            self._data = replace(
+                self._data,
+                full_metrics_dict=result,
+                data_lag_secs=float(result.get("_data_lag_secs", 0.0)),
+            )
+
+        # Always compact after fetch — O(1) no-op when
+        # len(samples) < 900.
+        self.compact(now)
+
+        data = self._data
+        if data and data.samples:
+            logger.debug(
+                "EnergyCache: len %d start %s now %s",
+                len(data.samples),
+                data.data_start,
+                now,
+            )
+
+        return (result, True)
+
     # ------------------------------------------------------------------
     # Quarter-hour extraction (caller holds lock when called from
     # get_current_qh, but we acquire it here too for standalone safety.)
@@ -916,12 +1240,15 @@ class EnergyCache:
             Dict with QH prediction info or ``None`` if no cached data.
         """
         with self._lock:
-            if self._data is None or self._data.samples is None:
-                return None
+            # Take one immutable snapshot: a concurrent refresh may swap
+            # self._data while the NBC quarters are computed below.
+            snapshot = self._data
+        if snapshot is None or snapshot.samples is None:
+            return None
 
-            samples = self._data.samples
-            samples_len = len(samples)
-            data_start = self._data.data_start
+        samples = snapshot.samples
+        samples_len = len(samples)
+        data_start = snapshot.data_start
 
         if samples_len == 0:
             return None
@@ -944,8 +1271,8 @@ class EnergyCache:
 
         # Use quantization-aware prediction window when available.
         prediction_window_seconds: int | None = None
-        qs = self._data.quantization_seconds
-        qc = self._data.quantization_confidence
+        qs = snapshot.quantization_seconds
+        qc = snapshot.quantization_confidence
         if qs is not None and qc is not None and qc >= QUANTIZATION_CONFIDENCE_THRESHOLD:
             prediction_window_seconds = qs
 
@@ -993,14 +1320,132 @@ class EnergyCache:
     # ------------------------------------------------------------------
 
     def invalidate(self) -> None:
-        """Clear the cache."""
+        """Clear the cache.
+
+        With a history store, completed QHs are re-seeded from it (samples
+        are not: they may be what caused the invalidation).
+        """
         with self._lock:
             self._data = None
+        self.warm(self._clock.now(), include_samples=False)
+
+    def adopt(self, data: EnergyCacheData | None) -> None:
+        """Replace the snapshot with one built by another process.
+
+        Control-plane followers mirror the leader's cache this way instead
+        of fetching; the store is not written.
+
+        Args:
+            data: The leader's snapshot.
+        """
+        with self._lock:
+            self._data = data
+
+    # ------------------------------------------------------------------
+    # History store
+    # ------------------------------------------------------------------
+
+    def attach_store(self, store: HistoryStore) -> None:
+        """Start writing to *store* and warm the cache from it.
+
+        Args:
+            store: An open history store.
+        """
+        self._store = store
+        self.warm(self._clock.now())
+
+    def warm(self, now: datetime, include_samples: bool = True) -> None:
+        """Seed an empty cache from the history store.
+
+        Loads the completed periods of the last hour and, when the store
+        keeps samples, the in-progress QH's samples.  ``data_start`` is set
+        to the current QH when those samples exist or the previous QH is
+        stored, so ``_chart_start_for`` fetches only the current QH instead
+        of the full hour.  The warmed snapshot has no ``last_fetch_at``, so
+        it is never served as a cache hit.  No-op without a store or when
+        the cache already holds data.
+
+        Args:
+            now: Current time.
+            include_samples: Also load the in-progress QH's samples.
+        """
+        store = self._store
+        if store is None:
+            return
+        current_qh_start = floor_to_qh(now)
+        try:
+            completed = store.periods(now - timedelta(seconds=3600), current_qh_start)
+            samples = (
+                store.samples_at(current_qh_start)
+                if include_samples and store.keep_samples else None
+            )
+        except sqlite3.Error as exc:
+            logger.warning("EnergyCache warm: history store read failed: %s", exc)
+            return
+        completed = completed[-3:]
+        data_start: datetime | None = None
+        if samples:
+            data_start = current_qh_start
+        elif completed and completed[-1].start + timedelta(seconds=900) == current_qh_start:
+            data_start = current_qh_start
+        else:
+            samples = None
+        if data_start is None and not completed:
+            return
+        with self._lock:
+            if self._data is not None:
+                return
+            self._data = EnergyCacheData(
+                samples=samples,
+                data_start=data_start,
+                last_sample_at=(
+                    data_start + timedelta(seconds=len(samples) - 1)
+                    if data_start is not None and samples else None
+                ),
+                last_fetch_at=None,
+                sample_count=len(samples) if samples else None,
+                quantization_seconds=None,
+                quantization_offset=None,
+                quantization_confidence=None,
+                completed_periods=completed or None,
+            )
+        logger.info(
+            "EnergyCache warmed from history store: %d completed periods, "
+            "%d samples",
+            len(completed),
+            len(samples) if samples else 0,
+        )
+
+    def _flush_to_store(
+        self,
+        periods: list[CompletedNBCPeriod],
+        window: tuple[datetime, SampleWindow | None] | None,
+    ) -> None:
+        """Write queued periods and samples to the store (outside the lock).
+
+        Store failures are logged, never raised: the store only saves
+        refetches.
+
+        Args:
+            periods: Completed periods queued by ``compact``.
+            window: ``(data_start, samples)`` of the fetched window, or None.
+        """
+        assert self._store is not None
+        try:
+            self._store.record_periods(periods)
+            if window is not None and window[1] is not None:
+                self._store.record_samples(window[0], window[1])
+        except sqlite3.Error as exc:
+            logger.warning("EnergyCache: history store write failed: %s", exc)
 
     def sleep_interval_adjust(
         self, interval_seconds: float, now: datetime
     ) -> float:
-        """Given a sleep interval, adjust it to the nearest quantization step.
+        """Given a sleep interval, shorten it to when new data is expected.
+
+        That is just after the learned arrival of the next quantum
+        (``ArrivalScheduler``), or the next quantization step while the
+        scheduler is still learning.
 
         Args:
             interval_seconds: Seconds to sleep.
@@ -1029,13 +1474,20 @@ class EnergyCache:
         assert self._data.quantization_seconds is not None
         assert self._data.quantization_offset is not None
 
-        # quantization offset is relative to data_start.
-        offset_start = self._data.data_start + timedelta(seconds=self._data.quantization_offset)
-        seconds_from_start = (now - offset_start).total_seconds()
-        seconds_in_period = seconds_from_start % self._data.quantization_seconds
-        seconds_remaining = (
-            self._data.quantization_seconds - seconds_in_period
-        ) % self._data.quantization_seconds
+        # Prefer the learned arrival of the next quantum; fall back to the
+        # next quantum boundary while learning or once it is overdue.
+        with self._lock:
+            arrival = self._next_arrival_unlocked()
+        if arrival is not None and arrival > now:
+            seconds_remaining = (arrival - now).total_seconds()
+        else:
+            # quantization offset is relative to data_start.
+            offset_start = self._data.data_start + timedelta(seconds=self._data.quantization_offset)
+            seconds_from_start = (now - offset_start).total_seconds()
+            seconds_in_period = seconds_from_start % self._data.quantization_seconds
+            seconds_remaining = (
+                self._data.quantization_seconds - seconds_in_period
+            ) % self._data.quantization_seconds
         logger.debug(
             "EnergyCache.sleep_interval_adjust: %.1f > %.1f",
             interval_seconds,
@@ -0,0 +1,133 @@
+"""Dedicated asyncio event-loop thread for long-lived async resources.
+
+aiohttp sessions, HomeKit pairings and the Tesla Fleet API client are bound
+to the event loop they were created on.  Running each load-management cycle
+under ``asyncio.run()`` creates and closes a fresh loop, so those resources
+had to be thrown away and rebuilt every cycle — new TCP+TLS handshakes, a
+re-read of the Tesla private key, a new Telegram session.
+
+``EventLoopThread`` owns one loop on a daemon thread for the life of its
+owner.  Synchronous code submits coroutines with :meth:`EventLoopThread.run`
+and blocks for the result; resources created on the loop stay valid across
+submissions.
+
+Usage::
+
+    from event_loop import EventLoopThread
+
+    loop_thread = EventLoopThread(name="load-manager-loop")
+    result = loop_thread.run(some_coroutine())
+    loop_thread.close()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class EventLoopThread:
+    """Run coroutines on a single persistent loop in a background thread.
+
+    The thread is started lazily on the first :meth:`run` call and is a
+    daemon, so an owner that is never closed does not block interpreter
+    exit.  :meth:`close` stops the loop and joins the thread; a closed
+    instance restarts on the next :meth:`run`.
+    """
+
+    def __init__(self, name: str = "event-loop") -> None:
+        """Initialize without starting the thread.
+
+        Args:
+            name: Thread name, shown in logs and thread dumps.
+        """
+        self._name = name
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Return the running loop, starting the thread if needed."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._start()
+            assert self._loop is not None
+            return self._loop
+
+    def _start(self) -> None:
+        """Create the loop and start the thread. Caller holds ``_lock``."""
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def _run_loop() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            try:
+                loop.run_forever()
+            finally:
+                loop.close()
+
+        thread = threading.Thread(target=_run_loop, name=self._name, daemon=True)
+        thread.start()
+        started.wait()
+        self._loop = loop
+        self._thread = thread
+        logger.debug("EventLoopThread %s started", self._name)
+
+    def in_loop_thread(self) -> bool:
+        """Return True when called from the loop's own thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def run(
+        self, coro: Coroutine[Any, Any, T], timeout: float | None = None
+    ) -> T:
+        """Run *coro* on the loop and block until it completes.
+
+        Args:
+            coro: Coroutine to schedule.
+            timeout: Optional seconds to wait. On timeout the coroutine is
+                cancelled and :class:`TimeoutError` is raised.
+
+        Returns:
+            The coroutine's result; its exception is re-raised here.
+
+        Raises:
+            RuntimeError: When called from the loop thread itself, which
+                would deadlock.
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError(
+                f"EventLoopThread.run() called from its own loop thread ({self._name})"
+            )
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the loop and join the thread. Safe to call multiple times.
+
+        Args:
+            timeout: Seconds to wait for the thread to exit.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or thread is None:
+            return
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+        logger.debug("EventLoopThread %s stopped", self._name)
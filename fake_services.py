@@ -0,0 +1,1276 @@
+"""Local stand-ins for every external service, for end-to-end load tests.
+
+Each stand-in listens on a real socket on a background thread, so client
+timeouts, keep-alive reuse, retries and concurrency are exercised the way
+they are in production — without a network:
+
+- ``EmporiaStub``: the Emporia API paths PyEmVue uses (``customers``,
+  ``customers/devices``, ``AppAPI?apiMethod=getChartUsage``), reached
+  through ``PyEmVue.login_simulator`` when ``VUE_SIMULATOR_HOST`` is set.
+  Usage is generated by ``QuantizedUsage``: constant within each Emporia
+  quantum and published ``lag_secs`` after the quantum ends.
+- ``FleetStub``: the Tesla Fleet REST surface a vehicle-command proxy
+  exposes (``vehicle_data``, ``wake_up``, ``command/charge_start``,
+  ``command/charge_stop``, ``command/set_charging_amps``).  With a broker
+  attached, state changes are published as fleet-telemetry MQTT fields.
+- ``TelegramStub``: ``/bot<token>/sendMessage``.
+- ``HomeKitStub``: HAP's JSON characteristic API (``/accessories``,
+  ``/characteristics``) over plain HTTP, without pair-verify or session
+  encryption; ``HomeKitStubPlugController`` is its client.
+- ``MqttBroker``: a minimal MQTT 3.1.1 broker (QoS 0 delivery, retained
+  messages, wildcard filters) standing in for mosquitto.
+
+Every stand-in takes a ``Faults``: fixed latency plus uniform jitter,
+an error rate (answered with the service's own failure: HTTP 503 from
+Emporia, 408 "vehicle offline" from Tesla, 429 from Telegram, HAP status
+-70402 from HomeKit, a dropped message from MQTT) and a stall rate that
+holds the request long enough to trip client timeouts.
+
+Usage::
+
+    # Start all five on ports 9300-9304, print the .env lines to use them
+    uv run python fake_services.py --faults latency_secs=0.2,jitter_secs=0.3 \\
+        --emporia-faults latency_secs=1.5,error_rate=0.02 --accessory heater
+
+    # In a test
+    with EmporiaStub(QuantizedUsage(quantum_secs=30)) as emporia:
+        vue = PyEmVue()
+        vue.login_simulator(emporia.url)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import socket
+import socketserver
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import aiohttp
+
+from clock import Clock, RealClock
+from load_models import AbstractPlugController, PlugConfig
+
+logger = logging.getLogger(__name__)
+
+Response = tuple[int, Any]
+"""``(status, body)`` returned by a route; *body* is JSON-encoded unless None."""
+
+
+# === Fault injection ===
+
+
+@dataclass(frozen=True)
+class Faults:
+    """Latency and failure injection for one stand-in.
+
+    Attributes:
+        latency_secs: Fixed delay before every response.
+        jitter_secs: Extra delay drawn uniformly from ``[0, jitter_secs]``.
+        error_rate: Fraction of requests answered with the service's
+            failure response (a dropped delivery for MQTT).
+        stall_rate: Fraction of requests held for ``stall_secs`` before
+            being answered, to trip client timeouts.
+        stall_secs: How long a stalled request is held.
+    """
+
+    latency_secs: float = 0.0
+    jitter_secs: float = 0.0
+    error_rate: float = 0.0
+    stall_rate: float = 0.0
+    stall_secs: float = 35.0
+
+    @classmethod
+    def parse(cls, spec: str) -> Faults:
+        """Parse ``"latency_secs=0.2,error_rate=0.05"``; omitted fields keep defaults.
+
+        Raises:
+            ValueError: On an unknown field or a malformed value.
+        """
+        names = {f.name for f in fields(cls)}
+        values: dict[str, float] = {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            key, sep, raw = item.partition("=")
+            if not sep or key not in names:
+                raise ValueError(f"bad fault spec {item!r}; fields are {sorted(names)}")
+            values[key] = float(raw)
+        return cls(**values)
+
+
+class _FaultInjector:
+    """Draws the delay and outcome of each request from a seeded RNG."""
+
+    def __init__(self, faults: Faults, seed: int) -> None:
+        self.faults = faults
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> tuple[float, bool]:
+        """Return ``(delay_secs, fail)`` for the next request."""
+        f = self.faults
+        with self._lock:
+            delay = f.latency_secs + self._rng.uniform(0.0, f.jitter_secs)
+            if self._rng.random() < f.stall_rate:
+                delay += f.stall_secs
+            fail = self._rng.random() < f.error_rate
+        return delay, fail
+
+
+# === HTTP stand-ins ===
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Routes every request to the owning ``HttpStub``."""
+
+    # Keep-alive, so client connection pools are exercised.
+    protocol_version = "HTTP/1.1"
+    server: _StubServer
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.stub.count("connections")
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002  # pylint: disable=redefined-builtin
+        logger.debug("%s: " + format, self.server.stub.name, *args)
+
+    def _dispatch(self) -> None:
+        stub = self.server.stub
+        parts = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        delay, fail = stub.injector.draw()
+        if delay and stub.stopped.wait(delay):
+            return
+        try:
+            if fail:
+                stub.count("errors")
+                status, payload = stub.error_response(body, parts.query)
+            else:
+                status, payload = stub.route(
+                    self.command, parts.path.lstrip("/"),
+                    {k: v[-1] for k, v in parse_qs(parts.query).items()},
+                    {k.lower(): v for k, v in self.headers.items()},
+                    body,
+                )
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("%s: route failed for %s %s", stub.name, self.command, self.path)
+            status, payload = 500, {"error": "stub failure"}
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = _dispatch
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], stub: HttpStub) -> None:
+        self.stub = stub
+        super().__init__(address, _StubHandler)
+
+
+class HttpStub(ABC):
+    """An HTTP stand-in served from a background thread.
+
+    Subclasses implement :meth:`route` and may override
+    :meth:`error_response`.  ``stats`` counts requests per route label,
+    accepted ``connections`` and injected ``errors``.
+
+    Attributes:
+        name: Label used in logs.
+    """
+
+    name = "http"
+
+    def __init__(
+        self,
+        faults: Faults | None = None,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Configure without binding; call :meth:`start` (or use ``with``).
+
+        Args:
+            faults: Latency and failure injection (none by default).
+            seed: Seed for the fault RNG.
+            host: Address to bind.
+            port: Port to bind; 0 picks a free one.
+        """
+        self.injector = _FaultInjector(faults or Faults(), seed)
+        self.stats: Counter[str] = Counter()
+        self.stopped = threading.Event()
+        self._address = (host, port)
+        self._server: _StubServer | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def count(self, label: str) -> None:
+        """Increment ``stats[label]`` (thread-safe)."""
+        with self._lock:
+            self.stats[label] += 1
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running stand-in, without a trailing slash."""
+        assert self._server is not None, "stub not started"
+        host = self._server.server_address[0]
+        assert isinstance(host, str)
+        return f"http://{host}:{self._server.server_port}"
+
+    def start(self) -> HttpStub:
+        """Bind and serve on a daemon thread; returns self."""
+        self.stopped.clear()
+        self._server = _StubServer(self._address, self)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name=f"fake-{self.name}", daemon=True,
+        )
+        self._thread.start()
+        logger.info("%s stand-in listening on %s", self.name, self.url)
+        return self
+
+    def stop(self) -> None:
+        """Stop serving; stalled requests are released."""
+        self.stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> HttpStub:
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    def error_response(self, body: bytes, query: str) -> Response:  # noqa: ARG002
+        """Response for a request drawn as failed.
+
+        Args:
+            body: Raw request body.
+            query: Raw query string.
+        """
+        return 503, {"error": "service unavailable"}
+
+    @abstractmethod
+    def route(
+        self,
+        method: str,
+        path: str,
+        query: dict[str, str],
+        headers: dict[str, str],
+        body: bytes,
+    ) -> Response:
+        """Answer one request.
+
+        Args:
+            method: HTTP method.
+            path: URL path without the leading slash.
+            query: Query parameters (last value wins).
+            headers: Request headers, lower-cased names.
+            body: Raw request body.
+        """
+
+
+def _json_body(body: bytes) -> dict[str, Any]:
+    """Decode a JSON object body, or ``{}``."""
+    try:
+        decoded = json.loads(body) if body else {}
+    except ValueError:
+        return {}
+    return decoded if isinstance(decoded, dict) else {}
+
+
+def _iso(when: datetime) -> str:
+    """Format like the Emporia and Tesla APIs: UTC with a ``Z`` suffix."""
+    return when.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# === Emporia ===
+
+
+_SCALE_SECS = {"1S": 1, "1MIN": 60, "15MIN": 900, "1H": 3600, "1D": 86400}
+"""Chart scales the Emporia stand-in serves, in seconds per bucket."""
+
+
+@dataclass(frozen=True)
+class QuantizedUsage:
+    """Deterministic per-second kWh, constant within each Emporia quantum.
+
+    The same quantum always yields the same value, so overlapping fetches
+    agree sample for sample, as tail-splicing expects.
+
+    Attributes:
+        quantum_secs: Emporia's publication quantum.
+        lag_secs: Delay from the end of a quantum until it is published.
+        low_kw: Lowest average power of a quantum (negative = export).
+        high_kw: Highest average power of a quantum.
+        seed: Varies the generated series.
+    """
+
+    quantum_secs: int = 30
+    lag_secs: float = 15.0
+    low_kw: float = -4.0
+    high_kw: float = 1.5
+    seed: int = 0
+
+    def quantum_kwh(self, channel: str, index: int) -> float:
+        """Return the per-second kWh of quantum *index* (epoch seconds // quantum)."""
+        rng = random.Random(f"{self.seed}:{channel}:{index}")
+        return rng.uniform(self.low_kw, self.high_kw) / 3600.0
+
+    def published_until(self, now: datetime) -> int:
+        """Return the epoch second just after the newest published sample."""
+        ready = math.floor(now.timestamp() - self.lag_secs)
+        return ready - ready % self.quantum_secs
+
+    def total_kwh(self, channel: str, start: int, end: int) -> float:
+        """Sum kWh over epoch seconds ``[start, end)``."""
+        total = 0.0
+        second = start
+        while second < end:
+            index = second // self.quantum_secs
+            boundary = min(end, (index + 1) * self.quantum_secs)
+            total += self.quantum_kwh(channel, index) * (boundary - second)
+            second = boundary
+        return total
+
+    def series(
+        self, channel: str, start: int, end: int, now: datetime, scale_secs: int = 1
+    ) -> list[float]:
+        """Return complete published buckets of *scale_secs* in ``[start, end)``."""
+        stop = min(end, self.published_until(now))
+        if scale_secs == 1:
+            out: list[float] = []
+            index = start // self.quantum_secs
+            second = start
+            while second < stop:
+                boundary = min(stop, (index + 1) * self.quantum_secs)
+                out.extend([self.quantum_kwh(channel, index)] * (boundary - second))
+                second = boundary
+                index += 1
+            return out
+        return [
+            self.total_kwh(channel, bucket, bucket + scale_secs)
+            for bucket in range(start, stop - scale_secs + 1, scale_secs)
+        ]
+
+
+def _parse_emporia_time(raw: str) -> datetime:
+    """Parse PyEmVue's ``2026-06-08T14:00:00.000000Z`` timestamps."""
+    return datetime.fromisoformat(raw.replace("Z", "+00:00"))
+
+
+class EmporiaStub(HttpStub):
+    """Emporia API stand-in for PyEmVue's simulator login.
+
+    Serves ``devices`` ZIG001 meters (gids 1001, 1002, ...) with one
+    ``1,2,3`` mains channel each.  ``drift_rate`` is the fraction of chart
+    fetches whose ``firstUsageInstant`` lands one quantum after the
+    requested start, as when the head of the window is missing.
+    """
+
+    name = "emporia"
+
+    def __init__(
+        self,
+        usage: QuantizedUsage | None = None,
+        devices: int = 1,
+        time_zone: str = "America/Los_Angeles",
+        drift_rate: float = 0.0,
+        clock: Clock | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Args are as for ``HttpStub`` plus the usage model and meter count."""
+        super().__init__(**kwargs)
+        self.usage = usage or QuantizedUsage()
+        self.gids = [1001 + i for i in range(devices)]
+        self.time_zone = time_zone
+        self.drift_rate = drift_rate
+        self._clock: Clock = clock if clock is not None else RealClock()
+        self._drift_rng = random.Random(7)
+
+    def _device(self, gid: int) -> dict[str, Any]:
+        return {
+            "deviceGid": gid,
+            "manufacturerDeviceId": f"A2107A0{gid}",
+            "model": "ZIG001",
+            "firmware": "fake",
+            "locationProperties": {
+                "deviceName": f"Meter {gid}", "displayName": f"Meter {gid}",
+                "timeZone": self.time_zone,
+            },
+            "deviceConnected": {"connected": True, "offlineSince": None},
+            "channels": [{
+                "deviceGid": gid, "name": "Main", "channelNum": "1,2,3",
+                "channelMultiplier": 1.0, "channelTypeGid": None, "type": "Main",
+            }],
+            "devices": [],
+        }
+
+    def route(
+        self, method: str, path: str, query: dict[str, str],
+        headers: dict[str, str], body: bytes,
+    ) -> Response:
+        if not headers.get("authtoken"):
+            return 401, {"message": "Unauthorized"}
+        if method == "GET" and path == "customers":
+            self.count("customers")
+            return 200, {
+                "customerGid": 1, "email": "fake@example.com",
+                "firstName": "Fake", "lastName": "Customer",
+                "createdAt": "2020-01-01T00:00:00Z",
+            }
+        if method == "GET" and path == "customers/devices":
+            self.count("get_devices")
+            return 200, {"devices": [self._device(gid) for gid in self.gids]}
+        if method == "GET" and path == "AppAPI" and query.get("apiMethod") == "getChartUsage":
+            self.count("get_chart_usage")
+            return self._chart_usage(query)
+        return 404, {"message": f"no route {method} {path}"}
+
+    def _chart_usage(self, query: dict[str, str]) -> Response:
+        try:
+            gid = int(query["deviceGid"])
+            start = _parse_emporia_time(query["start"])
+            end = _parse_emporia_time(query["end"])
+            scale_secs = _SCALE_SECS[query.get("scale", "1S")]
+        except (KeyError, ValueError):
+            return 400, {"message": "bad getChartUsage parameters"}
+        if gid not in self.gids:
+            return 404, {"message": f"unknown device {gid}"}
+        first = math.floor(start.timestamp())
+        first -= first % scale_secs
+        with self._lock:
+            drifted = self._drift_rng.random() < self.drift_rate
+        if drifted:
+            first += self.usage.quantum_secs
+        channel = f"{gid}:{query.get('channel', '1,2,3')}"
+        usage = self.usage.series(
+            channel, first, math.ceil(end.timestamp()), self._clock.now(), scale_secs,
+        )
+        return 200, {
+            "firstUsageInstant": _iso(datetime.fromtimestamp(first, timezone.utc)),
+            "usageList": usage,
+        }
+
+
+# === Tesla Fleet ===
+
+
+@dataclass
+class VehicleState:
+    """Charging state of one stand-in vehicle."""
+
+    charging: bool = True
+    plugged_in: bool = True
+    charge_amps: int = 16
+    charge_current_request_max: int = 32
+    battery_level: int = 60
+    charge_limit_soc: int = 80
+    latitude: float = 37.0
+    longitude: float = -122.0
+
+    @property
+    def charging_state(self) -> str:
+        """REST ``charging_state``."""
+        if not self.plugged_in:
+            return "Disconnected"
+        return "Charging" if self.charging else "Stopped"
+
+    def telemetry(self) -> dict[str, Any]:
+        """Fleet-telemetry fields for this state."""
+        return {
+            "ChargeAmps": float(self.charge_amps if self.charging else 0),
+            "DetailedChargeState": f"DetailedChargeState{self.charging_state}",
+            "Location": {"latitude": self.latitude, "longitude": self.longitude},
+        }
+
+
+class FleetStub(HttpStub):
+    """Tesla Fleet REST stand-in, as a vehicle-command proxy serves it.
+
+    Any VIN is accepted and gets its own ``VehicleState`` on first use.
+    With *broker*, command effects are published as fleet-telemetry
+    fields under ``{topic_base}/`` (call :meth:`publish_telemetry` once
+    to seed them).  Failed requests answer 408 "vehicle offline".
+    """
+
+    name = "tesla"
+
+    def __init__(
+        self,
+        initial: VehicleState | None = None,
+        broker: MqttBroker | None = None,
+        topic_base: str = "telemetry",
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._initial = initial or VehicleState()
+        self.vehicles: dict[str, VehicleState] = {}
+        self.commands: list[tuple[str, str, dict[str, Any]]] = []
+        self.broker = broker
+        self.topic_base = topic_base
+
+    def vehicle(self, vin: str) -> VehicleState:
+        """Return (creating if needed) the state of *vin*."""
+        with self._lock:
+            if vin not in self.vehicles:
+                self.vehicles[vin] = replace(self._initial)
+            return self.vehicles[vin]
+
+    def publish_telemetry(self, vin: str) -> None:
+        """Publish every telemetry field of *vin* to the broker."""
+        if self.broker is None:
+            return
+        now = _iso(datetime.now(timezone.utc))
+        for name, value in self.vehicle(vin).telemetry().items():
+            self.broker.publish(
+                f"{self.topic_base}/{name}",
+                json.dumps({"value": value, "createdAt": now}),
+                retain=True,
+            )
+
+    def error_response(self, body: bytes, query: str) -> Response:  # noqa: ARG002
+        return 408, {"error": "vehicle unavailable: vehicle is offline or asleep"}
+
+    def route(
+        self, method: str, path: str, query: dict[str, str],
+        headers: dict[str, str], body: bytes,
+    ) -> Response:
+        if not headers.get("authorization", "").startswith("Bearer "):
+            return 401, {"error": "login_required"}
+        parts = path.split("/")
+        if parts[:3] != ["api", "1", "vehicles"] or len(parts) < 5:
+            return 404, {"error": "not_found"}
+        vin, action = parts[3], parts[4:]
+        state = self.vehicle(vin)
+        if method == "GET" and action == ["vehicle_data"]:
+            self.count("vehicle_data")
+            return 200, {"response": self._vehicle_data(vin, state, query.get("endpoints"))}
+        if method == "POST" and action == ["wake_up"]:
+            self.count("wake_up")
+            return 200, {"response": {"vin": vin, "state": "online"}}
+        if method == "POST" and len(action) == 2 and action[0] == "command":
+            self.count(f"command/{action[1]}")
+            return 200, {"response": self._command(vin, state, action[1], _json_body(body))}
+        return 404, {"error": "not_found"}
+
+    @staticmethod
+    def _vehicle_data(vin: str, state: VehicleState, endpoints: str | None) -> dict[str, Any]:
+        wanted = set((endpoints or "charge_state;location_data").split(";"))
+        data: dict[str, Any] = {"vin": vin, "state": "online"}
+        if "charge_state" in wanted:
+            data["charge_state"] = {
+                "charging_state": state.charging_state,
+                "charge_amps": state.charge_amps,
+                "charge_current_request": state.charge_amps,
+                "charge_current_request_max": state.charge_current_request_max,
+                "charger_actual_current": state.charge_amps if state.charging else 0,
+                "battery_level": state.battery_level,
+                "charge_limit_soc": state.charge_limit_soc,
+            }
+        if wanted & {"location_data", "drive_state"}:
+            data["drive_state"] = {
+                "latitude": state.latitude, "longitude": state.longitude,
+                "timestamp": int(time.time() * 1000),
+            }
+        return data
+
+    def _command(
+        self, vin: str, state: VehicleState, name: str, payload: dict[str, Any]
+    ) -> dict[str, Any]:
+        with self._lock:
+            self.commands.append((vin, name, payload))
+            if name == "set_charging_amps":
+                amps = int(payload.get("charging_amps", state.charge_amps))
+                state.charge_amps = max(0, min(amps, state.charge_current_request_max))
+            elif name in ("charge_start", "charge_stop"):
+                if not state.plugged_in:
+                    return {"result": False, "reason": "disconnected"}
+                if state.charging == (name == "charge_start"):
+                    return {"result": False, "reason": "is_charging" if state.charging else "not_charging"}
+                state.charging = name == "charge_start"
+            else:
+                return {"result": False, "reason": f"{name} not supported by the stand-in"}
+        self.publish_telemetry(vin)
+        return {"result": True, "reason": ""}
+
+
+# === Telegram ===
+
+
+class TelegramStub(HttpStub):
+    """Telegram Bot API stand-in; failed requests answer 429 with ``retry_after``.
+
+    Attributes:
+        messages: ``(chat_id, text)`` of every accepted message.
+    """
+
+    name = "telegram"
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.messages: list[tuple[str, str]] = []
+
+    def error_response(self, body: bytes, query: str) -> Response:  # noqa: ARG002
+        return 429, {
+            "ok": False, "error_code": 429,
+            "description": "Too Many Requests: retry after 1",
+            "parameters": {"retry_after": 1},
+        }
+
+    def route(
+        self, method: str, path: str, query: dict[str, str],
+        headers: dict[str, str], body: bytes,
+    ) -> Response:
+        bot, _, api_method = path.partition("/")
+        if not bot.startswith("bot") or len(bot) <= 3:
+            return 404, {"ok": False, "error_code": 404, "description": "Not Found"}
+        if method != "POST" or api_method != "sendMessage":
+            return 404, {"ok": False, "error_code": 404, "description": "Not Found"}
+        payload = _json_body(body)
+        chat_id, text = payload.get("chat_id"), payload.get("text")
+        if not chat_id or not text:
+            return 400, {
+                "ok": False, "error_code": 400,
+                "description": "Bad Request: chat_id and text are required",
+            }
+        self.count("sendMessage")
+        with self._lock:
+            self.messages.append((str(chat_id), str(text)))
+            message_id = len(self.messages)
+        return 200, {"ok": True, "result": {
+            "message_id": message_id, "date": int(time.time()),
+            "chat": {"id": chat_id}, "text": text,
+        }}
+
+
+# === HomeKit ===
+
+
+_HAP_SWITCH = "49"
+_HAP_ON = "25"
+_HAP_NAME = "23"
+_HAP_ON_IID = 10
+_HAP_NAME_IID = 2
+_HAP_COMMUNICATION_FAILURE = -70402
+
+
+class HomeKitStub(HttpStub):
+    """HAP JSON characteristic stand-in hosting one switch per accessory id.
+
+    Each accessory (``aid`` 1, 2, ...) carries its accessory id as the
+    Name characteristic and a Switch service with an On characteristic.
+    Failed requests answer HAP's 207 multi-status with -70402
+    (communication failure) for each characteristic.
+    """
+
+    name = "homekit"
+
+    def __init__(self, accessories: Iterable[str] = (), **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.aids = {name: aid for aid, name in enumerate(accessories, start=1)}
+        self.on: dict[int, bool] = {aid: False for aid in self.aids.values()}
+
+    def state(self, accessory_id: str) -> bool:
+        """Return the On value of *accessory_id*."""
+        return self.on[self.aids[accessory_id]]
+
+    @staticmethod
+    def _request_ids(body: bytes, query: dict[str, str]) -> list[dict[str, int]]:
+        """``[{"aid", "iid"}]`` named by a GET ``id=`` query or a PUT body."""
+        if "id" in query:
+            return [
+                {"aid": int(aid), "iid": int(iid)}
+                for aid, _, iid in (item.partition(".") for item in query["id"].split(",") if item)
+            ]
+        return [
+            {"aid": int(c["aid"]), "iid": int(c["iid"])}
+            for c in _json_body(body).get("characteristics", [])
+        ]
+
+    def error_response(self, body: bytes, query: str) -> Response:
+        ids = self._request_ids(body, {k: v[-1] for k, v in parse_qs(query).items()})
+        return 207, {"characteristics": [
+            dict(c, status=_HAP_COMMUNICATION_FAILURE) for c in ids
+        ]}
+
+    def route(
+        self, method: str, path: str, query: dict[str, str],
+        headers: dict[str, str], body: bytes,
+    ) -> Response:
+        if method == "GET" and path == "accessories":
+            self.count("accessories")
+            return 200, {"accessories": [
+                {"aid": aid, "services": [
+                    {"iid": 1, "type": "3E", "characteristics": [
+                        {"iid": _HAP_NAME_IID, "type": _HAP_NAME, "format": "string",
+                         "perms": ["pr"], "value": name},
+                    ]},
+                    {"iid": 9, "type": _HAP_SWITCH, "characteristics": [
+                        {"iid": _HAP_ON_IID, "type": _HAP_ON, "format": "bool",
+                         "perms": ["pr", "pw", "ev"], "value": self.on[aid]},
+                    ]},
+                ]}
+                for name, aid in self.aids.items()
+            ]}
+        if path != "characteristics" or method not in ("GET", "PUT"):
+            return 404, None
+        self.count(f"{method} characteristics")
+        if method == "GET":
+            results = []
+            for c in self._request_ids(b"", query):
+                if c["aid"] not in self.on or c["iid"] != _HAP_ON_IID:
+                    return 400, {"status": -70409}
+                results.append(dict(c, value=self.on[c["aid"]]))
+            return 200, {"characteristics": results}
+        for c in _json_body(body).get("characteristics", []):
+            aid = int(c.get("aid", 0))
+            if aid not in self.on or int(c.get("iid", 0)) != _HAP_ON_IID:
+                return 400, {"status": -70409}
+            with self._lock:
+                self.on[aid] = bool(c.get("value"))
+        return 204, None
+
+
+class HomeKitStubPlugController(AbstractPlugController):
+    """Plug controller speaking HAP JSON to a ``HomeKitStub``.
+
+    Used in place of ``RealPlugController`` when ``HOMEKIT_STUB_URL`` is
+    set.  Like the real controller it serializes requests over one
+    keep-alive connection and discovers each plug's ``aid`` from
+    ``/accessories`` on first use.
+    """
+
+    max_concurrency = 1
+
+    def __init__(self, plugs: dict[str, PlugConfig], url: str, timeout_secs: float = 10.0) -> None:
+        self.plugs = plugs
+        self.url = url.rstrip("/")
+        self._timeout = aiohttp.ClientTimeout(total=timeout_secs)
+        self._session: aiohttp.ClientSession | None = None
+        self._aids: dict[str, int] = {}
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> tuple[int, Any]:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=1), timeout=self._timeout,
+            )
+        async with self._session.request(method, f"{self.url}/{path}", **kwargs) as resp:
+            data = await resp.json() if resp.content_length else None
+            return resp.status, data
+
+    async def _aid(self, name: str) -> int | None:
+        plug = self.plugs.get(name)
+        if plug is None:
+            logger.warning("Unknown plug %s", name)
+            return None
+        if plug.accessory_id not in self._aids:
+            _status, data = await self._request("GET", "accessories")
+            for accessory in (data or {}).get("accessories", []):
+                for service in accessory.get("services", []):
+                    for char in service.get("characteristics", []):
+                        if char.get("type") == _HAP_NAME:
+                            self._aids[str(char.get("value"))] = accessory["aid"]
+        aid = self._aids.get(plug.accessory_id)
+        if aid is None:
+            logger.error("No HomeKit stand-in accessory for %s", plug.accessory_id)
+        return aid
+
+    async def get_state(self, name: str) -> bool | None:
+        """Query the On characteristic; None on error."""
+        try:
+            aid = await self._aid(name)
+            if aid is None:
+                return None
+            status, data = await self._request(
+                "GET", "characteristics", params={"id": f"{aid}.{_HAP_ON_IID}"},
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error("Connection error for plug %s: %s", name, e)
+            return None
+        if status != 200:
+            logger.error("HomeKit stand-in returned %d for plug %s: %s", status, name, data)
+            return None
+        return bool(data["characteristics"][0]["value"])
+
+    async def set_state(self, name: str, on: bool) -> bool:
+        """Write the On characteristic; False on error."""
+        try:
+            aid = await self._aid(name)
+            if aid is None:
+                return False
+            status, data = await self._request("PUT", "characteristics", json={
+                "characteristics": [{"aid": aid, "iid": _HAP_ON_IID, "value": int(on)}],
+            })
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error("Connection error for plug %s: %s", name, e)
+            return False
+        if status != 204:
+            logger.error("HomeKit stand-in returned %d for plug %s: %s", status, name, data)
+            return False
+        logger.info("HomeKitStubPlugController.set_state(%s, %s)", name, on)
+        return True
+
+    async def disconnect(self) -> None:
+        """Close the keep-alive connection."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+# === MQTT ===
+
+
+_CONNECT, _CONNACK, _PUBLISH, _PUBACK, _PUBREC, _PUBREL, _PUBCOMP = 1, 2, 3, 4, 5, 6, 7
+_SUBSCRIBE, _SUBACK, _UNSUBSCRIBE, _UNSUBACK = 8, 9, 10, 11
+_PINGREQ, _PINGRESP, _DISCONNECT = 12, 13, 14
+
+
+def topic_matches(topic_filter: str, topic: str) -> bool:
+    """Return True when *topic* matches an MQTT filter with ``+``/``#`` wildcards."""
+    filter_parts = topic_filter.split("/")
+    topic_parts = topic.split("/")
+    for i, part in enumerate(filter_parts):
+        if part == "#":
+            return True
+        if i >= len(topic_parts) or (part != "+" and part != topic_parts[i]):
+            return False
+    return len(filter_parts) == len(topic_parts)
+
+
+def _encode_length(length: int) -> bytes:
+    out = bytearray()
+    while True:
+        length, digit = divmod(length, 128)
+        out.append(digit | (0x80 if length else 0))
+        if not length:
+            return bytes(out)
+
+
+def _utf8(text: str) -> bytes:
+    raw = text.encode("utf-8")
+    return struct.pack("!H", len(raw)) + raw
+
+
+def _packet(kind: int, flags: int, body: bytes) -> bytes:
+    return bytes([kind << 4 | flags]) + _encode_length(len(body)) + body
+
+
+class _MqttSession(socketserver.BaseRequestHandler):
+    """One client connection: reads packets until DISCONNECT or EOF."""
+
+    server: _MqttServer
+
+    def __init__(self, request: Any, client_address: Any, server: _MqttServer) -> None:
+        # The base class handles the connection inside __init__.
+        self.filters: set[str] = set()
+        self.write_lock = threading.Lock()
+        self.client_id = ""
+        super().__init__(request, client_address, server)
+
+    def send(self, data: bytes) -> None:
+        """Write *data*, serialized with deliveries from other threads."""
+        with self.write_lock:
+            self.request.sendall(data)
+
+    def _read(self, count: int) -> bytes:
+        data = b""
+        while len(data) < count:
+            chunk = self.request.recv(count - len(data))
+            if not chunk:
+                raise ConnectionError("client closed")
+            data += chunk
+        return data
+
+    def _read_packet(self) -> tuple[int, int, bytes]:
+        header = self._read(1)[0]
+        length, shift = 0, 0
+        while True:
+            digit = self._read(1)[0]
+            length += (digit & 0x7F) << shift
+            if not digit & 0x80:
+                break
+            shift += 7
+        return header >> 4, header & 0x0F, self._read(length) if length else b""
+
+    def handle(self) -> None:
+        broker = self.server.broker
+        try:
+            kind, _flags, body = self._read_packet()
+            if kind != _CONNECT:
+                return
+            # Protocol name, then level, flags and keep-alive (4 bytes).
+            offset = 2 + struct.unpack_from("!H", body)[0] + 4
+            id_len = struct.unpack_from("!H", body, offset)[0]
+            self.client_id = body[offset + 2:offset + 2 + id_len].decode("utf-8", "replace")
+            self.send(_packet(_CONNACK, 0, b"\x00\x00"))
+            broker.attach(self)
+            while True:
+                kind, flags, body = self._read_packet()
+                if kind == _PUBLISH:
+                    self._on_publish(flags, body)
+                elif kind == _PUBREL:
+                    self.send(_packet(_PUBCOMP, 0, body[:2]))
+                elif kind == _SUBSCRIBE:
+                    self._on_subscribe(body)
+                elif kind == _UNSUBSCRIBE:
+                    offset = 2
+                    while offset < len(body):
+                        size = struct.unpack_from("!H", body, offset)[0]
+                        self.filters.discard(body[offset + 2:offset + 2 + size].decode("utf-8"))
+                        offset += 2 + size
+                    self.send(_packet(_UNSUBACK, 0, body[:2]))
+                elif kind == _PINGREQ:
+                    self.send(_packet(_PINGRESP, 0, b""))
+                elif kind == _DISCONNECT:
+                    return
+        except (ConnectionError, OSError, struct.error, IndexError):
+            return
+        finally:
+            broker.detach(self)
+
+    def _on_publish(self, flags: int, body: bytes) -> None:
+        qos = (flags >> 1) & 0x03
+        size = struct.unpack_from("!H", body)[0]
+        topic = body[2:2 + size].decode("utf-8")
+        offset = 2 + size
+        if qos:
+            packet_id = body[offset:offset + 2]
+            offset += 2
+            self.send(_packet(_PUBACK if qos == 1 else _PUBREC, 0, packet_id))
+        self.server.broker.publish(topic, body[offset:], retain=bool(flags & 0x01))
+
+    def _on_subscribe(self, body: bytes) -> None:
+        packet_id, offset, granted, new = body[:2], 2, bytearray(), []
+        while offset < len(body):
+            size = struct.unpack_from("!H", body, offset)[0]
+            topic_filter = body[offset + 2:offset + 2 + size].decode("utf-8")
+            offset += 3 + size  # filter plus requested QoS byte
+            self.filters.add(topic_filter)
+            new.append(topic_filter)
+            granted.append(0)
+        self.send(_packet(_SUBACK, 0, packet_id + bytes(granted)))
+        self.server.broker.deliver_retained(self, new)
+
+
+class _MqttServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], broker: MqttBroker) -> None:
+        self.broker = broker
+        super().__init__(address, _MqttSession)
+
+
+class MqttBroker:
+    """Minimal MQTT 3.1.1 broker standing in for mosquitto.
+
+    Accepts any client, grants QoS 0 on every subscription, keeps the last
+    retained message per topic and fans each publish out to matching
+    sessions.  ``Faults`` apply per delivery: latency delays it, an error
+    drops it.  :meth:`publish` also injects messages from Python.
+    """
+
+    name = "mqtt"
+
+    def __init__(
+        self, faults: Faults | None = None, seed: int = 0,
+        host: str = "127.0.0.1", port: int = 0,
+    ) -> None:
+        self.injector = _FaultInjector(faults or Faults(), seed)
+        self.stats: Counter[str] = Counter()
+        self.retained: dict[str, bytes] = {}
+        self._address = (host, port)
+        self._sessions: list[_MqttSession] = []
+        self._lock = threading.Lock()
+        self._server: _MqttServer | None = None
+        self._stopped = threading.Event()
+
+    @property
+    def port(self) -> int:
+        """Bound port of the running broker."""
+        assert self._server is not None, "broker not started"
+        return int(self._server.server_address[1])
+
+    @property
+    def host(self) -> str:
+        """Bound address of the running broker."""
+        assert self._server is not None, "broker not started"
+        return str(self._server.server_address[0])
+
+    def start(self) -> MqttBroker:
+        """Bind and serve on a daemon thread; returns self."""
+        self._stopped.clear()
+        self._server = _MqttServer(self._address, self)
+        threading.Thread(
+            target=self._server.serve_forever, name="fake-mqtt", daemon=True,
+        ).start()
+        logger.info("mqtt stand-in listening on %s:%d", self.host, self.port)
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close every client connection."""
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            try:
+                session.request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __enter__(self) -> MqttBroker:
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    def attach(self, session: _MqttSession) -> None:
+        """Register a connected session."""
+        with self._lock:
+            self._sessions.append(session)
+            self.stats["connections"] += 1
+
+    def detach(self, session: _MqttSession) -> None:
+        """Forget a closed session."""
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+
+    def publish(self, topic: str, payload: bytes | str, retain: bool = False) -> None:
+        """Deliver *payload* to every session subscribed to *topic*."""
+        data = payload.encode("utf-8") if isinstance(payload, str) else payload
+        with self._lock:
+            self.stats["published"] += 1
+            if retain:
+                if data:
+                    self.retained[topic] = data
+                else:
+                    self.retained.pop(topic, None)
+            targets = [s for s in self._sessions if any(topic_matches(f, topic) for f in s.filters)]
+        for session in targets:
+            self._deliver(session, topic, data, retain=False)
+
+    def deliver_retained(self, session: _MqttSession, filters: list[str]) -> None:
+        """Send retained messages matching newly subscribed *filters*."""
+        with self._lock:
+            matches = [
+                (topic, data) for topic, data in self.retained.items()
+                if any(topic_matches(f, topic) for f in filters)
+            ]
+        for topic, data in matches:
+            self._deliver(session, topic, data, retain=True)
+
+    def _deliver(self, session: _MqttSession, topic: str, data: bytes, retain: bool) -> None:
+        delay, fail = self.injector.draw()
+        if delay and self._stopped.wait(delay):
+            return
+        if fail:
+            with self._lock:
+                self.stats["dropped"] += 1
+            return
+        try:
+            session.send(_packet(_PUBLISH, 0x01 if retain else 0, _utf8(topic) + data))
+        except OSError:
+            return
+        with self._lock:
+            self.stats["delivered"] += 1
+
+
+# === All together ===
+
+
+@dataclass
+class FakeServices:
+    """All five stand-ins, wired together (Tesla state changes go to MQTT)."""
+
+    emporia: EmporiaStub
+    tesla: FleetStub
+    telegram: TelegramStub
+    homekit: HomeKitStub
+    mqtt: MqttBroker
+    started: list[Any] = field(default_factory=list)
+
+    @classmethod
+    def build(
+        cls,
+        faults: Faults | None = None,
+        overrides: dict[str, Faults] | None = None,
+        usage: QuantizedUsage | None = None,
+        accessories: Iterable[str] = (),
+        topic_base: str = "telemetry",
+        base_port: int = 0,
+        host: str = "127.0.0.1",
+        seed: int = 0,
+    ) -> FakeServices:
+        """Configure all stand-ins without starting them.
+
+        Args:
+            faults: Faults for every service.
+            overrides: Per-service faults by name (``emporia``, ``tesla``,
+                ``telegram``, ``homekit``, ``mqtt``).
+            usage: Emporia usage model.
+            accessories: HomeKit accessory ids to host.
+            topic_base: MQTT topic prefix for Tesla telemetry.
+            base_port: First port (services take five consecutive ones);
+                0 picks free ports.
+            host: Address to bind.
+            seed: Base seed for the fault RNGs.
+        """
+        overrides = overrides or {}
+
+        def opts(index: int, name: str) -> dict[str, Any]:
+            return {
+                "faults": overrides.get(name, faults), "seed": seed + index,
+                "host": host, "port": base_port + index if base_port else 0,
+            }
+
+        mqtt = MqttBroker(**opts(4, "mqtt"))
+        return cls(
+            emporia=EmporiaStub(usage, **opts(0, "emporia")),
+            tesla=FleetStub(broker=mqtt, topic_base=topic_base, **opts(1, "tesla")),
+            telegram=TelegramStub(**opts(2, "telegram")),
+            homekit=HomeKitStub(accessories, **opts(3, "homekit")),
+            mqtt=mqtt,
+        )
+
+    def start(self, vin: str | None = None) -> FakeServices:
+        """Start every stand-in; with *vin*, seed its telemetry on MQTT."""
+        for service in (self.mqtt, self.emporia, self.tesla, self.telegram, self.homekit):
+            service.start()
+            self.started.append(service)
+        if vin:
+            self.tesla.publish_telemetry(vin)
+        return self
+
+    def stop(self) -> None:
+        """Stop every started stand-in."""
+        while self.started:
+            self.started.pop().stop()
+
+    def __enter__(self) -> FakeServices:
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    def env(self) -> dict[str, str]:
+        """Environment settings that point the app at the stand-ins."""
+        return {
+            "VUE_SIMULATOR_HOST": self.emporia.url,
+            "LOAD_TESLA_CONTROLLER": "real",
+            "TESLA_VEHICLE_COMMAND_PROXY_URL": self.tesla.url,
+            "TESLA_PRIVATE_KEY_PATH": "",
+            "TELEGRAM_API_BASE": self.telegram.url,
+            "LOAD_PLUG_CONTROLLER": "real",
+            "HOMEKIT_STUB_URL": self.homekit.url,
+            "MQTT_HOST": self.mqtt.host,
+            "MQTT_PORT": str(self.mqtt.port),
+            "MQTT_TOPIC_BASE": self.tesla.topic_base,
+        }
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Request, connection and fault counters per service."""
+        return {
+            s.name: dict(s.stats)
+            for s in (self.emporia, self.tesla, self.telegram, self.homekit, self.mqtt)
+        }
+
+
+def write_tesla_tokens(path: Path, lifetime_secs: float = 30 * 86400) -> None:
+    """Write a token file the Fleet stand-in accepts and that needs no refresh.
+
+    Raises:
+        FileExistsError: If *path* exists (real tokens are never overwritten).
+    """
+    with open(path, "x", encoding="utf-8") as f:
+        json.dump({
+            "access_token": "fake-access-token",
+            "refresh_token": "fake-refresh-token",
+            "expires": int(time.time() + lifetime_secs),
+        }, f)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser for running the stand-ins."""
+    parser = argparse.ArgumentParser(description="Run local stand-ins for external services")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind")
+    parser.add_argument(
+        "--base-port", type=int, default=9300,
+        help="Emporia, Tesla, Telegram, HomeKit and MQTT take five ports from here",
+    )
+    parser.add_argument("--faults", type=Faults.parse, default=Faults(), help="faults for every service")
+    for name in ("emporia", "tesla", "telegram", "homekit", "mqtt"):
+        parser.add_argument(f"--{name}-faults", type=Faults.parse, help=f"faults for {name}")
+    parser.add_argument("--quantum-secs", type=int, default=30, help="Emporia publication quantum")
+    parser.add_argument("--lag-secs", type=float, default=15.0, help="Emporia publication lag")
+    parser.add_argument("--drift-rate", type=float, default=0.0, help="fraction of drifted chart fetches")
+    parser.add_argument(
+        "--accessory", action="append", default=[],
+        help="HomeKit accessory id to host (repeatable; must match devices.json plugs)",
+    )
+    parser.add_argument("--vin", default="FAKEVIN0000000001", help="vehicle whose telemetry is seeded")
+    parser.add_argument("--topic-base", default="telemetry", help="MQTT topic prefix")
+    parser.add_argument("--tesla-tokens", type=Path, help="write a fake Tesla token file here")
+    return parser
+
+
+def main(argv: list[str] | None = None, wait: Callable[[], None] | None = None) -> None:
+    """Run the stand-ins until interrupted, then print their counters."""
+    args = _build_parser().parse_args(argv)
+    overrides = {
+        name: getattr(args, f"{name}_faults")
+        for name in ("emporia", "tesla", "telegram", "homekit", "mqtt")
+        if getattr(args, f"{name}_faults") is not None
+    }
+    services = FakeServices.build(
+        faults=args.faults, overrides=overrides,
+        usage=QuantizedUsage(quantum_secs=args.quantum_secs, lag_secs=args.lag_secs),
+        accessories=args.accessory, topic_base=args.topic_base,
+        base_port=args.base_port, host=args.host,
+    )
+    services.emporia.drift_rate = args.drift_rate
+    if args.tesla_tokens:
+        write_tesla_tokens(args.tesla_tokens)
+    with services.start(vin=args.vin):
+        print("# Add to .env (and restart) to use the stand-ins:")
+        for key, value in services.env().items():
+            print(f"{key}={value}")
+        print(f"TESLA_VEHICLE_ID={args.vin}")
+        try:
+            (wait or threading.Event().wait)()
+        except KeyboardInterrupt:
+            pass
+        print(json.dumps(services.stats(), indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
@@ -0,0 +1,333 @@
+"""On-disk history of completed quarter-hours and per-second samples.
+
+``EnergyCache`` only keeps the last hour in memory, so a process restart
+(or ``invalidate()`` after a loop error) used to forget every completed
+quarter-hour and force a full-hour refetch from Emporia.  ``HistoryStore``
+persists them in a local SQLite database in WAL mode:
+
+* ``completed_qh`` — one row per completed QH (``raw_wh``), written by
+  ``EnergyCache.compact``;
+* ``qh_samples`` — optional raw per-second samples, one ``array('d')`` blob
+  per QH (the in-progress QH is rewritten on each fetch);
+* ``tou_day`` — completed-day TOU rollups per channel, written by
+  ``TOURollupCache``.
+
+QH rows are keyed by the QH start in epoch seconds, rollups by channel and
+day.  Writing an existing key replaces the row, so a QH recomputed from
+fresher data wins.  Timestamps are
+returned in the timezone of the query arguments.
+
+Usage::
+
+    from history_store import HistoryStore
+
+    store = HistoryStore("solara-history.db", keep_samples=True)
+    store.record_periods(completed_periods)
+    periods = store.periods(start, end)
+    store.close()
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from array import array
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime, timedelta, tzinfo
+from pathlib import Path
+from typing import Any
+
+from config import Config
+from energy_aggregator import DayRollup, TOUBuckets
+from sample_window import SampleWindow
+from util import CompletedNBCPeriod, ceil_to_qh
+
+logger = logging.getLogger(__name__)
+
+QH_SECONDS = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS completed_qh (
+    start INTEGER PRIMARY KEY,
+    raw_wh REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS qh_samples (
+    start INTEGER PRIMARY KEY,
+    samples BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tou_day (
+    channel TEXT NOT NULL,
+    day TEXT NOT NULL,
+    total REAL NOT NULL,
+    peak REAL NOT NULL,
+    part_peak REAL NOT NULL,
+    off_peak REAL NOT NULL,
+    nbc REAL NOT NULL,
+    periods INTEGER NOT NULL,
+    PRIMARY KEY (channel, day)
+) WITHOUT ROWID;
+"""
+
+
+def _epoch(when: datetime) -> int:
+    return int(when.timestamp())
+
+
+def _from_epoch(seconds: int, tz: tzinfo | None) -> datetime:
+    return datetime.fromtimestamp(seconds, tz)
+
+
+class HistoryStore:
+    """Thread-safe SQLite store for completed QHs and per-second samples.
+
+    One connection is shared by all threads and serialized by a lock; every
+    statement touches a handful of rows, so contention is negligible.  WAL
+    mode keeps readers in other processes from blocking the writer.
+    """
+
+    def __init__(self, path: str | Path, keep_samples: bool = False) -> None:
+        """Open (and create if needed) the database at *path*.
+
+        Args:
+            path: Database file path, or ``":memory:"``.
+            keep_samples: Also persist raw per-second samples.
+        """
+        self._path = str(path)
+        self._keep_samples = keep_samples
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = sqlite3.connect(
+            self._path, check_same_thread=False, isolation_level=None,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> HistoryStore | None:
+        """Open the store configured by ``LOAD_HISTORY_DB``, or ``None``.
+
+        Args:
+            cfg: Application configuration.
+
+        Returns:
+            An open store, or ``None`` when no path is configured or the
+            database cannot be opened (the store is an optimization; the
+            app runs without it).
+        """
+        path = cfg.load_history_db
+        if not path:
+            return None
+        try:
+            return cls(path, keep_samples=cfg.load_history_samples)
+        except sqlite3.Error as exc:
+            logger.error("HistoryStore: cannot open %s: %s", path, exc)
+            return None
+
+    @property
+    def path(self) -> str:
+        """Return the database path."""
+        return self._path
+
+    @property
+    def keep_samples(self) -> bool:
+        """Return True when raw per-second samples are persisted."""
+        return self._keep_samples
+
+    def _execute(
+        self, sql: str, params: Sequence[object] = ()
+    ) -> list[tuple[Any, ...]]:
+        with self._lock:
+            if self._conn is None:
+                raise sqlite3.ProgrammingError("HistoryStore is closed")
+            return self._conn.execute(sql, params).fetchall()
+
+    def _executemany(self, sql: str, rows: list[tuple[object, ...]]) -> None:
+        if not rows:
+            return
+        with self._lock:
+            if self._conn is None:
+                raise sqlite3.ProgrammingError("HistoryStore is closed")
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(sql, rows)
+
+    # ------------------------------------------------------------------
+    # Completed quarter-hours
+    # ------------------------------------------------------------------
+
+    def record_periods(self, periods: Iterable[CompletedNBCPeriod]) -> None:
+        """Insert or replace completed QH periods.
+
+        Args:
+            periods: Completed periods; ``start`` must be QH-aligned.
+        """
+        self._executemany(
+            "INSERT OR REPLACE INTO completed_qh (start, raw_wh) VALUES (?, ?)",
+            [(_epoch(p.start), float(p.raw_wh)) for p in periods],
+        )
+
+    def periods(self, start: datetime, end: datetime) -> list[CompletedNBCPeriod]:
+        """Return stored periods with ``start <= period.start < end``.
+
+        Args:
+            start: Inclusive lower bound.
+            end: Exclusive upper bound.
+
+        Returns:
+            Periods sorted by start, timestamps in ``start.tzinfo``.
+        """
+        rows = self._execute(
+            "SELECT start, raw_wh FROM completed_qh "
+            "WHERE start >= ? AND start < ? ORDER BY start",
+            (_epoch(start), _epoch(end)),
+        )
+        return [
+            CompletedNBCPeriod(
+                start=_from_epoch(int(ts), start.tzinfo),
+                raw_wh=float(raw_wh),
+            )
+            for ts, raw_wh in rows
+        ]
+
+    def runs(
+        self, start: datetime, end: datetime
+    ) -> list[list[CompletedNBCPeriod]]:
+        """Return stored periods inside [start, end) as contiguous runs.
+
+        Only QHs that lie entirely inside the range are returned.
+
+        Args:
+            start: Inclusive lower bound.
+            end: Exclusive upper bound for the end of each QH.
+
+        Returns:
+            Lists of back-to-back periods, in chronological order.
+        """
+        periods = self.periods(
+            ceil_to_qh(start), end - timedelta(seconds=QH_SECONDS - 1),
+        )
+        runs: list[list[CompletedNBCPeriod]] = []
+        for period in periods:
+            if runs and period.start - runs[-1][-1].start == timedelta(
+                seconds=QH_SECONDS
+            ):
+                runs[-1].append(period)
+            else:
+                runs.append([period])
+        return runs
+
+    # ------------------------------------------------------------------
+    # Per-second samples
+    # ------------------------------------------------------------------
+
+    def record_samples(self, data_start: datetime, samples: Sequence[float]) -> None:
+        """Persist *samples* as one blob per QH (no-op unless ``keep_samples``).
+
+        A leading chunk before the first QH boundary is skipped; a trailing
+        partial QH is stored as-is and replaced by later writes.
+
+        Args:
+            data_start: Timestamp of ``samples[0]``.
+            samples: Per-second values.
+        """
+        if not self._keep_samples or not samples:
+            return
+        offset = int((ceil_to_qh(data_start) - data_start).total_seconds())
+        base = _epoch(data_start)
+        rows: list[tuple[object, ...]] = []
+        while offset < len(samples):
+            chunk = samples[offset:offset + QH_SECONDS]
+            if isinstance(chunk, SampleWindow):
+                blob = chunk.view().tobytes()
+            else:
+                blob = array("d", chunk).tobytes()
+            rows.append((base + offset, blob))
+            offset += QH_SECONDS
+        self._executemany(
+            "INSERT OR REPLACE INTO qh_samples (start, samples) VALUES (?, ?)",
+            rows,
+        )
+
+    def samples_at(self, qh_start: datetime) -> SampleWindow | None:
+        """Return the stored samples of the QH starting at *qh_start*.
+
+        Args:
+            qh_start: QH-aligned start time.
+
+        Returns:
+            The samples (up to 900), or ``None`` when none are stored.
+        """
+        rows = self._execute(
+            "SELECT samples FROM qh_samples WHERE start = ?", (_epoch(qh_start),),
+        )
+        if not rows:
+            return None
+        values = array("d")
+        values.frombytes(rows[0][0])
+        return SampleWindow(values)
+
+    # ------------------------------------------------------------------
+    # Daily TOU rollups
+    # ------------------------------------------------------------------
+
+    def record_day_rollups(self, channel: str, rollups: Iterable[DayRollup]) -> None:
+        """Insert or replace completed-day rollups for *channel*.
+
+        Args:
+            channel: Channel key (see ``TOURollupCache``).
+            rollups: Rollups of completed local days.
+        """
+        self._executemany(
+            "INSERT OR REPLACE INTO tou_day (channel, day, total, peak, "
+            "part_peak, off_peak, nbc, periods) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    channel, r.day.isoformat(), r.buckets.total, r.buckets.peak,
+                    r.buckets.part_peak, r.buckets.off_peak, r.nbc, r.periods,
+                )
+                for r in rollups
+            ],
+        )
+
+    def day_rollups(self, channel: str, first: date, last: date) -> list[DayRollup]:
+        """Return stored rollups for *channel* with ``first <= day <= last``.
+
+        Args:
+            channel: Channel key.
+            first: First local day (inclusive).
+            last: Last local day (inclusive).
+
+        Returns:
+            Rollups sorted by day.
+        """
+        rows = self._execute(
+            "SELECT day, total, peak, part_peak, off_peak, nbc, periods "
+            "FROM tou_day WHERE channel = ? AND day >= ? AND day <= ? ORDER BY day",
+            (channel, first.isoformat(), last.isoformat()),
+        )
+        return [
+            DayRollup(
+                day=date.fromisoformat(str(day)),
+                buckets=TOUBuckets(
+                    total=float(total),
+                    peak=float(peak),
+                    part_peak=float(part_peak),
+                    off_peak=float(off_peak),
+                ),
+                nbc=float(nbc),
+                periods=int(periods),
+            )
+            for day, total, peak, part_peak, off_peak, nbc, periods in rows
+        ]
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        """Close the connection. Safe to call multiple times."""
+        with self._lock:
+            conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()
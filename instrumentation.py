@@ -0,0 +1,448 @@
+"""In-process counters and histograms, exposed in Prometheus text format.
+
+Hot-path timings used to exist only in log lines (``cycle_complete``
+timings, ``metrics["api_response"]``, the EnergyCache fetch debug log).
+This module keeps them as a small set of Prometheus-style metrics that
+``/metrics`` renders in the text exposition format (version 0.0.4).
+
+The metrics are module-level constants so call sites only import and
+record.  Recording is cheap: ``labels()`` returns a cached child (a dict
+lookup once created) and ``inc``/``observe`` take one uncontended lock;
+formatting happens only when a scrape calls ``Registry.render``.  Label
+values must come from small fixed sets (stage names, channel numbers,
+command names), never from free text.
+
+Each process keeps its own registry.  With ``CONTROL_PLANE_DIR`` set the
+leader ships its families in the control-plane snapshot and followers
+render those, keeping only their own ``PER_WORKER_PREFIXES`` families
+(see ``merge_families``).
+
+Usage::
+
+    from instrumentation import CACHE_REQUESTS, EMPORIA_FETCH_SECONDS, REGISTRY
+
+    CACHE_REQUESTS.labels("index", "hit").inc()
+    EMPORIA_FETCH_SECONDS.labels("1").observe(0.42)
+    body = REGISTRY.render()
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Families every worker reports for itself instead of taking the leader's.
+PER_WORKER_PREFIXES: tuple[str, ...] = ("solara_sse_",)
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+NETWORK_BUCKETS: tuple[float, ...] = (
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class MetricFamily:
+    """Point-in-time values of one metric, ready to render or pickle.
+
+    Attributes:
+        name: Metric name without sample suffixes.
+        kind: ``counter``, ``gauge`` or ``histogram``.
+        help: One-line description.
+        samples: ``(suffix, labels, value)`` triples; *labels* is a tuple
+            of ``(name, value)`` pairs.
+    """
+
+    name: str
+    kind: str
+    help: str
+    samples: tuple[tuple[str, tuple[tuple[str, str], ...], float], ...]
+
+
+def outcome(ok: bool) -> str:
+    """Return the ``result`` label value for a success flag."""
+    return "ok" if ok else "failed"
+
+
+class _CounterChild:
+    """One labelled counter value."""
+
+    __slots__ = ("_lock", "_value")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add *amount* (must be non-negative)."""
+        if amount < 0:
+            raise ValueError("counters only increase")
+        with self._lock:
+            self._value += amount
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        """Return the ``_total`` sample."""
+        with self._lock:
+            return [("_total", (), self._value)]
+
+
+class _GaugeChild:
+    """One labelled gauge value, set directly or read from a callback."""
+
+    __slots__ = ("_lock", "_value", "_function")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._value = 0.0
+        self._function: Callable[[], float] | None = None
+
+    def set(self, value: float) -> None:
+        """Set the gauge to *value*."""
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add *amount* (may be negative)."""
+        with self._lock:
+            self._value += amount
+
+    def set_function(self, function: Callable[[], float] | None) -> None:
+        """Read the value from *function* at scrape time (None to stop)."""
+        with self._lock:
+            self._function = function
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        """Return the current value, calling the callback if one is set."""
+        with self._lock:
+            function, value = self._function, self._value
+        if function is not None:
+            value = float(function())
+        return [("", (), value)]
+
+
+class _HistogramChild:
+    """One labelled histogram: per-bucket counts, sum and count."""
+
+    __slots__ = ("_lock", "_bounds", "_counts", "_sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._lock = threading.Lock()
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation of *value*."""
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        """Return cumulative ``_bucket`` samples, then ``_sum`` and ``_count``."""
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        out: list[tuple[str, tuple[tuple[str, str], ...], float]] = []
+        cumulative = 0
+        for bound, count in zip((*self._bounds, math.inf), counts):
+            cumulative += count
+            out.append(("_bucket", (("le", _format_value(bound)),), cumulative))
+        out.append(("_sum", (), total))
+        out.append(("_count", (), cumulative))
+        return out
+
+
+_Child = TypeVar("_Child", _CounterChild, _GaugeChild, _HistogramChild)
+
+
+class _Metric(ABC, Generic[_Child]):
+    """A named metric with a fixed label schema and one child per label set."""
+
+    kind: str = ""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        registry: Registry | None = None,
+    ) -> None:
+        """Create the metric and register it.
+
+        Args:
+            name: Metric name (``solara_...``).
+            help_text: One-line description for ``# HELP``.
+            labelnames: Label names; values are given positionally to
+                ``labels()``.
+            registry: Registry to join; ``REGISTRY`` by default, so pass a
+                fresh ``Registry()`` in tests.
+        """
+        self.name: str = name
+        self.help: str = help_text
+        self.labelnames: tuple[str, ...] = tuple(labelnames)
+        self._children: dict[tuple[str, ...], _Child] = {}
+        self._lock: threading.Lock = threading.Lock()
+        (REGISTRY if registry is None else registry).register(self)
+
+    @abstractmethod
+    def _new_child(self) -> _Child:
+        """Return a fresh child for a new label set."""
+
+    def labels(self, *values: object) -> _Child:
+        """Return the child for *values*, creating it on first use."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {key}"
+                )
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def collect(self) -> MetricFamily:
+        """Return the current values of every child."""
+        with self._lock:
+            children = sorted(self._children.items())
+        samples = []
+        for key, child in children:
+            labels = tuple(zip(self.labelnames, key))
+            for suffix, extra, value in child.samples():
+                samples.append((suffix, labels + extra, value))
+        return MetricFamily(self.name, self.kind, self.help, tuple(samples))
+
+
+class Counter(_Metric[_CounterChild]):
+    """Monotonically increasing count (rendered with a ``_total`` suffix)."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment an unlabelled counter."""
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric[_GaugeChild]):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        """Set an unlabelled gauge."""
+        self.labels().set(value)
+
+
+class Histogram(_Metric[_HistogramChild]):
+    """Distribution of observations over fixed cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        registry: Registry | None = None,
+    ) -> None:
+        """Create the histogram; *buckets* are upper bounds, ascending."""
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames, registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record an observation on an unlabelled histogram."""
+        self.labels().observe(value)
+
+
+class Registry:
+    """The set of metrics a process exposes."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        """Add *metric*; names must be unique."""
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+
+    def collect(self) -> list[MetricFamily]:
+        """Return every metric's current values, ordered by name."""
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        return [metric.collect() for _name, metric in metrics]
+
+    def render(self) -> str:
+        """Return the registry in Prometheus text format."""
+        return render(self.collect())
+
+
+def merge_families(
+    leader: Iterable[MetricFamily],
+    local: Iterable[MetricFamily],
+    per_worker_prefixes: tuple[str, ...] = PER_WORKER_PREFIXES,
+) -> list[MetricFamily]:
+    """Combine a leader's families with a follower worker's own.
+
+    Args:
+        leader: Families from the control-plane snapshot.
+        local: This worker's families.
+        per_worker_prefixes: Name prefixes taken from *local*; every
+            other family is taken from *leader*.
+
+    Returns:
+        The merged families, ordered by name.
+    """
+    merged = {f.name: f for f in leader if not f.name.startswith(per_worker_prefixes)}
+    merged.update(
+        (f.name, f) for f in local if f.name.startswith(per_worker_prefixes)
+    )
+    return [merged[name] for name in sorted(merged)]
+
+
+@contextmanager
+def observe_cycle_stages() -> Iterator[dict[str, float]]:
+    """Yield a stage-timings dict and record it in ``CYCLE_STAGE_SECONDS`` on exit.
+
+    ``run_cycle`` uses the dict as ``CycleContext.timings``, so early exits
+    are recorded too.
+    """
+    timings: dict[str, float] = {}
+    try:
+        yield timings
+    finally:
+        for stage, secs in timings.items():
+            CYCLE_STAGE_SECONDS.labels(stage).observe(secs)
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value or bucket bound the way Prometheus expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def render(families: Iterable[MetricFamily]) -> str:
+    """Return *families* in the Prometheus text exposition format."""
+    lines: list[str] = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {_escape(family.help)}")
+        lines.append(f"# TYPE {family.name} {family.kind}")
+        for suffix, labels, value in family.samples:
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+            name = family.name + suffix
+            if label_text:
+                name = f"{name}{{{label_text}}}"
+            lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+REGISTRY = Registry()
+
+# Load cycle.
+CYCLE_STAGE_SECONDS = Histogram(
+    "solara_cycle_stage_seconds",
+    "Wall time per run_cycle stage and async sub-stage.",
+    ("stage",),
+)
+
+# Emporia and the energy cache.
+EMPORIA_FETCH_SECONDS = Histogram(
+    "solara_emporia_fetch_seconds",
+    "get_chart_usage latency per channel.",
+    ("channel",),
+    buckets=NETWORK_BUCKETS,
+)
+EMPORIA_FETCH_TIMEOUTS = Counter(
+    "solara_emporia_fetch_timeouts",
+    "Energy cache fetches abandoned after the fetch timeout.",
+)
+EMPORIA_DRIFT_REJECTIONS = Counter(
+    "solara_emporia_drift_rejections",
+    "get_chart_usage windows rejected for a drifted data_start.",
+    ("channel",),
+)
+CACHE_FETCH_SECONDS = Histogram(
+    "solara_cache_fetch_seconds",
+    "Energy cache refresh latency (the whole create_metrics call).",
+    ("result",),
+    buckets=NETWORK_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "solara_cache_requests",
+    "EnergyCache.get_or_fetch calls by caller and how they were served.",
+    ("caller", "result"),
+)
+CACHE_SAMPLES_FETCHED = Counter(
+    "solara_cache_samples_fetched",
+    "Per-second samples received from fetches.",
+)
+CACHE_SAMPLES_NEW = Counter(
+    "solara_cache_samples_new",
+    "Fetched samples past the previous newest sample.",
+)
+
+# Server-sent events.
+SSE_SUBSCRIBERS = Gauge(
+    "solara_sse_subscribers",
+    "Connected SSE clients.",
+    ("server",),
+)
+SSE_EVICTIONS = Counter(
+    "solara_sse_evictions",
+    "Queued SSE frames replaced by a newer frame of the same type.",
+)
+SSE_BYTES_SENT = Counter(
+    "solara_sse_bytes_sent",
+    "Bytes written to SSE clients.",
+    ("server",),
+)
+
+# Commands and notifications.
+TESLA_COMMAND_SECONDS = Histogram(
+    "solara_tesla_command_seconds",
+    "Tesla charging command latency.",
+    ("command", "result"),
+    buckets=NETWORK_BUCKETS,
+)
+PLUG_COMMAND_SECONDS = Histogram(
+    "solara_plug_command_seconds",
+    "Smart plug on/off command latency.",
+    ("command", "result"),
+    buckets=NETWORK_BUCKETS,
+)
+TELEGRAM_SEND_SECONDS = Histogram(
+    "solara_telegram_send_seconds",
+    "Telegram sendMessage latency, retries included.",
+    ("mode", "result"),
+    buckets=NETWORK_BUCKETS,
+)
@@ -102,6 +102,8 @@ class PlugController(AbstractPlugController):
     All methods are no-ops that return success with in-memory state tracking.
     """
 
+    max_concurrency = 8
+
     def __init__(self, plugs: dict[str, PlugConfig]) -> None:
         self.plugs = plugs
         self._state: dict[str, bool] = {name: False for name in plugs}
@@ -225,6 +227,14 @@ def load_tesla_tokens(tokens_path: Path = TESLA_TOKENS_FILE) -> dict[str, Any] |
         return None
 
 
+def _tokens_mtime_ns(tokens_path: Path = TESLA_TOKENS_FILE) -> int | None:
+    """Return the token file's modification time, or None if it is absent."""
+    try:
+        return tokens_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
 def save_tesla_tokens(
     refresh_token: str,
     access_token: str,
@@ -302,6 +312,7 @@ class RealTeslaController(AbstractTeslaController):
         """
         self._session: aiohttp.ClientSession | None = None
         self._api: Any | None = None  # TeslaFleetOAuth instance
+        self._tokens_mtime_ns: int | None = None
         self.last_error: str | None = None
 
     async def _get_session(self, ssl: bool = True) -> aiohttp.ClientSession:
@@ -313,10 +324,10 @@ class RealTeslaController(AbstractTeslaController):
                 certificate.
 
         NOTE: A cached ClientSession binds to the event loop active at creation
-        time.  When ``asyncio.run()`` creates a fresh loop and closes it, the
-        cached session becomes unusable even though ``session.closed`` is still
-        ``False``.  This is why ``reset_session()`` must be called before each
-        ``asyncio.run()`` invocation.
+        time.  ``LoadManager`` runs every cycle on one persistent loop, so the
+        session and its keep-alive connections are reused across cycles.
+        Callers that instead use ``asyncio.run()`` (which creates a fresh loop
+        and closes it) must call ``reset_session()`` before each invocation.
         """
         if self._session is None or self._session.closed:
             connector = aiohttp.TCPConnector(ssl=ssl)
@@ -326,17 +337,27 @@ class RealTeslaController(AbstractTeslaController):
     async def _ensure_api(self) -> None:
         """Initialize the TeslaFleetOAuth API client if needed.
 
-        Reloads persisted tokens from disk on each call so that tokens written
-        by an external OAuth callback are picked up without restarting gunicorn.
+        Reloads persisted tokens from disk whenever the token file has changed
+        so that tokens written by an external OAuth callback are picked up
+        without restarting gunicorn.
         """
         from tesla_fleet_api import TeslaFleetOAuth
 
         session = await self._get_session(
             ssl=not bool(self.config.vehicle_command_proxy_url),
         )
+        mtime_ns = _tokens_mtime_ns()
+        if (
+            self._api is not None
+            and self._api.session is session
+            and mtime_ns is not None
+            and mtime_ns == self._tokens_mtime_ns
+        ):
+            return
         region = cast(Literal["na", "eu", "cn"], self._cfg.tesla_region)
 
         tokens = load_tesla_tokens()
+        self._tokens_mtime_ns = mtime_ns
         if tokens is not None:
             logger.info("Loaded persisted Tesla OAuth tokens")
 
@@ -349,7 +370,12 @@ class RealTeslaController(AbstractTeslaController):
                 redirect_uri=self.config.redirect_uri,
             )
             self._apply_persisted_tokens(tokens)
-            if not self.config.private_key_path:
+            if self._proxy_signs_commands():
+                logger.info(
+                    "TESLA_PRIVATE_KEY_PATH not set; vehicle commands are sent "
+                    "unsigned for the vehicle-command proxy to sign"
+                )
+            elif not self.config.private_key_path:
                 logger.warning(
                     "TESLA_PRIVATE_KEY_PATH not set; vehicle commands (set_amps, "
                     "start/stop charging) will be unavailable"
@@ -500,6 +526,15 @@ class RealTeslaController(AbstractTeslaController):
                 raise
             logger.error("Failed to save Tesla tokens after refresh: %s", e)
 
+    def _proxy_signs_commands(self) -> bool:
+        """Return True when commands go unsigned to a vehicle-command proxy.
+
+        tesla-http-proxy signs plain REST commands with its own key, so a
+        proxy URL without a local private key is a complete setup (and is
+        how fake_services.py's Fleet stand-in is reached).
+        """
+        return bool(self.config.vehicle_command_proxy_url) and not self.config.private_key_path
+
     async def _get_vehicle(self):
         """Get the vehicle instance for our VIN."""
         await self._ensure_api()
@@ -534,7 +569,7 @@ class RealTeslaController(AbstractTeslaController):
                 "Cannot stop Tesla charging: API unavailable. "
             )
             return False
-        if not self._api.has_private_key:
+        if not self._api.has_private_key and not self._proxy_signs_commands():
             logger.error(
                 "Cannot stop Tesla charging: private key not loaded. "
                 "Set TESLA_PRIVATE_KEY_PATH to a valid key file."
@@ -570,7 +605,7 @@ class RealTeslaController(AbstractTeslaController):
                 "Cannot set Tesla charge amps: API unavailable. "
             )
             return False
-        if not self._api.has_private_key:
+        if not self._api.has_private_key and not self._proxy_signs_commands():
             logger.error(
                 "Cannot set Tesla charge amps: private key not loaded. "
                 "Set TESLA_PRIVATE_KEY_PATH to a valid key file."
@@ -606,9 +641,10 @@ class RealTeslaController(AbstractTeslaController):
     async def init_tesla_state(self, timeout: int = 60) -> TeslaState | None:
         """Initialize Tesla state from telemetry or REST API fallback.
 
-        Waits up to ``timeout`` seconds for MQTT telemetry to arrive.
-        If telemetry provides the required fields (DetailedChargeState),
-        converts the snapshot to a TeslaState and returns it immediately.
+        Waits up to ``timeout`` seconds for MQTT telemetry to arrive
+        (``mqtt_telemetry.wait_for_tesla_state``).  As soon as telemetry
+        provides the required fields (DetailedChargeState or ChargeAmps),
+        converts the snapshot to a TeslaState and returns it.
 
         If telemetry times out, falls back to the REST API:
         1. Use ChargeAmps from telemetry (if available) to determine
@@ -646,25 +682,19 @@ class RealTeslaController(AbstractTeslaController):
                 )
                 return None
 
-        # Phase 1: Wait for telemetry
-        from mqtt_telemetry import get_telemetry_snapshot, has_telemetry, tesla_state_from_snapshot
-
-        waited = 0
-        while waited < timeout:
-            if has_telemetry():
-                snapshot = get_telemetry_snapshot()
-
-                state = tesla_state_from_snapshot(snapshot)
-                if state is not None:
-                    self._init_state = state
-                    self._backoff_secs = 0.0
-                    logger.info(
-                        "init_tesla_state: telemetry arrived after %.1fs — is_charging=%s",
-                        waited, state.is_charging,
-                    )
-                    return state
-            await asyncio.sleep(1)
-            waited += 1
+        # Phase 1: Wait for telemetry (woken by MQTT arrivals, not polled)
+        from mqtt_telemetry import get_telemetry_snapshot, has_telemetry, wait_for_tesla_state
+
+        started = _time.monotonic()
+        state = await wait_for_tesla_state(timeout)
+        if state is not None:
+            self._init_state = state
+            self._backoff_secs = 0.0
+            logger.info(
+                "init_tesla_state: telemetry arrived after %.1fs — is_charging=%s",
+                _time.monotonic() - started, state.is_charging,
+            )
+            return state
 
         # Phase 2: Telemetry timed out — fall back to REST API
         # Pass the partial snapshot so _init_from_rest can use ChargeAmps
@@ -917,6 +947,9 @@ class RealPlugController(AbstractPlugController):
     then uses (aid, iid) tuples for get/put operations.
     """
 
+    # One pairing, one HAP connection: requests are serialized.
+    max_concurrency = 1
+
     def __init__(
         self,
         plugs: dict[str, PlugConfig],
@@ -1145,6 +1178,9 @@ class VocolincPlugController(AbstractPlugController):
     wrapping to keep synchronous boto3 calls from blocking the event loop.
     """
 
+    # Independent HTTPS calls on worker threads.
+    max_concurrency = 4
+
     def __init__(
         self,
         plugs: dict[str, PlugConfig],
@@ -1296,6 +1332,19 @@ class CompositePlugController(AbstractPlugController):
             len(vc_plugs),
         )
 
+    def backend_for(self, name: str) -> AbstractPlugController:
+        """Return the HomeKit or VOCOlinc backend serving plug *name*."""
+        plug = self.plugs.get(name)
+        if plug is not None and plug.controller_type == "vocolinc":
+            return self._vocolinc_ctrl.backend_for(name)
+        return self._homekit_ctrl.backend_for(name)
+
+    async def disconnect(self) -> None:
+        """Disconnect the HomeKit backend, if it holds a connection."""
+        disconnect = getattr(self._homekit_ctrl, "disconnect", None)
+        if disconnect is not None:
+            await disconnect()
+
     async def get_state(self, name: str) -> bool | None:
         """Query plug state from the appropriate backend.
 
@@ -10,13 +10,15 @@ from __future__ import annotations
 import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timedelta, time, timezone
+import functools
 import logging
 import sys
 import threading
 import time as _time_mod
+import weakref
 
 # Third-party imports.
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable
 
 import pytz
 
@@ -31,6 +33,7 @@ from constants import (
     DEFAULT_SLEEP_HINT_SECS,
     MIN_QUANTIZATION_WINDOW_SECS,
     MIN_SAMPLES_FOR_PREDICTION,
+    PLUG_CALL_TIMEOUT_SECS,
     QUANTIZATION_CONFIDENCE_THRESHOLD,
     STALE_DATA_THRESHOLD_SECS,
     TESLA_CHARGE_AMPS_MAX_DEFAULT,
@@ -40,6 +43,14 @@ from constants import (
 from config_loader import (
     _parse_load_manage_enabled,
 )
+from event_loop import EventLoopThread
+from instrumentation import (
+    PLUG_COMMAND_SECONDS,
+    TESLA_COMMAND_SECONDS,
+    observe_cycle_stages,
+    outcome,
+)
+from tracing import current_trace_id, span, start_trace, traced
 
 from config_loader import (
     load_plugs_from_file,
@@ -205,6 +216,11 @@ class LoadManager:
 
         self._lock = threading.Lock()
         self._config_watcher = ConfigWatcher()
+        # One event loop for the life of the manager: controller sessions,
+        # the Telegram client and HomeKit pairings are bound to it and keep
+        # their connections alive across cycles.
+        self._loop_thread = EventLoopThread(name="load-manager-loop")
+        weakref.finalize(self, self._loop_thread.close)
         self.plug_ctrl: AbstractPlugController
         self.tesla_ctrl: AbstractTeslaController | None
         self.plugs: dict[str, PlugConfig]
@@ -268,6 +284,13 @@ class LoadManager:
         # Set to True when a Tesla command fails with VehicleOffline this cycle.
         # Used to select a shorter sleep hint so the next cycle retries quickly.
         self._vehicle_offline_this_cycle: bool = False
+        # Sub-stage timings from the async phase, merged into ctx.timings.
+        # "*_calls" entries sum the per-call time of a concurrent fan-out, so
+        # comparing them with the wall-clock entry shows the parallelism.
+        self._async_timings: dict[str, float] = {}
+        # ctx.timings of the most recent run_cycle(), early exits included;
+        # read by the replay driver (replay.py).
+        self.last_cycle_timings: dict[str, float] = {}
 
         logger.debug("LoadManager %s", plug_ctrl)
         if plug_ctrl is not None:
@@ -280,12 +303,7 @@ class LoadManager:
 
             # Auto-detect: if both types exist, use composite controller
             if has_homekit_plugs and has_vocolinc_plugs:
-                controller_type = self._cfg.load_plug_controller
-                hk_ctrl = (
-                    RealPlugController(plugs_from_file)
-                    if controller_type == "real"
-                    else PlugController(plugs_from_file)
-                )
+                hk_ctrl = self._homekit_controller(plugs_from_file)
                 vc_creds = load_vocolinc_credentials(config=self._cfg)
                 vc_ctrl = VocolincPlugController(
                     vocolinc_plugs,
@@ -303,11 +321,7 @@ class LoadManager:
                     config=self._cfg,
                 )
             else:
-                controller_type = self._cfg.load_plug_controller
-                if controller_type == "real":
-                    self.plug_ctrl = RealPlugController(plugs_from_file)
-                else:
-                    self.plug_ctrl = PlugController(plugs_from_file)
+                self.plug_ctrl = self._homekit_controller(plugs_from_file)
 
         self.plugs = self.plug_ctrl.plugs  # type: ignore[attr-defined]
 
@@ -357,6 +371,19 @@ class LoadManager:
             metrics_fetch=metrics_fetch,
         )
 
+    def _homekit_controller(self, plugs: dict[str, PlugConfig]) -> AbstractPlugController:
+        """Build the HomeKit backend selected by LOAD_PLUG_CONTROLLER.
+
+        With ``HOMEKIT_STUB_URL`` set, "real" talks to the local stand-in
+        from fake_services.py instead of paired accessories.
+        """
+        if self._cfg.load_plug_controller != "real":
+            return PlugController(plugs)
+        if self._cfg.homekit_stub_url:
+            from fake_services import HomeKitStubPlugController
+            return HomeKitStubPlugController(plugs, self._cfg.homekit_stub_url)
+        return RealPlugController(plugs)
+
     @staticmethod
     def _resolve_enabled(cfg: Config | None = None) -> bool | tuple[time, time]:
         """Resolve LOAD_MANAGE_ENABLED from config.
@@ -479,6 +506,7 @@ class LoadManager:
         current_time = now_local.time()
         return start_time <= current_time < end_time
 
+    @traced("enabled_check")
     def _stage_enabled_check(
         self, ctx: CycleContext
     ) -> CycleResult | None:
@@ -507,6 +535,7 @@ class LoadManager:
             sleep_hint_at=ctx.now.isoformat(),
         )
 
+    @traced("nbc_fetch")
     def _stage_nbc_fetch(
         self, ctx: CycleContext
     ) -> CycleResult | None:
@@ -570,6 +599,7 @@ class LoadManager:
         ctx.now_postfetch = ctx.now + timedelta(seconds=fetch_end - fetch_start)
         return None
 
+    @traced("compute_gap")
     def _stage_compute_gap(self, ctx: CycleContext) -> None:
         """Stage 4: Accept fresh data and compute the Wh gap.
 
@@ -598,6 +628,7 @@ class LoadManager:
         ctx.adjusted_wh = adjusted_wh
         ctx.gap_wh = gap_wh
 
+    @traced("commit")
     def _stage_commit(self, ctx: CycleContext) -> CycleResult | None:
         """Stage 6: Sentinel check, commit effects, Tesla tracking, hysteresis.
 
@@ -712,6 +743,7 @@ class LoadManager:
 
         return None
 
+    @traced("build_result")
     def _stage_build_result(self, ctx: CycleContext) -> CycleResult:
         """Stage 7 (final): Build candidate details and construct the result.
 
@@ -784,11 +816,17 @@ class LoadManager:
             ),
         )
 
+    def _run_async(self, coro: Any) -> Any:
+        """Run *coro* on the manager's persistent event loop and wait for it."""
+        return self._loop_thread.run(coro)
+
+    @traced("async_phase")
     def _stage_async_phase(self, ctx: CycleContext) -> None:
         """Stage 5: Run the async portion of the cycle.
 
-        Resets the Tesla controller session, then runs _cycle_async_phase
-        via asyncio.run(). Unpacks the 8-tuple result into ctx fields,
+        Runs _cycle_async_phase on the persistent event loop, so controller
+        sessions survive from one cycle to the next. Unpacks the 8-tuple
+        result into ctx fields,
         overwriting ctx.gap_wh and ctx.adjusted_wh with corrected values
         from the async phase. Always returns None.
         """
@@ -803,11 +841,6 @@ class LoadManager:
         assert now_postfetch is not None
         assert seconds_remaining is not None
 
-        if self.tesla_ctrl is not None:
-            self.tesla_ctrl.reset_session()
-
-        if self.telegram_sender is not None:
-            self.telegram_sender.reset_session()
         (
             ctx.tesla_state,
             ctx.tesla_error,
@@ -817,13 +850,15 @@ class LoadManager:
             ctx.gap_wh,
             ctx.adjusted_wh,
             ctx.sentinel_on,
-        ) = asyncio.run(
+        ) = self._run_async(
             self._cycle_async_phase(
                 gap_wh, adjusted_wh, now_postfetch, seconds_remaining,
                 self.dry_run, qh_name, data_point_at=data_point_at,
             )
         )
+        ctx.timings.update(self._async_timings)
 
+    @traced("pending_check")
     def _stage_pending_check(
         self, ctx: CycleContext
     ) -> CycleResult | None:
@@ -1215,6 +1250,7 @@ class LoadManager:
             return float(diagnostics.seconds_remaining or 0)
         return 0.0
 
+    @traced("tesla_fetch")
     async def _fetch_tesla_state_async(
         self,
     ) -> tuple[TeslaState | None, str | None, str | None]:
@@ -1305,6 +1341,53 @@ class LoadManager:
             return telemetry_state, None, None
         return None, None, None
 
+    def _plug_semaphores(self, names: list[str]) -> dict[str, asyncio.Semaphore]:
+        """Map each plug name to a semaphore shared by its backend controller.
+
+        A fresh set is built per fan-out so each controller's
+        ``max_concurrency`` bounds the calls in flight against it.
+        """
+        by_backend: dict[int, asyncio.Semaphore] = {}
+        semaphores: dict[str, asyncio.Semaphore] = {}
+        for name in names:
+            backend: Any = self.plug_ctrl
+            if isinstance(self.plug_ctrl, AbstractPlugController):
+                backend = self.plug_ctrl.backend_for(name)
+            sem = by_backend.get(id(backend))
+            if sem is None:
+                limit = getattr(backend, "max_concurrency", 1)
+                if not isinstance(limit, int) or limit < 1:
+                    limit = 1
+                sem = by_backend[id(backend)] = asyncio.Semaphore(limit)
+            semaphores[name] = sem
+        return semaphores
+
+    async def _bounded_call(
+        self,
+        sem: asyncio.Semaphore,
+        call: Callable[[], Awaitable[Any]],
+        timeout: float | None,
+        timing_key: str,
+        **span_attrs: Any,
+    ) -> Any:
+        """Await ``call()`` under *sem* with an optional timeout.
+
+        The time spent inside the semaphore is added to
+        ``_async_timings[timing_key]`` and traced as a *timing_key* span
+        carrying *span_attrs*.
+        """
+        async with sem:
+            started = _time_mod.perf_counter()
+            try:
+                with span(timing_key, **span_attrs):
+                    return await asyncio.wait_for(call(), timeout)
+            finally:
+                self._async_timings[timing_key] = (
+                    self._async_timings.get(timing_key, 0.0)
+                    + _time_mod.perf_counter() - started
+                )
+
+    @traced("plug_sync")
     async def _sync_plug_states(self) -> None:
         """Query actual plug states from controllers and reconcile with tracking.
 
@@ -1312,13 +1395,39 @@ class LoadManager:
         the controller's reported state against our internal desired_state. When they
         diverge, updates both actual_state and desired_state to match reality so the
         GapMinder makes decisions based on current conditions.
+
+        All plugs are queried concurrently, bounded per controller and by
+        ``PLUG_CALL_TIMEOUT_SECS`` per call, so a dead plug cannot stall the
+        rest.
         """
-        for name in self.plugs:
-            try:
-                actual = await self.plug_ctrl.get_state(name)
-            except Exception as e:
+        names = list(self.plugs)
+        semaphores = self._plug_semaphores(names)
+        started = _time_mod.perf_counter()
+        outcomes = await asyncio.gather(
+            *(
+                self._bounded_call(
+                    semaphores[name],
+                    functools.partial(self.plug_ctrl.get_state, name),
+                    PLUG_CALL_TIMEOUT_SECS,
+                    "plug_sync_calls",
+                    device=name,
+                )
+                for name in names
+            ),
+            return_exceptions=True,
+        )
+        self._async_timings["plug_sync"] = _time_mod.perf_counter() - started
+
+        for name, actual in zip(names, outcomes):
+            if isinstance(actual, TimeoutError):
+                logger.warning(
+                    "Timed out syncing state for plug %s after %.1fs",
+                    name, PLUG_CALL_TIMEOUT_SECS,
+                )
+                continue
+            if isinstance(actual, BaseException):
                 logger.warning(
-                    "Failed to sync state for plug %s: %s", name, e
+                    "Failed to sync state for plug %s: %s", name, actual
                 )
                 continue
 
@@ -1705,11 +1814,11 @@ class LoadManager:
         float,
         bool,
     ]:
-        """Run the async portion of a cycle in a single event loop.
+        """Run the async portion of a cycle as a single coroutine.
 
         Syncs plug states from controllers, fetches Tesla state, calls decide()
-        with that state, then executes all resulting actions. Consolidating into
-        one coroutine means one event loop per cycle instead of one per action.
+        with that state, then executes all resulting actions. Sessions are
+        left open for the next cycle; close() releases them.
 
         Tesla amp-change effects have no power_watts so they're excluded from
         estimated_current_wh(). After fetching the vehicle state we recompute
@@ -1723,13 +1832,10 @@ class LoadManager:
             The final bool is True when any sentinel device was detected on
             during sync, allowing the caller to disable the cycle.
         """
-        try:
-            return await self._cycle_async_phase_body(
-                gap_wh, adjusted_wh, now, seconds_remaining,
-                dry_run, qh_name=qh_name, data_point_at=data_point_at,
-            )
-        finally:
-            await self._cleanup_sessions()
+        return await self._cycle_async_phase_body(
+            gap_wh, adjusted_wh, now, seconds_remaining,
+            dry_run, qh_name=qh_name, data_point_at=data_point_at,
+        )
 
     async def _cycle_async_phase_body(
         self,
@@ -1751,8 +1857,9 @@ class LoadManager:
         float,
         bool,
     ]:
-        """Body of _cycle_async_phase, extracted for try/finally cleanup."""
+        """Body of _cycle_async_phase."""
         self._vehicle_offline_this_cycle = False
+        self._async_timings = {}
         # Sync actual plug states before making decisions so the engine sees
         # external changes (user toggles, other automations, etc.)
         await self._sync_plug_states()
@@ -1918,41 +2025,39 @@ class LoadManager:
         ):
             eligible_tesla = None
 
-        actions = self.engine.decide(
-            ctx=DecideContext(
-                now=now,
-                seconds_remaining=seconds_remaining,
-                state=self.state,
-                plugs=eligible_plugs,
-                tesla=eligible_tesla,
-                dry_run=dry_run,
-                data_point_at=data_point_at,
-                requires_home_check=(
-                    self.tesla_config is not None
-                    and self.tesla_config.home_lat is not None
-                    and self.tesla_config.home_lon is not None
+        with span("decide"):
+            actions = self.engine.decide(
+                ctx=DecideContext(
+                    now=now,
+                    seconds_remaining=seconds_remaining,
+                    state=self.state,
+                    plugs=eligible_plugs,
+                    tesla=eligible_tesla,
+                    dry_run=dry_run,
+                    data_point_at=data_point_at,
+                    requires_home_check=(
+                        self.tesla_config is not None
+                        and self.tesla_config.home_lat is not None
+                        and self.tesla_config.home_lon is not None
+                    ),
                 ),
-            ),
-            predicted_wh=corrected_adjusted_wh,
-            target_wh=self.target_wh,
-        )
+                predicted_wh=corrected_adjusted_wh,
+                target_wh=self.target_wh,
+            )
 
         succeeded_effects: list[PendingEffect] = []
         results: list[PendingEffect] = []
-        for action in actions:
-            # Suppress Tesla turn_on when active telemetry confirms charging.
-            # The callback updates telemetry with a ~10 s delay; if the car is
-            # confirmed charging, dispatching a turn_on action is wasteful and
-            # defeats the purpose of the telemetry feedback loop.
-            if dry_run:
+        if dry_run:
+            for action in actions:
                 logger.info(
                     "[DRY-RUN] Would execute: %s on %s",
                     action.action,
                     action.device_name,
                 )
                 results.append(action)
-            else:
-                success = await self._execute_action(action)
+        else:
+            outcomes = await self._dispatch_actions(actions)
+            for action, success in zip(actions, outcomes):
                 if success:
                     succeeded_effects.append(action)
                     results.append(action)
@@ -1979,29 +2084,6 @@ class LoadManager:
 
         return tesla_state, tesla_error, tesla_login_url, succeeded_effects, results, corrected_gap_wh, corrected_adjusted_wh, False
 
-    async def _cleanup_sessions(self) -> None:
-        """Close aiohttp sessions held by controllers.
-
-        Must be called while the event loop is still alive (inside asyncio.run)
-        so that session.close() can be awaited.  Discards the session reference
-        afterward so reset_session() is a no-op on the next cycle.
-        """
-        if self.tesla_ctrl is not None:
-            try:
-                await self.tesla_ctrl.close()
-            except Exception:  # pylint: disable=broad-exception-caught
-                pass
-        if self.telegram_sender is not None:
-            client = getattr(self.telegram_sender, "_telegram_client", None)
-            if client is not None:
-                session = getattr(client, "_session", None)
-                if session is not None:
-                    try:
-                        await session.close()
-                    except Exception:  # pylint: disable=broad-exception-caught
-                        pass
-                    client._session = None
-
     @staticmethod
     def _plug_states_from_candidates(
         candidate_details: list[CandidateDetail],
@@ -2140,10 +2222,11 @@ class LoadManager:
         Returns:
             CycleResult with status, diagnostics, and sleep_hint.
         """
-        with self._lock:
+        with self._lock, observe_cycle_stages() as timings, start_trace("run_cycle"):
             self._check_config_changes()
 
-            ctx = CycleContext(now=self._clock.now(), force=force)
+            ctx = CycleContext(now=self._clock.now(), force=force, timings=timings)
+            self.last_cycle_timings = ctx.timings
             # DEBUG: fires every ~30 s even when a cycle_early_exit /
             # cycle_complete event immediately follows; the boundary events
             # carry the signal, so the start marker stays at DEBUG.
@@ -2227,25 +2310,86 @@ class LoadManager:
                                "reason": reason, "actions_count": len(result.actions),
                                "sleep_hint": result.sleep_hint, "timings": ctx.timings,
                                "gap_wh": ctx.gap_wh, "adjusted_wh": ctx.adjusted_wh,
-                               "predicted_wh": ctx.predicted_wh, "qh_name": ctx.qh_name})
+                               "predicted_wh": ctx.predicted_wh, "qh_name": ctx.qh_name,
+                               "trace_id": current_trace_id()})
             return result
 
+    @traced("dispatch")
+    async def _dispatch_actions(self, actions: list[PendingEffect]) -> list[bool]:
+        """Execute *actions* concurrently and return per-action success.
+
+        Actions on the same device run in decision order; different devices
+        run concurrently, bounded per plug controller.  Plug actions are
+        capped at ``PLUG_CALL_TIMEOUT_SECS``; a timeout counts as failure.
+
+        Returns:
+            Success flags in the same order as *actions*.
+        """
+        by_device: dict[str, list[int]] = {}
+        for index, action in enumerate(actions):
+            by_device.setdefault(action.device_name, []).append(index)
+        plug_names = [name for name in by_device if name != "tesla"]
+        semaphores = self._plug_semaphores(plug_names)
+        tesla_sem = asyncio.Semaphore(1)
+        outcomes: list[bool] = [False] * len(actions)
+
+        async def _run_device(device_name: str, indices: list[int]) -> None:
+            is_tesla = device_name == "tesla"
+            sem = tesla_sem if is_tesla else semaphores[device_name]
+            timeout = None if is_tesla else PLUG_CALL_TIMEOUT_SECS
+            for index in indices:
+                action = actions[index]
+                try:
+                    outcomes[index] = await self._bounded_call(
+                        sem,
+                        functools.partial(self._execute_action, action),
+                        timeout,
+                        "dispatch_calls",
+                        device=device_name,
+                        action=action.action,
+                    )
+                except TimeoutError:
+                    logger.error(
+                        "Timed out executing action %s after %.1fs",
+                        action, PLUG_CALL_TIMEOUT_SECS,
+                    )
+
+        started = _time_mod.perf_counter()
+        await asyncio.gather(
+            *(_run_device(name, indices) for name, indices in by_device.items())
+        )
+        self._async_timings["dispatch"] = _time_mod.perf_counter() - started
+        return outcomes
+
     async def _execute_action(self, action: PendingEffect) -> bool:
         """Execute a single pending action against the appropriate controller.
 
         Args:
             action: The action to execute.
 
+        The call's latency is recorded in ``solara_tesla_command_seconds``
+        or ``solara_plug_command_seconds``.
+
         Returns:
             True on success, False on failure.
         """
+        is_tesla = action.device_name == "tesla"
+        started = _time_mod.perf_counter()
+        ok = False
         try:
-            if action.device_name == "tesla":
-                return await self._execute_tesla_action(action)
-            return await self._execute_plug_action(action)
+            if is_tesla:
+                ok = await self._execute_tesla_action(action)
+            else:
+                ok = await self._execute_plug_action(action)
+            return ok
         except Exception as e:
             logger.error("Failed to execute action %s: %s", action, e)
             return False
+        finally:
+            histogram = TESLA_COMMAND_SECONDS if is_tesla else PLUG_COMMAND_SECONDS
+            histogram.labels(action.action, outcome(ok)).observe(
+                _time_mod.perf_counter() - started
+            )
 
     async def _execute_plug_action(self, action: PendingEffect) -> bool:
         """Execute a plug on/off action."""
@@ -2330,22 +2474,33 @@ class LoadManager:
     def close(self) -> None:
         """Close the LoadManager and release resources.
 
-        Calls close on the Tesla controller to clean up any open aiohttp
-        sessions. Also closes the TelegramSender if one is configured.
+        Closes the Tesla controller and TelegramSender sessions on the
+        event loop they were created on, then stops that loop.
         Safe to call multiple times.
         """
         if self.tesla_ctrl is not None:
             try:
-                asyncio.run(self.tesla_ctrl.close())
+                self._run_async(self.tesla_ctrl.close())
             except Exception as e:
                 logger.warning("Failed to close Tesla controller: %s", e)
 
         if self.telegram_sender is not None:
             try:
-                asyncio.run(self.telegram_sender.close())
+                self._run_async(self.telegram_sender.close())
             except Exception as e:
                 logger.warning("Failed to close TelegramSender: %s", e)
 
+        # HomeKit pairings hold a connection on the loop; other plug
+        # controllers have nothing to release.
+        disconnect = getattr(self.plug_ctrl, "disconnect", None)
+        if disconnect is not None:
+            try:
+                self._run_async(disconnect())
+            except Exception as e:
+                logger.warning("Failed to disconnect plug controller: %s", e)
+
+        self._loop_thread.close()
+
     def provision_fleet_telemetry(
         self, config: FleetTelemetryProvisionConfig
     ) -> bool:
@@ -2395,7 +2550,7 @@ class LoadManager:
             return False
 
         try:
-            asyncio.run(fleet_telemetry_config_create(self.tesla_ctrl, config))
+            self._run_async(fleet_telemetry_config_create(self.tesla_ctrl, config))
             logger.info("provision_fleet_telemetry: Provisioning succeeded.")
             from mqtt_telemetry import _FLEET_TELEMETRY_DOTFILE
             _FLEET_TELEMETRY_DOTFILE.write_text(
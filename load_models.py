@@ -15,6 +15,7 @@ from datetime import datetime, time
 from pathlib import Path
 from typing import Any, Literal
 
+from util import camelize
 from constants import (
     TESLA_CHARGE_AMPS_MAX_DEFAULT,
     TESLA_CHARGE_AMPS_MIN_DEFAULT,
@@ -38,6 +39,18 @@ class AbstractPlugController(ABC):
 
     plugs: "dict[str, PlugConfig]"
 
+    max_concurrency: int = 1
+    """Maximum calls LoadManager keeps in flight against this controller."""
+
+    def backend_for(self, name: str) -> "AbstractPlugController":
+        """Return the controller that serves plug *name*.
+
+        Used to apply each backend's ``max_concurrency`` separately.
+        Delegating controllers override this; others serve all plugs.
+        """
+        del name
+        return self
+
     @abstractmethod
     async def get_state(self, name: str) -> bool | None:
         """Query plug on/off state.
@@ -500,6 +513,45 @@ class CycleDiagnostics:
             "settle_window_secs": self.settle_window_secs,
         }
 
+    def to_camel_dict(self) -> dict[str, Any]:
+        """Serialize like ``camelize(self.to_dict())``, with literal keys.
+
+        Returns:
+            The ``to_dict()`` payload with camelCase keys; only the
+            free-form Tesla dicts go through ``camelize``.
+        """
+        return {
+            "gapWh": self.gap_wh,
+            "hysteresisWh": self.hysteresis_wh,
+            "secondsRemaining": self.seconds_remaining,
+            "dataPointAt": (
+                self.data_point_at.isoformat()
+                if self.data_point_at
+                else None
+            ),
+            "reason": self.reason,
+            "pendingEffectsCount": self.pending_effects_count,
+            "teslaConfigured": self.tesla_configured,
+            "teslaState": camelize(self.tesla_state),
+            "teslaError": self.tesla_error,
+            "teslaLoginUrl": self.tesla_login_url,
+            "plugsConfigured": self.plugs_configured,
+            "candidates": (
+                [c.to_camel_dict() for c in self.candidates]
+                if self.candidates
+                else None
+            ),
+            "sentinelNames": self.sentinel_names,
+            "sentinelOn": self.sentinel_on,
+            "telemetryRegistered": self.telemetry_registered,
+            "activeTeslaTelemetry": camelize(self.active_tesla_telemetry),
+            "teslaCommandOffline": self.tesla_command_offline,
+            "quantizationSeconds": self.quantization_seconds,
+            "quantizationOffset": self.quantization_offset,
+            "quantizationConfidence": self.quantization_confidence,
+            "settleWindowSecs": self.settle_window_secs,
+        }
+
 
 @dataclass(frozen=True)
 class CandidateDetailPlug:
@@ -635,6 +687,25 @@ class CandidateDetail:
             "error": self.error,
         }
 
+    def to_camel_dict(self) -> dict[str, Any]:
+        """Serialize like ``camelize(self.to_dict())``, with literal keys."""
+        return {
+            "deviceType": self.device_type,
+            "name": self.name,
+            "powerWatts": self.power_watts,
+            "capacityWh": self.capacity_wh,
+            "canToggle": self.can_toggle,
+            "desiredState": self.desired_state,
+            "actualState": self.actual_state,
+            "stateAvailable": self.state_available,
+            "isCharging": self.is_charging,
+            "currentAmps": self.current_amps,
+            "pluggedIn": self.plugged_in,
+            "atHome": self.at_home,
+            "reason": self.reason,
+            "error": self.error,
+        }
+
 
 @dataclass(frozen=True)
 class CycleResult:
@@ -715,6 +786,46 @@ class CycleResult:
             ),
         }
 
+    def to_camel_dict(self) -> dict[str, Any]:
+        """Serialize like ``camelize(self.to_dict())``, with literal keys.
+
+        Returns:
+            The ``to_dict()`` payload with camelCase keys at every level,
+            built directly instead of by a recursive key rewrite.
+        """
+        return {
+            "status": self.status,
+            "qh": self.qh,
+            "predictedWh": self.predicted_wh,
+            "adjustedWh": self.adjusted_wh,
+            "targetWh": self.target_wh,
+            "currentWh": self.current_wh,
+            "estimatedWh": self.estimated_wh,
+            "actions": [
+                {
+                    "deviceName": pe.device_name,
+                    "action": pe.action,
+                    "timestamp": pe.timestamp.isoformat(),
+                    "dataPointAt": pe.data_point_at.isoformat(),
+                    "powerWatts": pe.power_watts,
+                    "targetAmps": pe.target_amps,
+                }
+                for pe in self.actions
+            ],
+            "diagnostics": (
+                self.diagnostics.to_camel_dict() if self.diagnostics else None
+            ),
+            "sleepHint": self.sleep_hint,
+            "sleepHintAt": self.sleep_hint_at,
+            "gapWh": self.gap_wh,
+            "pendingEffectsCount": self.pending_effects_count,
+            "candidates": (
+                [c.to_camel_dict() for c in self.candidates]
+                if self.candidates
+                else None
+            ),
+        }
+
 
 # === Pipeline Context (Direction A) ===
 
@@ -749,6 +860,8 @@ class CycleContext:
         actions: All actions decided by this cycle (including dry-run).
         sentinel_on: True when a sentinel device was found on.
         timings: Wall-clock seconds per pipeline stage, populated during run_cycle().
+            Stage 5 adds ``plug_sync``/``dispatch`` sub-stage wall times and
+            ``plug_sync_calls``/``dispatch_calls`` summed per-call times.
     """
 
     # Input
@@ -2,16 +2,20 @@
 Call Emporia VUE API and marshal predicted usage.
 """
 
+import concurrent.futures
 import dataclasses
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import json
 import locale
 import logging
+import sqlite3
 import threading
+import time
 from typing import Any, ClassVar, Optional
 
+import pytz
 import requests
 from pyemvue import PyEmVue
 from pyemvue.enums import Scale, Unit
@@ -20,10 +24,27 @@ from clock import Clock, RealClock
 from constants import (
     DRIFT_REJECTION_ALERT_AFTER,
     QUANTIZATION_CONFIDENCE_THRESHOLD,
+    TAIL_FETCH_OVERLAP_SECS,
+    TOU_FETCH_MAX_ATTEMPTS,
+    TOU_FETCH_MAX_WORKERS,
+    TOU_FETCH_MIN_INTERVAL_SECS,
+    TOU_FETCH_RETRY_BACKOFF_SECS,
 )
+from emporia_session import get_session
 from energy_cache import EnergyCache
-from energy_aggregator import EnergyDataAggregator, TOUBuckets
+from energy_aggregator import DayRollup, EnergyDataAggregator, TOUBuckets
+from history_store import HistoryStore
+from instrumentation import EMPORIA_DRIFT_REJECTIONS, EMPORIA_FETCH_SECONDS
+from tracing import span, traced
+from tou_rollup import (
+    TOURollupCache,
+    complete_days,
+    expected_periods,
+    local_midnight,
+    rollup_chunks,
+)
 from util import (
+    CompletedNBCPeriod,
     CustomJSONProvider,
     NBCQuarterSet,
     RetryableError,
@@ -35,7 +56,7 @@ from util import (
     is_debug,
 )
 
-from config import Config, _config
+from config import Config, _config, get_timezone
 
 
 logger = logging.getLogger(__name__)
@@ -180,6 +201,40 @@ def _chart_start_for(energy_cache: EnergyCache, now: datetime) -> datetime:
     return current_qh_start
 
 
+def _tail_start_for(
+    energy_cache: EnergyCache | None, chart_start: datetime
+) -> datetime | None:
+    """Pick the start of a tail-only fetch, or ``None`` for a full fetch.
+
+    A tail fetch is possible when the cached window already starts at
+    *chart_start* (the window ``_chart_start_for`` would refetch in full)
+    and holds at least ``TAIL_FETCH_OVERLAP_SECS`` samples.  The tail then
+    starts that many samples before the end of the cached window so
+    ``EnergyCache.splice_tail`` can verify alignment on the overlap.
+
+    Args:
+        energy_cache: The EnergyCache instance storing per-second samples.
+        chart_start: QH-aligned start of the full fetch window.
+
+    Returns:
+        The tail fetch start, or ``None`` when a full fetch is required.
+    """
+    if energy_cache is None:
+        return None
+    data = energy_cache.data
+    if (
+        data is None
+        or data.samples is None
+        or data.data_start != chart_start
+        or len(data.samples) < TAIL_FETCH_OVERLAP_SECS
+    ):
+        return None
+    return chart_start + timedelta(
+        seconds=len(data.samples) - TAIL_FETCH_OVERLAP_SECS
+    )
+
+
+@traced("create_metrics")
 def create_metrics(energy_cache: EnergyCache, now: datetime, logger: logging.Logger) -> dict[str, Any] | None:
     """Fetch metrics with QH-window chart_start tracking via EnergyCache.
 
@@ -188,7 +243,9 @@ def create_metrics(energy_cache: EnergyCache, now: datetime, logger: logging.Log
     is floored to the current QH boundary so the full quarter-hour is
     refetched on every cycle regardless of the API's data_start alignment;
     a stale QH-aligned data_start keeps the window anchored so a completed
-    QH is not lost (see ``_chart_start_for``).
+    QH is not lost (see ``_chart_start_for``).  When the cache already holds
+    the head of that window, only the tail after ``last_sample_at`` is
+    requested and appended (see ``_tail_start_for``).
 
     Args:
         energy_cache: instance of EnergyCache.
@@ -208,7 +265,7 @@ def create_metrics(energy_cache: EnergyCache, now: datetime, logger: logging.Log
     try:
         chart_start = cap_chart_start(_chart_start_for(energy_cache, now), now)
         hp = HourlyProjection(now, logger, energy_cache)
-        hp.populate(chart_start)
+        hp.populate(chart_start, append=True)
         logger.debug(
             "create_metrics result: devices=%d, data_start=%s, "
             "per_second_data_total=%d",
@@ -373,7 +430,9 @@ class MetricsBase:
     ``device_info``, ``vue``, and ``vue_auth`` are intentional class-level
     caches shared across instances so that repeated short-lived instantiations
     (e.g., one per request) reuse the same authenticated PyEmVue session
-    without re-logging in on every call.
+    without re-logging in on every call.  The process-wide
+    ``EmporiaSession`` decides when ``vue_init`` actually has to run: once,
+    then only after a 401 or a failed token refresh.
     """
 
     device_info: ClassVar[dict[int, Any]] = {}
@@ -389,8 +448,13 @@ class MetricsBase:
     ) -> None:
         self._cfg = config if config is not None else _config
         self.logger = logger_next or logger
-        self.vue_init()
-        self.get_device_info()
+        session = get_session()
+        with span("emporia_auth"):
+            session.ensure(self.vue, login=self.vue_init)
+        if session.authenticated_at is not None:
+            self.vue_auth["last"] = session.authenticated_at
+        with span("get_device_info"):
+            self.get_device_info()
 
     def vue_init(self) -> None:
         """
@@ -404,6 +468,15 @@ class MetricsBase:
 
         cfg = getattr(self, '_cfg', _config)
 
+        if cfg.vue_simulator_host:
+            # Local stand-in (fake_services.py): no tokens, no Cognito.
+            if not self.vue.login_simulator(
+                cfg.vue_simulator_host, username=cfg.vue_username,
+            ):
+                raise VueAuthenticationError("Vue simulator login failed")
+            self.vue_auth["last"] = _CLOCK.now()
+            return
+
         #self.logger.debug({"keys": self.vue_keys})
         try:
             encoding = locale.getpreferredencoding()
@@ -474,6 +547,7 @@ class MetricsBase:
             if ex.response is not None and ex.response.status_code == 401:
                 self.logger.exception("invalidating auth tokens")
                 self.vue.auth = None
+                get_session().invalidate()
             else:
                 self.logger.exception(ex)
             raise RetryableMetricsException("get_devices failed") from ex
@@ -503,6 +577,9 @@ class HourlyProjection(MetricsBase):
     Maintains backward compatibility with original Metrics class.
     """
 
+    # Tail-only fetch mode for the current populate() call.
+    append: bool = False
+
     def __init__(
         self,
         instant: datetime,
@@ -522,7 +599,9 @@ class HourlyProjection(MetricsBase):
         self.metrics["instant"] = self.instant
         self.energy_cache = energy_cache  # Merged samples for NBC computation
 
-    def populate(self, chart_start: datetime) -> dict[int, DevicePrediction]:
+    def populate(
+        self, chart_start: datetime, append: bool = False
+    ) -> dict[int, DevicePrediction]:
         """Fetch recent data using second granularity to minimize lag.
 
         The caller must compute chart_start. On the first call, use
@@ -530,11 +609,17 @@ class HourlyProjection(MetricsBase):
         of historical data. On subsequent calls, use the current QH
         boundary (floor_to_qh(now)) so the full quarter-hour is refetched.
 
+        With *append*, a cached window that already starts at chart_start
+        is extended by a tail-only fetch instead (see ``_fetch_tail``);
+        the resulting device data still covers the whole window.
+
         Evict older data so that the cache contains at most 3600 samples.
 
         Args:
             chart_start: Start of the fetch window (inclusive). Must be a
                 timezone-aware datetime — never None.
+            append: Request only samples after the cached window's
+                ``last_sample_at`` when possible.
 
         Returns:
             Dict of gid -> prediction results for each device.
@@ -554,6 +639,9 @@ class HourlyProjection(MetricsBase):
             chart_start = capped
 
         self.logger.debug("populate from %s", chart_start)
+        # The cache holds one flat sample window, so a tail can only be
+        # spliced onto it unambiguously when there is a single device.
+        self.append = append and len(self.device_info) == 1
         # Fetch usage data without mutating device_info
         population = self.populate_internal(chart_start, self.energy_cache)
 
@@ -599,23 +687,31 @@ class HourlyProjection(MetricsBase):
 
         return predictions
 
-    def _fetch_channel_data(self, chan, chart_start, instant):
+    def _fetch_channel_data(self, chan, chart_start, instant, tail=False):
         """
         Fetch channel usage data from the VUE API and validate it.
 
         Returns a tuple of (usage_data_local, usage_data_start_local, channel_num).
         Raises RetryableMetricsException if no valid data is returned.
+
+        With *tail* set, *chart_start* is a tail-fetch start rather than a
+        QH boundary: a drifted start is logged at INFO and rejected without
+        drift tracking, since the caller falls back to a full-window fetch.
         """
         scale = Scale.SECOND.value
         fetch_started_at = _CLOCK.now()
-        usage_data_local, usage_data_start_local = self.vue.get_chart_usage(
-            chan,
-            chart_start,
-            instant,
-            scale=scale,
-            unit=Unit.KWH.value,
-        )
+        with span("get_chart_usage", channel=chan.channel_num):
+            usage_data_local, usage_data_start_local = self.vue.get_chart_usage(
+                chan,
+                chart_start,
+                instant,
+                scale=scale,
+                unit=Unit.KWH.value,
+            )
         fetch_elapsed = _CLOCK.now() - fetch_started_at
+        EMPORIA_FETCH_SECONDS.labels(chan.channel_num).observe(
+            fetch_elapsed.total_seconds()
+        )
         if (
             usage_data_start_local is None
             or usage_data_local is None
@@ -624,6 +720,16 @@ class HourlyProjection(MetricsBase):
         ):
             self.logger.debug({"usage_data": usage_data_local})
             raise RetryableMetricsException("No data for hour")
+        if usage_data_start_local != chart_start and tail:
+            self.logger.info(
+                "tail get_chart_usage returned data_start %s != requested "
+                "start %s",
+                usage_data_start_local,
+                chart_start,
+            )
+            raise RetryableMetricsException(
+                f"data_start {usage_data_start_local} != tail start {chart_start}"
+            )
         if usage_data_start_local != chart_start:
             # pyemvue returns the API's ``firstUsageInstant`` as the start,
             # which drifts off the requested (QH-aligned) chart_start when
@@ -637,6 +743,7 @@ class HourlyProjection(MetricsBase):
             # Stale entries for long-past windows are pruned first so the
             # tracker stays bounded: chart_start advances every QH, so a key
             # older than the fetch window can never be fetched again.
+            EMPORIA_DRIFT_REJECTIONS.labels(chan.channel_num).inc()
             cutoff = instant - MAX_FETCH_WINDOW
             with _drift_lock:
                 for stale_key in list(_drift_rejections):
@@ -679,13 +786,51 @@ class HourlyProjection(MetricsBase):
             raise RetryableMetricsException(
                 f"data_start {usage_data_start_local} != chart_start {chart_start}"
             )
-        with _drift_lock:
-            _drift_rejections.pop((chan.channel_num, chart_start), None)
+        if not tail:
+            with _drift_lock:
+                _drift_rejections.pop((chan.channel_num, chart_start), None)
         self.metrics["api_response"]["get_chart_usage/" + str(chan.channel_num)] = (
             fetch_elapsed
         )
         return usage_data_local, usage_data_start_local, chan.channel_num
 
+    def _fetch_tail(
+        self,
+        chan: Any,
+        tail_start: datetime,
+        energy_cache: "EnergyCache",
+    ) -> Optional[list[float]]:
+        """Fetch samples from *tail_start* and splice them onto the cache.
+
+        Args:
+            chan: The pyemvue channel to fetch.
+            tail_start: Start of the tail window (see ``_tail_start_for``).
+            energy_cache: Cache holding the head of the window.
+
+        Returns:
+            The full window (cached head + fetched tail), or ``None`` when
+            the tail is rejected (drifted start or overlap mismatch) and the
+            caller should fall back to a full-window fetch.
+        """
+        try:
+            tail, tail_data_start, _ = self._fetch_channel_data(
+                chan, tail_start, self.instant, tail=True
+            )
+        except RetryableMetricsException as exc:
+            self.logger.info("tail fetch rejected (%s); refetching window", exc)
+            return None
+        spliced = energy_cache.splice_tail(
+            tail, tail_data_start, TAIL_FETCH_OVERLAP_SECS
+        )
+        if spliced is not None:
+            self.logger.debug(
+                "tail fetch from %s: %d samples, %d new",
+                tail_start,
+                len(tail),
+                len(tail) - TAIL_FETCH_OVERLAP_SECS,
+            )
+        return spliced
+
     def populate_internal(
         self, chart_start: datetime, energy_cache: Optional["EnergyCache"] = None
     ) -> dict[int, _PopulationResult]:
@@ -782,10 +927,22 @@ class HourlyProjection(MetricsBase):
             self.energy_cache = energy_cache
         for chan in vdi.channels:
             usage_data_start_local = chart_start  # safe default if fetch fails
+            tail_start = (
+                _tail_start_for(self.energy_cache, chart_start)
+                if self.append else None
+            )
             try:
-                usage_data_local, usage_data_start_local, _ = (
-                    self._fetch_channel_data(chan, chart_start, self.instant)
+                spliced = (
+                    self._fetch_tail(chan, tail_start, self.energy_cache)
+                    if tail_start is not None and self.energy_cache is not None
+                    else None
                 )
+                if spliced is not None:
+                    usage_data_local = spliced
+                else:
+                    usage_data_local, usage_data_start_local, _ = (
+                        self._fetch_channel_data(chan, chart_start, self.instant)
+                    )
             except (requests.exceptions.RequestException, IOError) as exc:
                 self.logger.warning(
                     "error fetching device data: skipping %s (%s)",
@@ -874,8 +1031,10 @@ class HourlyProjection(MetricsBase):
         """
         energy_cache = self.energy_cache
 
-        nbc_seconds = list(pop_result.nbc_seconds) if pop_result.nbc_seconds is not None else []
-        per_second_data = list(pop_result.per_second_data) if pop_result.per_second_data is not None else []
+        # The population lists are freshly fetched and never mutated, so they
+        # are shared rather than copied.
+        nbc_seconds = pop_result.nbc_seconds if pop_result.nbc_seconds is not None else []
+        per_second_data = pop_result.per_second_data if pop_result.per_second_data is not None else []
 
         # Determine the prediction window from quantization data, if available.
         prediction_window_seconds: int | None = None
@@ -913,6 +1072,77 @@ class HourlyProjection(MetricsBase):
         )
 
 
+@dataclass(eq=False)
+class _ChunkRequest:
+    """One planned ``get_chart_usage`` call (hashed by identity)."""
+
+    chan: Any
+    start: datetime
+    end: datetime
+    stop_at: Optional[datetime] = None
+
+
+# A planned TOU chunk: ready data from the history store, or a request.
+_Part = dict[str, Any] | _ChunkRequest
+
+
+@dataclass
+class _DayGroup:
+    """Consecutive completed days to fetch and roll up."""
+
+    days: list[date]
+    parts: list[_Part]
+
+
+@dataclass
+class _ChannelPlan:
+    """Everything needed to report on one channel.
+
+    Attributes:
+        key: Rollup cache key (``"<device_gid>:<channel_num>"``).
+        live: Chunks aggregated directly (range edges, today).
+        groups: Missing completed days, rolled up once fetched.
+        cached: Completed days answered from the rollup cache.
+    """
+
+    key: str
+    live: list[_Part] = dataclasses.field(default_factory=list)
+    groups: list[_DayGroup] = dataclasses.field(default_factory=list)
+    cached: dict[date, DayRollup] = dataclasses.field(default_factory=dict)
+
+    def parts(self) -> list[_Part]:
+        """Return all planned parts, live and grouped."""
+        return self.live + [part for group in self.groups for part in group.parts]
+
+
+class _RateLimiter:
+    """Space call starts at least *interval* seconds apart across threads."""
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        """Block until the next call may start."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _is_transient(ex: BaseException) -> bool:
+    """Return True for Emporia errors worth retrying (network, 429, 5xx)."""
+    if isinstance(ex, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(ex, requests.exceptions.HTTPError) and ex.response is not None:
+        status = ex.response.status_code
+        return isinstance(status, int) and (status == 429 or status >= 500)
+    return False
+
+
 class TOUReporter(MetricsBase):
     """
     Multi-day Time-of-Use aggregation.
@@ -922,6 +1152,11 @@ class TOUReporter(MetricsBase):
     sum of all 15-minute period values in Wh across the entire period.
     Supports both historical (completed days) and real-time
     (current partial day) reporting.
+
+    With a ``HistoryStore``, quarter-hours already recorded by the energy
+    cache are read from it and only the gaps are fetched from Emporia.
+    With a ``TOURollupCache``, completed local days are summed from their
+    cached rollups and only the partial days are fetched.
     """
 
     def __init__(
@@ -930,13 +1165,18 @@ class TOUReporter(MetricsBase):
         end_date: datetime,
         logger_next: Optional[logging.Logger] = None,
         config: Config | None = None,
+        store: Optional[HistoryStore] = None,
+        rollups: Optional[TOURollupCache] = None,
     ) -> None:
         super().__init__(logger_next, config=config)
 
         self.start_date = start_date
         self.end_date = end_date
+        self.store = store
+        self.rollups = rollups
         self.tou_result: Optional[TOUBuckets] = None
         self.nbc_result: Optional[float] = None
+        self.day_rollups: list[DayRollup] = []
 
         self.fetch_usage_data()
         if is_debug(config):
@@ -954,50 +1194,326 @@ class TOUReporter(MetricsBase):
 
         The 15MIN scale has a much larger API limit than per-minute data,
         but we still chunk to be safe and handle large date ranges.
+        Quarter-hours found in the history store are used as-is and, with a
+        rollup cache, completed local days are answered from their cached
+        rollups (see ``_plan_channel``).
+
+        The chunk plan for every channel is built up front; the remaining
+        Emporia requests then run concurrently (``_fetch_chunks``) and the
+        results are reassembled in plan order, so ``aggregate_tou`` sees
+        the same chunks as a sequential walk would produce.
         """
         self.usage_data_list: list[dict[str, Any]] = []
+        self.day_rollups = []
         self._fetch_error: Optional[Exception] = None
 
+        plans: list[_ChannelPlan] = []
         for vdi in self.device_info.values():
             for chan in vdi.channels:
-                self.logger.debug("fetching TOU data for channel: %s", chan.name)
+                self.logger.debug("planning TOU fetch for channel: %s", chan.name)
+                plans.append(self._plan_channel(vdi, chan))
 
-                current_time = self.start_date
-                while current_time < self.end_date:
-                    chunk_end = min(current_time + timedelta(days=7), self.end_date)
+        fetched = self._fetch_chunks([
+            part for plan in plans for part in plan.parts()
+            if isinstance(part, _ChunkRequest)
+        ])
+        for plan in plans:
+            self._assemble(plan, fetched)
 
-                    try:
-                        self.logger.debug(
-                            "fetching chunk: %s - %s", current_time, chunk_end
-                        )
-                        usage_data, usage_data_start = self.vue.get_chart_usage(
-                            chan,
-                            current_time,
-                            chunk_end,
-                            scale=Scale.MINUTES_15.value,
-                            unit=Unit.KWH.value,
-                        )
+    def _plan_channel(self, vdi: Any, chan: Any) -> _ChannelPlan:
+        """Plan the chunks needed to report on one channel.
 
-                        if usage_data and len(usage_data) > 0:
-                            self.usage_data_list.append(
-                                {"start": usage_data_start, "data": usage_data}
-                            )
-                    except (requests.exceptions.RequestException, IOError) as ex:
-                        error_msg = str(ex)
-                        if isinstance(ex, requests.exceptions.HTTPError):
-                            if ex.response is not None:
-                                try:
-                                    error_msg = f"{error_msg}: {ex.response.text}"
-                                except (
-                                    requests.exceptions.RequestException,
-                                    AttributeError,
-                                ):
-                                    pass
-                        self.logger.exception("error fetching TOU data: %s", error_msg)
-                        self._fetch_error = ex
-                        raise
-
-                    current_time = chunk_end + timedelta(minutes=15)
+        Without a rollup cache the whole range is fetched live.  With one,
+        local days that are entirely inside the report range and already
+        over are taken from the cache; missing ones are grouped into
+        consecutive runs to be fetched and rolled up.  The partial days at
+        either edge, including today, are fetched live.
+
+        Args:
+            vdi: The device the channel belongs to.
+            chan: The channel being reported.
+
+        Returns:
+            The channel's plan.
+        """
+        plan = _ChannelPlan(key=f"{vdi.device_gid}:{chan.channel_num}")
+        rollups = self.rollups
+        tz = pytz.timezone(get_timezone())
+        days = (
+            complete_days(self.start_date, min(self.end_date, _CLOCK.now()), tz)
+            if rollups is not None else []
+        )
+        if rollups is None or not days:
+            plan.live = self._plan_span(vdi, chan, self.start_date, self.end_date)
+            return plan
+
+        first_start = local_midnight(days[0], tz)
+        last_end = local_midnight(days[-1] + timedelta(days=1), tz)
+        if self.start_date < first_start:
+            plan.live.extend(
+                self._plan_span(vdi, chan, self.start_date, first_start, first_start)
+            )
+
+        plan.cached = rollups.get_many(plan.key, days)
+        missing: list[list[date]] = []
+        for day in days:
+            if day in plan.cached:
+                continue
+            if missing and missing[-1][-1] + timedelta(days=1) == day:
+                missing[-1].append(day)
+            else:
+                missing.append([day])
+        for group in missing:
+            group_start = local_midnight(group[0], tz)
+            group_end = local_midnight(group[-1] + timedelta(days=1), tz)
+            plan.groups.append(_DayGroup(
+                days=group,
+                parts=self._plan_span(vdi, chan, group_start, group_end, group_end),
+            ))
+
+        if last_end < self.end_date:
+            plan.live.extend(self._plan_span(vdi, chan, last_end, self.end_date))
+        return plan
+
+    def _assemble(
+        self,
+        plan: _ChannelPlan,
+        fetched: dict[_ChunkRequest, Optional[dict[str, Any]]],
+    ) -> None:
+        """Fold one channel's fetched chunks into the report inputs.
+
+        Args:
+            plan: The channel's plan.
+            fetched: Results of ``_fetch_chunks`` (``None`` for empty chunks).
+        """
+        def resolve(parts: list[_Part]) -> list[dict[str, Any]]:
+            chunks = []
+            for part in parts:
+                chunk = fetched.get(part) if isinstance(part, _ChunkRequest) else part
+                if chunk is not None:
+                    chunks.append(chunk)
+            return chunks
+
+        by_day = dict(plan.cached)
+        if plan.groups:
+            tz = pytz.timezone(get_timezone())
+            for group in plan.groups:
+                rollups = rollup_chunks(resolve(group.parts), tz)
+                complete: list[DayRollup] = []
+                for day in group.days:
+                    rollup = rollups.get(day)
+                    if rollup is None:
+                        continue
+                    by_day[day] = rollup
+                    if rollup.periods == expected_periods(day, tz):
+                        complete.append(rollup)
+                if self.rollups is not None:
+                    self.rollups.put(plan.key, complete)
+        self.day_rollups.extend(by_day[day] for day in sorted(by_day))
+        self.usage_data_list.extend(resolve(plan.live))
+
+    def _plan_span(
+        self,
+        vdi: Any,
+        chan: Any,
+        start: datetime,
+        end: datetime,
+        stop_at: Optional[datetime] = None,
+    ) -> list[_Part]:
+        """Plan [start, end]: stored runs first, Emporia requests for the rest.
+
+        Args:
+            vdi: The device the channel belongs to.
+            chan: The channel to fetch.
+            start: Range start.
+            end: Range end.
+            stop_at: Passed to ``_plan_range`` for the last Emporia range.
+
+        Returns:
+            Ready chunks from the history store and pending requests, in
+            time order.
+        """
+        parts: list[_Part] = []
+        current_time = start
+        for run in self._stored_runs(vdi, chan, start, end):
+            run_start = run[0].start
+            if current_time < run_start:
+                parts.extend(
+                    self._plan_range(chan, current_time, run_start, run_start)
+                )
+            parts.append({
+                "start": run_start,
+                "data": [p.raw_wh / 1000.0 for p in run],
+            })
+            current_time = run[-1].start + timedelta(minutes=15)
+        parts.extend(self._plan_range(chan, current_time, end, stop_at))
+        return parts
+
+    def _stored_runs(
+        self, vdi: Any, chan: Any, start: datetime, end: datetime
+    ) -> list[list[CompletedNBCPeriod]]:
+        """Return contiguous runs of stored QHs for *chan*, if it is cached.
+
+        The energy cache (and so the store) holds the first channel of the
+        single configured device — the one ``HourlyProjection`` fetches.
+
+        Args:
+            vdi: The device the channel belongs to.
+            chan: The channel being reported.
+            start: Range start.
+            end: Range end.
+
+        Returns:
+            Runs of back-to-back completed periods inside [start, end);
+            empty when there is no store or the channel is not the cached one.
+        """
+        if (
+            self.store is None
+            or len(self.device_info) != 1
+            or not vdi.channels
+            or chan is not vdi.channels[0]
+        ):
+            return []
+        try:
+            return self.store.runs(start, end)
+        except sqlite3.Error as ex:
+            self.logger.warning("history store read failed: %s", ex)
+            return []
+
+    @staticmethod
+    def _plan_range(
+        chan: Any,
+        start: datetime,
+        end: datetime,
+        stop_at: Optional[datetime] = None,
+    ) -> list[_ChunkRequest]:
+        """Split [start, end] into 7-day Emporia requests.
+
+        Args:
+            chan: The channel to fetch.
+            start: Range start.
+            end: Range end.
+            stop_at: When set, drop returned quarter-hours starting at or
+                after this time (they are supplied by the history store or
+                belong to the next range).
+
+        Returns:
+            Requests in time order.
+        """
+        planned: list[_ChunkRequest] = []
+        current_time = start
+        while current_time < end:
+            chunk_end = min(current_time + timedelta(days=7), end)
+            planned.append(_ChunkRequest(chan, current_time, chunk_end, stop_at))
+            current_time = chunk_end + timedelta(minutes=15)
+        return planned
+
+    def _fetch_chunks(
+        self, planned: list[_ChunkRequest]
+    ) -> dict[_ChunkRequest, Optional[dict[str, Any]]]:
+        """Run *planned* requests on a bounded thread pool.
+
+        Calls are rate limited across workers (``TOU_FETCH_MIN_INTERVAL_SECS``)
+        and each chunk is retried on transient errors.  The first chunk that
+        still fails cancels the requests not yet started and its error is
+        re-raised.
+
+        Args:
+            planned: Requests to run.
+
+        Returns:
+            Chunk (or ``None`` when Emporia returned no data) per request.
+        """
+        if not planned:
+            return {}
+        limiter = _RateLimiter(TOU_FETCH_MIN_INTERVAL_SECS)
+        results: dict[_ChunkRequest, Optional[dict[str, Any]]] = {}
+        workers = min(TOU_FETCH_MAX_WORKERS, len(planned))
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="tou-fetch",
+        ) as pool:
+            futures = {
+                pool.submit(self._fetch_chunk, req, limiter): req for req in planned
+            }
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    results[futures[future]] = future.result()
+            except BaseException:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+        return results
+
+    def _fetch_chunk(
+        self, req: _ChunkRequest, limiter: _RateLimiter
+    ) -> Optional[dict[str, Any]]:
+        """Fetch one planned chunk, retrying transient failures.
+
+        Args:
+            req: The request.
+            limiter: Shared rate limiter.
+
+        Returns:
+            ``{"start": datetime, "data": [kWh, ...]}``, or ``None`` when
+            Emporia returned no data.
+        """
+        usage_data, usage_data_start = self._request_chunk(req, limiter)
+        if usage_data and req.stop_at is not None and usage_data_start is not None:
+            keep = int((req.stop_at - usage_data_start).total_seconds() // 900)
+            usage_data = usage_data[:max(0, keep)]
+        if usage_data and len(usage_data) > 0:
+            return {"start": usage_data_start, "data": usage_data}
+        return None
+
+    def _request_chunk(
+        self, req: _ChunkRequest, limiter: _RateLimiter
+    ) -> tuple[Any, Optional[datetime]]:
+        """Call ``get_chart_usage`` for *req*, retrying transient failures.
+
+        Args:
+            req: The request.
+            limiter: Shared rate limiter.
+
+        Returns:
+            ``(usage_data, usage_data_start)`` as returned by Emporia.
+
+        Raises:
+            requests.exceptions.RequestException: When the final attempt fails.
+            IOError: When the final attempt fails.
+        """
+        attempt = 1
+        while True:
+            limiter.wait()
+            try:
+                self.logger.debug("fetching chunk: %s - %s", req.start, req.end)
+                return self.vue.get_chart_usage(
+                    req.chan,
+                    req.start,
+                    req.end,
+                    scale=Scale.MINUTES_15.value,
+                    unit=Unit.KWH.value,
+                )
+            except (requests.exceptions.RequestException, IOError) as ex:
+                if attempt < TOU_FETCH_MAX_ATTEMPTS and _is_transient(ex):
+                    self.logger.warning(
+                        "TOU chunk %s - %s failed (attempt %d): %s; retrying",
+                        req.start, req.end, attempt, ex,
+                    )
+                    time.sleep(TOU_FETCH_RETRY_BACKOFF_SECS * 2 ** (attempt - 1))
+                    attempt += 1
+                    continue
+                error_msg = str(ex)
+                if isinstance(ex, requests.exceptions.HTTPError):
+                    if ex.response is not None:
+                        try:
+                            error_msg = f"{error_msg}: {ex.response.text}"
+                        except (
+                            requests.exceptions.RequestException,
+                            AttributeError,
+                        ):
+                            pass
+                self.logger.exception("error fetching TOU data: %s", error_msg)
+                self._fetch_error = ex
+                raise
 
     def aggregate_tou(self) -> None:
         """
@@ -1005,7 +1521,7 @@ class TOUReporter(MetricsBase):
 
         Delegates to EnergyDataAggregator for TOU bucket classification.
         NBC is the sum of all 15-minute period values in Wh across the
-        entire reporting period.
+        entire reporting period.  Cached day rollups are added as-is.
         """
         total = 0.0
         peak = 0.0
@@ -1029,6 +1545,13 @@ class TOUReporter(MetricsBase):
                 if usage_kwh is not None and usage_kwh > 0:
                     nbc_total_wh += usage_kwh * 1000.0
 
+        for rollup in self.day_rollups:
+            total += rollup.buckets.total
+            peak += rollup.buckets.peak
+            part_peak += rollup.buckets.part_peak
+            off_peak += rollup.buckets.off_peak
+            nbc_total_wh += rollup.nbc
+
         self.tou_result = TOUBuckets(
             total=total, peak=peak, part_peak=part_peak, off_peak=off_peak,
         )
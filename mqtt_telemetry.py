@@ -21,9 +21,11 @@ Single-vehicle assumed — no per-VIN storage.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import threading
+from collections.abc import Callable
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -51,6 +53,16 @@ _telemetry_state: dict[str, Any] = {}
 _telemetry_warned_empty = False
 # Wall-clock timestamp of the last update to each field.
 _field_update_at: dict[str, datetime] = {}
+# Callables notified as ``listener(field, old, new)`` after each update,
+# on the paho network thread.
+_listeners: list[Callable[[str, Any, Any], None]] = []
+
+# Fields whose changes can alter a load-management decision.
+CHARGE_FIELDS: frozenset[str] = frozenset(
+    {"ChargeAmps", "ChargeState", "DetailedChargeState"}
+)
+# Fields that can make ``tesla_state_from_snapshot`` return a state.
+STATE_FIELDS: frozenset[str] = frozenset({"ChargeAmps", "DetailedChargeState"})
 
 # === Public API ===
 
@@ -94,6 +106,94 @@ def get_field_update_at(field: str) -> datetime | None:
         return _field_update_at.get(field)
 
 
+def add_listener(listener: Callable[[str, Any, Any], None]) -> None:
+    """Call *listener* as ``listener(field, old, new)`` on every update.
+
+    Listeners run on the paho network thread after the state lock is
+    released, so they must be quick and must not block; exceptions are
+    logged and swallowed.
+
+    Args:
+        listener: Callable taking the field name, its previous value
+            (``None`` if never received) and the new value.
+    """
+    with _telemetry_lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[str, Any, Any], None]) -> None:
+    """Stop notifying *listener*; unknown listeners are ignored."""
+    with _telemetry_lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def is_charge_transition(field: str, old: Any, new: Any) -> bool:
+    """Return True if an update changes the vehicle's charging picture.
+
+    ``ChargeAmps`` counts only when its whole-amp value changes (the car
+    reports fractional jitter); the charge-state enums count on any change.
+    Other fields (e.g. ``Location``) never do.
+
+    Args:
+        field: Telemetry field name.
+        old: Previous normalised value, or ``None``.
+        new: New normalised value.
+    """
+    if field not in CHARGE_FIELDS:
+        return False
+    if field == "ChargeAmps":
+        return parse_charge_amps(old) != parse_charge_amps(new)
+    return old != new
+
+
+async def wait_for_tesla_state(timeout: float) -> TeslaState | None:
+    """Wait until telemetry yields a parseable ``TeslaState``.
+
+    Returns at once if the current snapshot already parses.  Otherwise a
+    listener on the paho thread hands each ``STATE_FIELDS`` update to the
+    caller's event loop with ``call_soon_threadsafe``, and the wait ends
+    the moment one of them makes the snapshot parse — no polling.
+
+    Args:
+        timeout: Maximum seconds to wait; ``<= 0`` returns ``None``
+            without looking at telemetry.
+
+    Returns:
+        The state built from the snapshot, or ``None`` on timeout.
+    """
+    if timeout <= 0:
+        return None
+    loop = asyncio.get_running_loop()
+    arrived: asyncio.Future[TeslaState] = loop.create_future()
+
+    def _check() -> None:
+        if arrived.done() or not has_telemetry():
+            return
+        state = tesla_state_from_snapshot(get_telemetry_snapshot())
+        if state is not None:
+            arrived.set_result(state)
+
+    def _on_update(field: str, _old: Any, _new: Any) -> None:
+        if field in STATE_FIELDS:
+            try:
+                loop.call_soon_threadsafe(_check)
+            except RuntimeError:
+                pass  # loop already closed; the waiter is gone
+
+    add_listener(_on_update)
+    try:
+        _check()
+        if arrived.done():
+            return arrived.result()
+        return await asyncio.wait_for(arrived, timeout)
+    except TimeoutError:
+        return None
+    finally:
+        remove_listener(_on_update)
+
+
 def on_message(_client: Any, _userdata: Any, msg: Any) -> None:  # noqa: ARG001
     """paho callback: parse incoming MQTT message and update state.
 
@@ -120,22 +220,49 @@ def on_message(_client: Any, _userdata: Any, msg: Any) -> None:  # noqa: ARG001
             return
 
         # Unwrap fleet-telemetry's {"value": ..., "createdAt": ...} envelope.
-        value = unwrap_telemetry_value(payload)
-
-        with _telemetry_lock:
-            is_new = field not in _telemetry_state
-            _telemetry_state[field] = value
-            _field_update_at[field] = datetime.now(timezone.utc)
-
-        if is_new:
-            logger.info("mqtt_telemetry: first value for field %s = %r", field, value)
-        else:
-            logger.debug("mqtt_telemetry: %s = %r", field, value)
+        apply_update(field, unwrap_telemetry_value(payload))
 
     except Exception:  # pylint: disable=broad-exception-caught
         logger.exception("mqtt_telemetry.on_message: unexpected error")
 
 
+def apply_update(field: str, value: Any, at: datetime | None = None) -> None:
+    """Store a normalised *value* for *field* and notify listeners.
+
+    ``on_message`` calls this for every broker message; the replay driver
+    (replay.py) calls it directly with recorded values and times.
+
+    Args:
+        field: Telemetry field name (e.g. ``"ChargeAmps"``).
+        value: Unwrapped value.
+        at: Update time; defaults to now.
+    """
+    with _telemetry_lock:
+        is_new = field not in _telemetry_state
+        old = _telemetry_state.get(field)
+        _telemetry_state[field] = value
+        _field_update_at[field] = at if at is not None else datetime.now(timezone.utc)
+        listeners = list(_listeners)
+
+    if is_new:
+        logger.info("mqtt_telemetry: first value for field %s = %r", field, value)
+    else:
+        logger.debug("mqtt_telemetry: %s = %r", field, value)
+
+    for listener in listeners:
+        try:
+            listener(field, old, value)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("mqtt_telemetry: listener %r failed", listener)
+
+
+def reset_state() -> None:
+    """Forget all received fields, as if no message had arrived yet."""
+    with _telemetry_lock:
+        _telemetry_state.clear()
+        _field_update_at.clear()
+
+
 def check_fleet_telemetry_dotfile() -> None:
     """Warn if fleet-telemetry has never been provisioned.
 
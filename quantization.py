@@ -3,12 +3,22 @@
 Scans per-second float arrays for repeating constant-value windows
 (N-second chunks) and reports the sample size, the offset where the
 first complete sample begins, and a confidence score.
+
+Two entry points share one selection routine and give identical results:
+
+* ``detect_quantization`` — one-shot scan of a sample list.
+* ``QuantizationDetector`` — incremental; ``extend()`` appended samples and
+  read ``result()`` without rescanning the window.
 """
 
 from __future__ import annotations
 
 import math
 from collections import Counter
+from typing import Callable, Iterable, Sequence
+
+MAX_SAMPLE_SIZE = 60
+"""Largest quantization period (seconds) that is reported."""
 
 
 def _equal(a: float, b: float) -> bool:
@@ -21,10 +31,6 @@ def _equal(a: float, b: float) -> bool:
 
 
 def detect_quantization(data: list[float]) -> tuple[int, int, float] | None:
-    # pylint: disable=too-many-locals
-    # The detector tracks window size, offset, per-second counts and the
-    # running confidence for every candidate N — dense but all required to
-    # score the repeating constant-value windows.
     """Detect quantization in per-second float data.
 
     Scans the data for repeating constant-value windows of N seconds.
@@ -48,6 +54,10 @@ def detect_quantization(data: list[float]) -> tuple[int, int, float] | None:
        whose every element is identical).  Confidence is the fraction of
        points inside pure windows.
 
+    Window purity is read from a cumulative count of value changes: a
+    window is pure when no change falls strictly inside it, so each
+    candidate N is scored in O(len(data)) rather than O(len(data) * N).
+
     This approach naturally handles real-world clock skew: some runs
     will be slightly shorter or longer than N, but the mode still gives
     the correct sample size, and most windows will be pure.
@@ -85,26 +95,77 @@ def detect_quantization(data: list[float]) -> tuple[int, int, float] | None:
     if data_len < 4:
         return None
 
-    # Step 1: Find runs of consecutive identical values.
-    # Each run is (value, start_index, length).
-    runs: list[tuple[float, int, int]] = []
-    run_start = 0
-    for i in range(1, data_len):
-        if not _equal(data[i], data[i - 1]):
-            runs.append((data[i - 1], run_start, i - run_start))
-            run_start = i
-    runs.append((data[-1], run_start, data_len - run_start))
-
-    if len(runs) < 2:
+    # Step 1: Find runs of consecutive identical values, via the indices
+    # where the value changes ("breaks").
+    breaks = [
+        i for i in range(1, data_len) if not _equal(data[i], data[i - 1])
+    ]
+    if not breaks:
         # All values are the same — every N-sized window is pure.
         # Smallest valid sample size is 2.
         return (2, 0, 1.0)
+    bounds = [0, *breaks, data_len]
+    length_counts: Counter = Counter(
+        bounds[k + 1] - bounds[k] for k in range(len(bounds) - 1)
+    )
+
+    # changes[i] = number of breaks at indices <= i.  Window [ws, ws + d)
+    # is pure iff changes[ws + d - 1] == changes[ws].
+    changes: list[int] = []
+    count = 0
+    next_break = iter(breaks)
+    upcoming = next(next_break)
+    for i in range(data_len):
+        if i == upcoming:
+            count += 1
+            upcoming = next(next_break, data_len)
+        changes.append(count)
+
+    def _offset_scores(d: int) -> list[int]:
+        return _prefix_offset_scores(changes, data_len, d)
+
+    return _select(length_counts, data_len, _offset_scores)
+
+
+def _prefix_offset_scores(changes: list[int], data_len: int, d: int) -> list[int]:
+    """Return the pure-window score of every offset ``0 .. d-1``.
+
+    Args:
+        changes: Cumulative break counts (see ``detect_quantization``).
+        data_len: Number of samples.
+        d: Window size.
+
+    Returns:
+        ``scores[off]`` = points in pure windows when windows start at *off*.
+    """
+    scores = []
+    for off in range(d):
+        ends = changes[off + d - 1:data_len:d]
+        starts = changes[off:data_len:d]
+        scores.append(d * sum(1 for e, s in zip(ends, starts) if e == s))
+    return scores
 
+
+def _select(
+    length_counts: Counter,
+    data_len: int,
+    offset_scores: Callable[[int], list[int]],
+) -> tuple[int, int, float] | None:
+    """Choose (N, offset, confidence) from run lengths and window scores.
+
+    Args:
+        length_counts: Run length -> number of runs (at least two runs).
+        data_len: Number of samples.
+        offset_scores: Returns the per-offset pure-window scores for a
+            window size (see ``_prefix_offset_scores``).
+
+    Returns:
+        ``(sample_size, offset, confidence)``, or ``None`` when the chosen
+        size is outside ``2 .. MAX_SAMPLE_SIZE``.
+    """
     # Step 2: N = mode of run lengths (smallest in case of tie).
-    length_counts: Counter = Counter(r[2] for r in runs)
     max_count = max(length_counts.values())
-    candidates = sorted(n for n, c in length_counts.items() if c == max_count)
-    n = candidates[0]
+    n = min(rl for rl, c in length_counts.items() if c == max_count)
 
     # The run-length mode can be wrong in two ways:
     #   1. Adjacent windows with identical values merge, inflating the mode
@@ -113,21 +174,8 @@ def detect_quantization(data: list[float]) -> tuple[int, int, float] | None:
     #      (e.g. real period 30, mode becomes 15).  Check multiples of N.
     # For each candidate, score window-purity and prefer the one that
     # scores strictly higher (≥ 2 % improvement) over the mode.
-    def _score(d: int) -> int:
-        best = 0
-        for off in range(d):
-            s = 0
-            nw = (data_len - off) // d
-            for k in range(nw):
-                ws = off + k * d
-                v = data[ws]
-                if all(_equal(data[j], v) for j in range(ws + 1, ws + d)):
-                    s += d
-            best = max(best, s)
-        return best
-
     best_n = n
-    best_s = _score(n)
+    best_s = max(offset_scores(n))
 
     # Check N/2 (handles inflated mode).
     # Only switch if N/2 has some representation in the run distribution —
@@ -136,19 +184,18 @@ def detect_quantization(data: list[float]) -> tuple[int, int, float] | None:
     if n > 2 and n % 2 == 0:
         n_half = n // 2
         n_half_runs = sum(
-            1 for _, _, rl in runs
-            if abs(rl - n_half) <= 1
+            c for rl, c in length_counts.items() if abs(rl - n_half) <= 1
         )
         if n_half_runs >= 1:
-            s_half = _score(n_half)
+            s_half = max(offset_scores(n_half))
             if best_s > 0 and s_half > best_s * 1.02:
                 best_n, best_s = n_half, s_half
 
     # Check multiples 2N, 3N, … up to 60 (handles shrunk mode).
     mult = 2
-    while mult * n <= 60:
+    while mult * n <= MAX_SAMPLE_SIZE:
         n_mult = mult * n
-        s_mult = _score(n_mult)
+        s_mult = max(offset_scores(n_mult))
         if best_s > 0 and s_mult > best_s * 1.02:
             best_n, best_s = n_mult, s_mult
         mult += 1
@@ -156,30 +203,98 @@ def detect_quantization(data: list[float]) -> tuple[int, int, float] | None:
     n = best_n
 
     # Cap at 60; must be at least 2.
-    if n > 60 or n < 2:
+    if n > MAX_SAMPLE_SIZE or n < 2:
         return None
 
-    # Step 3: For each offset 0 .. N-1, score by number of pure windows.
-    best_offset = 0
-    best_score = 0
-
-    for offset in range(n):
-        score = 0
-        num_windows = (data_len - offset) // n
-        for k in range(num_windows):
-            window_start = offset + k * n
-            window_end = window_start + n
-            window_value = data[window_start]
-            is_pure = True
-            for j in range(window_start + 1, window_end):
-                if not _equal(data[j], window_value):
-                    is_pure = False
-                    break
-            if is_pure:
-                score += n
-        if score > best_score:
-            best_score = score
-            best_offset = offset
-
-    confidence = best_score / data_len
-    return (n, best_offset, confidence)
+    # Step 3: pick the offset with the most points in pure windows (the
+    # first one on a tie).
+    scores = offset_scores(n)
+    best_offset = max(range(n), key=scores.__getitem__)
+    return (n, best_offset, scores[best_offset] / data_len)
+
+
+class QuantizationDetector:
+    """Incremental ``detect_quantization`` for an append-only sample window.
+
+    Tracks the run-length distribution and, for every window size
+    ``1 .. MAX_SAMPLE_SIZE`` and offset, the number of points in pure
+    windows.  Appending a sample completes exactly one window per size, so
+    ``extend()`` costs O(MAX_SAMPLE_SIZE) per sample and ``result()`` only
+    reads the tables.  Results are identical to ``detect_quantization``
+    over the same samples.
+
+    Usage::
+
+        detector = QuantizationDetector(samples)
+        detector.extend(new_samples)
+        n_offset_confidence = detector.result()
+    """
+
+    def __init__(self, data: Iterable[float] = ()) -> None:
+        """Initialize the detector, optionally with initial samples.
+
+        Args:
+            data: Samples to feed through ``extend()``.
+        """
+        self.samples: list[float] = []
+        self._run_start = 0
+        self._closed_runs: Counter = Counter()
+        # Cumulative break counts, needed only to score window sizes above
+        # MAX_SAMPLE_SIZE (a run-length mode that large is rare).
+        self._changes: list[int] = []
+        # _scores[d][off]: points in pure windows of size d starting at off.
+        self._scores: list[list[int]] = [
+            [0] * d for d in range(MAX_SAMPLE_SIZE + 1)
+        ]
+        self.extend(data)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def extend(self, data: Iterable[float]) -> None:
+        """Append samples and update the run and window tables.
+
+        Args:
+            data: Samples following those already seen.
+        """
+        samples = self.samples
+        changes = self._changes
+        scores = self._scores
+        count = changes[-1] if changes else 0
+        for value in data:
+            i = len(samples)
+            if i and not _equal(value, samples[i - 1]):
+                self._closed_runs[i - self._run_start] += 1
+                self._run_start = i
+                count += 1
+            samples.append(value)
+            changes.append(count)
+            # The window of size d ending at i starts at i - d + 1; it is
+            # pure iff the current run began at or before that start.
+            run_start = self._run_start
+            for d in range(1, min(i + 1, MAX_SAMPLE_SIZE) + 1):
+                ws = i - d + 1
+                if run_start <= ws:
+                    scores[d][ws % d] += d
+
+    def matches_prefix(self, data: Sequence[float]) -> bool:
+        """Return True when *data* starts with every sample seen so far."""
+        k = len(self.samples)
+        return len(data) >= k and data[:k] == self.samples
+
+    def result(self) -> tuple[int, int, float] | None:
+        """Return ``detect_quantization`` of the samples seen so far."""
+        data_len = len(self.samples)
+        if data_len < 4:
+            return None
+        if not self._closed_runs:
+            return (2, 0, 1.0)
+        length_counts = self._closed_runs.copy()
+        length_counts[data_len - self._run_start] += 1
+
+        def _offset_scores(d: int) -> list[int]:
+            if d <= MAX_SAMPLE_SIZE:
+                return self._scores[d]
+            return _prefix_offset_scores(self._changes, data_len, d)
+
+        return _select(length_counts, data_len, _offset_scores)
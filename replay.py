@@ -0,0 +1,746 @@
+"""Record live load-management inputs and replay them at accelerated time.
+
+``Recorder`` captures what the load manager sees from the outside world
+into a compact JSON Lines log (gzip when the path ends in ``.gz``):
+
+- every fresh Emporia fetch (``_fetched_at``, ``data_start``, lag, and per
+  device the NBC quarters and per-second samples),
+- every MQTT telemetry update (via ``mqtt_telemetry.add_listener``),
+- plug states that changed outside the load manager, and its own commands.
+
+Samples are stored run-length encoded (Emporia quantizes them, so runs
+are long) and as a tail after the prefix shared with the previous fetch,
+which keeps a day of 30 s fetches to a few MB.  The app records when
+``LOAD_RECORD_PATH`` is set.
+
+``ReplayDriver`` pushes a recorded span through ``LoadManager.run_cycle``
+with a ``FakeClock``, a private ``EnergyCache`` and the in-memory
+``PlugController``/``TeslaController``, pacing cycles by ``sleep_hint``
+(or at the recorded fetch times) and waking early on recorded charge
+transitions like the live loop.  It reports cycles per second, per-stage
+``ctx.timings``, status and action counts, and the NBC of each QH.
+Replay goes through the process-wide telemetry state in mqtt_telemetry,
+so it must not run inside the app.
+
+Record kinds (``t`` is epoch seconds):
+
+- ``config``: ``target_wh``, ``nbc_device``, ``enabled``, ``plugs``, ``tesla``
+- ``fetch``: ``ds``, ``lag``, ``dev``: ``[{"n", "nbc", "o", "keep", "s"}]``
+- ``mqtt``: ``f`` (field), ``v`` (value)
+- ``plug``: ``n``, ``on`` (observed state that differs from the last known)
+- ``cmd``: ``n``, ``on``, ``ok`` (command issued by the load manager)
+
+Usage::
+
+    # Record: add to .env and restart
+    LOAD_RECORD_PATH=solara-record.jsonl.gz
+
+    # Replay one day, with a different target
+    uv run python replay.py solara-record.jsonl.gz \\
+        --start 2026-06-08T00:00-07:00 --end 2026-06-09T00:00-07:00 --target-wh -200
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import logging
+import threading
+import time as _time_mod
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import IO, Any
+
+import mqtt_telemetry
+from clock import Clock, FakeClock, RealClock
+from constants import (
+    LOAD_WAKE_DEBOUNCE_SECS,
+    LOAD_WAKE_MIN_SPACING_SECS,
+    TESLA_CHARGE_AMPS_MAX_DEFAULT,
+    TESLA_CHARGE_AMPS_MIN_DEFAULT,
+)
+from energy_cache import EnergyCache
+from load_controllers import PlugController, TeslaController
+from load_manager import LoadManager, LoadManagerConfig
+from load_models import AbstractPlugController, CycleResult, PlugConfig, TeslaConfig
+from load_nbc import GapMinder
+from util import custom_json_default, floor_to_qh
+
+logger = logging.getLogger(__name__)
+
+MIN_REPLAY_INTERVAL_SECS = 1.0
+"""Shortest simulated gap between replayed cycles."""
+
+
+# ── Log encoding ──────────────────────────────────────────────────────
+
+
+def _epoch(dt: datetime) -> float:
+    return round(dt.timestamp(), 3)
+
+
+def _from_epoch(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+def _rle(values: Sequence[float]) -> list[list[float]]:
+    """Run-length encode *values* as ``[[value, count], ...]``."""
+    runs: list[list[float]] = []
+    for value in values:
+        if runs and runs[-1][0] == value:
+            runs[-1][1] += 1
+        else:
+            runs.append([value, 1])
+    return runs
+
+
+def _unrle(runs: Iterable[Sequence[float]]) -> list[float]:
+    values: list[float] = []
+    for value, count in runs:
+        values.extend([value] * int(count))
+    return values
+
+
+def encode_samples(
+    prev: tuple[datetime, Sequence[float]] | None,
+    start: datetime,
+    values: Sequence[float],
+) -> dict[str, Any]:
+    """Encode a sample window against the previous window of the same device.
+
+    Args:
+        prev: ``(start, values)`` of the previous window, or None.
+        start: Timestamp of ``values[0]``.
+        values: Per-second samples.
+
+    Returns:
+        ``{"o": offset, "keep": n, "s": runs}`` where the first *n* samples
+        equal ``prev[offset:offset + n]``; ``o``/``keep`` are omitted when
+        nothing is shared.
+    """
+    encoded: dict[str, Any] = {}
+    tail: Sequence[float] = values
+    if prev is not None:
+        prev_start, prev_values = prev
+        offset = (start - prev_start).total_seconds()
+        if offset == int(offset) and 0 <= offset < len(prev_values):
+            o = int(offset)
+            limit = min(len(prev_values) - o, len(values))
+            keep = 0
+            while keep < limit and prev_values[o + keep] == values[keep]:
+                keep += 1
+            if keep:
+                encoded = {"o": o, "keep": keep}
+                tail = values[keep:]
+    encoded["s"] = _rle(tail)
+    return encoded
+
+
+def decode_samples(
+    prev: tuple[datetime, Sequence[float]] | None, encoded: dict[str, Any]
+) -> list[float]:
+    """Invert :func:`encode_samples`.
+
+    Raises:
+        ValueError: If the record shares a prefix with a missing window.
+    """
+    head: list[float] = []
+    keep = encoded.get("keep", 0)
+    if keep:
+        if prev is None:
+            raise ValueError("sample record refers to a missing previous window")
+        o = encoded["o"]
+        head = list(prev[1][o:o + keep])
+    return head + _unrle(encoded["s"])
+
+
+def _encode_time_range(value: tuple[time, time] | None) -> list[str] | None:
+    return None if value is None else [value[0].isoformat(), value[1].isoformat()]
+
+
+def _decode_time_range(value: Sequence[str] | None) -> tuple[time, time] | None:
+    return None if value is None else (time.fromisoformat(value[0]), time.fromisoformat(value[1]))
+
+
+def read_log(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the records of a log written by :class:`Recorder`, in order.
+
+    A truncated last line (the process died mid-write) is ignored.
+    """
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as stream:
+        for line in stream:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("replay: skipping malformed record in %s", path)
+
+
+# ── Recording ─────────────────────────────────────────────────────────
+
+
+class Recorder:
+    """Thread-safe writer of the replay log.
+
+    Fed from the load-management thread (fetches), the paho thread
+    (telemetry) and the event loop (plugs).
+    """
+
+    def __init__(self, stream: IO[str], clock: Clock | None = None) -> None:
+        """Write records to *stream*.
+
+        Args:
+            stream: Text stream, flushed after every record.
+            clock: Timestamps telemetry and plug records.
+        """
+        self._stream = stream
+        self._clock: Clock = clock if clock is not None else RealClock()
+        self._lock = threading.Lock()
+        self._windows: dict[str, tuple[datetime, list[float]]] = {}
+        self._last_fetched_at: datetime | None = None
+
+    @classmethod
+    def open(cls, path: str | Path) -> Recorder:
+        """Append to the log at *path* (gzip when it ends in ``.gz``)."""
+        path = Path(path)
+        if path.suffix == ".gz":
+            return cls(gzip.open(path, "at", encoding="utf-8"))
+        return cls(open(path, "a", encoding="utf-8"))  # pylint: disable=consider-using-with
+
+    def close(self) -> None:
+        """Stop telemetry recording and close the log."""
+        mqtt_telemetry.remove_listener(self.record_telemetry)
+        with self._lock:
+            self._stream.close()
+
+    def _write(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, default=custom_json_default, separators=(",", ":"))
+        with self._lock:
+            if self._stream.closed:
+                return
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+    def attach(self, lm: LoadManager) -> None:
+        """Start recording everything *lm* observes, except fetches.
+
+        Writes the ``config`` record, wraps ``lm.plug_ctrl`` and subscribes
+        to telemetry (seeded with the fields already received).  Fetches are
+        recorded by the callable from :meth:`wrap_fetch`.
+        """
+        self.record_config(lm)
+        lm.plug_ctrl = RecordingPlugController(lm.plug_ctrl, self)
+        for name, value in mqtt_telemetry.get_telemetry_snapshot().items():
+            self.record_telemetry(name, None, value, at=mqtt_telemetry.get_field_update_at(name))
+        mqtt_telemetry.add_listener(self.record_telemetry)
+
+    def record_config(self, lm: LoadManager) -> None:
+        """Record the settings replay needs to rebuild an equivalent LoadManager."""
+        tesla = getattr(lm.tesla_ctrl, "config", None) if lm.tesla_ctrl is not None else None
+        enabled = lm.enabled if isinstance(lm.enabled, bool) else _encode_time_range(lm.enabled)
+        self._write({
+            "k": "config",
+            "t": _epoch(self._clock.now()),
+            "target_wh": lm.target_wh,
+            "nbc_device": lm.nbc_device,
+            "enabled": enabled,
+            "plugs": [
+                {
+                    "name": p.name, "accessory_id": p.accessory_id,
+                    "power_watts": p.power_watts, "priority": p.priority,
+                    "time_range": _encode_time_range(p.time_range), "sentinel": p.sentinel,
+                }
+                for p in lm.plugs.values()
+            ],
+            "tesla": None if tesla is None else {
+                "home_lat": tesla.home_lat, "home_lon": tesla.home_lon,
+                "home_radius_m": tesla.home_radius_m,
+                "charge_amps_min": tesla.charge_amps_min,
+                "charge_amps_max": tesla.charge_amps_max,
+                "time_range": _encode_time_range(tesla.time_range),
+            },
+        })
+
+    def record_fetch(self, metrics: dict[str, Any] | None) -> None:
+        """Record a fetch result; cached results already recorded are skipped."""
+        if metrics is None:
+            return
+        fetched_at = metrics.get("_fetched_at")
+        data_start = metrics.get("data_start")
+        if fetched_at is None or data_start is None or fetched_at == self._last_fetched_at:
+            return
+        self._last_fetched_at = fetched_at
+        devices = []
+        for device in metrics.get("devices", []):
+            name = device.get("name", "")
+            values = list(device.get("per_second_data") or [])
+            entry = {"n": name, "nbc": device.get("nbc")}
+            entry.update(encode_samples(self._windows.get(name), data_start, values))
+            self._windows[name] = (data_start, values)
+            devices.append(entry)
+        self._write({
+            "k": "fetch",
+            "t": _epoch(fetched_at),
+            "ds": _epoch(data_start),
+            "lag": metrics.get("_data_lag_secs", 0.0),
+            "dev": devices,
+        })
+
+    def wrap_fetch(
+        self, fetch: Callable[[], dict[str, Any] | None]
+    ) -> Callable[[], dict[str, Any] | None]:
+        """Return *fetch* recording each fresh result it returns."""
+
+        def recording_fetch() -> dict[str, Any] | None:
+            metrics = fetch()
+            try:
+                self.record_fetch(metrics)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("replay: failed to record fetch")
+            return metrics
+
+        return recording_fetch
+
+    def record_telemetry(
+        self, name: str, old: Any, new: Any, at: datetime | None = None
+    ) -> None:
+        """Record a telemetry update (``mqtt_telemetry`` listener signature)."""
+        del old
+        self._write({"k": "mqtt", "t": _epoch(at or self._clock.now()), "f": name, "v": new})
+
+    def record_plug(self, name: str, on: bool) -> None:
+        """Record an observed plug state."""
+        self._write({"k": "plug", "t": _epoch(self._clock.now()), "n": name, "on": on})
+
+    def record_command(self, name: str, on: bool, ok: bool) -> None:
+        """Record a plug command issued by the load manager."""
+        self._write({"k": "cmd", "t": _epoch(self._clock.now()), "n": name, "on": on, "ok": ok})
+
+
+class RecordingPlugController(AbstractPlugController):
+    """Delegating plug controller that records state changes and commands.
+
+    A polled state is recorded only when it differs from the last state
+    seen or commanded, i.e. when the plug changed outside load management.
+    """
+
+    def __init__(self, inner: AbstractPlugController, recorder: Recorder) -> None:
+        self._inner = inner
+        self._recorder = recorder
+        self._known: dict[str, bool] = {}
+        self.max_concurrency = inner.max_concurrency
+
+    @property  # type: ignore[override]
+    def plugs(self) -> dict[str, PlugConfig]:
+        """The wrapped controller's plugs (reassigned on config reload)."""
+        return self._inner.plugs
+
+    @plugs.setter
+    def plugs(self, value: dict[str, PlugConfig]) -> None:
+        self._inner.plugs = value
+
+    def backend_for(self, name: str) -> AbstractPlugController:
+        return self._inner.backend_for(name)
+
+    async def get_state(self, name: str) -> bool | None:
+        state = await self._inner.get_state(name)
+        if state is not None and self._known.get(name) != state:
+            self._known[name] = state
+            self._recorder.record_plug(name, state)
+        return state
+
+    async def set_state(self, name: str, on: bool) -> bool:
+        ok = await self._inner.set_state(name, on)
+        if ok:
+            self._known[name] = on
+        self._recorder.record_command(name, on, ok)
+        return ok
+
+    async def disconnect(self) -> None:
+        """Disconnect the wrapped controller, if it holds connections."""
+        disconnect = getattr(self._inner, "disconnect", None)
+        if disconnect is not None:
+            await disconnect()
+
+
+# ── Replay ────────────────────────────────────────────────────────────
+
+
+class _ReplayPlugController(PlugController):
+    """In-memory plug controller whose state can follow the recording."""
+
+    def observe(self, name: str, on: bool) -> None:
+        """Apply a recorded external state change."""
+        if name in self._state:
+            self._state[name] = on
+
+
+@dataclass
+class QHOutcome:
+    """What happened in one quarter-hour of a replay.
+
+    Attributes:
+        start: QH boundary.
+        raw_wh: Recorded net energy once the QH completed (None if the
+            replay ended first).
+        nbc_wh: ``raw_wh`` clamped at zero, the billed NBC.
+        last_predicted_wh: Final prediction a cycle saw for the QH.
+        cycles: Cycles run during the QH.
+        actions: Actions decided during the QH.
+    """
+
+    start: datetime
+    raw_wh: float | None = None
+    nbc_wh: float | None = None
+    last_predicted_wh: float | None = None
+    cycles: int = 0
+    actions: int = 0
+
+
+@dataclass
+class ReplayReport:
+    """Result of :meth:`ReplayDriver.run`.
+
+    ``stage_secs`` sums ``ctx.timings`` per stage over all cycles that
+    reached the stage; ``stage_cycles`` counts those cycles.
+    """
+
+    cycles: int = 0
+    wall_secs: float = 0.0
+    simulated_secs: float = 0.0
+    status_counts: Counter[str] = field(default_factory=Counter)
+    reason_counts: Counter[str] = field(default_factory=Counter)
+    action_counts: Counter[str] = field(default_factory=Counter)
+    stage_secs: dict[str, float] = field(default_factory=dict)
+    stage_cycles: Counter[str] = field(default_factory=Counter)
+    quarters: list[QHOutcome] = field(default_factory=list)
+
+    @property
+    def cycles_per_sec(self) -> float:
+        """Replayed cycles per wall-clock second."""
+        return self.cycles / self.wall_secs if self.wall_secs else 0.0
+
+    @property
+    def speedup(self) -> float:
+        """Simulated seconds per wall-clock second."""
+        return self.simulated_secs / self.wall_secs if self.wall_secs else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for ``--json``."""
+        return {
+            "cycles": self.cycles,
+            "wall_secs": self.wall_secs,
+            "simulated_secs": self.simulated_secs,
+            "cycles_per_sec": self.cycles_per_sec,
+            "speedup": self.speedup,
+            "status_counts": dict(self.status_counts),
+            "reason_counts": dict(self.reason_counts),
+            "action_counts": dict(self.action_counts),
+            "stage_secs": self.stage_secs,
+            "stage_cycles": dict(self.stage_cycles),
+            "quarters": [asdict(qh) for qh in self.quarters],
+        }
+
+
+class ReplayDriver:  # pylint: disable=too-many-instance-attributes
+    """Runs ``LoadManager.run_cycle`` over recorded inputs on simulated time."""
+
+    def __init__(
+        self,
+        records: Iterable[dict[str, Any]],
+        target_wh: int | None = None,
+        hysteresis_wh: int | None = None,
+        pacing: str = "sleep_hint",
+    ) -> None:
+        """Prepare a replay.
+
+        Args:
+            records: Log records in order (see :func:`read_log`).
+            target_wh: Override the recorded target.
+            hysteresis_wh: Override the hysteresis (default: a third of
+                the target, as LoadManager does).
+            pacing: ``"sleep_hint"`` to schedule cycles as the live loop
+                would, or ``"recorded"`` to cycle at each recorded fetch.
+
+        Raises:
+            ValueError: If the log has no ``config`` or ``fetch`` records.
+        """
+        if pacing not in ("sleep_hint", "recorded"):
+            raise ValueError(f"unknown pacing {pacing!r}")
+        self._records = list(records)
+        config = next((r for r in self._records if r["k"] == "config"), None)
+        fetches = [r["t"] for r in self._records if r["k"] == "fetch"]
+        if config is None or not fetches:
+            raise ValueError("log needs a config record and at least one fetch")
+        self._config = config
+        self._fetch_times = fetches
+        self._target_wh = target_wh if target_wh is not None else config["target_wh"]
+        self._hysteresis_wh = hysteresis_wh
+        self._pacing = pacing
+        self._clock = FakeClock(_from_epoch(fetches[0]))
+        self._cache = EnergyCache(ttl_seconds=3600, clock=self._clock)
+        self._current: dict[str, Any] | None = None
+        self._windows: dict[str, tuple[datetime, list[float]]] = {}
+        self._cursor = 0
+        self._plug_ctrl = _ReplayPlugController(self._plugs())
+        self._last_result: CycleResult | None = None
+
+    def _plugs(self) -> dict[str, PlugConfig]:
+        """Return the recorded plug configs, keyed by name."""
+        return {
+            p["name"]: PlugConfig(
+                name=p["name"], accessory_id=p["accessory_id"],
+                power_watts=p["power_watts"], priority=p["priority"],
+                time_range=_decode_time_range(p.get("time_range")),
+                sentinel=p.get("sentinel", False),
+            )
+            for p in self._config["plugs"]
+        }
+
+    def _build_manager(self) -> LoadManager:
+        """Return a LoadManager wired to the replay cache, clock and controllers.
+
+        The Tesla controller and GapMinder amp limits come from the recorded
+        configuration; without a recorded Tesla the defaults apply.
+        """
+        tesla = self._config.get("tesla")
+        tesla_ctrl = None
+        amps_min, amps_max = TESLA_CHARGE_AMPS_MIN_DEFAULT, TESLA_CHARGE_AMPS_MAX_DEFAULT
+        if tesla is not None:
+            amps_min, amps_max = tesla["charge_amps_min"], tesla["charge_amps_max"]
+            tesla_ctrl = TeslaController(TeslaConfig(
+                client_id="replay", client_secret="replay", redirect_uri="", vehicle_id="replay",
+                home_lat=tesla["home_lat"], home_lon=tesla["home_lon"],
+                home_radius_m=tesla["home_radius_m"],
+                time_range=_decode_time_range(tesla.get("time_range")),
+                charge_amps_min=amps_min,
+                charge_amps_max=amps_max,
+            ))
+        hysteresis = self._hysteresis_wh
+        if hysteresis is None:
+            hysteresis = int(abs(self._target_wh) / 3)
+        enabled = self._config.get("enabled", True)
+        lm = LoadManager(LoadManagerConfig(
+            metrics_fetch=self._metrics_fetch,
+            energy_cache=self._cache,
+            plug_ctrl=self._plug_ctrl,
+            tesla_ctrl=tesla_ctrl,
+            engine=GapMinder(
+                hysteresis_wh=hysteresis, charge_amps_min=amps_min, charge_amps_max=amps_max,
+            ),
+            target_wh=self._target_wh,
+            nbc_device=self._config["nbc_device"],
+            enabled=enabled if isinstance(enabled, bool) else _decode_time_range(enabled),
+            dry_run=False,
+            clock=self._clock,
+        ))
+        # LoadManager reads tesla_config from the environment; use the recorded one.
+        if tesla_ctrl is not None:
+            lm.tesla_config = tesla_ctrl.config
+        return lm
+
+    def _metrics_fetch(self) -> dict[str, Any] | None:
+        current = self._current
+        return self._cache.get_or_fetch(
+            lambda: dict(current) if current is not None else None,
+            self._clock.now(),
+            force=True,
+            skip_unchanged=True,
+            caller="replay",
+        )[0]
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        kind = record["k"]
+        at = _from_epoch(record["t"])
+        if kind == "fetch":
+            data_start = _from_epoch(record["ds"])
+            devices = []
+            for dev in record["dev"]:
+                values = decode_samples(self._windows.get(dev["n"]), dev)
+                self._windows[dev["n"]] = (data_start, values)
+                devices.append({"name": dev["n"], "nbc": dev["nbc"], "per_second_data": values})
+            self._current = {
+                "devices": devices,
+                "data_start": data_start,
+                "_fetched_at": at,
+                "_data_lag_secs": record["lag"],
+            }
+        elif kind == "mqtt":
+            mqtt_telemetry.apply_update(record["f"], record["v"], at=at)
+        elif kind == "plug":
+            self._plug_ctrl.observe(record["n"], record["on"])
+
+    def _advance_to(self, now: datetime) -> None:
+        """Apply every record up to and including *now*."""
+        limit = _epoch(now)
+        while self._cursor < len(self._records) and self._records[self._cursor]["t"] <= limit:
+            self._apply(self._records[self._cursor])
+            self._cursor += 1
+
+    def _next_wake(self, now: datetime, until: datetime) -> datetime:
+        """Return the first charge-transition wake-up in (now, until], or *until*."""
+        last: dict[str, Any] = mqtt_telemetry.get_telemetry_snapshot()
+        lo, hi = _epoch(now), _epoch(until)
+        for record in self._records[self._cursor:]:
+            if record["t"] > hi:
+                break
+            if record["k"] != "mqtt" or record["t"] <= lo:
+                continue
+            if mqtt_telemetry.is_charge_transition(record["f"], last.get(record["f"]), record["v"]):
+                wake = _from_epoch(record["t"]) + timedelta(seconds=LOAD_WAKE_DEBOUNCE_SECS)
+                return min(until, max(wake, now + timedelta(seconds=LOAD_WAKE_MIN_SPACING_SECS)))
+            last[record["f"]] = record["v"]
+        return until
+
+    def _schedule(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        if self._pacing == "recorded":
+            for ts in self._fetch_times:
+                if start <= _from_epoch(ts) < end:
+                    yield _from_epoch(ts)
+            return
+        now = start
+        while now < end:
+            yield now
+            result = self._last_result
+            interval = float(result.sleep_hint) if result is not None else 30.0
+            if result is None or result.status != "disabled":
+                interval = self._cache.sleep_interval_adjust(interval, now)
+            interval = max(interval, MIN_REPLAY_INTERVAL_SECS)
+            now = self._next_wake(now, now + timedelta(seconds=interval))
+
+    def run(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> ReplayReport:
+        """Replay the records between *start* and *end*.
+
+        Records before *start* are still applied, so the cache, sample
+        decoding and telemetry are warm when the first cycle runs.
+
+        Args:
+            start: First cycle time; defaults to the first fetch.
+            end: Stop before this time; defaults to just after the last fetch.
+        """
+        first, last = _from_epoch(self._fetch_times[0]), _from_epoch(self._fetch_times[-1])
+        start = max(_as_utc(start) if start else first, first)
+        after_last = last + timedelta(microseconds=1)
+        end = min(_as_utc(end), after_last) if end else after_last
+        report = ReplayReport()
+        quarters: dict[datetime, QHOutcome] = {}
+        mqtt_telemetry.reset_state()
+        lm = self._build_manager()
+        wall_start = _time_mod.perf_counter()
+        try:
+            for now in self._schedule(start, end):
+                self._clock.set(now)
+                self._advance_to(now)
+                result = lm.run_cycle()
+                self._last_result = result
+                self._tally(report, quarters, lm, result, now)
+            report.wall_secs = _time_mod.perf_counter() - wall_start
+        finally:
+            lm.close()
+            mqtt_telemetry.reset_state()
+        report.simulated_secs = (self._clock.now() - start).total_seconds()
+        for period in self._cache.completed_periods or []:
+            self._record_period(quarters, period.start, period.raw_wh)
+        report.quarters = [quarters[k] for k in sorted(quarters)]
+        return report
+
+    def _tally(
+        self,
+        report: ReplayReport,
+        quarters: dict[datetime, QHOutcome],
+        lm: LoadManager,
+        result: CycleResult,
+        now: datetime,
+    ) -> None:
+        report.cycles += 1
+        report.status_counts[result.status] += 1
+        if result.diagnostics is not None:
+            report.reason_counts[result.diagnostics.reason] += 1
+        for action in result.actions:
+            report.action_counts[f"{action.device_name}:{action.action}"] += 1
+        for stage, secs in lm.last_cycle_timings.items():
+            report.stage_secs[stage] = report.stage_secs.get(stage, 0.0) + secs
+            report.stage_cycles[stage] += 1
+        qh = quarters.setdefault(floor_to_qh(now), QHOutcome(start=floor_to_qh(now)))
+        qh.cycles += 1
+        qh.actions += len(result.actions)
+        if result.predicted_wh is not None:
+            qh.last_predicted_wh = result.predicted_wh
+        for period in self._cache.completed_periods or []:
+            self._record_period(quarters, period.start, period.raw_wh)
+
+    @staticmethod
+    def _record_period(
+        quarters: dict[datetime, QHOutcome], start: datetime, raw_wh: float
+    ) -> None:
+        start = start.astimezone(timezone.utc)
+        qh = quarters.setdefault(start, QHOutcome(start=start))
+        qh.raw_wh = raw_wh
+        qh.nbc_wh = max(raw_wh, 0.0)
+
+
+def _print_report(report: ReplayReport) -> None:
+    print(f"cycles {report.cycles} in {report.wall_secs:.2f}s wall "
+          f"({report.cycles_per_sec:.0f} cycles/s, {report.speedup:.0f}x real time)")
+    print("stage timings (mean ms per cycle reaching the stage):")
+    for stage, secs in sorted(report.stage_secs.items(), key=lambda kv: -kv[1]):
+        print(f"  {stage:<24} {secs / report.stage_cycles[stage] * 1000:8.3f}  x{report.stage_cycles[stage]}")
+    print("status:", dict(report.status_counts.most_common()))
+    print("reasons:", dict(report.reason_counts.most_common()))
+    print("actions:", dict(report.action_counts.most_common()))
+    print("quarter-hours (UTC start, NBC Wh, raw Wh, last prediction, cycles, actions):")
+    for qh in report.quarters:
+        raw = "-" if qh.raw_wh is None else f"{qh.raw_wh:.1f}"
+        nbc = "-" if qh.nbc_wh is None else f"{qh.nbc_wh:.1f}"
+        pred = "-" if qh.last_predicted_wh is None else f"{qh.last_predicted_wh:.1f}"
+        print(f"  {qh.start:%Y-%m-%d %H:%M}  {nbc:>8}  {raw:>8}  {pred:>8}  {qh.cycles:4d}  {qh.actions:3d}")
+    total = sum(qh.nbc_wh for qh in report.quarters if qh.nbc_wh is not None)
+    print(f"total NBC {total:.1f} Wh")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser for replaying a recorded log."""
+    parser = argparse.ArgumentParser(description="Replay a recorded load-management log")
+    parser.add_argument("log", type=Path, help="log written with LOAD_RECORD_PATH")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="first cycle (ISO 8601)")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="stop before (ISO 8601)")
+    parser.add_argument("--target-wh", type=int, help="override the recorded target")
+    parser.add_argument("--hysteresis-wh", type=int, help="override the hysteresis")
+    parser.add_argument(
+        "--pacing", choices=("sleep_hint", "recorded"), default="sleep_hint",
+        help="schedule cycles by sleep_hint (default) or at recorded fetch times",
+    )
+    parser.add_argument("--json", type=Path, help="also write the report here as JSON")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Replay a log and print the report."""
+    args = _build_parser().parse_args(argv)
+    driver = ReplayDriver(
+        read_log(args.log), target_wh=args.target_wh,
+        hysteresis_wh=args.hysteresis_wh, pacing=args.pacing,
+    )
+    report = driver.run(args.start, args.end)
+    _print_report(report)
+    if args.json:
+        args.json.write_text(
+            json.dumps(report.to_dict(), default=custom_json_default, indent=2) + "\n",
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    # Cycles log at INFO and WARNING; keep the replay output readable.
+    logging.basicConfig(level=logging.ERROR, format="%(levelname)s %(message)s")
+    main()
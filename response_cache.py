@@ -0,0 +1,111 @@
+"""Memoized response bodies for endpoints polled faster than data changes.
+
+Home-automation pollers request ``/`` every few seconds, but its body only
+changes when the energy cache swaps snapshots, a load cycle completes, or
+the recalculated ``lag`` crosses a bucket boundary.  ``ResponseCache``
+keeps the rendered bytes per key (built from those generation numbers,
+the representation and the lag bucket) together with a strong ETag, so
+repeat requests skip enrichment, ``camelize`` and rendering and
+conditional requests get ``304 Not Modified``.
+
+Each entry also remembers the objects it was rendered from; a lookup only
+hits while the caller passes the very same objects, so swapping state
+without bumping a generation (tests, mocks) can never serve a stale body.
+
+Usage::
+
+    from response_cache import ResponseCache
+
+    cache = ResponseCache()
+    cached = cache.get(key, inputs)
+    if cached is None:
+        cached = cache.put(key, inputs, render(), "application/json")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from constants import RESPONSE_CACHE_MAX_ENTRIES
+
+
+@dataclass(frozen=True, slots=True)
+class CachedBody:
+    """A rendered response body.
+
+    Attributes:
+        body: Encoded response body.
+        etag: Strong ETag derived from *body*.
+        mimetype: Response content type.
+    """
+
+    body: bytes
+    etag: str
+    mimetype: str
+
+
+class ResponseCache:
+    """Thread-safe LRU of rendered bodies keyed by state generations."""
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_MAX_ENTRIES) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Entries kept before the least recently used is dropped.
+        """
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[tuple[Any, ...], CachedBody]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, inputs: tuple[Any, ...]) -> CachedBody | None:
+        """Return the body stored for *key* if it was built from *inputs*.
+
+        Args:
+            key: Generations, representation and lag bucket.
+            inputs: Objects the body was rendered from, compared by identity.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or len(entry[0]) != len(inputs) or any(
+                a is not b for a, b in zip(entry[0], inputs)
+            ):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(
+        self, key: Hashable, inputs: tuple[Any, ...], body: bytes, mimetype: str
+    ) -> CachedBody:
+        """Store a freshly rendered body and return it with its ETag.
+
+        Args:
+            key: As for :meth:`get`.
+            inputs: As for :meth:`get`.
+            body: Encoded response body.
+            mimetype: Response content type.
+        """
+        cached = CachedBody(
+            body=body,
+            etag=hashlib.blake2b(body, digest_size=16).hexdigest(),
+            mimetype=mimetype,
+        )
+        with self._lock:
+            self._entries[key] = (inputs, cached)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return cached
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,157 @@
+"""Immutable array-backed window of per-second samples.
+
+``EnergyCacheData`` snapshots are shared between the Flask request threads
+and the LoadManager thread, so their samples must never change after they
+are published.  ``SampleWindow`` stores the values once in an
+``array('d')`` (8 bytes per sample instead of a boxed float per list slot)
+and hands out views instead of copies:
+
+* contiguous slices (``window[900:]``) are new windows over the same
+  buffer — dropping compacted quarter-hours costs O(1);
+* :meth:`SampleWindow.view` exposes a read-only ``memoryview``;
+* :meth:`SampleWindow.total` sums a range once per buffer and memoizes it,
+  so the quarter-hour sums recomputed on every ``get_current_qh`` call are
+  O(1) after the first.  Sums are computed with the builtin ``sum`` over the
+  same values in the same order, so they match ``sum(list)`` bit for bit
+  (float prefix-sum differences would not).
+
+Usage::
+
+    from sample_window import SampleWindow
+
+    window = SampleWindow(per_second_values)
+    qh = window[900:1800]          # zero-copy
+    raw_wh = 1000.0 * qh.total()   # memoized
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, cast, overload
+
+
+class SampleWindow(Sequence[float]):
+    """Read-only sequence of floats backed by a shared ``array('d')``.
+
+    Compares equal to any list, tuple or window holding the same values, so
+    it can stand in for the ``list[float]`` it replaces.  The backing array
+    is never mutated once constructed; build a new window with
+    :meth:`extended` instead.
+    """
+
+    __slots__ = ("_buf", "_start", "_stop", "_sums")
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        """Copy *values* into a new backing array.
+
+        Args:
+            values: Per-second sample values.
+        """
+        self._buf = array("d", values)
+        self._start = 0
+        self._stop = len(self._buf)
+        # Memoized range sums keyed by absolute buffer positions; shared by
+        # every view of the same buffer.
+        self._sums: dict[tuple[int, int], float] = {}
+
+    @classmethod
+    def of(cls, values: Iterable[float]) -> SampleWindow:
+        """Return *values* as a window, without copying if it already is one."""
+        if isinstance(values, SampleWindow):
+            return values
+        return cls(values)
+
+    def _view_of(self, start: int, stop: int) -> SampleWindow:
+        window = SampleWindow.__new__(SampleWindow)
+        window._buf = self._buf
+        window._start = start
+        window._stop = stop
+        window._sums = self._sums
+        return window
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> float: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> SampleWindow: ...
+
+    def __getitem__(self, index: int | slice) -> float | SampleWindow:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return SampleWindow(self.view()[start:stop:step])
+            stop = max(start, stop)
+            return self._view_of(self._start + start, self._start + stop)
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("SampleWindow index out of range")
+        return self._buf[self._start + index]
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.view())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SampleWindow):
+            return len(self) == len(other) and self.view() == other.view()
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and self.tolist() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"SampleWindow({self.tolist()!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (SampleWindow, (self.tolist(),))
+
+    def view(self) -> memoryview:
+        """Return a read-only, zero-copy ``memoryview`` of the samples."""
+        return memoryview(self._buf)[self._start:self._stop].toreadonly()
+
+    def tolist(self) -> list[float]:
+        """Return the samples as a new list."""
+        return cast(list[float], self.view().tolist())
+
+    def total(self, start: int = 0, stop: int | None = None) -> float:
+        """Return ``sum(self[start:stop])``, memoized per buffer range.
+
+        Args:
+            start: First index (relative to this window).
+            stop: End index (exclusive); defaults to the window length.
+
+        Returns:
+            The sum, identical to the builtin ``sum`` over the same slice.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        key = (self._start + start, self._start + max(start, stop))
+        cached = self._sums.get(key)
+        if cached is None:
+            cached = sum(memoryview(self._buf)[key[0]:key[1]])
+            self._sums[key] = cached
+        return cached
+
+    def extended(self, tail: Iterable[float], at: int) -> SampleWindow:
+        """Return a new window of ``self[:at]`` followed by *tail*.
+
+        Args:
+            tail: Samples that continue the window from index *at*.
+            at: Number of leading samples of this window to keep.
+
+        Returns:
+            A window over a new backing array.
+        """
+        head = self[:at]
+        window = SampleWindow.__new__(SampleWindow)
+        window._buf = head._buf[head._start:head._stop]
+        window._buf.extend(tail)
+        window._start = 0
+        window._stop = len(window._buf)
+        window._sums = {}
+        return window
@@ -2,86 +2,491 @@
 
 Provides SSEBroadcaster for pub/sub event distribution and event_stream
 generator for Flask-compatible SSE output.
+
+Each published event is JSON-encoded exactly once into an immutable
+``SSEFrame`` carrying a monotonically increasing event id; the same frame
+object (and its bytes) is fanned out to every subscriber, so the
+per-client cost of an event is a queue append and a socket write.
+
+The broadcaster also keeps the last few frames in a replay ring.  A
+reconnecting client that sends ``Last-Event-ID`` is handed only the frames
+it missed (see ``SSEBroadcaster.resume``).  Wire ids are ``<epoch>-<n>``
+with a random per-broadcaster epoch, so ids from before a restart (or from
+another gunicorn worker) are never mistaken for local ones.
+
+Subscribers may select event types and a minimum interval per type
+(``StreamFilter``).  A ``Subscription`` delivers throttled types — and
+every type once its queue is full — coalesced to the latest frame per
+type, so slow or throttled clients hold at most one pending frame per
+type instead of being evicted.
+
+Usage::
+
+    broadcaster = SSEBroadcaster(dumper=app.json.dumps)
+    broadcaster.publish("load_cycle", payload)
+    stream_filter = StreamFilter.from_query(request.args)
+    last_event_id = request.headers.get("Last-Event-ID")
+    return Response(event_stream(broadcaster, last_event_id=last_event_id,
+                                 bootstrap=build_initial, stream_filter=stream_filter), ...)
 """
 
 from __future__ import annotations
 
 import json
+import math
 import queue
+import secrets
 import threading
-from datetime import datetime, timezone
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
 from typing import Any
 
+from instrumentation import SSE_BYTES_SENT, SSE_EVICTIONS
+
+HEARTBEAT_FRAME = b"event: heartbeat\ndata: {}\n\n"
+
+
+def encode_frame(event: str, data: str, event_id: str | None = None) -> bytes:
+    """Return the UTF-8 wire encoding of one SSE event.
+
+    Args:
+        event: SSE event type.
+        data: Already-serialized JSON payload (must not contain newlines).
+        event_id: Optional ``id:`` field; omitted when None.
+
+    Returns:
+        ``[id: N\n]event: NAME\ndata: JSON\n\n`` as bytes.
+    """
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {data}\n\n".encode("utf-8")
+
+
+@dataclass(frozen=True, slots=True)
+class SSEFrame:
+    """One published event, encoded once and shared by all subscribers.
+
+    Attributes:
+        id: Broadcaster-assigned event id, increasing by one per publish.
+        event: SSE event type.
+        frame: Complete wire encoding, including the ``<epoch>-<id>`` line.
+        keyframe: Self-contained encoding of the same event, sent instead of
+            ``frame`` to a subscriber that skipped earlier frames of this
+            type (``frame`` may be a delta); None when ``frame`` already is.
+    """
+
+    id: int
+    event: str
+    frame: bytes
+    keyframe: bytes | None = None
+
+
+@dataclass(frozen=True)
+class StreamFilter:
+    """Per-subscriber event selection and rate limit.
+
+    Attributes:
+        events: Event types delivered; None delivers all.
+        intervals: Minimum seconds between deliveries, per event type.
+        default_interval: Minimum seconds for types not in *intervals*.
+    """
+
+    events: frozenset[str] | None = None
+    intervals: Mapping[str, float] = field(default_factory=dict)
+    default_interval: float = 0.0
+
+    @classmethod
+    def from_query(cls, args: Mapping[str, str]) -> StreamFilter | None:
+        """Build a filter from ``/stream/status`` query parameters.
+
+        ``events=load_cycle,metrics_update`` selects event types;
+        ``interval=60`` sets one minimum interval for all types and
+        ``interval=load_cycle:60,metrics_update:10`` sets it per type.
+
+        Args:
+            args: Query parameters (e.g. ``request.args``).
+
+        Returns:
+            The filter, or None when neither parameter is given.
+
+        Raises:
+            ValueError: On an empty selection or a malformed interval.
+        """
+        events_arg = args.get("events")
+        interval_arg = args.get("interval")
+        if events_arg is None and interval_arg is None:
+            return None
+        events: frozenset[str] | None = None
+        if events_arg is not None:
+            events = frozenset(e.strip() for e in events_arg.split(",") if e.strip())
+            if not events:
+                raise ValueError("events must name at least one event type")
+        intervals: dict[str, float] = {}
+        default_interval = 0.0
+        for part in (interval_arg or "").split(","):
+            if not part.strip():
+                continue
+            name, sep, secs = part.rpartition(":")
+            value = float(secs)
+            if value < 0 or not math.isfinite(value):
+                raise ValueError(f"invalid interval: {part!r}")
+            if sep:
+                intervals[name.strip()] = value
+            else:
+                default_interval = value
+        return cls(events=events, intervals=intervals, default_interval=default_interval)
+
+    def accepts(self, event: str) -> bool:
+        """Return True when *event* is selected."""
+        return self.events is None or event in self.events
+
+    def interval(self, event: str) -> float:
+        """Return the minimum seconds between deliveries of *event*."""
+        return self.intervals.get(event, self.default_interval)
+
+
+class Subscription:
+    """One subscriber's delivery state: a bounded FIFO plus coalescing.
+
+    Frames of a type that is not due yet (rate limit) or that arrive while
+    the FIFO is full are parked as the latest pending frame of their type,
+    replacing any older one. Pending frames are released once due and the
+    FIFO has room; a frame that replaced others is released as its
+    keyframe. Memory per subscriber is therefore bounded by *maxsize* plus
+    one frame per event type.
+    """
+
+    def __init__(
+        self,
+        stream_filter: StreamFilter | None = None,
+        maxsize: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty subscription.
+
+        Args:
+            stream_filter: Event selection and rate limits; None = all.
+            maxsize: FIFO length before frames coalesce.
+            clock: Monotonic time source, in seconds.
+        """
+        self._filter = stream_filter
+        self._maxsize = maxsize
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._fifo: deque[bytes] = deque()
+        self._pending: dict[str, SSEFrame] = {}
+        self._skipped: set[str] = set()
+        self._next_due: dict[str, float] = {}
+
+    @property
+    def stream_filter(self) -> StreamFilter | None:
+        """Return the subscriber's filter."""
+        return self._filter
+
+    def offer(self, sse_frame: SSEFrame) -> None:
+        """Queue *sse_frame* for delivery, coalescing if throttled or full."""
+        event = sse_frame.event
+        if self._filter is not None and not self._filter.accepts(event):
+            return
+        with self._cond:
+            now = self._clock()
+            if (
+                event in self._pending
+                or now < self._next_due.get(event, now)
+                or len(self._fifo) >= self._maxsize
+            ):
+                if event in self._pending:
+                    self._skipped.add(event)
+                    SSE_EVICTIONS.inc()
+                self._pending[event] = sse_frame
+            else:
+                self._deliver(sse_frame, now)
+            self._cond.notify()
+
+    def _deliver(self, sse_frame: SSEFrame, now: float) -> None:
+        """Append *sse_frame* to the FIFO. Caller holds ``_cond``."""
+        event = sse_frame.event
+        data = sse_frame.frame
+        if event in self._skipped:
+            self._skipped.discard(event)
+            data = sse_frame.keyframe or data
+        self._fifo.append(data)
+        if self._filter is not None:
+            interval = self._filter.interval(event)
+            if interval:
+                self._next_due[event] = now + interval
+
+    def _release_due(self, now: float) -> float | None:
+        """Move due pending frames to the FIFO. Caller holds ``_cond``.
+
+        Returns:
+            Seconds until the next pending frame is due, or None.
+        """
+        wait: float | None = None
+        for event, sse_frame in list(self._pending.items()):
+            if len(self._fifo) >= self._maxsize:
+                break
+            due = self._next_due.get(event, now)
+            if due <= now:
+                del self._pending[event]
+                self._deliver(sse_frame, now)
+            elif wait is None or due - now < wait:
+                wait = due - now
+        return wait
+
+    def poll(self) -> list[bytes]:
+        """Return every payload ready now, without blocking."""
+        with self._cond:
+            self._release_due(self._clock())
+            ready = list(self._fifo)
+            self._fifo.clear()
+            self._release_due(self._clock())
+            ready.extend(self._fifo)
+            self._fifo.clear()
+            return ready
+
+    def next_due_in(self) -> float | None:
+        """Return seconds until a parked frame becomes due, or None."""
+        with self._cond:
+            return self._release_due(self._clock())
+
+    def get(self, timeout: float) -> bytes:
+        """Return the next payload, blocking up to *timeout* seconds.
+
+        Raises:
+            queue.Empty: If nothing became ready in time.
+        """
+        deadline = self._clock() + timeout
+        with self._cond:
+            while True:
+                now = self._clock()
+                wait = self._release_due(now)
+                if self._fifo:
+                    return self._fifo.popleft()
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise queue.Empty
+                self._cond.wait(remaining if wait is None else min(wait, remaining))
+
+    def qsize(self) -> int:
+        """Return the number of payloads ready in the FIFO."""
+        with self._cond:
+            return len(self._fifo)
+
 
 class SSEBroadcaster:
     """Thread-safe pub/sub for SSE events.
 
-    Each subscriber gets a queue.Queue. The background loop pumps events
-    into all subscriber queues; each SSE generator reads from its own queue
-    and formats SSE frames.
+    Each subscriber gets a ``Subscription``. The background loop publishes
+    events; the broadcaster serializes each one once into an ``SSEFrame``
+    and offers that same frame to every subscription. Each SSE generator
+    reads from its own subscription and writes the bytes as is.
 
     Attributes:
-        maxsize: Maximum items per subscriber queue (default 64).
-            Slow clients that fill their queue are evicted automatically.
+        maxsize: Frames queued per subscriber before coalescing (default 64).
+        replay_size: Number of recent frames kept for ``resume`` (default 64).
     """
 
-    def __init__(self, maxsize: int = 64) -> None:
+    def __init__(
+        self,
+        maxsize: int = 64,
+        dumper: Callable[[Any], str] = json.dumps,
+        replay_size: int = 64,
+        epoch: str | None = None,
+    ) -> None:
         """Initialize the broadcaster.
 
         Args:
-            maxsize: Maximum items per subscriber queue.
+            maxsize: Frames queued per subscriber before coalescing.
+            dumper: JSON serialization function (default json.dumps). Pass
+                app.json.dumps (or an equivalent) when payloads contain
+                datetimes or timedeltas.
+            replay_size: Number of recent frames kept for replay.
+            epoch: Wire-id prefix; random by default.
         """
         self._maxsize = maxsize
-        self._subscribers: set[queue.Queue] = set()
+        self._dumper = dumper
+        self._epoch = epoch if epoch is not None else secrets.token_hex(4)
+        self._subscribers: set[Subscription] = set()
         self._lock = threading.Lock()
+        self._last_id = 0
+        self._replay: deque[SSEFrame] = deque(maxlen=replay_size)
+        self._listeners: list[Callable[[SSEFrame], None]] = []
+        self._published: dict[str, object] = {}
 
-    def subscribe(self) -> queue.Queue:
+    def subscribe(self, stream_filter: StreamFilter | None = None) -> Subscription:
         """Register a new subscriber.
 
+        Args:
+            stream_filter: Event selection and rate limits; None = all.
+
+        Returns:
+            A Subscription that receives published events.
+        """
+        sub = Subscription(stream_filter, maxsize=self._maxsize)
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        """Remove a subscriber.
+
+        Args:
+            sub: The subscription to remove.
+        """
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def resume(
+        self,
+        last_event_id: str | None,
+        stream_filter: StreamFilter | None = None,
+    ) -> Subscription | None:
+        """Subscribe a reconnecting client, replaying the frames it missed.
+
+        Args:
+            last_event_id: The client's ``Last-Event-ID`` header value.
+            stream_filter: Event selection and rate limits; None = all.
+                Replayed frames are filtered and coalesced like live ones.
+
+        Returns:
+            A subscription holding every (selected) frame published after
+            *last_event_id*, or None when the id is missing, foreign (other
+            epoch), or older than the replay ring — the caller must then
+            bootstrap the client with full state and ``subscribe()``.
+        """
+        seen = self.parse_event_id(last_event_id)
+        if seen is None:
+            return None
+        sub = Subscription(stream_filter, maxsize=self._maxsize)
+        with self._lock:
+            missed = self._frames_after(seen)
+            if missed is None:
+                return None
+            for sse_frame in missed:
+                sub.offer(sse_frame)
+            self._subscribers.add(sub)
+        return sub
+
+    def frames_since(self, last_event_id: str | None) -> list[SSEFrame] | None:
+        """Return the frames published after *last_event_id*.
+
+        Args:
+            last_event_id: A wire id from this broadcaster.
+
+        Returns:
+            The missed frames in order (possibly empty), or None when the id
+            is missing, foreign, or no longer covered by the replay ring.
+        """
+        seen = self.parse_event_id(last_event_id)
+        if seen is None:
+            return None
+        with self._lock:
+            return self._frames_after(seen)
+
+    def _frames_after(self, seen: int) -> list[SSEFrame] | None:
+        """Return ring frames with id > *seen*, or None on a gap. Caller holds ``_lock``."""
+        if seen > self._last_id:
+            return None
+        missed = [f for f in self._replay if f.id > seen]
+        if len(missed) != self._last_id - seen:
+            return None
+        return missed
+
+    def parse_event_id(self, event_id: str | None) -> int | None:
+        """Return the sequence number of a wire id, or None if not ours."""
+        if not event_id:
+            return None
+        epoch, _, seq = event_id.strip().partition("-")
+        if epoch != self._epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    @property
+    def last_event_id(self) -> str:
+        """Return the wire id of the most recently published event.
+
+        Before the first publish this is ``<epoch>-0``, which resumes to
+        "every frame since startup".
+        """
+        with self._lock:
+            return self._wire_id(self._last_id)
+
+    def snapshot(self) -> tuple[str, dict[str, object]]:
+        """Return the last event id and the state published up to it.
+
+        Bootstrap events built from the returned payloads are consistent
+        with the id they are tagged with, so resuming from it neither
+        repeats nor skips anything a delta event carries.
+
         Returns:
-            A queue.Queue that receives published events.
+            ``(wire_id, published)``, where *published* maps each event
+            type to its latest self-contained payload (the keyframe when
+            one was given, else the data).
         """
-        q: queue.Queue = queue.Queue(maxsize=self._maxsize)
         with self._lock:
-            self._subscribers.add(q)
-        return q
+            return self._wire_id(self._last_id), dict(self._published)
+
+    def add_listener(self, listener: Callable[[SSEFrame], None]) -> None:
+        """Call *listener* with every published frame, in id order.
 
-    def unsubscribe(self, q: queue.Queue) -> None:
-        """Remove a subscriber queue.
+        Listeners run under the broadcaster lock on the publishing thread,
+        so they must only hand the frame off (e.g. ``call_soon_threadsafe``).
 
         Args:
-            q: The queue to remove.
+            listener: Callable receiving each ``SSEFrame``.
         """
         with self._lock:
-            self._subscribers.discard(q)
+            self._listeners.append(listener)
 
-    def publish(self, event: str, data: object) -> int:
+    def remove_listener(self, listener: Callable[[SSEFrame], None]) -> None:
+        """Stop calling *listener*; unknown listeners are ignored."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _wire_id(self, seq: int) -> str:
+        """Return the ``id:`` field value for sequence number *seq*."""
+        return f"{self._epoch}-{seq}"
+
+    def publish(self, event: str, data: object, keyframe: object = None) -> int:
         """Publish a named SSE event to all subscribers.
 
-        Subscribers whose queues are full are evicted automatically.
+        The payload is serialized once, outside the lock; the id is assigned
+        and the frame fanned out under the lock, so every subscriber sees
+        ids in increasing order. The frame is also kept in the replay ring.
 
         Args:
             event: SSE event type (e.g. "load_cycle", "metrics_update").
             data: JSON-serializable payload.
+            keyframe: Optional self-contained payload for subscribers that
+                skipped earlier frames of this type, when *data* is a delta.
 
         Returns:
-            Number of subscribers that received the event.
+            Number of subscribers the event was offered to.
         """
-        payload: dict[str, object] = {
-            "event": event,
-            "data": data,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
-        dead: list[queue.Queue] = []
+        body = self._dumper(data)
+        key_body = self._dumper(keyframe) if keyframe is not None else None
         with self._lock:
-            for q in self._subscribers:
-                try:
-                    q.put_nowait(payload)
-                except queue.Full:
-                    dead.append(q)
-            for q in dead:
-                self._subscribers.discard(q)
-        return len(self._subscribers)
+            self._last_id += 1
+            wire_id = self._wire_id(self._last_id)
+            sse_frame = SSEFrame(
+                id=self._last_id,
+                event=event,
+                frame=encode_frame(event, body, wire_id),
+                keyframe=(
+                    encode_frame(event, key_body, wire_id)
+                    if key_body is not None else None
+                ),
+            )
+            self._replay.append(sse_frame)
+            self._published[event] = keyframe if keyframe is not None else data
+            for listener in self._listeners:
+                listener(sse_frame)
+            for sub in self._subscribers:
+                sub.offer(sse_frame)
+            return len(self._subscribers)
 
     def subscriber_count(self) -> int:
         """Return the current number of subscribers."""
@@ -94,9 +499,15 @@ def event_stream(
     timeout: int = 30,
     initial_events: list[tuple[str, object]] | None = None,
     dumper: Any = json.dumps,
+    last_event_id: str | None = None,
+    bootstrap: Callable[[dict[str, object]], list[tuple[str, object]]] | None = None,
+    stream_filter: StreamFilter | None = None,
 ) -> Any:
     """Generator yielding SSE-formatted frames from a broadcaster.
 
+    Nothing is registered with the broadcaster until the generator is first
+    advanced, so a response that is never iterated leaks no subscription.
+
     Args:
         broadcaster: The SSEBroadcaster instance.
         timeout: Seconds before emitting a heartbeat when queue is idle.
@@ -109,26 +520,45 @@ def event_stream(
             with the current state.
         dumper: JSON serialization function (default json.dumps). Pass
             app.json.dumps when using Flask's custom JSON encoder.
+        last_event_id: The client's ``Last-Event-ID``; when the replay ring
+            still covers it, only the missed frames are sent and the initial
+            events are skipped.
+        bootstrap: Builds the initial events lazily, only when the client
+            cannot resume (used when *initial_events* is None).  Given the
+            payloads published up to the snapshot id (see
+            ``SSEBroadcaster.snapshot``).
+        stream_filter: Event selection and rate limits; None = all.
 
     Yields:
-        SSE-formatted text frames: "event: NAME\\ndata: JSON\\n\\n"
+        UTF-8 SSE frames: b"id: E-N\\nevent: NAME\\ndata: JSON\\n\\n".
+        Initial events carry the id of the last broadcast before the
+        snapshot, so a client reconnecting before the next broadcast can
+        resume; broadcast events are the broadcaster's pre-encoded frames.
     """
-    if initial_events:
-        for event_name, data in initial_events:
-            yield f"event: {event_name}\ndata: {dumper(data)}\n\n"
-
-    q = broadcaster.subscribe()
+    bytes_sent = SSE_BYTES_SENT.labels("flask")
+    sub = broadcaster.resume(last_event_id, stream_filter) if last_event_id else None
+    if sub is None:
+        snapshot_id, published = broadcaster.snapshot()
+        if initial_events is None and bootstrap is not None:
+            initial_events = bootstrap(published)
+        for event_name, data in initial_events or ():
+            payload = encode_frame(event_name, dumper(data), snapshot_id)
+            bytes_sent.inc(len(payload))
+            yield payload
+        # Resuming from the snapshot id also delivers anything published
+        # while the initial events were being built and sent.
+        sub = broadcaster.resume(snapshot_id, stream_filter)
+        if sub is None:
+            sub = broadcaster.subscribe(stream_filter)
     try:
         while True:
             try:
-                payload = q.get(timeout=timeout)
-                yield (
-                    f"event: {payload['event']}\n"
-                    f"data: {dumper(payload['data'])}\n\n"
-                )
+                payload = sub.get(timeout=timeout)
             except queue.Empty:
-                yield "event: heartbeat\ndata: {}\n\n"
+                payload = HEARTBEAT_FRAME
+            bytes_sent.inc(len(payload))
+            yield payload
     except GeneratorExit:
         pass
     finally:
-        broadcaster.unsubscribe(q)
+        broadcaster.unsubscribe(sub)
@@ -0,0 +1,357 @@
+"""Event-driven SSE server: many stream clients on one asyncio loop.
+
+Under gunicorn's gthread worker every ``/stream/status`` client holds a
+request thread blocked in ``queue.get`` for as long as it stays connected,
+so a few open dashboard tabs starve ``/``, ``/health`` and the API routes.
+
+``SSEStreamServer`` serves the same stream from a single
+``EventLoopThread`` on its own port.  It attaches to the ``SSEBroadcaster``
+once, as a listener, and writes each pre-encoded frame to every client's
+non-blocking transport: a client costs a transport and one idle task, not
+a thread.  Each client has a ``Subscription`` honouring its ``events`` /
+``interval`` query parameters; while a client's unsent output exceeds
+``SSE_STREAM_MAX_BUFFER_BYTES`` nothing more is written to it and its
+frames coalesce to the latest per type until it catches up.
+
+Bootstrap (``initial_*`` events) and ``Last-Event-ID`` resume behave as on
+``/stream/status``; bootstrap payloads are built on a two-thread pool so
+the loop never waits on the load-manager lock.
+
+Usage::
+
+    from sse_server import SSEStreamServer
+
+    server = SSEStreamServer(broadcaster, bootstrap=initial_events, dumper=dumps)
+    port = server.start(port=8001)
+    ...
+    server.close()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from constants import (
+    SSE_HEARTBEAT_SECS,
+    SSE_STREAM_MAX_BUFFER_BYTES,
+    SSE_STREAM_REQUEST_TIMEOUT_SECS,
+)
+from event_loop import EventLoopThread
+from instrumentation import SSE_BYTES_SENT
+from sse_event import (
+    HEARTBEAT_FRAME,
+    SSEBroadcaster,
+    SSEFrame,
+    StreamFilter,
+    Subscription,
+    encode_frame,
+)
+
+logger = logging.getLogger(__name__)
+
+_STREAM_HEAD = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/event-stream\r\n"
+    b"Cache-Control: no-cache\r\n"
+    b"X-Accel-Buffering: no\r\n"
+    b"Connection: close\r\n"
+    b"\r\n"
+)
+
+
+def _error_head(status: str) -> bytes:
+    """Return a complete, bodiless HTTP error response."""
+    return (
+        f"HTTP/1.1 {status}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+    ).encode("ascii")
+
+
+def _parse_head(
+    head: bytes,
+) -> tuple[str, str, dict[str, str], dict[str, str]] | None:
+    """Split an HTTP request head into method, path, query and headers.
+
+    Returns:
+        ``(method, path, query, headers)`` with lower-cased header names,
+        or None if the head is malformed.
+    """
+    try:
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, _version = lines[0].split(" ", 2)
+    except ValueError:
+        return None
+    headers: dict[str, str] = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    url = urlsplit(target)
+    return method, url.path, dict(parse_qsl(url.query)), headers
+
+
+class _Client:
+    """One connected stream client. Only touched on the loop thread."""
+
+    __slots__ = ("writer", "sub", "last_id", "last_write")
+
+    def __init__(
+        self,
+        writer: asyncio.StreamWriter,
+        sub: Subscription,
+        last_id: int,
+        now: float,
+    ) -> None:
+        self.writer = writer
+        self.sub = sub
+        self.last_id = last_id
+        self.last_write = now
+
+
+class SSEStreamServer:
+    """Serve an ``SSEBroadcaster`` to many clients from one event loop."""
+
+    def __init__(
+        self,
+        broadcaster: SSEBroadcaster,
+        bootstrap: Callable[
+            [StreamFilter | None, dict[str, object]], list[tuple[str, object]]
+        ],
+        dumper: Callable[[Any], str] = json.dumps,
+        path: str = "/stream/status",
+        heartbeat_secs: float = SSE_HEARTBEAT_SECS,
+        max_buffer_bytes: int = SSE_STREAM_MAX_BUFFER_BYTES,
+        request_timeout_secs: float = SSE_STREAM_REQUEST_TIMEOUT_SECS,
+    ) -> None:
+        """Initialize without binding a socket.
+
+        Args:
+            broadcaster: Source of published frames.
+            bootstrap: Given the client's ``StreamFilter`` (or None) and the
+                payloads published up to the snapshot id (see
+                ``SSEBroadcaster.snapshot``), returns the ``(event, data)``
+                pairs sent to clients that cannot resume; called on the
+                bootstrap thread pool.
+            dumper: JSON serialization for bootstrap payloads.
+            path: Request path served; anything else gets a 404.
+            heartbeat_secs: Idle seconds before a heartbeat frame.
+            max_buffer_bytes: Unsent bytes above which writes to a client
+                pause and its frames coalesce.
+            request_timeout_secs: Deadline for a client's request head.
+        """
+        self._broadcaster = broadcaster
+        self._bootstrap = bootstrap
+        self._dumper = dumper
+        self._path = path
+        self._heartbeat_secs = heartbeat_secs
+        self._max_buffer_bytes = max_buffer_bytes
+        self._request_timeout_secs = request_timeout_secs
+        self._loop_thread = EventLoopThread(name="sse-stream")
+        self._executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="sse-bootstrap"
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._heartbeat_task: asyncio.Task[None] | None = None
+        self._clients: set[_Client] = set()
+
+    @property
+    def client_count(self) -> int:
+        """Return the number of connected stream clients."""
+        return len(self._clients)
+
+    def start(self, host: str = "0.0.0.0", port: int = 0) -> int:
+        """Bind the listening socket and attach to the broadcaster.
+
+        Args:
+            host: Interface to bind.
+            port: TCP port; 0 picks a free one.
+
+        Returns:
+            The bound port.
+
+        Raises:
+            OSError: If the port cannot be bound (e.g. another gunicorn
+                worker already serves it).
+        """
+        self._loop = self._loop_thread.loop
+        try:
+            bound = self._loop_thread.run(self._start(host, port))
+        except OSError:
+            self._loop_thread.close()
+            raise
+        self._broadcaster.add_listener(self._on_frame)
+        logger.info("SSE stream server listening on %s:%d%s", host, bound, self._path)
+        return bound
+
+    async def _start(self, host: str, port: int) -> int:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self._heartbeat_task = asyncio.get_running_loop().create_task(
+            self._heartbeat()
+        )
+        return self._server.sockets[0].getsockname()[1]
+
+    def close(self) -> None:
+        """Detach from the broadcaster, disconnect clients and stop the loop."""
+        self._broadcaster.remove_listener(self._on_frame)
+        if self._server is not None:
+            try:
+                self._loop_thread.run(self._stop(), timeout=5.0)
+            except (RuntimeError, TimeoutError) as exc:
+                logger.warning("SSE stream server: unclean shutdown: %s", exc)
+            self._server = None
+        self._loop_thread.close()
+        self._loop = None
+        self._executor.shutdown(wait=False)
+
+    async def _stop(self) -> None:
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+        assert self._server is not None
+        self._server.close()
+        for client in list(self._clients):
+            self._drop(client)
+
+    def _on_frame(self, sse_frame: SSEFrame) -> None:
+        """Broadcaster listener: hand the frame to the loop thread."""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._fanout, sse_frame)
+        except RuntimeError:
+            pass  # loop already closed during shutdown
+
+    def _fanout(self, sse_frame: SSEFrame) -> None:
+        """Offer *sse_frame* to every client that has not seen it yet."""
+        for client in list(self._clients):
+            if sse_frame.id > client.last_id:
+                client.last_id = sse_frame.id
+                client.sub.offer(sse_frame)
+                self._flush(client)
+
+    def _flush(self, client: _Client, heartbeat: bool = False) -> None:
+        """Write the client's ready payloads unless its buffer is full.
+
+        Args:
+            client: The client.
+            heartbeat: Send a heartbeat if nothing else is written.
+        """
+        transport = client.writer.transport
+        if transport.is_closing():
+            self._drop(client)
+            return
+        if transport.get_write_buffer_size() > self._max_buffer_bytes:
+            return  # slow reader: leave frames to coalesce in its subscription
+        payloads = client.sub.poll()
+        if not payloads and heartbeat:
+            payloads = [HEARTBEAT_FRAME]
+        if payloads:
+            data = b"".join(payloads)
+            client.writer.write(data)
+            SSE_BYTES_SENT.labels("stream").inc(len(data))
+            client.last_write = asyncio.get_running_loop().time()
+
+    def _drop(self, client: _Client) -> None:
+        """Forget *client* and close its connection."""
+        self._clients.discard(client)
+        client.writer.close()
+
+    async def _heartbeat(self) -> None:
+        """Release due throttled frames and heartbeat idle clients."""
+        loop = asyncio.get_running_loop()
+        tick = min(1.0, self._heartbeat_secs / 3)
+        while True:
+            await asyncio.sleep(tick)
+            cutoff = loop.time() - self._heartbeat_secs
+            for client in list(self._clients):
+                self._flush(client, heartbeat=client.last_write <= cutoff)
+
+    def _encode_bootstrap(
+        self,
+        event_id: str,
+        stream_filter: StreamFilter | None,
+        published: dict[str, object],
+    ) -> bytes:
+        """Build and encode the bootstrap events (runs on the executor)."""
+        return b"".join(
+            encode_frame(name, self._dumper(data), event_id)
+            for name, data in self._bootstrap(stream_filter, published)
+        )
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one connection until the client goes away."""
+        try:
+            head = await asyncio.wait_for(
+                reader.readuntil(b"\r\n\r\n"), self._request_timeout_secs
+            )
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        request = _parse_head(head)
+        if request is None or request[0] != "GET" or request[1] != self._path:
+            status = "404 Not Found" if request is not None else "400 Bad Request"
+            writer.write(_error_head(status))
+            writer.close()
+            return
+        _method, _path, query, headers = request
+        try:
+            stream_filter = StreamFilter.from_query(query)
+        except ValueError:
+            writer.write(_error_head("400 Bad Request"))
+            writer.close()
+            return
+
+        loop = asyncio.get_running_loop()
+        broadcaster = self._broadcaster
+        resume_from = headers.get("last-event-id")
+        missed = broadcaster.frames_since(resume_from)
+        preamble = b""
+        if missed is None:
+            resume_from, published = broadcaster.snapshot()
+            try:
+                preamble = await loop.run_in_executor(
+                    self._executor, self._encode_bootstrap,
+                    resume_from, stream_filter, published,
+                )
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error("SSE stream server: bootstrap failed: %s", exc)
+                writer.write(_error_head("500 Internal Server Error"))
+                writer.close()
+                return
+            # Frames published while the snapshot was built; normally empty.
+            missed = broadcaster.frames_since(resume_from) or []
+
+        # No await from here until the client is registered, so _fanout
+        # callbacks cannot slip between the replay and the registration.
+        writer.write(_STREAM_HEAD + preamble)
+        SSE_BYTES_SENT.labels("stream").inc(len(_STREAM_HEAD) + len(preamble))
+        # A one-frame FIFO: while writes are paused, everything beyond the
+        # next frame coalesces to the latest per type instead of queueing.
+        client = _Client(
+            writer,
+            Subscription(stream_filter, maxsize=1),
+            broadcaster.parse_event_id(resume_from) or 0,
+            loop.time(),
+        )
+        self._clients.add(client)
+        for sse_frame in missed:
+            client.last_id = sse_frame.id
+            client.sub.offer(sse_frame)
+            self._flush(client)
+
+        try:
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self._drop(client)
@@ -18,6 +18,7 @@ Usage::
 from __future__ import annotations
 
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
@@ -25,6 +26,7 @@ from datetime import datetime, timezone
 import pytz
 
 from config import Config, _config
+from instrumentation import TELEGRAM_SEND_SECONDS, outcome
 from load_models import PendingEffect
 from telegram_client import TelegramClient, TelegramConfig
 
@@ -193,7 +195,9 @@ class TelegramSender:
 
         bot_token = raw_config["bot_token"]
         chat_id = raw_config["chat_id"]
-        telegram_config = TelegramConfig(bot_token=bot_token, chat_id=chat_id)
+        telegram_config = TelegramConfig(
+            bot_token=bot_token, chat_id=chat_id, api_base=_config.telegram_api_base,
+        )
         logger.info("Telegram configured %s", chat_id)
         return cls(telegram_config)
 
@@ -259,6 +263,8 @@ class TelegramSender:
             client = TelegramClient(self.config)
             object.__setattr__(self, "_telegram_client", client)
 
+        started = time.perf_counter()
+        result = False
         try:
             result = await client.send_message(text)
             if result:
@@ -269,6 +275,10 @@ class TelegramSender:
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.warning("Telegram send failed: %s", e)
             return False
+        finally:
+            TELEGRAM_SEND_SECONDS.labels("async", outcome(result)).observe(
+                time.perf_counter() - started
+            )
 
     async def send_notification(
         self,
@@ -313,6 +323,8 @@ class TelegramSender:
             object.__setattr__(self, "_telegram_client", client)
 
         message = event.format_message()
+        started = time.perf_counter()
+        result = False
         try:
             result = client.send_message_sync(message)
             if result:
@@ -325,6 +337,10 @@ class TelegramSender:
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.warning("Telegram sync send failed: %s", e)
             return False
+        finally:
+            TELEGRAM_SEND_SECONDS.labels("sync", outcome(result)).observe(
+                time.perf_counter() - started
+            )
 
     async def close(self) -> None:
         """Release the underlying async client resources."""
@@ -29,17 +29,23 @@ class TelegramConfig:
     Attributes:
         bot_token: Bot API token from devices.json.
         chat_id: Telegram chat ID (private or group).
+        api_base: Bot API root URL (``TELEGRAM_API_BASE`` points it at a
+            local stand-in, see fake_services.py).
     """
 
-    def __init__(self, bot_token: str, chat_id: str) -> None:
+    def __init__(
+        self, bot_token: str, chat_id: str, api_base: str = "https://api.telegram.org"
+    ) -> None:
         """Initialize the Telegram configuration.
 
         Args:
             bot_token: Bot API token from devices.json.
             chat_id: Telegram chat ID (private or group).
+            api_base: Bot API root URL.
         """
         self.bot_token = bot_token
         self.chat_id = chat_id
+        self.api_base = api_base
 
     def base_url(self) -> str:
         """Return the Telegram Bot API base URL.
@@ -47,7 +53,7 @@ class TelegramConfig:
         Returns:
             The base URL for API requests.
         """
-        return f"https://api.telegram.org/bot{self.bot_token}"
+        return f"{self.api_base}/bot{self.bot_token}"
 
 
 class TelegramClient:
@@ -1,6 +1,10 @@
-"""Shared helper functions for load management tests."""
+"""Shared helper functions for load management and metrics tests."""
 
 from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from metrics import MetricsBase, TOUReporter
 
 
 def _make_qh_data(
@@ -104,3 +108,29 @@ def _make_metrics_with_wh(
 def _now_utc() -> datetime:
     """Return the current UTC time."""
     return datetime.now(timezone.utc)
+
+
+def _make_tou_reporter(
+    vue: Any,
+    device_info: dict[int, Any],
+    start: datetime,
+    end: datetime,
+    **kwargs: Any,
+) -> TOUReporter:
+    """Build a TOUReporter through its constructor against a fake Emporia.
+
+    Authentication and device discovery are patched out; the report's
+    fetch and aggregation run against ``vue`` and ``device_info``.
+
+    Args:
+        vue: Stand-in for the PyEmVue client.
+        device_info: Devices to report on, keyed by device gid.
+        start: Report start.
+        end: Report end.
+        **kwargs: Passed through to TOUReporter (``store``, ``rollups``).
+    """
+    with patch("metrics.get_session", return_value=MagicMock()), \
+         patch.object(MetricsBase, "get_device_info"), \
+         patch.object(MetricsBase, "vue", vue), \
+         patch.object(MetricsBase, "device_info", device_info):
+        return TOUReporter(start, end, **kwargs)
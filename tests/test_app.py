@@ -1410,7 +1410,7 @@ class TestLoadManagementLoopErrorHandling(unittest.TestCase):
         app_mod._state.last_error_type = None
 
         with patch("app._get_load_manager", return_value=mock_lm):
-            with patch("app.time.sleep", side_effect=InterruptedError("stop")):
+            with patch.object(app_mod._state.cycle_waker, "wait", side_effect=InterruptedError("stop")):
                 with self.assertRaises(InterruptedError):
                     app_mod._load_management_loop()
 
@@ -1429,7 +1429,7 @@ class TestLoadManagementLoopErrorHandling(unittest.TestCase):
         app_mod._state.consecutive_error_count = 0
 
         with patch("app._get_load_manager", return_value=mock_lm):
-            with patch("app.time.sleep", side_effect=InterruptedError("stop")):
+            with patch.object(app_mod._state.cycle_waker, "wait", side_effect=InterruptedError("stop")):
                 with self.assertRaises(InterruptedError):
                     app_mod._load_management_loop()
 
@@ -1462,7 +1462,7 @@ class TestLoadManagementLoopErrorHandling(unittest.TestCase):
         app_mod._state.telegram_sender = None
 
         with patch("app._get_load_manager", return_value=mock_lm):
-            with patch("app.time.sleep", side_effect=InterruptedError("stop")):
+            with patch.object(app_mod._state.cycle_waker, "wait", side_effect=InterruptedError("stop")):
                 with self.assertRaises(InterruptedError):
                     app_mod._load_management_loop()
 
@@ -1492,7 +1492,7 @@ class TestLoadManagementLoopErrorHandling(unittest.TestCase):
                 raise InterruptedError("stop")
 
         with patch("app._get_load_manager", return_value=mock_lm):
-            with patch("app.time.sleep", side_effect=stop_after_n_sleeps):
+            with patch.object(app_mod._state.cycle_waker, "wait", side_effect=stop_after_n_sleeps):
                 with self.assertRaises(InterruptedError):
                     app_mod._load_management_loop()
 
@@ -1554,7 +1554,7 @@ class TestLoadManagementLoopErrorHandling(unittest.TestCase):
                 raise InterruptedError("stop")
 
         with patch("app._get_load_manager", return_value=mock_lm):
-            with patch("app.time.sleep", side_effect=capture_sleep):
+            with patch.object(app_mod._state.cycle_waker, "wait", side_effect=capture_sleep):
                 with self.assertRaises(InterruptedError):
                     app_mod._load_management_loop()
 
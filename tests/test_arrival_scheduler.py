@@ -0,0 +1,130 @@
+"""Tests for learned data-arrival scheduling and skipped fetches."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from arrival_scheduler import ArrivalScheduler
+from energy_cache import EnergyCache
+
+T0 = datetime(2026, 6, 8, 14, 0, tzinfo=timezone.utc)
+QUANTUM = 30
+
+
+class TestArrivalScheduler:
+    """Lags are learned from fetches that advanced the newest sample."""
+
+    def test_learning_allows_every_fetch(self) -> None:
+        scheduler = ArrivalScheduler(min_observations=3)
+        scheduler.record(T0, T0 + timedelta(seconds=10))
+        assert scheduler.expected_lag_secs is None
+        assert scheduler.expected_arrival(T0, QUANTUM) is None
+        assert scheduler.can_have_new_data(T0, QUANTUM, T0)
+
+    def test_quantile_of_recent_lags(self) -> None:
+        scheduler = ArrivalScheduler(window=4, quantile=0.25, min_observations=4)
+        for i, lag in enumerate((40, 12, 10, 11, 30)):
+            newest = T0 + timedelta(seconds=QUANTUM * i)
+            scheduler.record(newest, newest + timedelta(seconds=lag))
+        # Window keeps 12, 10, 11, 30 -> sorted[1] == 11.
+        assert scheduler.expected_lag_secs == 11
+
+    def test_repeat_of_same_quantum_ignored(self) -> None:
+        scheduler = ArrivalScheduler(min_observations=1)
+        scheduler.record(T0, T0 + timedelta(seconds=8))
+        scheduler.record(T0, T0 + timedelta(seconds=25))
+        assert scheduler.expected_lag_secs == 8
+
+    def test_next_arrival_gates_fetches(self) -> None:
+        scheduler = ArrivalScheduler(min_observations=1, margin_secs=1.0)
+        scheduler.record(T0, T0 + timedelta(seconds=8))
+        arrival = T0 + timedelta(seconds=QUANTUM + 8 + 1)
+        assert scheduler.expected_arrival(T0, QUANTUM) == arrival
+        assert not scheduler.can_have_new_data(T0, QUANTUM, arrival - timedelta(seconds=1))
+        assert scheduler.can_have_new_data(T0, QUANTUM, arrival)
+
+    def test_on_schedule_fetches_do_not_ratchet(self) -> None:
+        """Censored on-schedule lags keep the estimate near the true lag."""
+        true_lag = 8.0
+        scheduler = ArrivalScheduler(min_observations=4, margin_secs=1.0)
+        newest = T0
+        for lag in (20, 24, 28, 22):  # loose upper bounds while learning
+            newest += timedelta(seconds=QUANTUM)
+            scheduler.record(newest, newest + timedelta(seconds=lag), QUANTUM)
+        misses = 0
+        lags = []
+        for _ in range(400):
+            arrival = scheduler.expected_arrival(newest, QUANTUM)
+            assert arrival is not None
+            fetched_at = arrival + timedelta(seconds=0.3)
+            published = newest + timedelta(seconds=QUANTUM + true_lag)
+            if fetched_at < published:
+                misses += 1
+                scheduler.record(newest, fetched_at, QUANTUM)
+                # Load loop falls back to the next quantum boundary.
+                fetched_at = newest + timedelta(seconds=2 * QUANTUM)
+            newest += timedelta(seconds=QUANTUM)
+            scheduler.record(newest, fetched_at, QUANTUM)
+            lags.append(scheduler.expected_lag_secs)
+        assert all(lag is not None and 6.0 <= lag <= 9.0 for lag in lags[200:])
+        assert misses < 40
+
+    def test_miss_after_quantum_is_lower_bound(self) -> None:
+        scheduler = ArrivalScheduler(min_observations=1, margin_secs=1.0)
+        scheduler.record(T0, T0 + timedelta(seconds=8), QUANTUM)
+        scheduler.record(T0, T0 + timedelta(seconds=QUANTUM + 12), QUANTUM)
+        assert scheduler.expected_lag_secs == 12
+        # A miss before the current estimate adds nothing.
+        scheduler.record(T0, T0 + timedelta(seconds=QUANTUM + 5), QUANTUM)
+        assert scheduler.expected_lag_secs == 12
+
+
+def _metrics(newest: datetime) -> dict:
+    """One hour of quantized samples ending at *newest*."""
+    start = newest - timedelta(seconds=3599)
+    samples = [float((i // QUANTUM) % 7) for i in range(3600)]
+    return {"per_second_data": samples, "data_start": start}
+
+
+class TestEnergyCacheSkipsUnchanged:
+    """Forced fetches are skipped until the next quantum can be published."""
+
+    def _learned_cache(self) -> tuple[EnergyCache, datetime]:
+        cache = EnergyCache(ttl_seconds=1)
+        cache._arrivals = ArrivalScheduler(min_observations=2, margin_secs=1.0)
+        newest = T0
+        for _ in range(3):
+            now = newest + timedelta(seconds=8)
+            cache.get_or_fetch(lambda n=newest: _metrics(n), now, force=True)
+            newest += timedelta(seconds=QUANTUM)
+        assert cache.quantization_seconds == QUANTUM
+        return cache, newest - timedelta(seconds=QUANTUM)
+
+    def test_skips_before_expected_arrival(self) -> None:
+        cache, newest = self._learned_cache()
+        fetch = MagicMock(return_value=_metrics(newest + timedelta(seconds=QUANTUM)))
+        early = newest + timedelta(seconds=QUANTUM + 5)
+        result, fresh = cache.get_or_fetch(fetch, early, force=True, skip_unchanged=True)
+        fetch.assert_not_called()
+        assert fresh is False and result is not None
+        assert cache.arrivals.skipped == 1
+        # Without skip_unchanged a forced fetch still runs.
+        cache.get_or_fetch(fetch, early, force=True)
+        fetch.assert_called_once()
+
+    def test_fetches_after_expected_arrival(self) -> None:
+        cache, newest = self._learned_cache()
+        fetch = MagicMock(return_value=_metrics(newest + timedelta(seconds=QUANTUM)))
+        due = newest + timedelta(seconds=QUANTUM + 8 + 1)
+        _result, fresh = cache.get_or_fetch(fetch, due, force=True, skip_unchanged=True)
+        fetch.assert_called_once()
+        assert fresh is True
+        assert cache.arrivals.skipped == 0
+
+    def test_sleep_until_expected_arrival(self) -> None:
+        cache, newest = self._learned_cache()
+        now = newest + timedelta(seconds=8)
+        # Next quantum expected at newest + 30 + 8 + 1.
+        assert cache.sleep_interval_adjust(60.0, now) == 31.0
+        assert cache.sleep_interval_adjust(20.0, now) == 20.0
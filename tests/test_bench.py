@@ -0,0 +1,54 @@
+"""Tests for the benchmark harness; slow tests smoke-run every benchmark."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from bench.__main__ import main
+from bench.core import BenchResult, compare, load_medians, registry, run_benchmark, save_results
+
+
+def _result(name: str, median: float) -> BenchResult:
+    return BenchResult(name=name, number=1, repeat=1, best_secs=median, median_secs=median, mean_secs=median)
+
+
+class TestCompare:
+    """Medians are compared against the baseline with a fractional threshold."""
+
+    def test_regression_past_threshold(self) -> None:
+        results = [_result("a", 1.3), _result("b", 1.2), _result("new", 5.0)]
+        comparisons = compare(results, {"a": 1.0, "b": 1.0}, threshold=0.25)
+        assert [(c.name, c.regressed) for c in comparisons] == [("a", True), ("b", False)]
+        assert comparisons[0].ratio == pytest.approx(1.3)
+
+    def test_json_round_trip(self, tmp_path: Path) -> None:
+        path = tmp_path / "results.json"
+        save_results(path, [_result("a", 0.5)])
+        assert load_medians(path) == {"a": 0.5}
+
+
+class TestCli:
+    """The CLI writes results, compares with a baseline and sets the exit status."""
+
+    def test_baseline_then_regression(self, tmp_path: Path) -> None:
+        baseline = tmp_path / "baseline.json"
+        args = ["--only", "util.camelize", "--number", "1", "--repeat", "1", "--baseline", str(baseline)]
+        assert main([*args, "--update-baseline"]) == 0
+        assert set(load_medians(baseline)) == {"util.camelize"}
+        save_results(baseline, [_result("util.camelize", 1e-12)])
+        output = tmp_path / "out.json"
+        assert main([*args, "--output", str(output)]) == 1
+        assert output.exists()
+
+    def test_unknown_name(self) -> None:
+        assert main(["--only", "nope"]) == 2
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("name", sorted(registry()))
+def test_benchmark_runs(name: str) -> None:
+    """Each registered benchmark sets up and runs once."""
+    result = run_benchmark(registry()[name], number=1, repeat=1)
+    assert result.median_secs > 0
@@ -0,0 +1,103 @@
+"""Tests for the camelCase serializers and the memoized key table."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import util
+from load_models import CandidateDetail, CycleDiagnostics, CycleResult, PendingEffect
+from util import camel_case, camelize
+
+_AT = datetime(2026, 6, 8, 14, 5, tzinfo=timezone.utc)
+
+
+def _candidates() -> list[CandidateDetail]:
+    return [
+        CandidateDetail(
+            device_type="plug", name="heater", power_watts=1500.0,
+            capacity_wh=375.0, can_toggle=True, desired_state=True,
+            actual_state=False, reason="surplus",
+        ),
+        CandidateDetail(
+            device_type="tesla", name="tesla", power_watts=None,
+            capacity_wh=0.0, can_toggle=False, state_available=True,
+            is_charging=True, current_amps=16, plugged_in=True,
+            at_home=True, error="asleep",
+        ),
+    ]
+
+
+class TestCamelCase:
+    """Key translation is memoized and matches the split/capitalize rule."""
+
+    def test_translation(self) -> None:
+        assert camel_case("sleep_hint_at") == "sleepHintAt"
+        assert camel_case("QH1") == "QH1"
+        assert camel_case("per_second_data") == "perSecondData"
+        assert util._CAMEL_KEYS["sleep_hint_at"] == "sleepHintAt"
+
+    def test_table_bounded(self, monkeypatch) -> None:
+        monkeypatch.setattr(util, "_CAMEL_KEYS", {})
+        monkeypatch.setattr(util, "_CAMEL_KEYS_MAX", 2)
+        for key in ("a_b", "c_d", "e_f"):
+            camel_case(key)
+        assert camel_case("e_f") == "eF"
+        assert list(util._CAMEL_KEYS) == ["a_b", "c_d"]
+
+    def test_camelize_nested(self) -> None:
+        assert camelize({"a_b": [{"c_d": 1}, 2], 3: {"e_f": None}}) == {
+            "aB": [{"cD": 1}, 2], 3: {"eF": None},
+        }
+
+
+class TestToCamelDict:
+    """Each ``to_camel_dict()`` equals ``camelize(to_dict())``."""
+
+    def test_candidate_detail(self) -> None:
+        for candidate in _candidates():
+            assert candidate.to_camel_dict() == camelize(candidate.to_dict())
+
+    def test_cycle_diagnostics(self) -> None:
+        diagnostics = CycleDiagnostics(
+            gap_wh=-4.0, hysteresis_wh=2, seconds_remaining=300,
+            data_point_at=_AT, reason="deficit", pending_effects_count=1,
+            tesla_configured=True,
+            tesla_state={"is_charging": True, "charge_amps": 8},
+            tesla_error="asleep", tesla_login_url="https://example.invalid",
+            plugs_configured=["heater"], candidates=_candidates(),
+            sentinel_names=["fridge"], sentinel_on=True,
+            telemetry_registered=True,
+            active_tesla_telemetry={"battery_level": {"value": 80}},
+            tesla_command_offline=False, quantization_seconds=60,
+            quantization_offset=5, quantization_confidence=0.9,
+            settle_window_secs=30,
+        )
+        assert diagnostics.to_camel_dict() == camelize(diagnostics.to_dict())
+
+    def test_empty_cycle_diagnostics(self) -> None:
+        diagnostics = CycleDiagnostics()
+        assert diagnostics.to_camel_dict() == camelize(diagnostics.to_dict())
+
+    def test_cycle_result(self) -> None:
+        result = CycleResult(
+            status="actions_taken", qh="QH1", predicted_wh=10.0,
+            adjusted_wh=12.0, target_wh=0, current_wh=3.0, estimated_wh=9.0,
+            actions=[PendingEffect(
+                device_name="tesla", action="set_amps", timestamp=_AT,
+                data_point_at=_AT - timedelta(seconds=30), power_watts=240.0,
+                target_amps=8,
+            )],
+            diagnostics=CycleDiagnostics(
+                gap_wh=-4.0, data_point_at=_AT, reason="deficit",
+                tesla_state={"is_charging": True, "charge_amps": 8},
+                active_tesla_telemetry={"battery_level": {"value": 80}},
+                candidates=_candidates(), plugs_configured=["heater"],
+            ),
+            sleep_hint=5.0, sleep_hint_at=_AT.isoformat(), gap_wh=-4.0,
+            pending_effects_count=1, candidates=_candidates(),
+        )
+        assert result.to_camel_dict() == camelize(result.to_dict())
+
+    def test_empty_cycle_result(self) -> None:
+        result = CycleResult(status="no_incomplete_qh", candidates=[])
+        assert result.to_camel_dict() == camelize(result.to_dict())
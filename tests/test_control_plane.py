@@ -0,0 +1,237 @@
+"""Tests for control-plane leader election and snapshot sharing."""
+
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import app as app_mod
+from control_plane import ControlPlane, ControlPlaneSnapshot
+from energy_cache import EnergyCacheData
+from sse_event import SSEBroadcaster
+
+
+def _cache_data(samples: list[float]) -> EnergyCacheData:
+    end = datetime(2026, 6, 8, 14, 5, tzinfo=timezone.utc)
+    return EnergyCacheData(
+        samples=samples,
+        data_start=end - timedelta(seconds=len(samples) - 1),
+        last_sample_at=end,
+        last_fetch_at=end,
+        sample_count=len(samples),
+        quantization_seconds=None,
+        quantization_offset=None,
+        quantization_confidence=None,
+        full_metrics_dict={
+            "devices": [{"name": "meter", "lag": timedelta(seconds=15)}],
+            "api_response": {},
+            "instant": end,
+        },
+    )
+
+
+class TestControlPlane:
+    """One leader per directory; followers read what it publishes."""
+
+    def test_single_leader(self, tmp_path: Path) -> None:
+        first, second = ControlPlane(tmp_path), ControlPlane(tmp_path)
+        try:
+            assert first.try_lead()
+            assert not second.try_lead()
+            first.close()
+            assert second.try_lead()
+        finally:
+            first.close()
+            second.close()
+
+    def test_publish_and_read(self, tmp_path: Path) -> None:
+        leader, follower = ControlPlane(tmp_path), ControlPlane(tmp_path)
+        try:
+            assert follower.read() is None
+            leader.try_lead()
+            leader.publish(cache_data=_cache_data([1.0, 2.0]), load_management={"enabled": True})
+            snapshot = follower.read()
+            assert snapshot is not None
+            assert snapshot.generation == 1
+            assert list(snapshot.cache_data.samples) == [1.0, 2.0]
+            assert snapshot.load_management == {"enabled": True}
+            # Unchanged file: the loaded snapshot is reused.
+            assert follower.read() is snapshot
+        finally:
+            leader.close()
+
+    def test_follower_cannot_publish(self, tmp_path: Path) -> None:
+        with pytest.raises(RuntimeError):
+            ControlPlane(tmp_path).publish()
+
+    def test_new_leader_continues_generations(self, tmp_path: Path) -> None:
+        first = ControlPlane(tmp_path)
+        first.try_lead()
+        first.publish()
+        first.publish()
+        first.close()
+        second = ControlPlane(tmp_path)
+        try:
+            second.try_lead()
+            assert second.publish().generation == 3
+        finally:
+            second.close()
+
+    def test_refuses_shared_directory(self, tmp_path: Path) -> None:
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        shared.chmod(0o770)
+        with pytest.raises(PermissionError):
+            ControlPlane(shared)
+
+    def test_ignores_foreign_snapshot(self, tmp_path: Path) -> None:
+        leader = ControlPlane(tmp_path)
+        try:
+            leader.try_lead()
+            leader.publish()
+            follower = ControlPlane(tmp_path)
+            with patch("control_plane.os.getuid", return_value=os.getuid() + 1), \
+                 patch("control_plane.pickle.load") as load:
+                assert follower.read() is None
+            load.assert_not_called()
+        finally:
+            leader.close()
+
+    def test_follower_sees_snapshots_then_takes_over(self, tmp_path: Path) -> None:
+        leader = ControlPlane(tmp_path)
+        follower = ControlPlane(tmp_path, poll_secs=0.01)
+        leader.try_lead()
+        leader.publish()
+        seen: list[tuple[int, bool]] = []
+        promoted = threading.Event()
+        follower.start_following(
+            lambda s, skipped: seen.append((s.generation, skipped)), promoted.set,
+        )
+        try:
+            for _ in range(200):
+                if seen:
+                    break
+                threading.Event().wait(0.01)
+            assert seen == [(1, False)]
+            leader.close()
+            assert promoted.wait(2)
+            assert follower.is_leader
+        finally:
+            leader.close()
+            follower.close()
+
+
+class TestAppFollower:
+    """A follower worker serves the leader's snapshot instead of fetching."""
+
+    @pytest.fixture
+    def follower(self, tmp_path: Path):
+        leader = ControlPlane(tmp_path)
+        leader.try_lead()
+        plane = ControlPlane(tmp_path)
+        saved = (
+            app_mod._state.control_plane,
+            app_mod._state.control_snapshot,
+            app_mod._state.energy_cache.data,
+            app_mod._state.sse_broadcaster,
+        )
+        app_mod._state.control_plane = plane
+        app_mod._state.sse_broadcaster = SSEBroadcaster(epoch="e")
+        yield leader
+        leader.close()
+        (
+            app_mod._state.control_plane,
+            app_mod._state.control_snapshot,
+            data,
+            app_mod._state.sse_broadcaster,
+        ) = saved
+        app_mod._state.energy_cache.adopt(data)
+
+    def test_apply_snapshot_adopts_and_relays(self, follower: ControlPlane) -> None:
+        snapshot = follower.publish(
+            cache_data=_cache_data([1.0, 2.0, 3.0]),
+            load_management={"enabled": True},
+            load_cycle={"enabled": True},
+            metrics_update=({"delta": 1}, {"full": 1}),
+        )
+        sub = app_mod._state.sse_broadcaster.subscribe()
+        app_mod._apply_control_snapshot(snapshot, skipped=True)
+        assert list(app_mod._state.energy_cache.samples) == [1.0, 2.0, 3.0]
+        assert b"event: load_cycle" in sub.get(timeout=1)
+        assert b'{"full": 1}' in sub.get(timeout=1)
+        with patch.dict("os.environ", {"LOAD_MANAGE_ENABLED": "True"}), \
+             patch.object(app_mod, "_get_load_manager") as get_lm:
+            assert app_mod._build_load_management_payload() == {"enabled": True}
+        get_lm.assert_not_called()
+
+    def test_index_and_status_do_not_fetch(self, follower: ControlPlane) -> None:
+        snapshot = follower.publish(
+            cache_data=_cache_data([1.0] * 5),
+            load_status={"enabled": True, "devices": {}},
+        )
+        app_mod._apply_control_snapshot(snapshot, skipped=False)
+        client = app_mod.app.test_client()
+        with patch.dict("os.environ", {"MOCK": "False", "LOAD_MANAGE_ENABLED": "True"}), \
+             patch.object(app_mod, "create_metrics") as create_metrics, \
+             patch.object(app_mod, "_get_load_manager") as get_lm:
+            resp = client.get("/", headers={"Accept": "application/json"})
+            status = client.get("/api/v1/load/status")
+        assert resp.status_code == 200
+        assert resp.get_json()["devices"][0]["name"] == "meter"
+        assert status.get_json() == {"enabled": True, "devices": {}}
+        create_metrics.assert_not_called()
+        get_lm.assert_not_called()
+
+    def test_stale_snapshot_still_served(self, follower: ControlPlane) -> None:
+        snapshot = ControlPlaneSnapshot(
+            generation=1, written_at=datetime.now(timezone.utc) - timedelta(hours=1),
+        )
+        app_mod._state.control_snapshot = snapshot
+        assert app_mod._follower_snapshot(datetime.now(timezone.utc)) is snapshot
+
+
+class TestLeaderPublishes:
+    """The leader writes a snapshot; without a control plane nothing happens."""
+
+    def test_publish_only_as_leader(self, tmp_path: Path) -> None:
+        plane = MagicMock(is_leader=False)
+        with patch.object(app_mod._state, "control_plane", plane):
+            app_mod._publish_control_snapshot(load_cycle={})
+        plane.publish.assert_not_called()
+        leader = ControlPlane(tmp_path)
+        leader.try_lead()
+        try:
+            with patch.object(app_mod._state, "control_plane", leader):
+                app_mod._publish_control_snapshot(load_cycle={"x": 1})
+            snapshot = ControlPlane(tmp_path).read()
+            assert snapshot is not None and snapshot.load_cycle == {"x": 1}
+        finally:
+            leader.close()
+
+    def test_fetch_publishes_and_keeps_load_state(self, tmp_path: Path) -> None:
+        leader = ControlPlane(tmp_path)
+        leader.try_lead()
+        cache = MagicMock(data=_cache_data([1.0]))
+        cache.get_or_fetch.return_value = ({"devices": []}, True)
+        try:
+            with patch.object(app_mod._state, "control_plane", leader), \
+                 patch.object(app_mod._state, "control_snapshot", None), \
+                 patch.object(app_mod._state, "energy_cache", cache):
+                app_mod._publish_control_snapshot(
+                    load_status={"enabled": True}, load_cycle={"x": 1},
+                )
+                assert app_mod._refresh_metrics(
+                    datetime.now(timezone.utc), caller="index",
+                ) == ({"devices": []}, True)
+            snapshot = ControlPlane(tmp_path).read()
+            assert snapshot is not None and snapshot.generation == 2
+            assert snapshot.load_status == {"enabled": True}
+            assert snapshot.load_cycle is None
+            assert list(snapshot.cache_data.samples) == [1.0]
+        finally:
+            leader.close()
@@ -0,0 +1,122 @@
+"""Tests for the wakeable load-management sleep and its wake-up sources."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import app as app_mod
+import mqtt_telemetry
+from config import ConfigWatcher
+from cycle_waker import CycleWaker
+
+
+class TestCycleWaker:
+    """Sleeps the full interval unless woken; wake-ups are debounced."""
+
+    def test_timer_expires_without_wake(self) -> None:
+        waker = CycleWaker(debounce_secs=0.0, min_spacing_secs=0.0)
+        start = time.monotonic()
+        assert waker.wait(0.05) == []
+        assert time.monotonic() - start >= 0.05
+
+    def test_wake_ends_sleep_early(self) -> None:
+        waker = CycleWaker(debounce_secs=0.0, min_spacing_secs=0.0)
+        threading.Timer(0.05, waker.wake, args=("api",)).start()
+        start = time.monotonic()
+        assert waker.wait(10) == ["api"]
+        assert time.monotonic() - start < 5
+
+    def test_wake_before_wait_is_kept(self) -> None:
+        waker = CycleWaker(debounce_secs=0.0, min_spacing_secs=0.0)
+        waker.wake("config")
+        assert waker.pending
+        assert waker.wait(10) == ["config"]
+        assert not waker.pending
+
+    def test_burst_coalesced_within_debounce(self) -> None:
+        waker = CycleWaker(debounce_secs=0.1, min_spacing_secs=0.0)
+        for reason in ("telemetry:ChargeAmps", "telemetry:ChargeAmps", "api"):
+            waker.wake(reason)
+        assert waker.wait(10) == ["telemetry:ChargeAmps", "api"]
+
+    def test_min_spacing_between_woken_cycles(self) -> None:
+        now = [100.0]
+        waker = CycleWaker(debounce_secs=0.0, min_spacing_secs=5.0, monotonic=lambda: now[0])
+        waker.wake("api")
+        assert waker.wait(30) == ["api"]
+        waker.wake("api")
+        # Released 0s ago; spacing defers the next release to t=105.
+        with patch.object(waker._cond, "wait", side_effect=lambda secs: now.__setitem__(0, now[0] + secs)) as cond_wait:
+            assert waker.wait(30) == ["api"]
+        assert cond_wait.call_args.args[0] == 5.0
+        assert now[0] == 105.0
+
+    def test_spacing_never_extends_timer(self) -> None:
+        now = [0.0]
+        waker = CycleWaker(debounce_secs=0.0, min_spacing_secs=60.0, monotonic=lambda: now[0])
+        waker.wait(0)
+        waker.wake("api")
+        with patch.object(waker._cond, "wait", side_effect=lambda secs: now.__setitem__(0, now[0] + secs)):
+            assert waker.wait(10) == ["api"]
+        assert now[0] == 10.0
+
+
+class TestChargeTransitions:
+    """Only changes to the charging picture wake the loop."""
+
+    def test_is_charge_transition(self) -> None:
+        assert mqtt_telemetry.is_charge_transition(
+            "DetailedChargeState", "DetailedChargeStateCharging", "DetailedChargeStateComplete",
+        )
+        assert not mqtt_telemetry.is_charge_transition("ChargeState", "Charging", "Charging")
+        assert mqtt_telemetry.is_charge_transition("ChargeAmps", 16.0, 8.0)
+        assert not mqtt_telemetry.is_charge_transition("ChargeAmps", 16.2, 16.4)
+        assert not mqtt_telemetry.is_charge_transition("Location", None, {"latitude": 1.0})
+
+    def test_listener_sees_old_and_new(self) -> None:
+        listener = MagicMock()
+        mqtt_telemetry.add_listener(listener)
+        try:
+            with patch.dict(mqtt_telemetry._telemetry_state, {"ChargeAmps": 16.0}):
+                mqtt_telemetry.on_message(None, None, MagicMock(topic="tesla/ChargeAmps", payload=b"8"))
+        finally:
+            mqtt_telemetry.remove_listener(listener)
+        listener.assert_called_once_with("ChargeAmps", 16.0, 8)
+
+    def test_app_listener_wakes_loop(self) -> None:
+        with patch.object(app_mod._state, "cycle_waker", CycleWaker()) as waker:
+            app_mod._wake_on_charge_transition("Location", None, {})
+            assert not waker.pending
+            app_mod._wake_on_charge_transition("ChargeAmps", 16.0, 0.0)
+            assert waker.pending
+
+
+class TestOtherWakeSources:
+    """Config edits and the API trigger wake the loop."""
+
+    def test_config_watcher_modified(self, tmp_path: Path) -> None:
+        env, devices = tmp_path / ".env", tmp_path / "devices.json"
+        env.write_text("A=1\n")
+        watcher = ConfigWatcher(env_path=env, devices_path=devices)
+        assert not watcher.modified()
+        devices.write_text("{}")
+        os.utime(devices, (time.time() + 10, time.time() + 10))
+        assert watcher.modified()
+        assert not watcher.modified()
+
+    def test_api_trigger(self) -> None:
+        client = app_mod.app.test_client()
+        with patch.object(app_mod._state, "cycle_waker", CycleWaker()) as waker:
+            with patch.object(app_mod._state, "lm_thread_started", False):
+                assert client.post("/api/v1/load/cycle").status_code == 503
+            assert not waker.pending
+            with patch.object(app_mod._state, "lm_thread_started", True):
+                resp = client.post("/api/v1/load/cycle")
+            assert resp.status_code == 202
+            assert resp.get_json() == {"queued": True}
+            assert waker.pending
+        assert client.get("/api/v1/load/cycle").status_code == 405
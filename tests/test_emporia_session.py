@@ -0,0 +1,100 @@
+"""Tests for the process-wide Emporia session manager."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import jwt
+import pytest
+
+import emporia_session
+from clock import FakeClock
+from emporia_session import EmporiaSession
+from metrics import MetricsBase
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _vue_with_expiry(expires_at: datetime) -> MagicMock:
+    vue = MagicMock()
+    token = jwt.encode(
+        {"exp": int(expires_at.timestamp())}, "k" * 32, algorithm="HS256"
+    )
+    vue.auth.tokens = {"access_token": token}
+    return vue
+
+
+class TestEmporiaSession:
+    """Login once, refresh near expiry."""
+
+    def test_logs_in_once(self) -> None:
+        """Repeated ensure() calls reuse the first login."""
+        session = EmporiaSession(clock=FakeClock(NOW))
+        vue = _vue_with_expiry(NOW + timedelta(hours=1))
+        login = MagicMock()
+        for _ in range(3):
+            assert session.ensure(vue, login) is vue
+        login.assert_called_once()
+        assert session.authenticated_at == NOW
+
+    def test_refreshes_near_expiry(self) -> None:
+        """Inside the margin, tokens are refreshed instead of logging in."""
+        clock = FakeClock(NOW)
+        session = EmporiaSession(refresh_margin_secs=300, clock=clock)
+        vue = _vue_with_expiry(NOW + timedelta(hours=1))
+        login = MagicMock()
+        session.ensure(vue, login)
+        clock.advance(3600 - 200)
+        session.ensure(vue, login)
+        vue.auth.refresh_tokens.assert_called_once()
+        login.assert_called_once()
+        assert session.refreshes == 1
+
+    def test_refresh_failure_falls_back_to_login(self) -> None:
+        """A failed refresh triggers a full login."""
+        clock = FakeClock(NOW)
+        session = EmporiaSession(clock=clock)
+        vue = _vue_with_expiry(NOW + timedelta(minutes=1))
+        vue.auth.refresh_tokens.side_effect = RuntimeError("cognito down")
+        login = MagicMock()
+        session.ensure(vue, login)
+        session.ensure(vue, login)
+        assert login.call_count == 2
+
+    def test_cleared_auth_or_invalidate_forces_login(self) -> None:
+        """vue.auth=None (401 path) or invalidate() logs in again."""
+        session = EmporiaSession(clock=FakeClock(NOW))
+        vue = _vue_with_expiry(NOW + timedelta(hours=1))
+        login = MagicMock()
+        session.ensure(vue, login)
+        session.invalidate()
+        session.ensure(vue, login)
+        vue.auth = None
+        session.ensure(vue, login)
+        assert login.call_count == 3
+
+    def test_failed_login_retried_next_time(self) -> None:
+        """A login that raises leaves the session logged out."""
+        session = EmporiaSession(clock=FakeClock(NOW))
+        vue = _vue_with_expiry(NOW + timedelta(hours=1))
+        login = MagicMock(side_effect=[RuntimeError("bad"), None])
+        with pytest.raises(RuntimeError):
+            session.ensure(vue, login)
+        session.ensure(vue, login)
+        assert login.call_count == 2
+
+
+class TestMetricsBaseUsesSession:
+    """MetricsBase no longer logs in on every construction."""
+
+    def test_vue_init_runs_once(self) -> None:
+        """Two instances share one login."""
+        vue = _vue_with_expiry(datetime.now(timezone.utc) + timedelta(hours=1))
+        with patch.object(emporia_session, "_session", EmporiaSession()), \
+             patch.object(MetricsBase, "vue", vue), \
+             patch.object(MetricsBase, "vue_init") as vue_init, \
+             patch.object(MetricsBase, "get_device_info"):
+            MetricsBase()
+            MetricsBase()
+        vue_init.assert_called_once()
@@ -523,3 +523,216 @@ class TestPruneOldSamplesLastSampleAt:
         assert pruned.last_sample_at >= pruned.data_start, (
             f"last_sample_at {pruned.last_sample_at} < data_start {pruned.data_start}"
         )
+
+
+class TestSingleFlightRefresh:
+    """Tests for the single-flight, stale-while-revalidate refresh path."""
+
+    @staticmethod
+    def _stale_cache(now: datetime, **kwargs: Any) -> EnergyCache:
+        """Create an EnergyCache holding an expired snapshot."""
+        stale_time = now - timedelta(seconds=120)
+        cache = EnergyCache(ttl_seconds=30, **kwargs)
+        cache._data = EnergyCacheData(
+            samples=[0.001] * 60,
+            data_start=ceil_to_qh(stale_time),
+            last_sample_at=stale_time,
+            last_fetch_at=stale_time,
+            sample_count=60,
+            quantization_seconds=None,
+            quantization_offset=None,
+            quantization_confidence=None,
+            full_metrics_dict={"devices": [], "tag": "stale"},
+        )
+        return cache
+
+    def test_reader_served_snapshot_while_fetch_in_flight(self) -> None:
+        """A non-forced reader returns the stale snapshot without waiting."""
+        import threading
+        import time
+
+        now = datetime(2025, 6, 15, 14, 5, 0, tzinfo=timezone.utc)
+        cache = self._stale_cache(now)
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_fetcher() -> dict[str, Any] | None:
+            started.set()
+            release.wait(5)
+            return {"devices": [], "tag": "fresh"}
+
+        owner = threading.Thread(
+            target=cache.get_or_fetch, args=(slow_fetcher, now, True)
+        )
+        owner.start()
+        assert started.wait(5)
+
+        t0 = time.monotonic()
+        result, was_fresh = cache.get_or_fetch(MagicMock(), now)
+        elapsed = time.monotonic() - t0
+        release.set()
+        owner.join(5)
+
+        assert result is not None and result["tag"] == "stale"
+        assert was_fresh is False
+        assert elapsed < 1.0
+        assert cache.full_metrics_dict is not None
+        assert cache.full_metrics_dict["tag"] == "fresh"
+
+    def test_forced_callers_share_one_fetch(self) -> None:
+        """Concurrent forced callers join the in-flight fetch (one API call)."""
+        import threading
+
+        now = datetime(2025, 6, 15, 14, 5, 0, tzinfo=timezone.utc)
+        cache = self._stale_cache(now)
+        started = threading.Event()
+        release = threading.Event()
+        calls = 0
+
+        def slow_fetcher() -> dict[str, Any] | None:
+            nonlocal calls
+            calls += 1
+            started.set()
+            release.wait(5)
+            return {"devices": [], "tag": "fresh"}
+
+        outcomes: list[tuple[dict[str, Any] | None, bool]] = []
+
+        def run() -> None:
+            outcomes.append(cache.get_or_fetch(slow_fetcher, now, force=True))
+
+        threads = [threading.Thread(target=run) for _ in range(3)]
+        threads[0].start()
+        assert started.wait(5)
+        for t in threads[1:]:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join(5)
+
+        assert calls == 1
+        assert len(outcomes) == 3
+        assert all(r is not None and r["tag"] == "fresh" for r, _ in outcomes)
+
+    def test_lock_not_held_during_fetch(self) -> None:
+        """The cache lock is free while fetch_func runs."""
+        now = datetime(2025, 6, 15, 14, 5, 0, tzinfo=timezone.utc)
+        cache = self._stale_cache(now)
+        lock_states: list[bool] = []
+
+        def fetcher() -> dict[str, Any] | None:
+            lock_states.append(cache.lock.locked())
+            return {"devices": []}
+
+        cache.get_or_fetch(fetcher, now, force=True)
+        assert lock_states == [False]
+
+    def test_disabled_stale_while_revalidate_joins_fetch(self) -> None:
+        """With stale_while_revalidate=False, readers wait for the refresh."""
+        import threading
+
+        now = datetime(2025, 6, 15, 14, 5, 0, tzinfo=timezone.utc)
+        cache = self._stale_cache(now, stale_while_revalidate=False)
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_fetcher() -> dict[str, Any] | None:
+            started.set()
+            release.wait(5)
+            return {"devices": [], "tag": "fresh"}
+
+        owner = threading.Thread(
+            target=cache.get_or_fetch, args=(slow_fetcher, now, True)
+        )
+        owner.start()
+        assert started.wait(5)
+        threading.Timer(0.2, release.set).start()
+        result, was_fresh = cache.get_or_fetch(MagicMock(), now)
+        owner.join(5)
+
+        assert result is not None and result["tag"] == "fresh"
+        assert was_fresh is True
+
+    def test_inflight_cleared_after_fetch_error(self) -> None:
+        """A failing fetch does not leave a stuck in-flight marker."""
+        now = datetime(2025, 6, 15, 14, 5, 0, tzinfo=timezone.utc)
+        cache = self._stale_cache(now)
+
+        def failing_fetcher() -> dict[str, Any] | None:
+            raise ConnectionError("API down")
+
+        cache.get_or_fetch(failing_fetcher, now, force=True)
+        assert cache._inflight is None
+
+
+class TestSpliceTail:
+    """Tests for splicing a tail-only fetch onto the cached window."""
+
+    START = datetime(2025, 6, 15, 14, 0, 0, tzinfo=timezone.utc)
+
+    def _cache(self, samples: list[float]) -> EnergyCache:
+        cache = EnergyCache()
+        cache.samples = list(samples)
+        cache.data_start = self.START
+        return cache
+
+    def test_overlap_match_appends_tail(self) -> None:
+        """Matching overlap samples splice the tail after the cached head."""
+        cache = self._cache([0.1, 0.2, 0.3, 0.4])
+        tail_start = self.START + timedelta(seconds=2)
+        result = cache.splice_tail([0.3, 0.4, 0.5, 0.6], tail_start, 2)
+        assert result == [0.1, 0.2, 0.3, 0.4, 0.5, 0.6]
+
+    def test_overlap_mismatch_returns_none(self) -> None:
+        """A revised overlap sample rejects the splice."""
+        cache = self._cache([0.1, 0.2, 0.3, 0.4])
+        tail_start = self.START + timedelta(seconds=2)
+        assert cache.splice_tail([0.3, 0.9, 0.5], tail_start, 2) is None
+
+    def test_tail_before_window_returns_none(self) -> None:
+        """A tail starting before the cached window cannot be spliced."""
+        cache = self._cache([0.1, 0.2])
+        tail_start = self.START - timedelta(seconds=1)
+        assert cache.splice_tail([0.0, 0.1, 0.2], tail_start, 1) is None
+
+    def test_overlap_past_cached_end_returns_none(self) -> None:
+        """An overlap reaching past the cached samples is rejected."""
+        cache = self._cache([0.1, 0.2])
+        tail_start = self.START + timedelta(seconds=1)
+        assert cache.splice_tail([0.2, 0.3, 0.4], tail_start, 2) is None
+
+
+class TestIncrementalQuantization:
+    """Tail-extended windows update quantization without a full rescan."""
+
+    START = datetime(2025, 6, 15, 14, 0, 0, tzinfo=timezone.utc)
+
+    @staticmethod
+    def _series(windows: int) -> list[float]:
+        return [float(i) for i in range(windows) for _ in range(20)]
+
+    def test_extension_uses_incremental_detector(self) -> None:
+        """Appending to the stored window skips detect_quantization."""
+        from unittest.mock import patch
+
+        cache = EnergyCache()
+        data = self._series(12)
+        cache._data = cache._merge_samples_replace(data[:100], self.START, self.START)
+        cache._data = cache._merge_samples_replace(data[:180], self.START, self.START)
+        with patch("energy_cache.detect_quantization") as batch:
+            cache._data = cache._merge_samples_replace(data, self.START, self.START)
+        batch.assert_not_called()
+        assert (
+            cache.quantization_seconds,
+            cache.quantization_offset,
+            cache.quantization_confidence,
+        ) == (20, 0, 1.0)
+
+    def test_non_extension_rescans(self) -> None:
+        """A window that does not extend the stored one is rescanned."""
+        cache = EnergyCache()
+        data = self._series(12)
+        cache._data = cache._merge_samples_replace(data[:100], self.START, self.START)
+        revised = [9.0] + data[1:200]
+        cache._data = cache._merge_samples_replace(revised, self.START, self.START)
+        assert cache._quant_detector is None
@@ -0,0 +1,95 @@
+"""Tests for EventLoopThread, the persistent loop used by LoadManager."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from event_loop import EventLoopThread
+
+
+class TestEventLoopThread:
+    """Coroutines submitted from sync code share one long-lived loop."""
+
+    def test_runs_coroutines_on_one_loop(self):
+        """Successive run() calls execute on the same loop and thread."""
+        runner = EventLoopThread(name="test-loop")
+
+        async def _where():
+            return asyncio.get_running_loop(), threading.current_thread()
+
+        try:
+            loop1, thread1 = runner.run(_where())
+            loop2, thread2 = runner.run(_where())
+        finally:
+            runner.close()
+        assert loop1 is loop2
+        assert thread1 is thread2
+        assert thread1 is not threading.current_thread()
+
+    def test_exception_propagates(self):
+        """A coroutine's exception is re-raised in the caller."""
+        runner = EventLoopThread()
+
+        async def _boom():
+            raise ValueError("boom")
+
+        try:
+            with pytest.raises(ValueError, match="boom"):
+                runner.run(_boom())
+        finally:
+            runner.close()
+
+    def test_timeout_cancels_coroutine(self):
+        """A timed-out coroutine is cancelled on the loop."""
+        runner = EventLoopThread()
+        cancelled = threading.Event()
+
+        async def _slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        try:
+            with pytest.raises(TimeoutError):
+                runner.run(_slow(), timeout=0.05)
+            assert cancelled.wait(2.0)
+        finally:
+            runner.close()
+
+    def test_close_is_idempotent_and_restartable(self):
+        """close() twice is safe; run() after close() starts a new loop."""
+        runner = EventLoopThread()
+
+        async def _loop():
+            return asyncio.get_running_loop()
+
+        first = runner.run(_loop())
+        runner.close()
+        runner.close()
+        try:
+            second = runner.run(_loop())
+        finally:
+            runner.close()
+        assert first is not second
+        assert first.is_closed()
+
+    def test_run_from_loop_thread_raises(self):
+        """Re-entrant run() from the loop thread raises instead of deadlocking."""
+        runner = EventLoopThread()
+
+        async def _noop():
+            return None
+
+        async def _reenter():
+            with pytest.raises(RuntimeError):
+                runner.run(_noop())
+
+        try:
+            runner.run(_reenter())
+        finally:
+            runner.close()
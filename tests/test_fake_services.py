@@ -0,0 +1,312 @@
+"""Tests for the local service stand-ins, driven by the real clients over sockets."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import os
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import paho.mqtt.client as mqtt
+import pytest
+import requests
+from pyemvue import PyEmVue
+
+import load_controllers
+import metrics
+from emporia_session import EmporiaSession
+from energy_cache import EnergyCache
+from fake_services import (
+    EmporiaStub,
+    FakeServices,
+    Faults,
+    FleetStub,
+    HomeKitStub,
+    HomeKitStubPlugController,
+    MqttBroker,
+    QuantizedUsage,
+    TelegramStub,
+    main,
+    topic_matches,
+)
+from load_controllers import RealTeslaController
+from load_manager import LoadManager, LoadManagerConfig
+from load_models import PlugConfig, TeslaConfig
+from telegram_client import TelegramClient, TelegramConfig
+
+NOW = datetime(2026, 6, 8, 14, 10, 7, tzinfo=timezone.utc)
+
+
+class TestFaults:
+    """Fault specs parse from the CLI and apply per request."""
+
+    def test_parse(self) -> None:
+        faults = Faults.parse("latency_secs=0.2, error_rate=0.5")
+        assert faults == Faults(latency_secs=0.2, error_rate=0.5)
+        with pytest.raises(ValueError):
+            Faults.parse("latency=1")
+
+    def test_errors_and_stalls(self) -> None:
+        with TelegramStub(faults=Faults(error_rate=1.0)) as stub:
+            resp = requests.post(f"{stub.url}/bot1:a/sendMessage", json={"chat_id": 1, "text": "x"}, timeout=5)
+            assert resp.status_code == 429
+            assert stub.stats["errors"] == 1
+        with TelegramStub(faults=Faults(stall_rate=1.0, stall_secs=30)) as stub:
+            with pytest.raises(requests.Timeout):
+                requests.post(f"{stub.url}/bot1:a/sendMessage", json={}, timeout=0.2)
+
+    def test_latency(self) -> None:
+        with TelegramStub(faults=Faults(latency_secs=0.1, jitter_secs=0.05)) as stub:
+            start = time.monotonic()
+            requests.post(f"{stub.url}/bot1:a/sendMessage", json={"chat_id": 1, "text": "x"}, timeout=5)
+            assert time.monotonic() - start >= 0.1
+
+
+class TestQuantizedUsage:
+    """Generated usage is quantized, published after a lag, and repeatable."""
+
+    def test_series(self) -> None:
+        usage = QuantizedUsage(quantum_secs=30, lag_secs=15)
+        start = int(NOW.replace(minute=0, second=0).timestamp())
+        series = usage.series("c", start, int(NOW.timestamp()) + 60, NOW)
+        # 14:10:07 - 15 s lag -> 14:09:52, floored to the 14:09:30 quantum.
+        assert start + len(series) == int(datetime(2026, 6, 8, 14, 9, 30, tzinfo=timezone.utc).timestamp())
+        assert series[:30] == [series[0]] * 30
+        assert series == usage.series("c", start, start + len(series), NOW + timedelta(hours=1))
+        assert series != usage.series("other", start, start + len(series), NOW)
+
+    def test_coarse_scale_sums_seconds(self) -> None:
+        usage = QuantizedUsage()
+        start = int(NOW.timestamp()) // 900 * 900 - 3600
+        quarters = usage.series("c", start, start + 3600, NOW, scale_secs=900)
+        seconds = usage.series("c", start, start + 3600, NOW)
+        assert len(quarters) == 4
+        assert quarters[0] == pytest.approx(sum(seconds[:900]))
+
+
+class TestEmporiaStub:
+    """PyEmVue's simulator login talks to the stand-in."""
+
+    def test_devices_and_chart_usage(self) -> None:
+        usage = QuantizedUsage()
+        with EmporiaStub(usage, clock=MagicMock(now=lambda: NOW)) as stub:
+            vue = PyEmVue()
+            assert vue.login_simulator(stub.url)
+            device = vue.get_devices()[-1]
+            assert (device.model, device.connected) == ("ZIG001", True)
+            start = NOW.replace(minute=0, second=0)
+            samples, first = vue.get_chart_usage(device.channels[0], start, NOW)
+            assert first == start
+            channel = f"{device.device_gid}:1,2,3"
+            assert samples == usage.series(channel, int(start.timestamp()), int(NOW.timestamp()), NOW)
+            assert requests.get(f"{stub.url}/customers", timeout=5).status_code == 401
+
+    def test_drift(self) -> None:
+        with EmporiaStub(drift_rate=1.0, clock=MagicMock(now=lambda: NOW)) as stub:
+            vue = PyEmVue()
+            vue.login_simulator(stub.url)
+            start = NOW.replace(minute=0, second=0)
+            _samples, first = vue.get_chart_usage(vue.get_devices()[-1].channels[0], start, NOW)
+            assert first == start + timedelta(seconds=30)
+
+    def test_create_metrics(self) -> None:
+        """The app's fetch path runs against the stand-in unchanged."""
+        with EmporiaStub() as stub, \
+                patch.dict(os.environ, {"VUE_SIMULATOR_HOST": stub.url}), \
+                patch.object(metrics.MetricsBase, "vue", PyEmVue()), \
+                patch.object(metrics.MetricsBase, "device_info", {}), \
+                patch.object(metrics.MetricsBase, "vue_auth", {}), \
+                patch.object(metrics, "get_session", return_value=EmporiaSession()):
+            cache = EnergyCache(ttl_seconds=30)
+            now = datetime.now(timezone.utc)
+            result, fresh = cache.get_or_fetch(
+                lambda: metrics.create_metrics(cache, now, logging.getLogger(__name__)), now,
+            )
+        assert fresh and result is not None
+        assert result["devices"][0]["nbc"] is not None
+        assert "get_chart_usage/1,2,3" in result["api_response"]
+        assert stub.stats["get_chart_usage"] == 1
+
+
+class _Listener:
+    """paho subscriber collecting ``(topic, payload)`` pairs."""
+
+    def __init__(self, broker: MqttBroker, topic_filter: str) -> None:
+        self.messages: list[tuple[str, bytes]] = []
+        self.subscribed = threading.Event()
+        self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+        self.client.on_connect = lambda c, *_a: c.subscribe(topic_filter)
+        self.client.on_subscribe = lambda *_a: self.subscribed.set()
+        self.client.on_message = lambda _c, _u, msg: self.messages.append((msg.topic, msg.payload))
+        self.client.connect(broker.host, broker.port)
+        self.client.loop_start()
+        assert self.subscribed.wait(5)
+
+    def wait_for(self, count: int) -> list[tuple[str, bytes]]:
+        deadline = time.monotonic() + 5
+        while len(self.messages) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.messages
+
+    def close(self) -> None:
+        self.client.disconnect()
+        self.client.loop_stop()
+
+
+class TestMqttBroker:
+    """paho clients connect, subscribe with wildcards and receive retained state."""
+
+    def test_topic_matches(self) -> None:
+        assert topic_matches("telemetry/#", "telemetry/ChargeAmps")
+        assert topic_matches("a/+/c", "a/b/c")
+        assert not topic_matches("a/+", "a/b/c")
+        assert not topic_matches("telemetry/ChargeAmps", "telemetry")
+
+    def test_publish_retain_and_drop(self) -> None:
+        with MqttBroker() as broker:
+            broker.publish("telemetry/ChargeAmps", "16", retain=True)
+            listener = _Listener(broker, "telemetry/#")
+            publisher = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+            publisher.connect(broker.host, broker.port)
+            publisher.loop_start()
+            publisher.publish("telemetry/ChargeState", "Charging", qos=1).wait_for_publish(5)
+            publisher.publish("other/topic", "x")
+            assert listener.wait_for(2) == [
+                ("telemetry/ChargeAmps", b"16"), ("telemetry/ChargeState", b"Charging"),
+            ]
+            publisher.disconnect()
+            publisher.loop_stop()
+            listener.close()
+        with MqttBroker(faults=Faults(error_rate=1.0)) as broker:
+            listener = _Listener(broker, "#")
+            broker.publish("t", "x")
+            assert broker.stats["dropped"] == 1 and not listener.messages
+            listener.close()
+
+
+def _tesla_config(proxy_url: str) -> TeslaConfig:
+    return TeslaConfig(
+        client_id="c", client_secret="s", redirect_uri="r", vehicle_id="VIN1",
+        home_lat=37.0, home_lon=-122.0, vehicle_command_proxy_url=proxy_url,
+    )
+
+
+class TestFleetStub:
+    """RealTeslaController commands the stand-in through the proxy setting."""
+
+    @pytest.fixture(autouse=True)
+    def _tokens(self):
+        tokens = {"access_token": "a", "refresh_token": "r", "expires": time.time() + 3600}
+        with patch.object(load_controllers, "load_tesla_tokens", return_value=tokens), \
+                patch.object(load_controllers, "_tokens_mtime_ns", return_value=1), \
+                patch.object(load_controllers, "save_tesla_tokens"):
+            yield
+
+    def test_commands_publish_telemetry(self) -> None:
+        with MqttBroker() as broker, FleetStub(broker=broker) as fleet:
+            listener = _Listener(broker, "telemetry/#")
+            ctrl = RealTeslaController(_tesla_config(fleet.url))
+
+            async def scenario() -> tuple[bool, bool]:
+                try:
+                    return await ctrl.set_charge_amps(10), await ctrl.stop_charging()
+                finally:
+                    await ctrl.close()
+
+            assert asyncio.run(scenario()) == (True, True)
+            state = fleet.vehicle("VIN1")
+            assert (state.charge_amps, state.charging) == (10, False)
+            assert [name for _vin, name, _p in fleet.commands] == ["set_charging_amps", "charge_stop"]
+            published = dict(listener.wait_for(6)[-3:])
+            assert b"DetailedChargeStateStopped" in published["telemetry/DetailedChargeState"]
+            listener.close()
+
+    def test_offline_vehicle(self) -> None:
+        with FleetStub(faults=Faults(error_rate=1.0)) as fleet:
+            ctrl = RealTeslaController(_tesla_config(fleet.url))
+            assert asyncio.run(ctrl.set_charge_amps(10)) is False
+            assert ctrl._last_command_vehicle_offline
+
+
+class TestTelegramStub:
+    """TelegramClient posts to the stand-in when TELEGRAM_API_BASE is set."""
+
+    def test_send(self) -> None:
+        with TelegramStub() as stub:
+            client = TelegramClient(TelegramConfig("1:abc", "-100", api_base=stub.url))
+            assert client.send_message_sync("hello")
+
+            async def send() -> bool:
+                try:
+                    return await client.send_message("again")
+                finally:
+                    await client.close()
+
+            assert asyncio.run(send())
+        assert stub.messages == [("-100", "hello"), ("-100", "again")]
+
+
+class TestHomeKitStub:
+    """The stub plug controller reads and writes HAP characteristics."""
+
+    def _plugs(self) -> dict[str, PlugConfig]:
+        return {"heater": PlugConfig(name="heater", accessory_id="10.0.0.5", power_watts=1500)}
+
+    def test_get_and_set(self) -> None:
+        with HomeKitStub(["10.0.0.5"]) as stub:
+            ctrl = HomeKitStubPlugController(self._plugs(), stub.url)
+
+            async def scenario() -> list[bool | None]:
+                try:
+                    return [await ctrl.get_state("heater"), await ctrl.set_state("heater", True),
+                            await ctrl.get_state("heater"), await ctrl.get_state("missing")]
+                finally:
+                    await ctrl.disconnect()
+
+            assert asyncio.run(scenario()) == [False, True, True, None]
+            assert stub.state("10.0.0.5") is True
+            assert stub.stats["connections"] == 1
+
+    def test_communication_failure(self) -> None:
+        with HomeKitStub(["10.0.0.5"], faults=Faults(error_rate=1.0)) as stub:
+            resp = requests.get(f"{stub.url}/characteristics", params={"id": "1.10"}, timeout=5)
+            assert resp.status_code == 207
+            assert resp.json()["characteristics"] == [{"aid": 1, "iid": 10, "status": -70402}]
+
+    def test_selected_by_load_manager(self) -> None:
+        env = {"LOAD_PLUG_CONTROLLER": "real", "HOMEKIT_STUB_URL": "http://127.0.0.1:9"}
+        with patch.dict(os.environ, env), \
+                patch("load_manager.load_plugs_from_file", return_value=self._plugs()), \
+                patch("load_manager.load_vocolinc_plugs_from_file", return_value={}):
+            lm = LoadManager(LoadManagerConfig(
+                metrics_fetch=lambda: None, energy_cache=EnergyCache(), tesla_ctrl=None,
+            ))
+        try:
+            assert isinstance(lm.plug_ctrl, HomeKitStubPlugController)
+        finally:
+            lm.close()
+
+
+class TestCli:
+    """``python fake_services.py`` prints the .env lines for its ports."""
+
+    def test_main(self) -> None:
+        out = io.StringIO()
+        with redirect_stdout(out):
+            main(["--base-port", "0", "--accessory", "heater"], wait=lambda: None)
+        text = out.getvalue()
+        assert "VUE_SIMULATOR_HOST=http://127.0.0.1:" in text
+        assert "TESLA_VEHICLE_ID=FAKEVIN0000000001" in text
+        assert '"mqtt"' in text
+
+    def test_build_env(self) -> None:
+        with FakeServices.build(overrides={"emporia": Faults(error_rate=1.0)}) as services:
+            env = services.env()
+            assert env["MQTT_PORT"] == str(services.mqtt.port)
+            assert services.emporia.injector.faults.error_rate == 1.0
+            assert services.tesla.injector.faults == Faults()
@@ -0,0 +1,185 @@
+"""Tests for the on-disk history store and its EnergyCache/TOU integration."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from clock import FakeClock
+from energy_cache import EnergyCache
+from history_store import HistoryStore
+from metrics import TOUReporter
+from tests.helpers import _make_tou_reporter
+from util import CompletedNBCPeriod
+
+START = datetime(2025, 6, 15, 14, 0, 0, tzinfo=timezone.utc)
+QH = timedelta(minutes=15)
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    s = HistoryStore(tmp_path / "history.db", keep_samples=True)
+    yield s
+    s.close()
+
+
+class TestHistoryStore:
+    """Round trips through the SQLite store."""
+
+    def test_periods_round_trip(self, store: HistoryStore) -> None:
+        """Recorded periods come back sorted and range-filtered."""
+        store.record_periods([
+            CompletedNBCPeriod(start=START + QH, raw_wh=2.0),
+            CompletedNBCPeriod(start=START, raw_wh=1.0),
+            CompletedNBCPeriod(start=START + 2 * QH, raw_wh=3.0),
+        ])
+        periods = store.periods(START, START + 2 * QH)
+        assert [p.raw_wh for p in periods] == [1.0, 2.0]
+        assert periods[0].start == START
+
+    def test_rerecord_replaces(self, store: HistoryStore) -> None:
+        """Writing an existing QH again keeps the newest value."""
+        store.record_periods([CompletedNBCPeriod(start=START, raw_wh=1.0)])
+        store.record_periods([CompletedNBCPeriod(start=START, raw_wh=5.0)])
+        assert [p.raw_wh for p in store.periods(START, START + QH)] == [5.0]
+
+    def test_runs_split_on_gaps(self, store: HistoryStore) -> None:
+        """runs() groups back-to-back QHs and drops QHs past the end."""
+        store.record_periods([
+            CompletedNBCPeriod(start=START + i * QH, raw_wh=float(i))
+            for i in (0, 1, 3, 4)
+        ])
+        runs = store.runs(START, START + 4 * QH + timedelta(minutes=5))
+        assert [[p.raw_wh for p in run] for run in runs] == [[0.0, 1.0], [3.0]]
+
+    def test_samples_round_trip(self, store: HistoryStore) -> None:
+        """Samples are stored per QH; a trailing partial QH is kept."""
+        samples = [0.001] * 900 + [0.002] * 30
+        store.record_samples(START, samples)
+        assert store.samples_at(START) == [0.001] * 900
+        assert store.samples_at(START + QH) == [0.002] * 30
+        assert store.samples_at(START + 2 * QH) is None
+
+    def test_samples_skipped_unless_enabled(self, tmp_path: Path) -> None:
+        """keep_samples=False persists no samples."""
+        s = HistoryStore(tmp_path / "h.db")
+        try:
+            s.record_samples(START, [0.001] * 10)
+            assert s.samples_at(START) is None
+        finally:
+            s.close()
+
+    def test_persists_across_reopen(self, tmp_path: Path) -> None:
+        """A second store on the same file sees earlier writes."""
+        path = tmp_path / "h.db"
+        s = HistoryStore(path)
+        s.record_periods([CompletedNBCPeriod(start=START, raw_wh=1.5)])
+        s.close()
+        s = HistoryStore(path)
+        try:
+            assert [p.raw_wh for p in s.periods(START, START + QH)] == [1.5]
+        finally:
+            s.close()
+
+
+class TestEnergyCacheStore:
+    """EnergyCache writes completed QHs to the store and warms from it."""
+
+    def test_compact_records_completed_periods(self, store: HistoryStore) -> None:
+        """A fetch spanning a completed QH writes it to the store."""
+        now = START + QH + timedelta(seconds=40)
+        cache = EnergyCache(clock=FakeClock(now), store=store)
+        samples = [0.001] * 900 + [0.002] * 40
+        cache.get_or_fetch(
+            lambda: {"per_second_data": samples, "data_start": START}, now,
+        )
+        periods = store.periods(START, START + 2 * QH)
+        assert [p.start for p in periods] == [START]
+        assert periods[0].raw_wh == pytest.approx(900.0)
+        assert store.samples_at(START + QH) == [0.002] * 40
+
+    def test_warm_on_construction(self, store: HistoryStore) -> None:
+        """A new cache starts from stored periods and the partial QH."""
+        now = START + QH + timedelta(seconds=40)
+        store.record_periods([CompletedNBCPeriod(start=START, raw_wh=900.0)])
+        store.record_samples(START + QH, [0.002] * 30)
+        cache = EnergyCache(clock=FakeClock(now), store=store)
+        assert cache.completed_periods == [
+            CompletedNBCPeriod(start=START, raw_wh=900.0)
+        ]
+        assert cache.data_start == START + QH
+        assert cache.samples == [0.002] * 30
+        assert not cache.is_valid(now)
+
+    def test_warm_without_previous_qh_keeps_full_fetch(
+        self, store: HistoryStore
+    ) -> None:
+        """With a gap before the current QH, data_start stays unset."""
+        now = START + 2 * QH + timedelta(seconds=40)
+        store.record_periods([CompletedNBCPeriod(start=START, raw_wh=900.0)])
+        cache = EnergyCache(clock=FakeClock(now), store=store)
+        assert cache.data_start is None
+        assert cache.completed_periods is not None
+
+    def test_invalidate_reseeds_completed_periods(
+        self, store: HistoryStore
+    ) -> None:
+        """invalidate() drops samples but restores completed QHs."""
+        now = START + QH + timedelta(seconds=40)
+        cache = EnergyCache(clock=FakeClock(now), store=store)
+        samples = [0.001] * 900 + [0.002] * 40
+        cache.get_or_fetch(
+            lambda: {"per_second_data": samples, "data_start": START}, now,
+        )
+        cache.invalidate()
+        assert cache.samples is None
+        assert [p.start for p in cache.completed_periods or []] == [START]
+
+    def test_warmed_snapshot_not_served_while_fetching(
+        self, store: HistoryStore
+    ) -> None:
+        """A failed first fetch after warming reports no data."""
+        now = START + QH + timedelta(seconds=40)
+        store.record_periods([CompletedNBCPeriod(start=START, raw_wh=900.0)])
+        cache = EnergyCache(clock=FakeClock(now), store=store)
+        assert cache.get_or_fetch(lambda: None, now) == (None, True)
+
+
+class TestTOUReporterStore:
+    """TOUReporter reads stored QHs and fetches only the gaps."""
+
+    def _reporter(self, vue: MagicMock, store: HistoryStore | None) -> TOUReporter:
+        chan = MagicMock(channel_num="1,2,3")
+        vdi = MagicMock(channels=[chan])
+        return _make_tou_reporter(vue, {1: vdi}, START, START + 4 * QH, store=store)
+
+    def test_gap_fetched_and_trimmed(self, store: HistoryStore) -> None:
+        """Only the head gap and the tail are requested from Emporia."""
+        store.record_periods([
+            CompletedNBCPeriod(start=START + i * QH, raw_wh=100.0) for i in (1, 2)
+        ])
+        responses = {
+            START: ([0.5, 0.1], START),              # gap — trimmed
+            START + 3 * QH: ([0.3], START + 3 * QH),  # tail after the run
+        }
+        vue = MagicMock()
+        vue.get_chart_usage.side_effect = (
+            lambda chan, start, end, **kwargs: responses[start]
+        )
+        tou = self._reporter(vue, store)
+        assert tou.usage_data_list == [
+            {"start": START, "data": [0.5]},
+            {"start": START + QH, "data": [0.1, 0.1]},
+            {"start": START + 3 * QH, "data": [0.3]},
+        ]
+        assert vue.get_chart_usage.call_count == 2
+
+    def test_without_store_fetches_everything(self) -> None:
+        """Instances without a store keep the original single-range fetch."""
+        vue = MagicMock()
+        vue.get_chart_usage.return_value = ([0.1] * 4, START)
+        tou = self._reporter(vue, None)
+        assert tou.usage_data_list == [{"start": START, "data": [0.1] * 4}]
@@ -0,0 +1,167 @@
+"""Tests for the instrumentation registry and the /metrics endpoint."""
+
+from __future__ import annotations
+
+import pickle
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+import app as app_mod
+from energy_cache import EnergyCache
+from instrumentation import (
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricFamily,
+    Registry,
+    merge_families,
+    observe_cycle_stages,
+    render,
+)
+from sse_event import SSEFrame, StreamFilter, Subscription, encode_frame
+
+NOW = datetime(2026, 6, 8, 12, 0, 30, tzinfo=timezone.utc)
+
+
+def _value(name: str, suffix: str = "_total", **labels: str) -> float:
+    """Return one sample of the global registry (0 when absent)."""
+    wanted = tuple(sorted(labels.items()))
+    for family in REGISTRY.collect():
+        if family.name != name:
+            continue
+        for sample_suffix, sample_labels, value in family.samples:
+            if sample_suffix == suffix and tuple(sorted(sample_labels)) == wanted:
+                return value
+    return 0.0
+
+
+class TestRegistry:
+    """Metrics render in the Prometheus text format."""
+
+    def test_counter_and_gauge(self) -> None:
+        registry = Registry()
+        requests = Counter("t_requests", "Requests.", ("route",), registry=registry)
+        requests.labels("/").inc()
+        requests.labels("/").inc(2)
+        depth = Gauge("t_depth", 'Queue "depth".', registry=registry)
+        depth.set(4.5)
+        assert registry.render() == (
+            '# HELP t_depth Queue \\"depth\\".\n'
+            "# TYPE t_depth gauge\n"
+            "t_depth 4.5\n"
+            "# HELP t_requests Requests.\n"
+            "# TYPE t_requests counter\n"
+            't_requests_total{route="/"} 3\n'
+        )
+        with pytest.raises(ValueError):
+            requests.labels("/").inc(-1)
+        with pytest.raises(ValueError):
+            requests.labels("/", "extra")
+        with pytest.raises(ValueError):
+            Counter("t_requests", "Again.", registry=registry)
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        registry = Registry()
+        latency = Histogram("t_seconds", "Latency.", buckets=(0.1, 1.0), registry=registry)
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+        lines = registry.render().splitlines()
+        assert lines[2:] == [
+            't_seconds_bucket{le="0.1"} 2',
+            't_seconds_bucket{le="1"} 3',
+            't_seconds_bucket{le="+Inf"} 4',
+            "t_seconds_sum 3.65",
+            "t_seconds_count 4",
+        ]
+
+    def test_gauge_function_read_at_scrape(self) -> None:
+        registry = Registry()
+        clients = Gauge("t_clients", "Clients.", ("server",), registry=registry)
+        count = [2]
+        clients.labels("a").set_function(lambda: count[0])
+        count[0] = 7
+        assert 't_clients{server="a"} 7' in registry.render()
+
+    def test_merge_keeps_per_worker_families(self) -> None:
+        leader = [
+            MetricFamily("solara_cycle_stage_seconds", "histogram", "", ()),
+            MetricFamily("solara_sse_evictions", "counter", "", (("_total", (), 9.0),)),
+        ]
+        local = [
+            MetricFamily("solara_cycle_stage_seconds", "histogram", "", (("_count", (), 0.0),)),
+            MetricFamily("solara_sse_evictions", "counter", "", (("_total", (), 1.0),)),
+        ]
+        merged = merge_families(leader, local)
+        assert merged == [leader[0], local[1]]
+        assert pickle.loads(pickle.dumps(merged)) == merged
+        assert render([]) == ""
+
+
+class TestHotPathHooks:
+    """Cycle stages, cache calls and SSE coalescing are counted."""
+
+    def test_cycle_stages_recorded_on_early_exit(self) -> None:
+        before = _value("solara_cycle_stage_seconds", "_count", stage="t_stage")
+        with pytest.raises(RuntimeError):
+            with observe_cycle_stages() as timings:
+                timings["t_stage"] = 0.2
+                raise RuntimeError("early exit")
+        assert _value("solara_cycle_stage_seconds", "_count", stage="t_stage") == before + 1
+
+    def test_cache_requests_and_samples(self) -> None:
+        cache = EnergyCache(ttl_seconds=60)
+        samples = [0.001] * 30
+
+        def fetch() -> dict:
+            return {"per_second_data": list(samples), "data_start": NOW.replace(second=0)}
+
+        before = {
+            result: _value("solara_cache_requests", caller="t_caller", result=result)
+            for result in ("miss", "hit")
+        }
+        fetched = _value("solara_cache_samples_fetched")
+        new = _value("solara_cache_samples_new")
+        cache.get_or_fetch(fetch, NOW, caller="t_caller")
+        cache.get_or_fetch(fetch, NOW, caller="t_caller")
+        samples.extend([0.002] * 10)
+        cache.get_or_fetch(fetch, NOW, force=True, caller="t_caller")
+        assert _value("solara_cache_requests", caller="t_caller", result="miss") == before["miss"] + 2
+        assert _value("solara_cache_requests", caller="t_caller", result="hit") == before["hit"] + 1
+        assert _value("solara_cache_samples_fetched") == fetched + 70
+        assert _value("solara_cache_samples_new") == new + 40
+
+    def test_sse_eviction_counted(self) -> None:
+        sub = Subscription(StreamFilter(events=None, intervals={"load_cycle": 60.0}))
+        before = _value("solara_sse_evictions")
+        for seq in range(1, 4):
+            sub.offer(SSEFrame(seq, "load_cycle", encode_frame("load_cycle", "{}", str(seq))))
+        assert _value("solara_sse_evictions") == before + 1
+
+
+class TestMetricsEndpoint:
+    """/metrics serves the registry, or the leader's families on a follower."""
+
+    def test_serves_text_format(self) -> None:
+        resp = app_mod.app.test_client().get("/metrics")
+        assert resp.status_code == 200
+        assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        body = resp.get_data(as_text=True)
+        assert "# TYPE solara_cycle_stage_seconds histogram" in body
+        assert 'solara_sse_subscribers{server="flask"}' in body
+
+    def test_follower_serves_leader_families(self) -> None:
+        leader_family = MetricFamily(
+            "solara_emporia_fetch_timeouts", "counter", "Timeouts.", (("_total", (), 5.0),)
+        )
+        snapshot = app_mod.ControlPlaneSnapshot(
+            generation=1, written_at=NOW, instrumentation=(leader_family,),
+        )
+        with patch.object(app_mod._state, "control_snapshot", snapshot), \
+             patch.object(app_mod, "_following_control_plane", return_value=True):
+            body = app_mod.app.test_client().get("/metrics").get_data(as_text=True)
+        assert "solara_emporia_fetch_timeouts_total 5\n" in body
+        assert "solara_cycle_stage_seconds" not in body
+        assert "solara_sse_subscribers" in body
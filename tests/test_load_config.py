@@ -22,6 +22,7 @@ from load_models import (
     AbstractPlugController,
     CycleResult,
     DeviceState,
+    PendingEffect,
     PlugConfig,
     TeslaAuthError,
     TeslaConfig,
@@ -537,6 +538,123 @@ def test_sync_handles_controller_error():
     asyncio.run(mgr._sync_plug_states())
 
 
+class _SlowController(AbstractPlugController):
+    """Controller whose calls sleep, tracking the peak number in flight."""
+
+    def __init__(
+        self,
+        plugs: dict[str, PlugConfig],
+        max_concurrency: int,
+        hang: frozenset[str] = frozenset(),
+    ) -> None:
+        self.plugs = plugs
+        self.max_concurrency = max_concurrency
+        self._hang = hang
+        self.in_flight = 0
+        self.peak = 0
+        self.set_calls: list[tuple[str, bool]] = []
+
+    async def _call(self, name: str) -> None:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(30 if name in self._hang else 0.05)
+        finally:
+            self.in_flight -= 1
+
+    async def get_state(self, name: str) -> bool | None:
+        """Return True after a short (or hanging) delay."""
+        await self._call(name)
+        return True
+
+    async def set_state(self, name: str, on: bool) -> bool:
+        """Record the call after a short (or hanging) delay."""
+        await self._call(name)
+        self.set_calls.append((name, on))
+        return True
+
+
+def _slow_manager(plug_ctrl: AbstractPlugController) -> LoadManager:
+    return LoadManager(LoadManagerConfig(
+        metrics_fetch=lambda: _make_metrics_with_wh("main_panel", -2000.0),
+        plug_ctrl=plug_ctrl,
+        tesla_ctrl=None,
+        target_wh=-500,
+        nbc_device="main_panel",
+        enabled=True,
+        dry_run=False,
+    ))
+
+
+def _plugs(*names: str) -> dict[str, PlugConfig]:
+    return {
+        name: PlugConfig(name=name, accessory_id=name, power_watts=500.0, priority=i)
+        for i, name in enumerate(names)
+    }
+
+
+def test_sync_queries_plugs_concurrently():
+    """Plug reads fan out up to the controller's max_concurrency."""
+    plug_ctrl = _SlowController(_plugs("a", "b", "c", "d"), max_concurrency=4)
+    mgr = _slow_manager(plug_ctrl)
+
+    asyncio.run(mgr._sync_plug_states())
+
+    assert plug_ctrl.peak == 4
+    assert all(mgr.state.devices[n].actual_state is True for n in "abcd")
+    assert mgr._async_timings["plug_sync"] < mgr._async_timings["plug_sync_calls"]
+
+
+def test_sync_respects_controller_concurrency_limit():
+    """A controller with max_concurrency=1 sees one call at a time."""
+    plug_ctrl = _SlowController(_plugs("a", "b", "c"), max_concurrency=1)
+    mgr = _slow_manager(plug_ctrl)
+
+    asyncio.run(mgr._sync_plug_states())
+
+    assert plug_ctrl.peak == 1
+    assert len(mgr.state.devices) == 3
+
+
+def test_sync_timeout_does_not_stall_other_plugs():
+    """A hanging plug times out; the others are still reconciled."""
+    plug_ctrl = _SlowController(
+        _plugs("a", "dead", "b"), max_concurrency=4, hang=frozenset({"dead"})
+    )
+    mgr = _slow_manager(plug_ctrl)
+
+    with patch("load_manager.PLUG_CALL_TIMEOUT_SECS", 0.2):
+        asyncio.run(mgr._sync_plug_states())
+
+    assert set(mgr.state.devices) == {"a", "b"}
+
+
+def test_dispatch_actions_returns_results_in_action_order():
+    """Actions run concurrently per device; results keep decision order."""
+    plug_ctrl = _SlowController(
+        _plugs("a", "dead", "b"), max_concurrency=4, hang=frozenset({"dead"})
+    )
+    mgr = _slow_manager(plug_ctrl)
+    now = datetime(2025, 6, 15, 12, 0, 0, tzinfo=timezone.utc)
+    actions = [
+        PendingEffect(device_name=name, action=action, timestamp=now,
+                      data_point_at=now, power_watts=500.0)
+        for name, action in (
+            ("a", "turn_on"), ("dead", "turn_on"), ("b", "turn_off"), ("a", "turn_off"),
+        )
+    ]
+
+    with patch("load_manager.PLUG_CALL_TIMEOUT_SECS", 0.2):
+        outcomes = asyncio.run(mgr._dispatch_actions(actions))
+
+    assert outcomes == [True, False, True, True]
+    # Same-device actions keep their decision order.
+    a_calls = [on for name, on in plug_ctrl.set_calls if name == "a"]
+    assert a_calls == [True, False]
+    assert plug_ctrl.peak >= 2
+    assert "dispatch" in mgr._async_timings
+
+
 def test_sync_no_reconciliation_when_states_match():
     """Sync does nothing when desired and actual states already match."""
     plugs = {
@@ -492,6 +492,40 @@ class TestRealTeslaControllerProxyUrl:
         assert mock_api.server == "https://fleet-api.prd.na.vn.cloud.tesla.com"
 
 
+    def test_ensure_api_skips_token_reload_when_file_unchanged(self):
+        """A live API client only re-reads the token file after it changes."""
+        import asyncio
+
+        from load_controllers import RealTeslaController
+
+        config = TeslaConfig(
+            client_id="test-id",
+            client_secret="secret",
+            redirect_uri="http://localhost/callback",
+            vehicle_id="v123",
+            home_lat=37.0,
+            home_lon=-122.0,
+            home_radius_m=500,
+        )
+        ctrl = RealTeslaController(config)
+        mock_session = MagicMock()
+        mock_api = MagicMock(session=mock_session)
+        mtime = [1]
+
+        with (
+            patch.object(ctrl, "_get_session", new_callable=lambda: AsyncMock(return_value=mock_session)),
+            patch("tesla_fleet_api.TeslaFleetOAuth", return_value=mock_api),
+            patch("load_controllers._tokens_mtime_ns", side_effect=lambda: mtime[0]),
+            patch("load_controllers.load_tesla_tokens", return_value=None) as mock_load,
+        ):
+            asyncio.run(ctrl._ensure_api())
+            asyncio.run(ctrl._ensure_api())
+            assert mock_load.call_count == 1
+            mtime[0] = 2
+            asyncio.run(ctrl._ensure_api())
+            assert mock_load.call_count == 2
+
+
 # =============================================================================
 # 9. RealTeslaController _get_session SSL handling for vehicle-command proxy
 # =============================================================================
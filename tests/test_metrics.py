@@ -18,6 +18,7 @@ from metrics import (
 from util import ceil_to_qh, compute_nbc_quarters
 from mockdata import MetricsMock
 from test_app import mock_config
+from tests.helpers import _make_tou_reporter
 from clock import FakeClock
 
 class TestTOUReporterAggregate(unittest.TestCase):
@@ -32,22 +33,9 @@ class TestTOUReporterAggregate(unittest.TestCase):
         the TOUReporter instance can successfully run aggregate_tou without
         raising AttributeError.
         """
-        from metrics import TOUReporter
-
-        # We can't fully instantiate TOUReporter (needs real VUE API),
-        # but we can verify the method doesn't reference self.EnergyDataAggregator
-        # by checking that calling it on a partial instance works.
-        class PartialTOU(TOUReporter):
-            def __init__(self):
-                # Skip parent init, just set what aggregate_tou needs
-                self.usage_data_list = [
-                    {
-                        "start": datetime(2024, 1, 1, 8, 0, tzinfo=timezone.utc),
-                        "data": [0.001] * 60,
-                    }
-                ]
-
-        reporter = PartialTOU()
+        start = datetime(2024, 1, 1, 8, 0, tzinfo=timezone.utc)
+        reporter = _make_tou_reporter(MagicMock(), {}, start, start)
+        reporter.usage_data_list = [{"start": start, "data": [0.001] * 60}]
         # Should not raise AttributeError for missing EnergyDataAggregator
         reporter.aggregate_tou()
         self.assertIsNotNone(reporter.tou_result)
@@ -548,16 +536,11 @@ class TestTOUReporterEdgeCases(unittest.TestCase):
 
     def test_aggregate_tou_empty_usage_data_list(self):
         """aggregate_tou with empty usage_data_list should produce zero buckets."""
-        from metrics import TOUReporter
-
-        tou = TOUReporter.__new__(TOUReporter)
-
-        # Set up required attributes
-        tou.usage_data_list = []
-        tou._fetch_error = None
+        now = datetime.now(timezone.utc)
+        tou = _make_tou_reporter(MagicMock(), {}, now, now)
 
-        # Call aggregate_tou directly (skip fetch_usage_data)
-        tou.aggregate_tou()
+        # Nothing to fetch, so the constructor aggregates an empty list
+        self.assertEqual(tou.usage_data_list, [])
 
         self.assertIsNotNone(tou.tou_result)
         for bucket in ["total", "peak", "part_peak", "off_peak"]:
@@ -565,14 +548,13 @@ class TestTOUReporterEdgeCases(unittest.TestCase):
 
     def test_aggregate_tou_with_none_values_in_data(self):
         """aggregate_tou should skip None values in 15-min data."""
-        from metrics import TOUReporter
-
-        tou = TOUReporter.__new__(TOUReporter)
+        now = datetime.now(timezone.utc)
+        tou = _make_tou_reporter(MagicMock(), {}, now, now)
 
         # Data with None values mixed in
         tou.usage_data_list = [
             {
-                "start": datetime.now(timezone.utc),
+                "start": now,
                 "data": [0.1, None, 0.2],
             }
         ]
@@ -584,14 +566,13 @@ class TestTOUReporterEdgeCases(unittest.TestCase):
 
     def test_aggregate_tou_with_negative_values(self):
         """aggregate_tou should handle negative values (solar export) in TOU buckets."""
-        from metrics import TOUReporter
-
-        tou = TOUReporter.__new__(TOUReporter)
+        now = datetime.now(timezone.utc)
+        tou = _make_tou_reporter(MagicMock(), {}, now, now)
 
         # Negative values represent solar export
         tou.usage_data_list = [
             {
-                "start": datetime.now(timezone.utc),
+                "start": now,
                 "data": [-0.1, 0.2],
             }
         ]
@@ -604,13 +585,12 @@ class TestTOUReporterEdgeCases(unittest.TestCase):
 
     def test_aggregate_tou_all_none_data(self):
         """aggregate_tou with all None data should produce zero NBC."""
-        from metrics import TOUReporter
-
-        tou = TOUReporter.__new__(TOUReporter)
+        now = datetime.now(timezone.utc)
+        tou = _make_tou_reporter(MagicMock(), {}, now, now)
 
         tou.usage_data_list = [
             {
-                "start": datetime.now(timezone.utc),
+                "start": now,
                 "data": [None, None],
             }
         ]
@@ -1266,70 +1246,121 @@ class TestTOUReporterFetchErrors(unittest.TestCase):
 
     def test_fetch_http_error_re_raises(self):
         """fetch_usage_data re-raises HTTPError from get_chart_usage."""
-        from unittest.mock import MagicMock
+        from datetime import UTC, datetime as dt
 
         vue_mock = MagicMock()
         http_ex = requests.exceptions.HTTPError("API error")
         http_ex.response = MagicMock()  # type: ignore[attr-defined]
         vue_mock.get_chart_usage.side_effect = http_ex
 
-        with patch.object(MetricsBase, "vue", vue_mock), \
-             patch("metrics.MetricsBase.device_info", {}):
-
-            # Create a minimal device with channels
-            vdi_mock = MagicMock()
-            chan_mock = MagicMock(channel_num=1)
-            vdi_mock.channels = [chan_mock]
-
-            with patch.object(MetricsBase, "device_info", {1: vdi_mock}):
-                from metrics import TOUReporter
-
-                from datetime import UTC, datetime as dt
-
-                tou = TOUReporter.__new__(TOUReporter)
-                # Set up required attributes without calling __init__ (which calls fetch_usage_data)
-                tou.vue = vue_mock
-                tou.logger = MagicMock()
-                tou.start_date = dt(2025, 1, 1, tzinfo=UTC)
-                tou.end_date = dt(2025, 1, 8, tzinfo=UTC)
+        # Create a minimal device with channels
+        vdi_mock = MagicMock()
+        chan_mock = MagicMock(channel_num=1)
+        vdi_mock.channels = [chan_mock]
 
-                with self.assertRaises(requests.exceptions.HTTPError):
-                    # Manually call fetch_usage_data (which will try to iterate device_info)
-                    tou.fetch_usage_data()
+        with self.assertRaises(requests.exceptions.HTTPError):
+            # The constructor fetches, iterating device_info
+            _make_tou_reporter(
+                vue_mock,
+                {1: vdi_mock},
+                dt(2025, 1, 1, tzinfo=UTC),
+                dt(2025, 1, 8, tzinfo=UTC),
+            )
 
     def test_fetch_empty_list(self):
         """fetch_usage_data with no data chunks produces empty usage_data_list."""
-
-        from datetime import UTC, datetime as dt
-
         vue_mock = MagicMock()
         # Return empty data for all calls (no chunks)
         vue_mock.get_chart_usage.return_value = ([], None)
 
-        with patch.object(MetricsBase, "vue", vue_mock), \
-             patch("metrics.MetricsBase.device_info", {}):
+        vdi_mock = MagicMock()
+        chan_mock = MagicMock(channel_num=1)
+        vdi_mock.channels = [chan_mock]
 
-            vdi_mock = MagicMock()
-            chan_mock = MagicMock(channel_num=1)
-            vdi_mock.channels = [chan_mock]
+        # Set up dates that will result in zero iterations (start >= end)
+        now = datetime.now(timezone.utc).replace(
+            hour=10, minute=30, second=0, microsecond=0
+        )
+        tou = _make_tou_reporter(vue_mock, {1: vdi_mock}, now, now)
 
-            with patch.object(MetricsBase, "device_info", {1: vdi_mock}):
-                from metrics import TOUReporter
+        self.assertEqual(tou.usage_data_list, [])
 
-                tou = TOUReporter.__new__(TOUReporter)
-                tou.vue = vue_mock
-                tou.logger = MagicMock()
 
-                # Set up dates that will result in zero iterations (start >= end)
-                now = datetime.now(timezone.utc).replace(
-                    hour=10, minute=30, second=0, microsecond=0
-                )
-                tou.start_date = now
-                tou.end_date = now  # Same time → no iterations
+class TestTOUReporterParallelFetch(unittest.TestCase):
+    """Tests for the planned, concurrent TOU chunk fetch."""
 
-                tou.fetch_usage_data()
+    START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def _reporter(self, vue, days=60, channels=1):
+        vdi = MagicMock()
+        vdi.channels = [MagicMock(channel_num=i) for i in range(channels)]
+        return _make_tou_reporter(
+            vue, {1: vdi}, self.START, self.START + timedelta(days=days)
+        )
 
-                self.assertEqual(tou.usage_data_list, [])
+    def test_chunks_reassembled_in_time_order(self):
+        """Chunks land in plan order even when calls finish out of order."""
+        def chart_usage(chan, start, end, **kwargs):
+            # Earlier chunks finish last.
+            time.sleep(max(0.0, 0.02 - (start - self.START).days / 1000))
+            return [float(start.day)], start
+
+        vue = MagicMock()
+        vue.get_chart_usage.side_effect = chart_usage
+        with patch("metrics.TOU_FETCH_MIN_INTERVAL_SECS", 0.0):
+            tou = self._reporter(vue, days=60, channels=2)
+
+        starts = [chunk["start"] for chunk in tou.usage_data_list]
+        per_channel = len(starts) // 2
+        self.assertEqual(per_channel, 9)
+        self.assertEqual(starts[:per_channel], sorted(starts[:per_channel]))
+        self.assertEqual(starts[:per_channel], starts[per_channel:])
+
+    def test_concurrency_bounded(self):
+        """No more than TOU_FETCH_MAX_WORKERS calls run at once."""
+        import threading
+
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def chart_usage(chan, start, end, **kwargs):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return [1.0], start
+
+        vue = MagicMock()
+        vue.get_chart_usage.side_effect = chart_usage
+        with patch("metrics.TOU_FETCH_MIN_INTERVAL_SECS", 0.0), \
+             patch("metrics.TOU_FETCH_MAX_WORKERS", 3):
+            self._reporter(vue, days=120)
+        self.assertLessEqual(active[1], 3)
+        self.assertGreater(active[1], 1)
+
+    def test_transient_error_retried(self):
+        """A 503 is retried and the chunk still succeeds."""
+        error = requests.exceptions.HTTPError("unavailable")
+        error.response = MagicMock(status_code=503)  # type: ignore[attr-defined]
+        vue = MagicMock()
+        vue.get_chart_usage.side_effect = [error, ([1.0], self.START)]
+        with patch("metrics.time.sleep") as sleep:
+            tou = self._reporter(vue, days=1)
+        self.assertEqual(vue.get_chart_usage.call_count, 2)
+        self.assertEqual(tou.usage_data_list, [{"start": self.START, "data": [1.0]}])
+        sleep.assert_called()
+
+    def test_client_error_not_retried(self):
+        """A 400 fails immediately and is re-raised."""
+        error = requests.exceptions.HTTPError("bad request")
+        error.response = MagicMock(status_code=400)  # type: ignore[attr-defined]
+        vue = MagicMock()
+        vue.get_chart_usage.side_effect = error
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self._reporter(vue, days=1)
+        self.assertEqual(vue.get_chart_usage.call_count, 1)
 
 
 class TestHourlyProjectionNoPredictions(unittest.TestCase):
@@ -2620,3 +2651,107 @@ class TestQuantizationAwarePrediction(unittest.TestCase):
 
 
 
+
+
+class TestTailFetch(unittest.TestCase):
+    """populate(append=True) fetches only the tail after the cached window."""
+
+    def setUp(self):
+        metrics._drift_rejections.clear()
+        self.chart_start = datetime(2025, 6, 15, 14, 0, 0, tzinfo=timezone.utc)
+        self.instant = self.chart_start + timedelta(minutes=2)
+        self.chan = MagicMock(channel_num=1)
+        self.vdi = MagicMock(device_name="panel", channels=[self.chan])
+
+    def _make_hp(self, cached: list[float]):
+        hp = HourlyProjection.__new__(HourlyProjection)
+        hp.instant = self.instant
+        hp.vue = MagicMock()
+        hp.logger = MagicMock()
+        hp.metrics = {"api_response": {}}
+        hp.energy_cache = _make_cache_with_samples(len(cached), self.chart_start)
+        hp.energy_cache.samples = list(cached)
+        hp.append = True
+        return hp
+
+    def test_tail_start_requires_matching_window(self):
+        """_tail_start_for only applies to a cache anchored at chart_start."""
+        cache = _make_cache_with_samples(100, self.chart_start)
+        overlap = metrics.TAIL_FETCH_OVERLAP_SECS
+        self.assertEqual(
+            metrics._tail_start_for(cache, self.chart_start),
+            self.chart_start + timedelta(seconds=100 - overlap),
+        )
+        later = self.chart_start + timedelta(minutes=15)
+        self.assertIsNone(metrics._tail_start_for(cache, later))
+        self.assertIsNone(metrics._tail_start_for(None, self.chart_start))
+
+    def test_tail_spliced_onto_cached_head(self):
+        """Only the tail is requested; the result covers the whole window."""
+        cached = [0.001 * i for i in range(100)]
+        hp = self._make_hp(cached)
+        overlap = metrics.TAIL_FETCH_OVERLAP_SECS
+        tail_start = self.chart_start + timedelta(seconds=100 - overlap)
+        tail = cached[-overlap:] + [0.5] * 20
+        hp.vue.get_chart_usage.return_value = (tail, tail_start)
+
+        result = hp._populate_device(self.vdi, self.chart_start)
+
+        hp.vue.get_chart_usage.assert_called_once()
+        self.assertEqual(hp.vue.get_chart_usage.call_args.args[1], tail_start)
+        self.assertEqual(result.per_second_data, cached + [0.5] * 20)
+        self.assertEqual(result.nbc_data_start, self.chart_start)
+
+    def test_overlap_mismatch_falls_back_to_full_window(self):
+        """A revised overlap sample triggers a full-window refetch."""
+        cached = [0.001] * 100
+        hp = self._make_hp(cached)
+        overlap = metrics.TAIL_FETCH_OVERLAP_SECS
+        tail_start = self.chart_start + timedelta(seconds=100 - overlap)
+        full = [0.002] * 120
+        hp.vue.get_chart_usage.side_effect = [
+            ([0.9] * (overlap + 20), tail_start),
+            (full, self.chart_start),
+        ]
+
+        result = hp._populate_device(self.vdi, self.chart_start)
+
+        self.assertEqual(hp.vue.get_chart_usage.call_count, 2)
+        self.assertEqual(
+            hp.vue.get_chart_usage.call_args.args[1], self.chart_start
+        )
+        self.assertEqual(result.per_second_data, full)
+
+    def test_drifted_tail_skips_drift_tracking(self):
+        """A drifted tail falls back quietly, without QH drift bookkeeping."""
+        hp = self._make_hp([0.001] * 100)
+        overlap = metrics.TAIL_FETCH_OVERLAP_SECS
+        tail_start = self.chart_start + timedelta(seconds=100 - overlap)
+        full = [0.002] * 120
+        hp.vue.get_chart_usage.side_effect = [
+            ([0.9] * (overlap + 20), tail_start + timedelta(seconds=3)),
+            (full, self.chart_start),
+        ]
+        before = metrics.EMPORIA_DRIFT_REJECTIONS.labels(1).samples()[0][2]
+
+        result = hp._populate_device(self.vdi, self.chart_start)
+
+        self.assertEqual(result.per_second_data, full)
+        self.assertEqual(metrics._drift_rejections, {})
+        self.assertEqual(
+            metrics.EMPORIA_DRIFT_REJECTIONS.labels(1).samples()[0][2], before
+        )
+        hp.logger.warning.assert_not_called()
+
+    def test_append_disabled_fetches_full_window(self):
+        """Without append mode the full window is always requested."""
+        hp = self._make_hp([0.001] * 100)
+        hp.append = False
+        hp.vue.get_chart_usage.return_value = ([0.002] * 120, self.chart_start)
+
+        hp._populate_device(self.vdi, self.chart_start)
+
+        hp.vue.get_chart_usage.assert_called_once()
+        self.assertEqual(
+            hp.vue.get_chart_usage.call_args.args[1], self.chart_start
+        )
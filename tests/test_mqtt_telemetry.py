@@ -275,6 +275,60 @@ class TestTeslaStateFromSnapshot:
         assert ts.at_home is True  # 100 m radius, same coords
 
 
+class TestWaitForTeslaState:
+    """wait_for_tesla_state() resumes on arrival instead of polling."""
+
+    def setup_method(self):
+        import mqtt_telemetry as mt
+        mt._telemetry_state.clear()
+
+    def teardown_method(self):
+        import mqtt_telemetry as mt
+        mt._telemetry_state.clear()
+
+    def _publish_later(self, field: str, payload: bytes, delay: float = 0.05) -> threading.Timer:
+        from mqtt_telemetry import on_message
+        msg = MagicMock(topic=f"tesla/{field}", payload=payload)
+        timer = threading.Timer(delay, on_message, args=(None, None, msg))
+        timer.start()
+        return timer
+
+    @pytest.mark.asyncio
+    async def test_returns_immediately_when_snapshot_parses(self):
+        import mqtt_telemetry as mt
+        mt._telemetry_state["DetailedChargeState"] = "DetailedChargeStateCharging"
+        with patch("mqtt_telemetry.asyncio.wait_for") as wait_for:
+            state = await mt.wait_for_tesla_state(60)
+        assert state is not None and state.is_charging is True
+        wait_for.assert_not_called()
+        assert mt._listeners == []
+
+    @pytest.mark.asyncio
+    async def test_wakes_on_arrival_from_paho_thread(self):
+        import mqtt_telemetry as mt
+        self._publish_later("Location", b'{"latitude": 1.0, "longitude": 2.0}', 0.02)
+        self._publish_later("DetailedChargeState", b'"DetailedChargeStateComplete"')
+        start = time.monotonic()
+        state = await mt.wait_for_tesla_state(10)
+        assert time.monotonic() - start < 5
+        assert state is not None
+        assert state.is_charging is False and state.plugged_in is True
+        assert mt._listeners == []
+
+    @pytest.mark.asyncio
+    async def test_unparseable_arrival_keeps_waiting(self):
+        import mqtt_telemetry as mt
+        self._publish_later("ChargeAmps", b"0", 0.01).join()
+        assert await mt.wait_for_tesla_state(0.1) is None
+        assert mt._listeners == []
+
+    @pytest.mark.asyncio
+    async def test_zero_timeout_skips_telemetry(self):
+        import mqtt_telemetry as mt
+        mt._telemetry_state["ChargeAmps"] = 16.0
+        assert await mt.wait_for_tesla_state(0) is None
+
+
 class TestStartMqttSubscriber:
     """start_mqtt_subscriber() starts the background MQTT thread."""
 
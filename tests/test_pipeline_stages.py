@@ -462,28 +462,36 @@ class TestStageAsyncPhase:
         assert ctx.adjusted_wh == -700.0
         assert ctx.sentinel_on is True
 
-    def test_resets_tesla_session_when_configured(
+    def test_keeps_tesla_session_across_cycles(
         self, lm: LoadManager, ctx: CycleContext
     ):
-        """reset_session() is called on tesla_ctrl when configured."""
+        """Sessions are not reset: the async phase runs on a persistent loop."""
+        import threading
+
         ctx.gap_wh = 500.0
         ctx.adjusted_wh = -500.0
         ctx.now_postfetch = datetime(2025, 6, 1, 12, 0, 30, tzinfo=timezone.utc)
         ctx.seconds_remaining = 450
         ctx.qh_name = "QH2"
         ctx.data_point_at = datetime(2025, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
-        # Give lm a tesla_ctrl stub
-        from load_controllers import TeslaController
         lm.tesla_ctrl = TeslaController(None)  # type: ignore[arg-type]
+        threads: list[threading.Thread] = []
+
+        async def _fake_async_phase(*_args, **_kwargs):
+            threads.append(threading.current_thread())
+            return (None, None, None, [], [], 500.0, -500.0, False)
+
         with (
-            patch.object(lm, "_cycle_async_phase") as mock_async,
+            patch.object(lm, "_cycle_async_phase", side_effect=_fake_async_phase),
             patch.object(lm.tesla_ctrl, "reset_session") as mock_reset,
         ):
-            mock_async.return_value = (
-                None, None, None, [], [], 500.0, -500.0, False,
-            )
             lm._stage_async_phase(ctx)
-        mock_reset.assert_called_once()
+            lm._stage_async_phase(ctx)
+        lm.close()
+        mock_reset.assert_not_called()
+        assert len(threads) == 2
+        assert threads[0] is threads[1]
+        assert threads[0] is not threading.current_thread()
 
     def test_async_phase_suppresses_turn_on_with_telemetry(
         self, lm: LoadManager, ctx: CycleContext
@@ -746,14 +754,14 @@ class TestStageAsyncPhase:
         assert len(ctx.actions) == 1
         assert ctx.actions[0].action == "turn_on"
 
-    def test_cycle_async_phase_closes_tesla_session(
+    def test_cycle_async_phase_keeps_tesla_session_open(
         self, lm: LoadManager
     ):
-        """_cycle_async_phase closes the Tesla controller's aiohttp session.
+        """_cycle_async_phase keeps the session; close() releases it.
 
-        When a RealTeslaController creates an aiohttp session during the
-        async phase, it must be closed before the event loop shuts down
-        to avoid 'Unclosed connector' warnings from aiohttp GC.
+        The aiohttp session lives on the manager's persistent loop so its
+        keep-alive connections are reused by the next cycle.  It is closed
+        only when the LoadManager itself is closed.
         """
         import asyncio
         from unittest.mock import AsyncMock, MagicMock
@@ -802,19 +810,20 @@ class TestStageAsyncPhase:
                 data_point_at=now,
             )
 
-        asyncio.run(_run())
+        lm._run_async(_run())
+        mock_session.close.assert_not_awaited()
+        lm.close()
         mock_session.close.assert_awaited_once()
 
-    def test_cleanup_sessions_closes_tesla_controller(
+    def test_close_closes_tesla_controller(
         self, lm: LoadManager
     ):
-        """_cleanup_sessions closes the Tesla controller via close().
+        """LoadManager.close() closes the Tesla controller via its close().
 
         Session cleanup must go through the controller's own close() method
         rather than reaching into private attributes, so the controller stays
         the single owner of its session lifecycle.
         """
-        import asyncio
         from unittest.mock import AsyncMock
 
         from load_controllers import TeslaController
@@ -823,7 +832,7 @@ class TestStageAsyncPhase:
         with patch.object(
             lm.tesla_ctrl, "close", new_callable=AsyncMock
         ) as mock_close:
-            asyncio.run(lm._cleanup_sessions())
+            lm.close()
         mock_close.assert_awaited_once()
 
 
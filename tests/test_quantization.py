@@ -6,7 +6,7 @@ import random
 
 import pytest
 
-from quantization import detect_quantization
+from quantization import QuantizationDetector, detect_quantization
 
 
 class TestDetectQuantization:
@@ -374,3 +374,56 @@ class TestDetectQuantization:
         assert sample_size == 30
         assert offset == 1
         assert confidence >= 0.99
+
+
+def _csv_data() -> list[float]:
+    import csv as csv_mod
+    with open("tests/data/2026-06-25-quant.csv") as f:
+        return [float(row["M1208.24-Mains (kWatts)"]) for row in csv_mod.DictReader(f)]
+
+
+def _jittered(seed: int) -> list[float]:
+    """Quantized series with clock-skew jitter, NaN windows and noise."""
+    rng = random.Random(seed)
+    n = rng.randint(1, 70)
+    data = [0.0] * rng.randint(0, n)
+    while len(data) < 900:
+        length = max(1, n + rng.choice([0, 0, 0, -1, 1, rng.randint(-n, n)]))
+        value = rng.choice([len(data) * 1.0, float("nan"), rng.random()])
+        data.extend([value] * length)
+    return data[:rng.randint(0, 900)]
+
+
+class TestQuantizationDetector:
+    """QuantizationDetector matches detect_quantization on appended data."""
+
+    @pytest.mark.parametrize("seed", range(40))
+    def test_matches_batch_on_every_prefix_chunk(self, seed):
+        """Results agree after every appended chunk of a random series."""
+        data = _jittered(seed)
+        rng = random.Random(seed)
+        detector = QuantizationDetector()
+        i = 0
+        while i < len(data):
+            i += rng.randint(1, 40)
+            detector.extend(data[len(detector):i])
+            assert detector.result() == detect_quantization(data[:i])
+
+    def test_matches_batch_on_real_data(self):
+        """Real Emporia data gives the same (N, offset, confidence)."""
+        data = _csv_data()
+        detector = QuantizationDetector(data[:1000])
+        detector.extend(data[1000:])
+        assert detector.result() == detect_quantization(data)
+
+    def test_short_and_constant_data(self):
+        """Edge cases mirror the batch detector."""
+        assert QuantizationDetector([1.0, 1.0, 2.0]).result() is None
+        assert QuantizationDetector([5.0] * 10).result() == (2, 0, 1.0)
+
+    def test_matches_prefix(self):
+        """matches_prefix is True only for extensions of the seen samples."""
+        detector = QuantizationDetector([1.0, 2.0])
+        assert detector.matches_prefix([1.0, 2.0, 3.0])
+        assert not detector.matches_prefix([1.0, 9.0, 3.0])
+        assert not detector.matches_prefix([1.0])
@@ -0,0 +1,230 @@
+"""Tests for the record-and-replay harness."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import io
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+import app as app_mod
+import mqtt_telemetry
+from clock import FakeClock
+from energy_cache import EnergyCache
+from load_controllers import PlugController, TeslaController
+from load_manager import LoadManager, LoadManagerConfig
+from load_models import PlugConfig, TeslaConfig
+from replay import (
+    Recorder,
+    RecordingPlugController,
+    ReplayDriver,
+    decode_samples,
+    encode_samples,
+    read_log,
+)
+from util import compute_nbc_quarters, floor_to_qh
+
+T0 = datetime(2026, 6, 8, 12, 0, tzinfo=timezone.utc)
+QUANTUM = 30
+LAG = 15
+
+
+def _day(seconds: int) -> list[float]:
+    """Quantized per-second kWh, net export with a load in the middle."""
+    return [
+        (-0.0008 if (i // 600) % 3 else 0.0003) + 0.00001 * ((i // QUANTUM) % 5)
+        for i in range(seconds)
+    ]
+
+
+class TestSampleEncoding:
+    """Windows are stored as run lengths after the prefix shared with the last one."""
+
+    def test_round_trip_with_shared_prefix(self) -> None:
+        samples = _day(3000)
+        first = (T0, samples[:1800])
+        start = T0 + timedelta(seconds=900)
+        window = samples[900:2400]
+        encoded = encode_samples(first, start, window)
+        assert encoded["o"] == 900 and encoded["keep"] == 900
+        assert sum(n for _v, n in encoded["s"]) == 600
+        assert decode_samples(first, encoded) == window
+
+    def test_unrelated_window_is_stored_whole(self) -> None:
+        window = _day(120)
+        encoded = encode_samples((T0, window), T0 + timedelta(hours=2), window)
+        assert "keep" not in encoded
+        assert decode_samples(None, encoded) == window
+        with pytest.raises(ValueError):
+            decode_samples(None, {"o": 0, "keep": 3, "s": []})
+
+
+class TestRecorder:
+    """Fetches, telemetry and plug changes are written once each."""
+
+    def test_fetch_recorded_once_per_fetched_at(self) -> None:
+        stream = io.StringIO()
+        recorder = Recorder(stream, clock=FakeClock(T0))
+        metrics = {
+            "devices": [{"name": "main", "nbc": None, "per_second_data": [1.0, 1.0, 2.0]}],
+            "data_start": T0, "_fetched_at": T0, "_data_lag_secs": 12.0,
+        }
+        fetch = recorder.wrap_fetch(lambda: metrics)
+        fetch()
+        fetch()
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert len(records) == 1
+        assert records[0]["lag"] == 12.0
+        assert records[0]["dev"][0]["s"] == [[1.0, 2], [2.0, 1]]
+
+    def test_plug_wrapper_records_external_changes_and_commands(self) -> None:
+        stream = io.StringIO()
+        recorder = Recorder(stream, clock=FakeClock(T0))
+        inner = PlugController({"heater": PlugConfig(name="heater", accessory_id="1", power_watts=500)})
+        plugs = RecordingPlugController(inner, recorder)
+
+        async def scenario() -> None:
+            await plugs.get_state("heater")           # first sighting: off
+            await plugs.get_state("heater")           # unchanged
+            await plugs.set_state("heater", True)     # command
+            await plugs.get_state("heater")           # matches command
+            await inner.set_state("heater", False)    # toggled outside
+            await plugs.get_state("heater")
+
+        asyncio.run(scenario())
+        kinds = [(r["k"], r["on"]) for r in map(json.loads, stream.getvalue().splitlines())]
+        assert kinds == [("plug", False), ("cmd", True), ("plug", False)]
+        assert plugs.plugs is inner.plugs
+
+    def test_gzip_log_tolerates_truncated_tail(self, tmp_path: Path) -> None:
+        path = tmp_path / "rec.jsonl.gz"
+        recorder = Recorder.open(path)
+        recorder.record_telemetry("ChargeAmps", None, 16.0)
+        recorder.close()
+        with gzip.open(path, "at", encoding="utf-8") as stream:
+            stream.write('{"k": "mqtt", "t"')
+        assert [r["v"] for r in read_log(path)] == [16.0]
+
+
+def _record_session(minutes: int) -> list[dict[str, Any]]:
+    """Run a live-style session over synthetic data and return its log."""
+    samples = _day(minutes * 60 + 3600)
+    clock = FakeClock(T0)
+    stream = io.StringIO()
+    recorder = Recorder(stream, clock=clock)
+
+    def create_metrics() -> dict[str, Any]:
+        now = clock.now()
+        newest = now - timedelta(seconds=LAG)
+        newest -= timedelta(seconds=newest.second % QUANTUM)
+        data_start = max(T0, floor_to_qh(newest) - timedelta(minutes=45))
+        window = samples[int((data_start - T0).total_seconds()):int((newest - T0).total_seconds())]
+        return {
+            "devices": [{
+                "name": "main_panel", "per_second_data": window,
+                "nbc": compute_nbc_quarters(window).to_dict(),
+            }],
+            "data_start": data_start, "_fetched_at": now, "_data_lag_secs": LAG,
+        }
+
+    cache = EnergyCache(ttl_seconds=3600, clock=clock)
+    plugs = {
+        name: PlugConfig(name=name, accessory_id=name, power_watts=watts, priority=i)
+        for i, (name, watts) in enumerate((("heater", 1500.0), ("pump", 700.0)))
+    }
+    lm = LoadManager(LoadManagerConfig(
+        metrics_fetch=recorder.wrap_fetch(
+            lambda: cache.get_or_fetch(create_metrics, clock.now(), force=True)[0]),
+        energy_cache=cache,
+        plug_ctrl=PlugController(plugs),
+        tesla_ctrl=TeslaController(TeslaConfig(
+            client_id="c", client_secret="s", redirect_uri="r", vehicle_id="v",
+            home_lat=37.0, home_lon=-122.0,
+        )),
+        target_wh=-50, nbc_device="main_panel", enabled=True, dry_run=False, clock=clock,
+    ))
+    lm.tesla_config = lm.tesla_ctrl.config
+    try:
+        recorder.attach(lm)
+        clock.advance(3600)
+        for _ in range(minutes * 2):
+            lm.run_cycle()
+            clock.advance(30)
+            if clock.now() == T0 + timedelta(minutes=75):
+                mqtt_telemetry.apply_update("ChargeAmps", 16.0, at=clock.now())
+        log = stream.getvalue()
+    finally:
+        lm.close()
+        recorder.close()
+        mqtt_telemetry.reset_state()
+    return [json.loads(line) for line in log.splitlines()]
+
+
+@pytest.fixture(scope="module")
+def records() -> list[dict[str, Any]]:
+    """Forty minutes of recorded cycles."""
+    return _record_session(minutes=40)
+
+
+class TestReplay:
+    """A recorded session replays deterministically on simulated time."""
+
+    def test_log_contents(self, records: list[dict[str, Any]]) -> None:
+        kinds = [r["k"] for r in records]
+        assert kinds[0] == "config"
+        assert kinds.count("fetch") == 80
+        assert "mqtt" in kinds
+        assert "cmd" in kinds
+
+    def test_recorded_pacing_runs_one_cycle_per_fetch(self, records: list[dict[str, Any]]) -> None:
+        report = ReplayDriver(records, pacing="recorded").run()
+        assert report.cycles == 80
+        assert sum(report.status_counts.values()) == 80
+        assert report.action_counts
+        assert report.stage_cycles["enabled_check"] == 80
+        assert report.speedup > 1
+        assert not mqtt_telemetry.has_telemetry()
+
+    def test_sleep_hint_pacing_and_nbc(self, records: list[dict[str, Any]]) -> None:
+        report = ReplayDriver(records).run()
+        assert report.cycles > 0
+        assert report.simulated_secs > 30 * 60
+        completed = [qh for qh in report.quarters if qh.raw_wh is not None]
+        assert completed
+        for qh in completed:
+            assert qh.nbc_wh == max(qh.raw_wh or 0.0, 0.0)
+        report_dict = report.to_dict()
+        assert report_dict["cycles_per_sec"] == report.cycles_per_sec
+        json.dumps(report_dict, default=str)
+
+    def test_window_and_target_override(self, records: list[dict[str, Any]]) -> None:
+        first_fetch = next(r["t"] for r in records if r["k"] == "fetch")
+        start = datetime.fromtimestamp(first_fetch, tz=timezone.utc) + timedelta(minutes=10)
+        report = ReplayDriver(records, target_wh=-2000, pacing="recorded").run(
+            start=start, end=start + timedelta(minutes=10),
+        )
+        assert report.cycles == 20
+
+    def test_needs_config_and_fetch(self) -> None:
+        with pytest.raises(ValueError):
+            ReplayDriver([{"k": "mqtt", "t": 0.0, "f": "ChargeAmps", "v": 1}])
+
+
+class TestAppRecorder:
+    """LOAD_RECORD_PATH turns recording on."""
+
+    def test_open_recorder(self, tmp_path: Path) -> None:
+        assert app_mod._open_recorder() is None
+        path = tmp_path / "rec.jsonl"
+        with patch.dict(os.environ, {"LOAD_RECORD_PATH": str(path)}):
+            recorder = app_mod._open_recorder()
+        assert isinstance(recorder, Recorder)
+        recorder.close()
+        assert path.exists()
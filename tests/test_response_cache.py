@@ -0,0 +1,127 @@
+"""Tests for memoized index responses and ETag handling."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+import app as app_mod
+from energy_cache import EnergyCache, EnergyCacheData
+from response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """Bodies are reused only for the same key and the same inputs."""
+
+    def test_hit_requires_identical_inputs(self) -> None:
+        cache = ResponseCache()
+        state = object()
+        stored = cache.put(("json", 1), (state,), b"{}", "application/json")
+        assert cache.get(("json", 1), (state,)) is stored
+        assert cache.get(("json", 1), (object(),)) is None
+        assert cache.get(("json", 2), (state,)) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_etag_follows_body(self) -> None:
+        cache = ResponseCache()
+        a = cache.put("a", (), b"one", "text/plain")
+        b = cache.put("b", (), b"one", "text/plain")
+        c = cache.put("c", (), b"two", "text/plain")
+        assert a.etag == b.etag != c.etag
+
+    def test_lru_bound(self) -> None:
+        cache = ResponseCache(maxsize=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, (), key.encode(), "text/plain")
+        assert cache.get("a", ()) is None
+        assert cache.get("c", ()) is not None
+
+
+class TestEnergyCacheGeneration:
+    """Every snapshot swap bumps the generation."""
+
+    def test_generation_counts_swaps(self) -> None:
+        cache = EnergyCache()
+        assert cache.generation == 0
+        cache.data_lag_secs = 1.0
+        assert cache.generation == 1
+        cache.invalidate()
+        assert cache.generation == 2
+        cache.invalidate()  # already empty: no swap
+        assert cache.generation == 2
+
+
+class TestIndexResponseCache:
+    """``/`` serves a memoized body with an ETag in real mode."""
+
+    @pytest.fixture
+    def cache(self):
+        now = datetime.now(timezone.utc)
+        cache = EnergyCache(ttl_seconds=3600)
+        cache.adopt(EnergyCacheData(
+            samples=[1.0, 2.0],
+            data_start=now - timedelta(seconds=1),
+            last_sample_at=now,
+            last_fetch_at=now,
+            sample_count=2,
+            quantization_seconds=None,
+            quantization_offset=None,
+            quantization_confidence=None,
+            full_metrics_dict={
+                "devices": [{"name": "meter", "lag": timedelta(seconds=15)}],
+                "api_response": {},
+                "instant": now,
+                "_fetched_at": now,
+            },
+        ))
+        saved = app_mod._state.energy_cache
+        app_mod._state.energy_cache = cache
+        app_mod._state.responses.clear()
+        with patch.dict("os.environ", {"MOCK": "False"}), \
+             patch.object(app_mod, "create_metrics") as create_metrics:
+            yield cache
+        create_metrics.assert_not_called()
+        app_mod._state.energy_cache = saved
+
+    def test_repeat_requests_reuse_body(self, cache: EnergyCache) -> None:
+        client = app_mod.app.test_client()
+        headers = {"Accept": "application/json"}
+        with patch.object(app_mod, "_enrich_metrics_for_sse", wraps=app_mod._enrich_metrics_for_sse) as enrich:
+            first = client.get("/", headers=headers)
+            second = client.get("/", headers=headers)
+        assert first.status_code == 200
+        assert first.headers["Content-Type"] == "application/json"
+        assert first.get_json()["devices"][0]["name"] == "meter"
+        assert first.data == second.data
+        assert first.headers["ETag"] == second.headers["ETag"]
+        enrich.assert_called_once()
+
+    def test_if_none_match_gets_304(self, cache: EnergyCache) -> None:
+        client = app_mod.app.test_client()
+        etag = client.get("/", headers={"Accept": "application/json"}).headers["ETag"]
+        resp = client.get(
+            "/", headers={"Accept": "application/json", "If-None-Match": etag},
+        )
+        assert resp.status_code == 304
+        assert resp.data == b""
+
+    def test_new_snapshot_new_etag(self, cache: EnergyCache) -> None:
+        client = app_mod.app.test_client()
+        headers = {"Accept": "application/json"}
+        before = client.get("/", headers=headers)
+        metrics = dict(cache.full_metrics_dict, api_response={"total": "1s"})
+        cache.adopt(replace(cache.data, full_metrics_dict=metrics))
+        after = client.get("/", headers=headers)
+        assert after.headers["ETag"] != before.headers["ETag"]
+        assert after.get_json()["apiResponse"] == {"total": "1s"}
+
+    def test_lag_bucketed(self, cache: EnergyCache) -> None:
+        fetched_at = cache.full_metrics_dict["_fetched_at"]
+        key, _inputs, now = app_mod._index_cache_key(
+            "json", cache.full_metrics_dict, fetched_at + timedelta(seconds=7.3),
+        )
+        assert key[1] == 1
+        assert now == fetched_at + timedelta(seconds=5)
@@ -0,0 +1,109 @@
+"""Tests for SampleWindow, the array-backed sample store."""
+
+from __future__ import annotations
+
+import pickle
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from energy_cache import EnergyCache, EnergyCacheData
+from sample_window import SampleWindow
+
+
+class TestSampleWindow:
+    """SampleWindow behaves like the list[float] it replaces."""
+
+    def test_sequence_behaviour(self):
+        """Indexing, slicing, iteration and equality match a list."""
+        values = [0.5, 1.0, 1.5, 2.0, 2.5]
+        window = SampleWindow(values)
+        assert len(window) == 5
+        assert window[0] == 0.5
+        assert window[-1] == 2.5
+        assert window[1:3] == [1.0, 1.5]
+        assert window[-2:] == values[-2:]
+        assert window[::2] == values[::2]
+        assert window[4:1] == []
+        assert list(window) == values
+        assert window == values
+        assert values == window
+        assert window != values[:-1]
+        with pytest.raises(IndexError):
+            window[5]
+
+    def test_slices_share_the_buffer(self):
+        """Contiguous slices are zero-copy views over one array."""
+        window = SampleWindow(range(10))
+        tail = window[4:]
+        assert tail._buf is window._buf
+        assert tail[2:4] == [6.0, 7.0]
+        assert tail[2:4]._buf is window._buf
+
+    def test_view_is_read_only(self):
+        """view() exposes the samples without allowing mutation."""
+        window = SampleWindow([1.0, 2.0, 3.0])[1:]
+        view = window.view()
+        assert view.tolist() == [2.0, 3.0]
+        with pytest.raises(TypeError):
+            view[0] = 9.0
+
+    def test_total_matches_builtin_sum_exactly(self):
+        """total() is bit-identical to sum() over the same slice."""
+        rng = random.Random(7)
+        values = [rng.uniform(-0.001, 0.001) for _ in range(3600)]
+        window = SampleWindow(values)
+        for start in range(0, 3600, 900):
+            assert window.total(start, start + 900) == sum(values[start:start + 900])
+        assert window[900:].total() == sum(values[900:])
+        assert window[-30:].total() == sum(values[-30:])
+
+    def test_total_is_memoized_across_views(self):
+        """A range summed through one view is cached for all views."""
+        window = SampleWindow([1.0] * 1800)
+        window[900:].total(0, 900)
+        assert (900, 1800) in window._sums
+
+    def test_extended_appends_tail(self):
+        """extended() keeps the head up to *at* and appends the tail."""
+        window = SampleWindow([1.0, 2.0, 3.0])
+        assert window.extended([3.5, 4.0], 2) == [1.0, 2.0, 3.5, 4.0]
+        assert window == [1.0, 2.0, 3.0]
+
+    def test_pickle_round_trip(self):
+        """Windows survive pickling."""
+        window = SampleWindow([1.0, 2.0, 3.0])[1:]
+        assert pickle.loads(pickle.dumps(window)) == [2.0, 3.0]
+
+
+class TestEnergyCacheSampleWindow:
+    """EnergyCacheData stores samples as a SampleWindow."""
+
+    def test_list_samples_are_coerced(self):
+        """A list passed to EnergyCacheData is stored as a SampleWindow."""
+        data = EnergyCacheData(
+            samples=[0.001, 0.002],
+            data_start=None,
+            last_sample_at=None,
+            last_fetch_at=None,
+            sample_count=2,
+            quantization_seconds=None,
+            quantization_offset=None,
+            quantization_confidence=None,
+        )
+        assert isinstance(data.samples, SampleWindow)
+        assert data.samples == [0.001, 0.002]
+
+    def test_compact_trims_without_copying(self):
+        """Compaction drops completed QHs as a view of the same buffer."""
+        start = datetime(2025, 6, 15, 12, 0, 0, tzinfo=timezone.utc)
+        cache = EnergyCache()
+        cache.samples = [0.001] * 1000
+        cache.data_start = start
+        buffer = cache.samples._buf
+        with cache.lock:
+            cache.compact(start + timedelta(minutes=20))
+        assert cache.samples == [0.001] * 100
+        assert cache.samples._buf is buffer
+        assert cache.completed_periods[0].raw_wh == 1000.0 * sum([0.001] * 900)
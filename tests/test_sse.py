@@ -11,24 +11,45 @@ from typing import Any
 from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
-from sse_event import SSEBroadcaster, event_stream
+from sse_event import SSEBroadcaster, SSEFrame, StreamFilter, Subscription, event_stream
 
 pytest.importorskip("app")
-from app import _enrich_metrics_for_sse, _state, _trim_output_device, app, camelize
+from app import (
+    _enrich_metrics_for_sse,
+    _initial_sse_events,
+    _mark_sample_range,
+    _metrics_update_payload,
+    _state,
+    _trim_output_device,
+    app,
+    camelize,
+)
+
+
+def _data(payload: bytes) -> Any:
+    """Decode the JSON payload of a pre-encoded frame."""
+    line = [l for l in payload.decode("utf-8").split("\n") if l.startswith("data: ")]
+    return json.loads(line[0][6:])
+
+
+def _frame(event_id: int, event: str = "evt", keyframe: bytes | None = None) -> SSEFrame:
+    return SSEFrame(
+        id=event_id,
+        event=event,
+        frame=f"id: e-{event_id}\nevent: {event}\ndata: {{}}\n\n".encode(),
+        keyframe=keyframe,
+    )
 
 
 class TestSSEBroadcaster:
     """Unit tests for the SSEBroadcaster thread-safe pub/sub."""
 
     def test_subscribe_and_publish(self) -> None:
-        b = SSEBroadcaster()
+        b = SSEBroadcaster(epoch="e")
         q = b.subscribe()
         count = b.publish("test_event", {"key": "val"})
         assert count == 1
-        payload = q.get(timeout=1)
-        assert payload["event"] == "test_event"
-        assert payload["data"] == {"key": "val"}
-        assert "timestamp" in payload
+        assert q.get(timeout=1) == b'id: e-1\nevent: test_event\ndata: {"key": "val"}\n\n'
 
     def test_multiple_subscribers(self) -> None:
         b = SSEBroadcaster()
@@ -36,8 +57,39 @@ class TestSSEBroadcaster:
         q2 = b.subscribe()
         count = b.publish("evt", {"n": 42})
         assert count == 2
-        assert q1.get(timeout=1)["data"] == {"n": 42}
-        assert q2.get(timeout=1)["data"] == {"n": 42}
+        f1 = q1.get(timeout=1)
+        f2 = q2.get(timeout=1)
+        assert _data(f1) == {"n": 42}
+        # One shared buffer for all subscribers.
+        assert f1 is f2
+
+    def test_encodes_once_per_publish(self) -> None:
+        """The dumper runs once per event regardless of subscriber count."""
+        dumper = MagicMock(side_effect=json.dumps)
+        b = SSEBroadcaster(dumper=dumper)
+        for _ in range(10):
+            b.subscribe()
+        b.publish("evt", {"n": 1})
+        dumper.assert_called_once_with({"n": 1})
+
+    def test_ids_increase(self) -> None:
+        b = SSEBroadcaster(epoch="e")
+        q = b.subscribe()
+        for i in range(3):
+            b.publish("evt", {"i": i})
+        assert [q.get(timeout=1)[:7] for _ in range(3)] == [b"id: e-1", b"id: e-2", b"id: e-3"]
+        assert b.last_event_id == "e-3"
+
+    def test_listener_sees_every_frame(self) -> None:
+        b = SSEBroadcaster(epoch="e")
+        assert b.last_event_id == "e-0"
+        seen: list[int] = []
+        listener = lambda f: seen.append(f.id)  # noqa: E731
+        b.add_listener(listener)
+        b.publish("evt", {})
+        b.remove_listener(listener)
+        b.publish("evt", {})
+        assert seen == [1]
 
     def test_unsubscribe(self) -> None:
         b = SSEBroadcaster()
@@ -46,25 +98,33 @@ class TestSSEBroadcaster:
         b.unsubscribe(q)
         assert b.subscriber_count() == 0
 
-    def test_slow_client_eviction(self) -> None:
-        b = SSEBroadcaster()
+    def test_slow_client_coalesced_not_evicted(self) -> None:
+        """A full subscriber keeps only the latest frame per type."""
+        b = SSEBroadcaster(maxsize=2, epoch="e")
         q = b.subscribe()
-        # Fill queue to maxsize (64)
-        for i in range(64):
-            q.put_nowait({"i": i})
-        # Next publish should find this subscriber's queue full and evict it
-        count = b.publish("evt", {})
-        assert count == 0  # subscriber was evicted
+        for i in range(10):
+            b.publish("load_cycle", {"i": i})
+        assert b.subscriber_count() == 1
+        assert [_data(q.get(timeout=1))["i"] for _ in range(3)] == [0, 1, 9]
+        with pytest.raises(queue.Empty):
+            q.get(timeout=0.01)
+
+    def test_keyframe_after_skip(self) -> None:
+        """A coalesced delta is delivered as its keyframe."""
+        b = SSEBroadcaster(maxsize=1)
+        q = b.subscribe()
+        for i in range(3):
+            b.publish("metrics_update", {"delta": i}, keyframe={"full": i})
+        assert _data(q.get(timeout=1)) == {"delta": 0}
+        assert _data(q.get(timeout=1)) == {"full": 2}
 
     def test_publish_event_naming(self) -> None:
         b = SSEBroadcaster()
         q = b.subscribe()
         b.publish("load_cycle", {"status": "ok"})
         b.publish("metrics_update", {"devices": []})
-        evt1 = q.get(timeout=1)
-        evt2 = q.get(timeout=1)
-        assert evt1["event"] == "load_cycle"
-        assert evt2["event"] == "metrics_update"
+        assert b"event: load_cycle" in q.get(timeout=1)
+        assert b"event: metrics_update" in q.get(timeout=1)
 
     def test_publish_after_all_unsubscribed(self) -> None:
         b = SSEBroadcaster()
@@ -74,6 +134,128 @@ class TestSSEBroadcaster:
         assert count == 0
 
 
+class TestStreamFilter:
+    """Query-parameter parsing for per-subscriber filters."""
+
+    def test_no_params(self) -> None:
+        assert StreamFilter.from_query({}) is None
+
+    def test_events_and_intervals(self) -> None:
+        f = StreamFilter.from_query(
+            {"events": "load_cycle, metrics_update", "interval": "30,load_cycle:60"}
+        )
+        assert f is not None
+        assert f.accepts("load_cycle") and not f.accepts("other")
+        assert f.interval("load_cycle") == 60
+        assert f.interval("metrics_update") == 30
+
+    @pytest.mark.parametrize(
+        "args", [{"events": ","}, {"interval": "abc"}, {"interval": "x:-1"}, {"interval": "inf"}],
+    )
+    def test_invalid(self, args: dict[str, str]) -> None:
+        with pytest.raises(ValueError):
+            StreamFilter.from_query(args)
+
+
+class TestSubscription:
+    """Filtering, rate limiting and coalescing per subscriber."""
+
+    def test_filter_drops_unselected(self) -> None:
+        sub = Subscription(StreamFilter(events=frozenset({"load_cycle"})))
+        sub.offer(_frame(1, "metrics_update"))
+        sub.offer(_frame(2, "load_cycle"))
+        assert sub.poll() == [_frame(2, "load_cycle").frame]
+
+    def test_throttle_coalesces_to_latest(self) -> None:
+        now = [0.0]
+        sub = Subscription(
+            StreamFilter(intervals={"load_cycle": 60}), clock=lambda: now[0],
+        )
+        for i in range(1, 5):
+            sub.offer(_frame(i, "load_cycle"))
+        sub.offer(_frame(5, "metrics_update"))
+        assert sub.poll() == [_frame(1, "load_cycle").frame, _frame(5, "metrics_update").frame]
+        assert sub.next_due_in() == 60
+        now[0] = 60.0
+        assert sub.poll() == [_frame(4, "load_cycle").frame]
+        assert sub.poll() == []
+
+    def test_get_waits_for_due_frame(self) -> None:
+        sub = Subscription(StreamFilter(default_interval=0.05))
+        sub.offer(_frame(1))
+        sub.offer(_frame(2, keyframe=b"key"))
+        sub.offer(_frame(3, keyframe=b"key3"))
+        assert sub.get(timeout=1) == _frame(1).frame
+        assert sub.get(timeout=1) == b"key3"
+
+
+class TestSSEResume:
+    """Last-Event-ID replay from the broadcaster's ring."""
+
+    def test_resume_replays_missed_frames(self) -> None:
+        b = SSEBroadcaster(epoch="e")
+        for i in range(5):
+            b.publish("evt", {"i": i})
+        q = b.resume("e-2")
+        assert q is not None
+        assert [_data(p)["i"] for p in q.poll()] == [2, 3, 4]
+        assert b.subscriber_count() == 1
+
+    def test_resume_applies_filter(self) -> None:
+        b = SSEBroadcaster(epoch="e")
+        b.publish("load_cycle", {"i": 1})
+        b.publish("metrics_update", {"i": 2})
+        q = b.resume("e-0", StreamFilter(events=frozenset({"metrics_update"})))
+        assert q is not None
+        assert [_data(p)["i"] for p in q.poll()] == [2]
+
+    def test_resume_up_to_date(self) -> None:
+        b = SSEBroadcaster(epoch="e")
+        b.publish("evt", {})
+        q = b.resume("e-1")
+        assert q is not None and q.qsize() == 0
+
+    @pytest.mark.parametrize("last_id", [None, "", "x-1", "e-9", "e-abc", "e-0"])
+    def test_resume_needs_bootstrap(self, last_id: str | None) -> None:
+        """Missing, foreign, future, malformed or evicted ids bootstrap."""
+        b = SSEBroadcaster(epoch="e", replay_size=2)
+        for i in range(3):
+            b.publish("evt", {"i": i})
+        assert b.resume(last_id) is None
+        assert b.subscriber_count() == 0
+
+    def test_event_stream_resumes(self) -> None:
+        b = SSEBroadcaster(epoch="e")
+        b.publish("evt", {"i": 1})
+        b.publish("evt", {"i": 2})
+        bootstrap = MagicMock()
+        gen = event_stream(b, timeout=0.1, last_event_id="e-1", bootstrap=bootstrap)
+        assert next(gen).startswith(b"id: e-2\n")
+        bootstrap.assert_not_called()
+        gen.close()
+        assert b.subscriber_count() == 0
+
+    def test_initial_events_carry_snapshot_id(self) -> None:
+        b = SSEBroadcaster(epoch="e")
+        b.publish("evt", {})
+        gen = event_stream(b, timeout=0.1, bootstrap=lambda _published: [("init", {})])
+        assert next(gen).startswith(b"id: e-1\nevent: init\n")
+
+    def test_nothing_registered_before_iteration(self) -> None:
+        b = SSEBroadcaster()
+        gen = event_stream(b, timeout=0.1)
+        gen.close()
+        assert b.subscriber_count() == 0
+
+    def test_events_during_bootstrap_not_lost(self) -> None:
+        """Frames published while initial events are sent still arrive."""
+        b = SSEBroadcaster(epoch="e")
+        gen = event_stream(b, timeout=0.1, initial_events=[("init", {})])
+        assert b"event: init" in next(gen)
+        b.publish("load_cycle", {"n": 1})
+        assert next(gen).startswith(b"id: e-1\nevent: load_cycle")
+
+
 class TestEventStream:
     """Tests for the event_stream generator function."""
 
@@ -85,17 +267,18 @@ class TestEventStream:
             initial_events=[("init1", {"a": 1}), ("init2", {"b": 2})],
         )
         frame1 = next(gen)
-        assert "event: init1" in frame1
-        assert '"a": 1' in frame1
+        assert b"event: init1" in frame1
+        assert b'"a": 1' in frame1
+        assert frame1.startswith(b"id: ")
         frame2 = next(gen)
-        assert "event: init2" in frame2
-        assert '"b": 2' in frame2
+        assert b"event: init2" in frame2
+        assert b'"b": 2' in frame2
 
     def test_heartbeat_on_idle(self) -> None:
         b = SSEBroadcaster()
         gen = event_stream(b, timeout=0.1)
         frame = next(gen)
-        assert "event: heartbeat" in frame
+        assert b"event: heartbeat" in frame
 
     def test_default_heartbeat_timeout_is_30s(self) -> None:
         """Default heartbeat fires every 30s, below typical 60s proxy timeouts.
@@ -111,7 +294,7 @@ class TestEventStream:
         assert default < 60
 
     def test_subscribed_events_appear_in_stream(self) -> None:
-        b = SSEBroadcaster()
+        b = SSEBroadcaster(epoch="e")
         gen = event_stream(b, timeout=0.1)
         # Read past heartbeat, then publish from another thread
         next(gen)  # heartbeat or initial
@@ -123,8 +306,9 @@ class TestEventStream:
         t = threading.Thread(target=publish, daemon=True)
         t.start()
         frame = next(gen)
-        assert "event: load_cycle" in frame
-        assert '"status": "dry-run"' in frame
+        assert frame.startswith(b"id: e-1\n")
+        assert b"event: load_cycle" in frame
+        assert b'"status": "dry-run"' in frame
 
     def test_unsubscribe_on_generator_exit(self) -> None:
         b = SSEBroadcaster()
@@ -272,6 +456,96 @@ class TestMetricsEnrichment:
         assert result["devices"] == []
 
 
+class TestMetricsDelta:
+    """metrics_update carries only samples after the previous event."""
+
+    END = datetime(2025, 6, 15, 14, 5, 0, tzinfo=timezone.utc)
+
+    @pytest.fixture(autouse=True)
+    def cache_data(self) -> Any:
+        orig_data = _state.energy_cache._data
+        _state.energy_cache._data = MagicMock(
+            samples=[float(i) for i in range(400)], last_sample_at=self.END,
+        )
+        yield
+        _state.energy_cache._data = orig_data
+
+    def _metrics(self) -> dict[str, Any]:
+        return {"devices": [{"name": "d", "per_second_data": [0.0]}]}
+
+    def test_first_event_is_full_window(self) -> None:
+        metrics = self._metrics()
+        assert _mark_sample_range(metrics) == self.END
+        device = metrics["devices"][0]
+        assert device["per_second_reset"] is True
+        assert device["per_second_data"] == [float(i) for i in range(100, 400)]
+        assert device["per_second_end"] == self.END
+
+    def test_delta_carries_new_samples(self) -> None:
+        metrics = self._metrics()
+        _mark_sample_range(metrics, since=self.END - timedelta(seconds=3))
+        device = metrics["devices"][0]
+        assert device["per_second_reset"] is False
+        assert device["per_second_data"] == [397.0, 398.0, 399.0]
+
+    def test_no_new_samples(self) -> None:
+        metrics = self._metrics()
+        _mark_sample_range(metrics, since=self.END)
+        assert metrics["devices"][0]["per_second_data"] == []
+
+    @pytest.mark.parametrize("gap_secs", [301, -5])
+    def test_gap_or_rewind_resets(self, gap_secs: int) -> None:
+        metrics = self._metrics()
+        _mark_sample_range(metrics, since=self.END - timedelta(seconds=gap_secs))
+        device = metrics["devices"][0]
+        assert device["per_second_reset"] is True
+        assert len(device["per_second_data"]) == 300
+
+    def test_bootstrap_between_cache_swap_and_publish(self) -> None:
+        """A client connecting after a fetch but before its delta gets no repeats."""
+        def swap_in(count: int, end: datetime) -> None:
+            _state.energy_cache._data = MagicMock(
+                samples=[float(i) for i in range(count)],
+                last_sample_at=end,
+                full_metrics_dict=self._metrics(),
+            )
+
+        def publish_update() -> None:
+            update = _metrics_update_payload()
+            assert update is not None
+            _state.sse_broadcaster.publish("metrics_update", update[0], keyframe=update[1])
+
+        orig_broadcaster = _state.sse_broadcaster
+        orig_sent = _state.sse_samples_sent_through
+        _state.sse_broadcaster = SSEBroadcaster(epoch="e", dumper=app.json.dumps)
+        _state.sse_samples_sent_through = None
+        try:
+            swap_in(400, self.END)
+            publish_update()
+            publish_update()
+            swap_in(410, self.END + timedelta(seconds=10))
+            gen = event_stream(
+                _state.sse_broadcaster,
+                timeout=0.1,
+                dumper=app.json.dumps,
+                bootstrap=lambda published: _initial_sse_events(
+                    StreamFilter(events=frozenset({"metrics_update"})), published
+                ),
+            )
+            initial = _data(next(gen))["devices"][0]
+            publish_update()
+            delta = _data(next(gen))["devices"][0]
+            gen.close()
+        finally:
+            _state.sse_broadcaster = orig_broadcaster
+            _state.sse_samples_sent_through = orig_sent
+
+        assert initial["perSecondEnd"] == json.loads(app.json.dumps(self.END))
+        assert delta["perSecondReset"] is False
+        window = (initial["perSecondData"] + delta["perSecondData"])[-300:]
+        assert window == [float(i) for i in range(110, 410)]
+
+
 class TestSSEEndpoint:
     """Integration tests for the /stream/status SSE endpoint."""
 
@@ -440,3 +714,19 @@ class TestSSEEndpoint:
         finally:
             _state.energy_cache._data = orig_data
             self._cleanup_load_manager()
+
+    def test_stream_status_resume_skips_bootstrap(self) -> None:
+        """A covered Last-Event-ID replays missed events without initial_*."""
+        self._setup_mock_load_manager()
+        orig_broadcaster = _state.sse_broadcaster
+        _state.sse_broadcaster = SSEBroadcaster(epoch="e")
+        try:
+            _state.sse_broadcaster.publish("load_cycle", {"n": 1})
+            _state.sse_broadcaster.publish("load_cycle", {"n": 2})
+            resp = self.client.get("/stream/status", headers={"Last-Event-ID": "e-1"})
+            first = next(iter(resp.response))
+            assert first.startswith(b"id: e-2\nevent: load_cycle\n")
+            resp.close()
+        finally:
+            _state.sse_broadcaster = orig_broadcaster
+            self._cleanup_load_manager()
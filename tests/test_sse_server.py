@@ -0,0 +1,178 @@
+"""Tests for the event-driven SSE stream server."""
+
+from __future__ import annotations
+
+import socket
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from sse_event import SSEBroadcaster
+from sse_server import SSEStreamServer
+
+
+def _connect(port: int, path: str = "/stream/status", headers: str = "") -> socket.socket:
+    sock = socket.create_connection(("127.0.0.1", port), timeout=2)
+    sock.sendall(f"GET {path} HTTP/1.1\r\nHost: x\r\n{headers}\r\n".encode())
+    return sock
+
+
+def _read_until(sock: socket.socket, marker: bytes) -> bytes:
+    data = b""
+    while marker not in data:
+        chunk = sock.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def _wait_for(predicate: Any, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("condition not reached")
+        time.sleep(0.01)
+
+
+class TestSSEStreamServer:
+    """Clients share one loop thread and receive pre-encoded frames."""
+
+    @pytest.fixture
+    def broadcaster(self) -> SSEBroadcaster:
+        return SSEBroadcaster(epoch="e")
+
+    @pytest.fixture
+    def server(self, broadcaster: SSEBroadcaster) -> Iterator[tuple[SSEStreamServer, int]]:
+        server = SSEStreamServer(
+            broadcaster,
+            bootstrap=lambda _filter, _published: [("initial_load_state", {"enabled": True})],
+            heartbeat_secs=0.3,
+        )
+        port = server.start(host="127.0.0.1", port=0)
+        yield server, port
+        server.close()
+
+    def test_bootstrap_then_broadcast(
+        self, broadcaster: SSEBroadcaster, server: tuple[SSEStreamServer, int]
+    ) -> None:
+        srv, port = server
+        sock = _connect(port)
+        try:
+            head = _read_until(sock, b"initial_load_state")
+            assert head.startswith(b"HTTP/1.1 200 OK\r\n")
+            assert b"Content-Type: text/event-stream" in head
+            assert b'id: e-0\nevent: initial_load_state\ndata: {"enabled": true}' in head
+            _wait_for(lambda: srv.client_count == 1)
+            broadcaster.publish("load_cycle", {"n": 1})
+            assert b"id: e-1\nevent: load_cycle\n" in _read_until(sock, b"load_cycle")
+        finally:
+            sock.close()
+        _wait_for(lambda: srv.client_count == 0)
+
+    def test_many_clients_no_threads(
+        self, broadcaster: SSEBroadcaster, server: tuple[SSEStreamServer, int]
+    ) -> None:
+        """Twenty clients cost no threads beyond the two bootstrap workers."""
+        import threading
+
+        srv, port = server
+        before = threading.active_count()
+        socks = [_connect(port) for _ in range(20)]
+        try:
+            _wait_for(lambda: srv.client_count == 20)
+            assert threading.active_count() <= before + 2
+            broadcaster.publish("load_cycle", {"n": 1})
+            for sock in socks:
+                assert b"event: load_cycle" in _read_until(sock, b"load_cycle")
+        finally:
+            for sock in socks:
+                sock.close()
+
+    def test_resume_skips_bootstrap(
+        self, broadcaster: SSEBroadcaster, server: tuple[SSEStreamServer, int]
+    ) -> None:
+        _, port = server
+        broadcaster.publish("load_cycle", {"n": 1})
+        broadcaster.publish("load_cycle", {"n": 2})
+        sock = _connect(port, headers="Last-Event-ID: e-1\r\n")
+        try:
+            data = _read_until(sock, b"e-2")
+            assert b"initial_load_state" not in data
+            assert b'id: e-2\nevent: load_cycle\ndata: {"n": 2}' in data
+        finally:
+            sock.close()
+
+    def test_heartbeat(self, server: tuple[SSEStreamServer, int]) -> None:
+        _, port = server
+        sock = _connect(port)
+        try:
+            assert b"event: heartbeat" in _read_until(sock, b"heartbeat")
+        finally:
+            sock.close()
+
+    def test_unknown_path_404(self, server: tuple[SSEStreamServer, int]) -> None:
+        _, port = server
+        sock = _connect(port, path="/health")
+        try:
+            assert _read_until(sock, b"\r\n\r\n").startswith(b"HTTP/1.1 404")
+        finally:
+            sock.close()
+
+    def test_slow_client_coalesced(self, broadcaster: SSEBroadcaster) -> None:
+        """A client that never reads stays connected; its frames coalesce."""
+        srv = SSEStreamServer(
+            broadcaster, bootstrap=lambda _filter, _published: [], max_buffer_bytes=1024
+        )
+        port = srv.start(host="127.0.0.1", port=0)
+        sock = _connect(port)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        try:
+            _wait_for(lambda: srv.client_count == 1)
+            blob = "x" * 65536
+            for i in range(400):
+                broadcaster.publish("metrics_update", {"i": i, "blob": blob})
+            time.sleep(0.2)
+            assert srv.client_count == 1
+            (client,) = srv._clients  # pylint: disable=protected-access
+            # Once the kernel buffers fill, unsent output stops growing.
+            assert client.writer.transport.get_write_buffer_size() < 2 * len(blob)
+            assert client.sub.qsize() <= 1
+        finally:
+            sock.close()
+            srv.close()
+
+    def test_query_filter(
+        self, broadcaster: SSEBroadcaster, server: tuple[SSEStreamServer, int]
+    ) -> None:
+        srv, port = server
+        sock = _connect(port, path="/stream/status?events=load_cycle")
+        try:
+            _read_until(sock, b"initial_load_state")
+            _wait_for(lambda: srv.client_count == 1)
+            broadcaster.publish("metrics_update", {"n": 1})
+            broadcaster.publish("load_cycle", {"n": 2})
+            data = _read_until(sock, b"load_cycle")
+            assert b"metrics_update" not in data
+        finally:
+            sock.close()
+
+    def test_bad_filter_400(self, server: tuple[SSEStreamServer, int]) -> None:
+        _, port = server
+        sock = _connect(port, path="/stream/status?interval=abc")
+        try:
+            assert _read_until(sock, b"\r\n\r\n").startswith(b"HTTP/1.1 400")
+        finally:
+            sock.close()
+
+    def test_port_in_use_raises(self, broadcaster: SSEBroadcaster) -> None:
+        first = SSEStreamServer(broadcaster, bootstrap=lambda _filter, _published: [])
+        port = first.start(host="127.0.0.1", port=0)
+        second = SSEStreamServer(broadcaster, bootstrap=lambda _filter, _published: [])
+        try:
+            with pytest.raises(OSError):
+                second.start(host="127.0.0.1", port=port)
+        finally:
+            first.close()
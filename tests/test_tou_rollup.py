@@ -0,0 +1,150 @@
+"""Tests for per-day TOU rollups and their use by TOUReporter."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytz
+
+import metrics
+from clock import FakeClock
+from energy_aggregator import DayRollup, EnergyDataAggregator, TOUBuckets
+from history_store import HistoryStore
+from metrics import TOUReporter
+from tests.helpers import _make_tou_reporter
+from tou_rollup import (
+    TOURollupCache,
+    complete_days,
+    expected_periods,
+    local_midnight,
+    rollup_chunks,
+)
+
+TZ = pytz.timezone("America/Los_Angeles")
+QH = timedelta(minutes=15)
+
+
+@pytest.fixture(autouse=True)
+def _local_tz():
+    with patch("energy_aggregator.get_timezone", return_value=TZ.zone), \
+         patch("metrics.get_timezone", return_value=TZ.zone):
+        yield
+
+
+class TestDays:
+    """Local-day helpers."""
+
+    def test_complete_days_excludes_partial_edges(self) -> None:
+        """Only days fully inside the range are returned."""
+        start = local_midnight(date(2025, 6, 1), TZ) + timedelta(hours=3)
+        end = local_midnight(date(2025, 6, 4), TZ) + timedelta(hours=1)
+        assert complete_days(start, end, TZ) == [date(2025, 6, 2), date(2025, 6, 3)]
+
+    def test_expected_periods_dst(self) -> None:
+        """DST transition days have 92 or 100 quarter-hours."""
+        assert expected_periods(date(2025, 6, 1), TZ) == 96
+        assert expected_periods(date(2025, 3, 9), TZ) == 92
+        assert expected_periods(date(2025, 11, 2), TZ) == 100
+
+    def test_rollup_chunks_splits_at_midnight(self) -> None:
+        """A chunk spanning midnight contributes to both days."""
+        start = local_midnight(date(2025, 6, 2), TZ) - 2 * QH
+        rollups = rollup_chunks([{"start": start, "data": [0.1, -0.2, 0.3]}], TZ)
+        assert rollups[date(2025, 6, 1)].periods == 2
+        assert rollups[date(2025, 6, 1)].nbc == pytest.approx(100.0)
+        assert rollups[date(2025, 6, 1)].buckets.total == pytest.approx(-100.0)
+        assert rollups[date(2025, 6, 2)].buckets.off_peak == pytest.approx(300.0)
+
+
+class TestTOURollupCache:
+    """In-memory cache with optional store backing."""
+
+    def _rollup(self, day: date) -> DayRollup:
+        return DayRollup(day=day, buckets=TOUBuckets(total=1.0), nbc=2.0, periods=96)
+
+    def test_put_get(self) -> None:
+        """Cached days are returned; others are absent."""
+        cache = TOURollupCache()
+        cache.put("c", [self._rollup(date(2025, 6, 1))])
+        found = cache.get_many("c", [date(2025, 6, 1), date(2025, 6, 2)])
+        assert list(found) == [date(2025, 6, 1)]
+        assert cache.get_many("other", [date(2025, 6, 1)]) == {}
+
+    def test_store_backed(self, tmp_path: Path) -> None:
+        """A new cache on the same store sees earlier rollups."""
+        store = HistoryStore(tmp_path / "h.db")
+        try:
+            TOURollupCache(store).put("c", [self._rollup(date(2025, 6, 1))])
+            found = TOURollupCache(store).get_many("c", [date(2025, 6, 1)])
+            assert found == {date(2025, 6, 1): self._rollup(date(2025, 6, 1))}
+        finally:
+            store.close()
+
+
+class TestTOUReporterRollups:
+    """TOUReporter answers completed days from the rollup cache."""
+
+    START = local_midnight(date(2025, 6, 1), TZ)
+    END = local_midnight(date(2025, 6, 4), TZ) + timedelta(hours=2)
+
+    @staticmethod
+    def _chart_usage(chan, start, end, scale=None, unit=None):
+        """Fake Emporia: 15-min values derived from the timestamp."""
+        first = start
+        values = []
+        ts = first
+        while ts <= end:
+            values.append(((ts.hour * 4 + ts.minute // 15) % 7 - 2) / 10.0)
+            ts += QH
+        return values, first
+
+    def _run(self, rollups: TOURollupCache | None) -> tuple[TOUReporter, MagicMock]:
+        chan = MagicMock(channel_num="1,2,3")
+        vdi = MagicMock(device_gid=42, channels=[chan])
+        vue = MagicMock()
+        vue.get_chart_usage.side_effect = self._chart_usage
+        with patch.object(metrics, "_CLOCK", FakeClock(self.END.astimezone(pytz.utc))):
+            tou = _make_tou_reporter(
+                vue, {42: vdi}, self.START, self.END, rollups=rollups
+            )
+        return tou, vue
+
+    def test_matches_uncached_result(self) -> None:
+        """Rollup-based totals equal the plain 15-minute aggregation."""
+        plain, _ = self._run(None)
+        cached, _ = self._run(TOURollupCache())
+        assert cached.nbc_result == pytest.approx(plain.nbc_result)
+        assert cached.tou_result is not None and plain.tou_result is not None
+        for field in ("total", "peak", "part_peak", "off_peak"):
+            assert getattr(cached.tou_result, field) == pytest.approx(
+                getattr(plain.tou_result, field)
+            )
+
+    def test_completed_days_not_refetched(self) -> None:
+        """A second report fetches only the partial last day."""
+        cache = TOURollupCache()
+        first, _ = self._run(cache)
+        assert len(cache) == 3
+        second, vue = self._run(cache)
+        assert vue.get_chart_usage.call_count == 1
+        assert vue.get_chart_usage.call_args[0][1] == local_midnight(date(2025, 6, 4), TZ)
+        assert second.nbc_result == pytest.approx(first.nbc_result)
+
+    def test_aggregate_uses_rollup_buckets(self) -> None:
+        """aggregate_tou adds day rollups to live chunks."""
+        tou = _make_tou_reporter(MagicMock(), {}, self.START, self.END)
+        assert tou.usage_data_list == []
+        tou.day_rollups = [
+            DayRollup(
+                day=date(2025, 6, 1),
+                buckets=EnergyDataAggregator.aggregate_from_15min(self.START, [0.5]),
+                nbc=500.0,
+                periods=1,
+            )
+        ]
+        tou.aggregate_tou()
+        assert tou.tou_result == TOUBuckets(total=500.0, off_peak=500.0)
+        assert tou.nbc_result == 500.0
@@ -0,0 +1,146 @@
+"""Tests for per-cycle span tracing."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+import app as app_mod
+import tracing
+from energy_cache import EnergyCache
+from event_loop import EventLoopThread
+
+NOW = datetime(2026, 6, 8, 12, 0, 30, tzinfo=timezone.utc)
+
+
+def _load(path: Path) -> list[dict[str, Any]]:
+    """Parse a trace file the way a viewer does (closing bracket optional)."""
+    text = path.read_text(encoding="utf-8").rstrip().rstrip(",")
+    return json.loads(text + "]")
+
+
+@pytest.fixture
+def trace_path(tmp_path: Path):
+    """Install a tracer that records every trace; uninstall afterwards."""
+    path = tmp_path / "trace.json"
+    tracing.configure(tracing.Tracer(tracing.TraceFile(path)))
+    yield path
+    tracing.configure(None)
+
+
+def _spans(path: Path) -> dict[str, dict[str, Any]]:
+    return {e["name"]: e for e in _load(path) if e["ph"] == "X"}
+
+
+class TestSpans:
+    """Spans nest under the current span and share the trace id."""
+
+    def test_nested_spans_written_at_root_exit(self, trace_path: Path) -> None:
+        with tracing.start_trace("cycle") as root:
+            with tracing.span("stage", n=1):
+                with tracing.span("call"):
+                    assert tracing.current_trace_id() == root.trace_id
+            assert not trace_path.exists()
+        spans = _spans(trace_path)
+        assert spans["stage"]["args"]["parent_id"] == spans["cycle"]["args"]["span_id"]
+        assert spans["call"]["args"]["parent_id"] == spans["stage"]["args"]["span_id"]
+        assert spans["stage"]["args"]["n"] == 1
+        assert {s["args"]["trace_id"] for s in spans.values()} == {root.trace_id}
+        assert any(e["ph"] == "M" for e in _load(trace_path))
+        assert tracing.current_trace_id() is None
+
+    def test_error_recorded(self, trace_path: Path) -> None:
+        with pytest.raises(ValueError):
+            with tracing.start_trace("cycle"):
+                raise ValueError("boom")
+        assert _spans(trace_path)["cycle"]["args"]["error"] == "ValueError"
+
+    def test_noop_outside_trace_and_when_not_sampled(self, tmp_path: Path) -> None:
+        assert tracing.span("x") is tracing.start_trace("y")
+        path = tmp_path / "trace.json"
+        tracing.configure(tracing.Tracer(tracing.TraceFile(path), 0.5, rng=lambda: 0.7))
+        try:
+            with tracing.start_trace("cycle"):
+                with tracing.span("stage"):
+                    assert tracing.current_trace_id() is None
+        finally:
+            tracing.configure(None)
+        assert not path.exists()
+
+
+class TestPropagation:
+    """The trace follows the cycle into the event loop and worker threads."""
+
+    def test_async_loop_and_gather(self, trace_path: Path) -> None:
+        loop_thread = EventLoopThread(name="trace-test")
+
+        @tracing.traced("phase")
+        async def phase() -> None:
+            async def call(name: str) -> None:
+                with tracing.span("call", device=name):
+                    await asyncio.sleep(0)
+
+            await asyncio.gather(call("a"), call("b"))
+
+        try:
+            with tracing.start_trace("cycle"):
+                loop_thread.run(phase())
+        finally:
+            loop_thread.close()
+        events = [e for e in _load(trace_path) if e["ph"] == "X"]
+        by_name = {e["name"]: e for e in events}
+        calls = [e for e in events if e["name"] == "call"]
+        assert len(calls) == 2
+        assert {c["args"]["parent_id"] for c in calls} == {by_name["phase"]["args"]["span_id"]}
+        assert by_name["phase"]["tid"] != by_name["cycle"]["tid"]
+
+    def test_energy_cache_fetch_thread(self, trace_path: Path) -> None:
+        cache = EnergyCache(ttl_seconds=60)
+
+        @tracing.traced("create_metrics")
+        def fetch() -> dict[str, Any]:
+            return {"per_second_data": [0.001] * 30, "data_start": NOW.replace(second=0)}
+
+        with tracing.start_trace("cycle"):
+            cache.get_or_fetch(fetch, NOW)
+        spans = _spans(trace_path)
+        assert spans["create_metrics"]["args"]["parent_id"] == spans["cycle"]["args"]["span_id"]
+
+
+class TestTraceFile:
+    """The file rotates by size and stays loadable."""
+
+    def test_rotation(self, tmp_path: Path) -> None:
+        path = tmp_path / "trace.json"
+        tracing.configure(tracing.Tracer(tracing.TraceFile(path, max_bytes=600, backup_count=2)))
+        try:
+            for index in range(12):
+                with tracing.start_trace("cycle", index=index):
+                    pass
+        finally:
+            tracing.configure(None)
+        names = {p.name for p in tmp_path.iterdir()}
+        assert {"trace.json.1", "trace.json.2"} <= names
+        assert names <= {"trace.json", "trace.json.1", "trace.json.2"}
+        for name in ("trace.json.1", "trace.json.2"):
+            events = _load(tmp_path / name)
+            assert events[0]["ph"] == "M"
+
+    def test_app_configures_from_env(self, tmp_path: Path) -> None:
+        path = tmp_path / "trace.json"
+        env = {"TRACE_PATH": str(path), "TRACE_SAMPLE_RATE": "2"}
+        with patch.dict(os.environ, env):
+            app_mod._configure_tracing()
+        try:
+            with tracing.start_trace("cycle"):
+                pass
+        finally:
+            tracing.configure(None)
+        assert _spans(path)["cycle"]["ph"] == "X"
@@ -0,0 +1,189 @@
+"""Per-channel, per-local-day TOU rollups for ``/api/v1/tou``.
+
+A TOU report is additive over days: bucket totals and the NBC sum (the sum
+of positive 15-minute periods) of a range are the sums of its days'.  Once
+a local day is over its 15-minute data no longer changes, so its rollup is
+computed once and reused; only the range edges and the current partial day
+are fetched from Emporia on each request.
+
+``TOURollupCache`` keeps rollups in memory keyed by ``(channel, day)`` and,
+when a ``HistoryStore`` is attached, persists them so they survive restarts.
+
+Usage::
+
+    from tou_rollup import TOURollupCache, rollup_chunks
+
+    cache = TOURollupCache()
+    cached = cache.get_many("1234:1,2,3", days)
+    cache.put("1234:1,2,3", [rollup])
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import sqlite3
+import threading
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta, tzinfo
+from typing import Any
+
+from energy_aggregator import DayRollup, EnergyDataAggregator, TOUBuckets
+from history_store import HistoryStore
+
+logger = logging.getLogger(__name__)
+
+QH = timedelta(minutes=15)
+
+
+def local_midnight(day: date, tz: Any) -> datetime:
+    """Return the start of *day* in *tz* (a pytz or zoneinfo timezone)."""
+    naive = datetime(day.year, day.month, day.day)
+    if hasattr(tz, "localize"):
+        return tz.localize(naive)
+    return naive.replace(tzinfo=tz)
+
+
+def complete_days(start: datetime, end: datetime, tz: tzinfo) -> list[date]:
+    """Return the local days lying entirely inside [start, end).
+
+    Args:
+        start: Range start (timezone-aware).
+        end: Range end (timezone-aware).
+        tz: Local timezone defining day boundaries.
+
+    Returns:
+        Consecutive local dates, possibly empty.
+    """
+    day = start.astimezone(tz).date()
+    if local_midnight(day, tz) < start:
+        day += timedelta(days=1)
+    days: list[date] = []
+    while local_midnight(day + timedelta(days=1), tz) <= end:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def expected_periods(day: date, tz: tzinfo) -> int:
+    """Return the number of 15-minute periods in local *day* (DST-aware)."""
+    span = local_midnight(day + timedelta(days=1), tz) - local_midnight(day, tz)
+    return int(span / QH)
+
+
+def rollup_chunks(
+    chunks: Iterable[dict[str, Any]], tz: tzinfo
+) -> dict[date, DayRollup]:
+    """Aggregate 15-minute chunks into per-local-day rollups.
+
+    Args:
+        chunks: ``{"start": datetime, "data": [kWh, ...]}`` dicts, as built
+            by ``TOUReporter``; chunks may split a day anywhere.
+        tz: Local timezone defining day boundaries.
+
+    Returns:
+        Rollups keyed by local date; ``periods`` counts non-None values.
+    """
+    pieces: dict[date, list[tuple[datetime, list[float]]]] = {}
+    for chunk in chunks:
+        start: datetime = chunk["start"]
+        data = chunk["data"]
+        idx = 0
+        while idx < len(data):
+            day = (start + QH * idx).astimezone(tz).date()
+            stop = idx + math.ceil(
+                (local_midnight(day + timedelta(days=1), tz) - (start + QH * idx)) / QH
+            )
+            stop = max(idx + 1, min(stop, len(data)))
+            pieces.setdefault(day, []).append((start + QH * idx, data[idx:stop]))
+            idx = stop
+
+    rollups: dict[date, DayRollup] = {}
+    for day, day_pieces in pieces.items():
+        buckets = TOUBuckets()
+        nbc = 0.0
+        count = 0
+        for piece_start, values in day_pieces:
+            buckets = buckets + EnergyDataAggregator.aggregate_from_15min(
+                piece_start, values,
+            )
+            for usage_kwh in values:
+                if usage_kwh is None:
+                    continue
+                count += 1
+                if usage_kwh > 0:
+                    nbc += usage_kwh * 1000.0
+        rollups[day] = DayRollup(day=day, buckets=buckets, nbc=nbc, periods=count)
+    return rollups
+
+
+class TOURollupCache:
+    """Thread-safe cache of completed-day rollups keyed by (channel, day)."""
+
+    def __init__(self, store: HistoryStore | None = None) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            store: Optional history store backing the cache.
+        """
+        self._lock = threading.Lock()
+        self._rollups: dict[tuple[str, date], DayRollup] = {}
+        self._store: HistoryStore | None = store
+
+    def attach_store(self, store: HistoryStore) -> None:
+        """Persist rollups to *store* and read misses from it."""
+        self._store = store
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rollups)
+
+    def get_many(self, channel: str, days: list[date]) -> dict[date, DayRollup]:
+        """Return the cached rollups among *days* for *channel*.
+
+        Misses are looked up in the store (one query) and kept in memory.
+
+        Args:
+            channel: Channel key.
+            days: Consecutive local dates.
+
+        Returns:
+            Rollups keyed by date; absent days are not cached.
+        """
+        with self._lock:
+            found = {
+                day: self._rollups[(channel, day)]
+                for day in days
+                if (channel, day) in self._rollups
+            }
+        store = self._store
+        if store is None or len(found) == len(days):
+            return found
+        try:
+            stored = store.day_rollups(channel, days[0], days[-1])
+        except sqlite3.Error as exc:
+            logger.warning("TOURollupCache: history store read failed: %s", exc)
+            return found
+        with self._lock:
+            for rollup in stored:
+                self._rollups[(channel, rollup.day)] = rollup
+                found.setdefault(rollup.day, rollup)
+        return found
+
+    def put(self, channel: str, rollups: list[DayRollup]) -> None:
+        """Cache completed-day *rollups* for *channel*.
+
+        Args:
+            channel: Channel key.
+            rollups: Rollups of days that are over and fully covered.
+        """
+        if not rollups:
+            return
+        with self._lock:
+            for rollup in rollups:
+                self._rollups[(channel, rollup.day)] = rollup
+        if self._store is not None:
+            try:
+                self._store.record_day_rollups(channel, rollups)
+            except sqlite3.Error as exc:
+                logger.warning("TOURollupCache: history store write failed: %s", exc)
@@ -0,0 +1,296 @@
+"""Per-cycle span tracing, exported to a local Chrome-trace file.
+
+``run_cycle`` logs stage boundaries, but not where time goes inside a
+stage.  ``start_trace`` opens a root span with a fresh trace id for one
+cycle; ``span`` (or the ``traced`` decorator) nests child spans under
+whatever span is current.  The current span lives in a ``ContextVar``,
+so it follows the cycle into the async loop (asyncio tasks copy the
+context they are created in) and into worker threads started through
+``propagate``.
+
+Only a ``TRACE_SAMPLE_RATE`` fraction of cycles is traced.  Outside a
+sampled trace ``span`` costs one ``ContextVar.get`` and returns a shared
+no-op context manager, so steady-state overhead is negligible.  A
+finished trace is written in one go, as complete (``"ph": "X"``) events
+in the Chrome trace JSON array format, one event per line.  That format
+allows the closing ``]`` to be omitted, so the file can be loaded into
+``chrome://tracing`` or https://ui.perfetto.dev while it is still being
+appended to.  ``TraceFile`` rotates it like ``RotatingFileHandler``.
+
+Usage::
+
+    import tracing
+
+    tracing.configure(tracing.Tracer(tracing.TraceFile("solara-trace.json"), 0.1))
+    with tracing.start_trace("run_cycle"):
+        with tracing.span("plug_sync", plugs=3):
+            ...
+        pool.submit(tracing.propagate(fetch))
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import secrets
+import threading
+import time
+from collections.abc import Callable
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, TypeVar
+
+from constants import TRACE_BACKUP_COUNT, TRACE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+_NULL_SPAN = nullcontext()
+
+
+class TraceFile:
+    """Append-only Chrome-trace file with size-based rotation.
+
+    Attributes:
+        path: The active file; rotated files get ``.1`` .. ``.N`` suffixes.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        max_bytes: int = TRACE_MAX_BYTES,
+        backup_count: int = TRACE_BACKUP_COUNT,
+    ) -> None:
+        """Initialize without opening the file.
+
+        Args:
+            path: Trace file path.
+            max_bytes: Size after which the file is rotated.
+            backup_count: Rotated files kept; 0 truncates instead.
+        """
+        self.path = Path(path)
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._lock = threading.Lock()
+        self._named_threads: set[int] = set()
+
+    def write(self, events: list[dict[str, Any]]) -> None:
+        """Append *events*, naming threads not yet seen in this file."""
+        with self._lock:
+            if not self.path.exists():
+                self._named_threads.clear()
+            lines = []
+            for event in events:
+                tid = event["tid"]
+                if tid not in self._named_threads:
+                    self._named_threads.add(tid)
+                    lines.append(_thread_name_event(event["pid"], tid, event.pop("_thread")))
+                else:
+                    event.pop("_thread")
+                lines.append(event)
+            with open(self.path, "a", encoding="utf-8") as f:
+                if f.tell() == 0:
+                    f.write("[\n")
+                for line in lines:
+                    f.write(json.dumps(line, separators=(",", ":"), default=str))
+                    f.write(",\n")
+                size = f.tell()
+            if size >= self._max_bytes:
+                self._rotate()
+
+    def _rotate(self) -> None:
+        """Shift ``path.N-1`` -> ``path.N`` ... ``path`` -> ``path.1``. Caller holds lock."""
+        if self._backup_count > 0:
+            for index in range(self._backup_count - 1, 0, -1):
+                source = self.path.with_name(f"{self.path.name}.{index}")
+                if source.exists():
+                    os.replace(source, self.path.with_name(f"{self.path.name}.{index + 1}"))
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._named_threads.clear()
+
+
+def _thread_name_event(pid: int, tid: int, name: str) -> dict[str, Any]:
+    """Return the metadata event that labels *tid* in trace viewers."""
+    return {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+
+
+class Tracer:
+    """Sampling decision and export target for traces."""
+
+    def __init__(
+        self,
+        exporter: TraceFile,
+        sample_rate: float = 1.0,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        """Initialize the tracer.
+
+        Args:
+            exporter: Where finished traces are written.
+            sample_rate: Fraction of traces recorded, 0.0 - 1.0.
+            rng: Uniform [0, 1) source (injected in tests).
+        """
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self._rng = rng
+
+    def sampled(self) -> bool:
+        """Return True if the next trace should be recorded."""
+        return self.sample_rate >= 1.0 or self._rng() < self.sample_rate
+
+    def export(self, events: list[dict[str, Any]]) -> None:
+        """Write a finished trace; I/O errors are logged, never raised."""
+        try:
+            self.exporter.write(events)
+        except OSError as exc:
+            logger.warning("Trace not written to %s: %s", self.exporter.path, exc)
+
+
+class _Trace:
+    """Events collected for one sampled trace."""
+
+    __slots__ = ("trace_id", "events", "tracer")
+
+    def __init__(self, tracer: Tracer) -> None:
+        self.trace_id = secrets.token_hex(8)
+        self.events: list[dict[str, Any]] = []
+        self.tracer = tracer
+
+
+class _Span:
+    """One timed operation; the context manager returned by ``span``."""
+
+    __slots__ = ("_trace", "_name", "_attrs", "_parent_id", "span_id",
+                 "_token", "_wall_us", "_start_ns", "_root")
+
+    def __init__(
+        self, trace: _Trace, name: str, attrs: dict[str, Any],
+        parent_id: str | None, root: bool = False,
+    ) -> None:
+        self._trace = trace
+        self._name = name
+        self._attrs = attrs
+        self._parent_id = parent_id
+        self.span_id = secrets.token_hex(4)
+        self._root = root
+        self._token: contextvars.Token[_Span | None] | None = None
+        self._wall_us = 0
+        self._start_ns = 0
+
+    @property
+    def trace_id(self) -> str:
+        """Return the id shared by every span of this trace."""
+        return self._trace.trace_id
+
+    def __enter__(self) -> _Span:
+        self._token = _current.set(self)
+        self._wall_us = time.time_ns() // 1000
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        duration_us = (time.perf_counter_ns() - self._start_ns) // 1000
+        assert self._token is not None
+        _current.reset(self._token)
+        args = {"trace_id": self._trace.trace_id, "span_id": self.span_id}
+        if self._parent_id is not None:
+            args["parent_id"] = self._parent_id
+        args.update(self._attrs)
+        if exc_type is not None:
+            args["error"] = exc_type.__name__
+        thread = threading.current_thread()
+        self._trace.events.append({
+            "name": self._name,
+            "cat": "solara",
+            "ph": "X",
+            "ts": self._wall_us,
+            "dur": duration_us,
+            "pid": os.getpid(),
+            "tid": thread.native_id or thread.ident,
+            "_thread": thread.name,
+            "args": args,
+        })
+        if self._root:
+            events = sorted(self._trace.events, key=lambda e: e["ts"])
+            self._trace.tracer.export(events)
+
+
+_current: contextvars.ContextVar[_Span | None] = contextvars.ContextVar(
+    "solara_span", default=None
+)
+_tracer: Tracer | None = None
+
+
+def configure(tracer: Tracer | None) -> None:
+    """Install *tracer* for this process; None turns tracing off."""
+    global _tracer  # pylint: disable=global-statement
+    _tracer = tracer
+
+
+def start_trace(name: str, **attrs: Any) -> _Span | nullcontext[None]:
+    """Return a root span with a new trace id, or a no-op when not sampled.
+
+    Inside an existing trace this is an ordinary child span.
+    """
+    parent = _current.get()
+    if parent is not None:
+        return _Span(parent._trace, name, attrs, parent.span_id)  # pylint: disable=protected-access
+    tracer = _tracer
+    if tracer is None or not tracer.sampled():
+        return _NULL_SPAN
+    return _Span(_Trace(tracer), name, attrs, None, root=True)
+
+
+def span(name: str, **attrs: Any) -> _Span | nullcontext[None]:
+    """Return a child span of the current span, or a no-op outside a trace."""
+    parent = _current.get()
+    if parent is None:
+        return _NULL_SPAN
+    return _Span(parent._trace, name, attrs, parent.span_id)  # pylint: disable=protected-access
+
+
+def traced(name: str) -> Callable[[_F], _F]:
+    """Decorate a function or coroutine function to run inside ``span(name)``."""
+
+    def decorate(func: _F) -> _F:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def current_trace_id() -> str | None:
+    """Return the id of the trace being recorded, or None."""
+    current = _current.get()
+    return current.trace_id if current is not None else None
+
+
+def propagate(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Bind *func* to the caller's context, for use on another thread.
+
+    ``ThreadPoolExecutor.submit`` does not carry context variables; submit
+    ``propagate(func)`` instead so spans opened by *func* join the trace.
+    """
+    if _current.get() is None:
+        return func
+    return functools.partial(contextvars.copy_context().run, func)
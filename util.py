@@ -5,7 +5,7 @@ Utility functions and custom JSON provider for the application.
 from dataclasses import dataclass
 from datetime import datetime, time as TimeType, timedelta
 import math
-from typing import Any
+from typing import Any, Sequence
 
 import isodate
 from flask.json.provider import DefaultJSONProvider
@@ -13,6 +13,7 @@ from flask.json.provider import DefaultJSONProvider
 from config import Config, _config
 
 from constants import DEFAULT_PREDICTION_WINDOW_SECS
+from sample_window import SampleWindow
 
 
 class RetryableError(Exception):
@@ -71,6 +72,47 @@ class CustomJSONProvider(DefaultJSONProvider):
         return custom_json_default(o)
 
 
+# snake_case -> camelCase translations seen so far. Payload keys come from
+# a small fixed vocabulary (field names, device names), so each is split
+# and capitalized once per process; the cap guards against unbounded
+# growth should arbitrary keys ever flow through.
+_CAMEL_KEYS: dict[str, str] = {}
+_CAMEL_KEYS_MAX = 4096
+
+
+def camel_case(key: str) -> str:
+    """Return *key* in camelCase (``"sleep_hint_at"`` -> ``"sleepHintAt"``)."""
+    camel = _CAMEL_KEYS.get(key)
+    if camel is None:
+        if "_" in key:
+            parts = key.split("_")
+            camel = parts[0] + "".join(p.capitalize() for p in parts[1:])
+        else:
+            camel = key
+        if len(_CAMEL_KEYS) < _CAMEL_KEYS_MAX:
+            _CAMEL_KEYS[key] = camel
+    return camel
+
+
+def camelize(obj: object) -> object:
+    """Convert snake_case keys to camelCase recursively.
+
+    Keys are translated through a memoized table, and only dict and list
+    values are descended into, so long lists of samples cost one type
+    check per element.
+    """
+    if isinstance(obj, dict):
+        return {
+            (camel_case(k) if isinstance(k, str) else k): (
+                camelize(v) if isinstance(v, (dict, list)) else v
+            )
+            for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [camelize(i) if isinstance(i, (dict, list)) else i for i in obj]
+    return obj
+
+
 QH_PERIOD_SECONDS = 900
 
 QH_NAMES: list[str] = ["QH1", "QH2", "QH3", "QH4"]
@@ -196,8 +238,15 @@ class CompletedNBCPeriod:
     raw_wh: float
 
 
+def _total(values: Sequence[float]) -> float:
+    """Sum *values*, using the memoized sum of a ``SampleWindow``."""
+    if isinstance(values, SampleWindow):
+        return values.total()
+    return sum(values)
+
+
 def compute_nbc_quarter(
-    values: list[float],
+    values: Sequence[float],
     prediction_window_seconds: int | None = None,
 ) -> NBCQuarter | None:
     """Compute NBC metrics for a single quarter-hour period from per-second kWh data.
@@ -224,7 +273,7 @@ def compute_nbc_quarter(
     )
 
     is_complete = values_len == QH_PERIOD_SECONDS
-    raw_wh = 1000 * sum(values)
+    raw_wh = 1000 * _total(values)
     wh = max(0, raw_wh)
 
     if not is_complete:
@@ -248,7 +297,7 @@ def compute_nbc_quarter(
 
 
 def compute_nbc_quarters(
-    values: list[float],
+    values: Sequence[float],
     prediction_window_seconds: int | None = None,
 ) -> NBCQuarterSet:
     """Compute NBC metrics for each quarter-hour from per-second kWh data.